@@ -8,6 +8,28 @@ This package contains versioned API endpoints for:
 - AI insights and analytics
 """
 
-from . import auth, health
+from . import (
+    analytics,
+    auth,
+    budgets,
+    categories,
+    exports,
+    health,
+    insights,
+    rules,
+    sync,
+    transactions,
+)
 
-__all__ = ["auth", "health"]
+__all__ = [
+    "analytics",
+    "auth",
+    "budgets",
+    "categories",
+    "exports",
+    "health",
+    "insights",
+    "rules",
+    "sync",
+    "transactions",
+]
@@ -0,0 +1,96 @@
+"""
+Analytics API endpoints for the SpendAhead backend.
+
+This module provides dashboard endpoints backed by the monthly spending
+rollups, so reads scale with categories × months rather than transactions.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Annotated, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.analytics import CategorySpendingResponse, MonthlySpendingResponse
+from app.services.spending_rollup import SpendingRollupService
+from app.services.transaction_events import month_start
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+def month_range(start: date, end: date) -> tuple[date, date]:
+    """Normalize a date range to month buckets and validate it."""
+    start_month = date(start.year, start.month, 1)
+    end_month = date(end.year, end.month, 1)
+    if start_month > end_month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_month must not be after end_month",
+        )
+    return start_month, end_month
+
+
+@router.get("/spending/categories", response_model=List[CategorySpendingResponse])
+async def get_category_spending(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start_month: date = Query(description="First month of the range"),
+    end_month: Optional[date] = Query(
+        default=None, description="Last month of the range (defaults to start)"
+    ),
+    transaction_type: str = Query(default="expense", description="Transaction type"),
+) -> List[CategorySpendingResponse]:
+    """
+    Get per-category spending totals over a range of months.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        start_month: First month of the range
+        end_month: Last month of the range
+        transaction_type: Transaction type to aggregate
+
+    Returns:
+        Category totals ordered by amount
+    """
+    start, end = month_range(start_month, end_month or start_month)
+    service = SpendingRollupService(db)
+    totals = await service.get_category_totals(
+        current_user.id, start, end, transaction_type=transaction_type
+    )
+    return [CategorySpendingResponse.model_validate(row) for row in totals]
+
+
+@router.get("/spending/monthly", response_model=List[MonthlySpendingResponse])
+async def get_monthly_spending(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start_month: date = Query(description="First month of the range"),
+    end_month: Optional[date] = Query(
+        default=None, description="Last month of the range (defaults to this month)"
+    ),
+) -> List[MonthlySpendingResponse]:
+    """
+    Get monthly income, expense and transfer totals over a range of months.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        start_month: First month of the range
+        end_month: Last month of the range
+
+    Returns:
+        Monthly totals ordered by month
+    """
+    start, end = month_range(
+        start_month, end_month or month_start(datetime.now(timezone.utc))
+    )
+    service = SpendingRollupService(db)
+    totals = await service.get_monthly_totals(current_user.id, start, end)
+    return [MonthlySpendingResponse.model_validate(row) for row in totals]
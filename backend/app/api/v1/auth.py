@@ -6,7 +6,7 @@ This module provides REST API endpoints for user authentication and management.
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -25,6 +25,8 @@ from app.schemas.auth import (
     RefreshToken,
 )
 from app.schemas.base import SuccessResponse, ErrorResponse
+from app.services.audit_capture import set_audit_context
+from app.services.audit_writer import AuditEvent, audit_writer, request_context
 from app.services.auth import AuthService
 
 logger = get_logger(__name__)
@@ -35,6 +37,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/register", response_model=SuccessResponse)
 async def register_user(
     user_data: UserCreate,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> SuccessResponse:
     """
@@ -42,6 +45,7 @@ async def register_user(
 
     Args:
         user_data: User registration data
+        request: Incoming HTTP request
         db: Database session
 
     Returns:
@@ -51,6 +55,7 @@ async def register_user(
         HTTPException: If registration fails
     """
     try:
+        set_audit_context(db, **request_context(request))
         auth_service = AuthService(db)
         user = await auth_service.register_user(user_data)
 
@@ -77,6 +82,7 @@ async def register_user(
 @router.post("/login", response_model=Token)
 async def login_user(
     user_data: UserLogin,
+    request: Request,
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> Token:
     """
@@ -84,6 +90,7 @@ async def login_user(
 
     Args:
         user_data: User login credentials
+        request: Incoming HTTP request
         db: Database session
 
     Returns:
@@ -97,13 +104,32 @@ async def login_user(
         user = await auth_service.authenticate_user(user_data.email, user_data.password)
 
         if not user:
+            audit_writer.record(
+                AuditEvent(
+                    action="login_failed",
+                    entity_type="user",
+                    severity="warning",
+                    audit_metadata={"email": user_data.email},
+                    **request_context(request),
+                )
+            )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return await auth_service.login_user(user)
+        token = await auth_service.login_user(user)
+        audit_writer.record(
+            AuditEvent(
+                action="login",
+                entity_type="user",
+                entity_id=user.id,
+                user_id=user.id,
+                **request_context(request),
+            )
+        )
+        return token
     except HTTPException:
         raise
     except Exception as e:
@@ -366,6 +392,7 @@ async def resend_verification_email(
 
 @router.delete("/me", response_model=SuccessResponse)
 async def delete_user_account(
+    request: Request,
     current_user: Annotated[User, Depends(get_current_active_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> SuccessResponse:
@@ -373,6 +400,7 @@ async def delete_user_account(
     Delete current user account.
 
     Args:
+        request: Incoming HTTP request
         current_user: Current authenticated user
         db: Database session
 
@@ -383,6 +411,7 @@ async def delete_user_account(
         HTTPException: If deletion fails
     """
     try:
+        set_audit_context(db, **request_context(request))
         auth_service = AuthService(db)
         success = await auth_service.delete_user(current_user)
 
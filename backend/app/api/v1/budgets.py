@@ -0,0 +1,178 @@
+"""
+Budget API endpoints for the SpendAhead backend.
+
+This module provides budget read endpoints. Actuals and variances are kept
+current by the budget actuals engine, so reads never aggregate transactions.
+"""
+
+from typing import Annotated, List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.dependencies.auth import get_current_active_user
+from app.models.budget import Budget
+from app.models.user import User
+from app.schemas.budget import (
+    BudgetDetailResponse,
+    BudgetResponse,
+    BudgetTemplateInstantiate,
+    BudgetTemplateInstantiateResponse,
+)
+from app.services.budget_actuals import BudgetActualsEngine
+from app.services.budget_templates import BudgetTemplateService
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/budgets", tags=["Budgets"])
+
+
+async def _get_owned_budget(db: AsyncSession, budget_id: UUID, user: User) -> Budget:
+    """Load a budget with its items, ensuring it belongs to the user."""
+    result = await db.execute(
+        select(Budget)
+        .options(selectinload(Budget.budget_items))
+        .where(
+            Budget.id == budget_id,
+            Budget.user_id == user.id,
+            Budget.is_deleted == False,  # noqa: E712
+        )
+        .execution_options(populate_existing=True)
+    )
+    budget = result.scalar_one_or_none()
+    if budget is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Budget not found"
+        )
+    return budget
+
+
+@router.get("", response_model=List[BudgetResponse])
+async def list_budgets(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> List[BudgetResponse]:
+    """
+    List the current user's budgets.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Budgets ordered by start date, most recent first
+    """
+    result = await db.execute(
+        select(Budget)
+        .where(
+            Budget.user_id == current_user.id,
+            Budget.is_deleted == False,  # noqa: E712
+            Budget.is_template == False,  # noqa: E712
+        )
+        .order_by(Budget.start_date.desc())
+    )
+    return [BudgetResponse.model_validate(budget) for budget in result.scalars()]
+
+
+@router.get("/{budget_id}", response_model=BudgetDetailResponse)
+async def get_budget(
+    budget_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> BudgetDetailResponse:
+    """
+    Get a budget with its line items.
+
+    Args:
+        budget_id: Budget ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Budget with stored actuals and variances
+    """
+    budget = await _get_owned_budget(db, budget_id, current_user)
+    return BudgetDetailResponse.model_validate(budget)
+
+
+@router.post("/{budget_id}/recompute", response_model=BudgetDetailResponse)
+async def recompute_budget(
+    budget_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> BudgetDetailResponse:
+    """
+    Recompute a budget's actuals from its transactions.
+
+    Args:
+        budget_id: Budget ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Budget with freshly recomputed actuals
+    """
+    await _get_owned_budget(db, budget_id, current_user)
+    await BudgetActualsEngine(db).recompute(budget_id)
+    await db.commit()
+
+    budget = await _get_owned_budget(db, budget_id, current_user)
+    return BudgetDetailResponse.model_validate(budget)
+
+
+@router.post(
+    "/templates/{template_id}/instantiate",
+    response_model=BudgetTemplateInstantiateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def instantiate_template(
+    template_id: UUID,
+    request: BudgetTemplateInstantiate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> BudgetTemplateInstantiateResponse:
+    """
+    Instantiate a budget template into one or more periods and users.
+
+    Regular users instantiate their own templates for themselves;
+    superusers may apply any template across a list of users.
+
+    Args:
+        template_id: Template budget ID
+        request: Periods and target users
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        IDs of the created budgets and item counts
+
+    Raises:
+        HTTPException: If the template is not found or the request is invalid
+    """
+    is_superuser = getattr(current_user, "is_superuser", False)
+    if request.user_ids and not is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    try:
+        outcome = await BudgetTemplateService(db).instantiate(
+            template_id,
+            [(period.start_date, period.end_date) for period in request.periods],
+            request.user_ids or [current_user.id],
+            owner_id=None if is_superuser else current_user.id,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return BudgetTemplateInstantiateResponse(
+        budget_ids=[str(budget_id) for budget_id in outcome.budget_ids],
+        items_created=outcome.items_created,
+        items_skipped=outcome.items_skipped,
+    )
@@ -0,0 +1,219 @@
+"""
+Category API endpoints for the SpendAhead backend.
+
+This module provides category endpoints. Hierarchy information and
+subtree spending come from the category closure table, so no endpoint walks
+the hierarchy in Python; creating or re-parenting a category updates the
+closure rows in the same transaction. Superusers can also read
+categorization cache statistics.
+"""
+
+from datetime import date
+from typing import Annotated, Dict, List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.analytics import month_range
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.dependencies.auth import get_current_active_user, get_current_superuser
+from app.models.category import Category
+from app.models.user import User
+from app.schemas.category import (
+    CategorizationCacheStatsResponse,
+    CategoryCreate,
+    CategoryResponse,
+    CategorySubtreeSpendingResponse,
+    CategoryUpdate,
+)
+from app.services.categorization_cache import CategorizationCacheService
+from app.services.category_hierarchy import CategoryHierarchyService, CategoryPosition
+from app.services.category_tree import invalidate_category_tree
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+
+def _category_response(
+    category: Category, positions: Dict[UUID, CategoryPosition]
+) -> CategoryResponse:
+    """Build a category response from the category and its position."""
+    position = positions.get(category.id)
+    return CategoryResponse(
+        id=str(category.id),
+        parent_id=str(category.parent_id) if category.parent_id else None,
+        name=category.name,
+        category_type=category.category_type,
+        color=category.color,
+        icon=category.icon,
+        is_system=category.is_system,
+        path=position.path if position else category.name,
+        level=position.level if position else 0,
+        is_leaf=position.is_leaf if position else True,
+    )
+
+
+@router.get("", response_model=List[CategoryResponse])
+async def list_categories(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> List[CategoryResponse]:
+    """
+    List the current user's categories with their hierarchy positions.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Categories ordered by full path
+    """
+    result = await db.execute(
+        select(Category).where(
+            Category.user_id == current_user.id,
+            Category.is_deleted == False,  # noqa: E712
+        )
+    )
+    categories = list(result.scalars())
+    positions = await CategoryHierarchyService(db).get_positions(current_user.id)
+
+    responses = [_category_response(category, positions) for category in categories]
+    return sorted(responses, key=lambda response: response.path)
+
+
+@router.post(
+    "",
+    response_model=CategoryResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_category(
+    request: CategoryCreate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CategoryResponse:
+    """
+    Create a category, optionally under a parent.
+
+    Args:
+        request: Category fields
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The created category with its hierarchy position
+
+    Raises:
+        HTTPException: If the parent category is not found
+    """
+    service = CategoryHierarchyService(db)
+    try:
+        category = await service.create_category(current_user.id, request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    await invalidate_category_tree(current_user.id)
+    return _category_response(category, await service.get_positions(current_user.id))
+
+
+@router.patch("/{category_id}", response_model=CategoryResponse)
+async def update_category(
+    category_id: UUID,
+    request: CategoryUpdate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CategoryResponse:
+    """
+    Update a category. Setting parent_id moves it and its subcategories.
+
+    Args:
+        category_id: Category ID
+        request: Fields to change
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The updated category with its hierarchy position
+
+    Raises:
+        HTTPException: If the category is not found or the move is invalid
+    """
+    service = CategoryHierarchyService(db)
+    try:
+        await service.get_category(current_user.id, category_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    try:
+        category = await service.update_category(
+            current_user.id, category_id, request.model_dump(exclude_unset=True)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    await db.commit()
+    await invalidate_category_tree(current_user.id)
+    return _category_response(category, await service.get_positions(current_user.id))
+
+
+@router.get(
+    "/categorization-cache/stats", response_model=CategorizationCacheStatsResponse
+)
+async def get_categorization_cache_stats(
+    current_user: Annotated[User, Depends(get_current_superuser)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CategorizationCacheStatsResponse:
+    """
+    Get categorization cache hit rates and token savings.
+
+    Args:
+        current_user: Current authenticated superuser
+        db: Database session
+
+    Returns:
+        Cache counters next to the tokens spent on model calls
+    """
+    stats = await CategorizationCacheService(db, await get_redis()).stats()
+    return CategorizationCacheStatsResponse(**stats)
+
+
+@router.get(
+    "/{category_id}/spending", response_model=List[CategorySubtreeSpendingResponse]
+)
+async def get_subtree_spending(
+    category_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start_month: date = Query(description="First month of the range"),
+    end_month: Optional[date] = Query(
+        default=None, description="Last month of the range (defaults to start)"
+    ),
+    transaction_type: str = Query(default="expense", description="Transaction type"),
+) -> List[CategorySubtreeSpendingResponse]:
+    """
+    Get spending in a category and all of its subcategories.
+
+    Args:
+        category_id: Root category ID
+        current_user: Current authenticated user
+        db: Database session
+        start_month: First month of the range
+        end_month: Last month of the range
+        transaction_type: Transaction type to aggregate
+
+    Returns:
+        Subtree totals per currency
+    """
+    category = await db.get(Category, category_id)
+    if category is None or category.user_id != current_user.id or category.is_deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
+        )
+
+    start, end = month_range(start_month, end_month or start_month)
+    totals = await CategoryHierarchyService(db).get_subtree_spending(
+        current_user.id, category_id, start, end, transaction_type=transaction_type
+    )
+    return [CategorySubtreeSpendingResponse.model_validate(row) for row in totals]
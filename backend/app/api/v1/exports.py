@@ -0,0 +1,117 @@
+"""
+Data export API endpoints for the SpendAhead backend.
+
+This module lets users request an export of all their data, follow its
+progress and download the finished archive. Exports are written by the
+export worker, never inside the request.
+"""
+
+from pathlib import Path
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.data_export import DataExportCreate, DataExportResponse
+from app.services.data_export import DataExportService
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/exports", tags=["Data Exports"])
+
+
+@router.post(
+    "",
+    response_model=DataExportResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def request_export(
+    request: DataExportCreate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> DataExportResponse:
+    """
+    Request an export of the current user's data.
+
+    Args:
+        request: Export format
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The queued export, or the one already in progress
+    """
+    export = await DataExportService(db).request_export(
+        current_user.id, request.export_format
+    )
+    return DataExportResponse.model_validate(export)
+
+
+@router.get("/{export_id}", response_model=DataExportResponse)
+async def get_export(
+    export_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> DataExportResponse:
+    """
+    Get the progress of an export.
+
+    Args:
+        export_id: Export ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The export and its progress
+
+    Raises:
+        HTTPException: If the export is not found
+    """
+    try:
+        export = await DataExportService(db).get_export(export_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return DataExportResponse.model_validate(export)
+
+
+@router.get("/{export_id}/download")
+async def download_export(
+    export_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> FileResponse:
+    """
+    Download the archive of a completed export.
+
+    Args:
+        export_id: Export ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The tar archive of gzip-compressed table files
+
+    Raises:
+        HTTPException: If the export is not found or not completed yet
+    """
+    try:
+        export = await DataExportService(db).get_export(export_id, current_user.id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if export.status != "completed" or not export.file_path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Export is not ready yet"
+        )
+    path = Path(export.file_path)
+    if not path.exists():
+        logger.error("Export archive missing", export_id=str(export.id))
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE, detail="Export archive is gone"
+        )
+    return FileResponse(path, media_type="application/x-tar", filename=path.name)
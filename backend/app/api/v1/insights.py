@@ -0,0 +1,154 @@
+"""
+AI insight API endpoints for the SpendAhead backend.
+
+This module serves the insight feed with cursor pagination, marks insights
+as read and reports the unread count for the notification badge. The badge
+is answered from a Redis counter without querying the database.
+"""
+
+from typing import Annotated, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.core.serialization import FastJSONResponse
+from app.dependencies.auth import get_current_active_user, get_current_user_id
+from app.models.user import User
+from app.schemas.base import parse_fieldset
+from app.schemas.insight import (
+    InsightFeedResponse,
+    InsightResponse,
+    MarkAllReadResponse,
+    UnreadCountResponse,
+)
+from app.services.insight_feed import FEED_PAGE_SIZE, InsightFeedService, UnreadCounters
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/insights", tags=["AI Insights"])
+
+
+@router.get("", response_model=InsightFeedResponse)
+async def get_feed(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(default=FEED_PAGE_SIZE, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(default=None, description="Cursor of the next page"),
+    unread_only: bool = Query(default=False, description="Only unread insights"),
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated fields to return (id is always included)",
+    ),
+) -> FastJSONResponse:
+    """
+    Get a page of the current user's insight feed.
+
+    Only the columns of the requested fields are loaded; ``response_model``
+    documents the full shape.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        limit: Page size
+        cursor: Cursor returned with the previous page
+        unread_only: Only return unread insights
+        fields: Comma-separated fields to return
+
+    Returns:
+        Insights ordered by priority, newest first, and the next cursor
+
+    Raises:
+        HTTPException: If the cursor or a field is invalid
+    """
+    try:
+        selected = parse_fieldset(fields, InsightResponse)
+        page = await InsightFeedService(db, await get_redis()).get_feed(
+            current_user.id,
+            limit=limit,
+            cursor=cursor,
+            unread_only=unread_only,
+            fields=selected,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return FastJSONResponse(
+        {
+            "items": [
+                {name: getattr(insight, name) for name in selected}
+                for insight in page.items
+            ],
+            "next_cursor": page.next_cursor,
+        }
+    )
+
+
+@router.get("/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    user_id: Annotated[UUID, Depends(get_current_user_id)],
+) -> UnreadCountResponse:
+    """
+    Get the current user's unread insight count from Redis.
+
+    Args:
+        user_id: ID of the authenticated user
+
+    Returns:
+        The unread count
+    """
+    return UnreadCountResponse(
+        unread=await UnreadCounters(await get_redis()).get(user_id)
+    )
+
+
+@router.post("/read-all", response_model=MarkAllReadResponse)
+async def mark_all_as_read(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> MarkAllReadResponse:
+    """
+    Mark every insight of the current user as read.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Number of insights marked
+    """
+    marked = await InsightFeedService(db, await get_redis()).mark_all_as_read(
+        current_user.id
+    )
+    return MarkAllReadResponse(marked=marked)
+
+
+@router.post("/{insight_id}/read", response_model=InsightResponse)
+async def mark_as_read(
+    insight_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> InsightResponse:
+    """
+    Mark an insight as read.
+
+    Args:
+        insight_id: Insight ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The updated insight
+
+    Raises:
+        HTTPException: If the insight is not found
+    """
+    try:
+        insight = await InsightFeedService(db, await get_redis()).mark_as_read(
+            current_user.id, insight_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return InsightResponse.model_validate(insight)
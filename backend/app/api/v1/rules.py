@@ -0,0 +1,175 @@
+"""
+Categorization rule API endpoints for the SpendAhead backend.
+
+This module lets users manage their auto-categorization rules and apply
+them retroactively to their transaction history. New transactions are
+matched against the rules by the categorization pipeline.
+"""
+
+from typing import Annotated, List
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.categorization_rule import (
+    CategorizationRuleCreate,
+    CategorizationRuleResponse,
+    CategorizationRuleUpdate,
+    RuleApplicationResponse,
+)
+from app.services.categorization_rules import CategorizationRuleService
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/rules", tags=["Categorization Rules"])
+
+
+@router.get("", response_model=List[CategorizationRuleResponse])
+async def list_rules(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> List[CategorizationRuleResponse]:
+    """
+    List the current user's rules in evaluation order.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        Rules ordered by priority
+    """
+    rules = await CategorizationRuleService(db, await get_redis()).list_rules(
+        current_user.id
+    )
+    return [CategorizationRuleResponse.model_validate(rule) for rule in rules]
+
+
+@router.post(
+    "",
+    response_model=CategorizationRuleResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_rule(
+    request: CategorizationRuleCreate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CategorizationRuleResponse:
+    """
+    Create a rule.
+
+    Args:
+        request: Rule conditions and actions
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The created rule
+
+    Raises:
+        HTTPException: If the rule is invalid
+    """
+    try:
+        rule = await CategorizationRuleService(db, await get_redis()).create_rule(
+            current_user.id, request.model_dump()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return CategorizationRuleResponse.model_validate(rule)
+
+
+@router.patch("/{rule_id}", response_model=CategorizationRuleResponse)
+async def update_rule(
+    rule_id: UUID,
+    request: CategorizationRuleUpdate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CategorizationRuleResponse:
+    """
+    Update a rule. Fields set to null clear the condition or action.
+
+    Args:
+        rule_id: Rule ID
+        request: Fields to change
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The updated rule
+
+    Raises:
+        HTTPException: If the rule is not found or becomes invalid
+    """
+    service = CategorizationRuleService(db, await get_redis())
+    try:
+        await service.get_rule(current_user.id, rule_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    try:
+        rule = await service.update_rule(
+            current_user.id, rule_id, request.model_dump(exclude_unset=True)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return CategorizationRuleResponse.model_validate(rule)
+
+
+@router.delete("/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_rule(
+    rule_id: UUID,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> None:
+    """
+    Delete a rule. Transactions it categorized keep their category.
+
+    Args:
+        rule_id: Rule ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Raises:
+        HTTPException: If the rule is not found
+    """
+    try:
+        await CategorizationRuleService(db, await get_redis()).delete_rule(
+            current_user.id, rule_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.post("/apply", response_model=RuleApplicationResponse)
+async def apply_rules(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    overwrite: bool = Query(
+        default=False,
+        description="Also recategorize transactions categorized by hand",
+    ),
+) -> RuleApplicationResponse:
+    """
+    Apply the active rules to the current user's whole history.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        overwrite: Also recategorize manually categorized transactions
+
+    Returns:
+        Counts of changed transactions
+    """
+    outcome = await CategorizationRuleService(db, await get_redis()).apply_retroactive(
+        current_user.id, overwrite=overwrite
+    )
+    return RuleApplicationResponse(
+        matched=outcome.matched,
+        categorized=outcome.categorized,
+        tagged=outcome.tagged,
+    )
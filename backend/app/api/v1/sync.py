@@ -0,0 +1,64 @@
+"""
+Sync API endpoints for the SpendAhead backend.
+
+This module serves the changes to a user's accounts, categories,
+transactions, budgets and insights since a client's sync cursor, so
+offline-capable clients only download what changed.
+"""
+
+from dataclasses import asdict
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.serialization import FastJSONResponse
+from app.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.sync import SyncResponse
+from app.services.delta_sync import SYNC_PAGE_SIZE, DeltaSyncService
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/sync", tags=["Sync"])
+
+
+@router.get("", response_model=SyncResponse)
+async def get_changes(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    cursor: Optional[str] = Query(
+        default=None, description="Cursor of the previous sync, omitted for a full one"
+    ),
+    limit: int = Query(
+        default=SYNC_PAGE_SIZE, ge=1, le=1000, description="Changes per entity type"
+    ),
+) -> FastJSONResponse:
+    """
+    Get the current user's changes since a sync cursor.
+
+    Call again with ``next_cursor`` while ``has_more`` is set, then keep
+    the last cursor for the next sync. The page is rendered straight from
+    Core rows; ``response_model`` documents its shape.
+
+    Args:
+        current_user: Current authenticated user
+        db: Database session
+        cursor: Cursor returned by the previous call
+        limit: Most changes to return per entity type
+
+    Returns:
+        Changed and deleted entities per type, and the next cursor
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    try:
+        page = await DeltaSyncService(db).get_changes(
+            current_user.id, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return FastJSONResponse(asdict(page))
@@ -0,0 +1,227 @@
+"""
+Transaction API endpoints for the SpendAhead backend.
+
+This module lists a user's transactions a page at a time and exports
+whole date ranges as streamed NDJSON or CSV, so large ranges never have to
+be held in memory before the response starts. Both take a sparse fieldset
+whose columns alone are fetched. Users can also recategorize a transaction,
+which teaches the categorization cache their choice.
+"""
+
+from datetime import datetime
+from typing import Annotated, Literal, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.core.serialization import FastJSONResponse, rows_to_dicts
+from app.dependencies.auth import get_current_active_user
+from app.models.user import User
+from app.schemas.transaction import (
+    TransactionCategoryUpdate,
+    TransactionListResponse,
+    TransactionResponse,
+)
+from app.services.transaction_list import (
+    TRANSACTION_PAGE_SIZE,
+    TransactionFilter,
+    TransactionListService,
+    encode_transaction_stream,
+    parse_fields,
+    stream_transaction_batches,
+)
+from app.services.transaction_recategorization import (
+    TransactionRecategorizationService,
+)
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/transactions", tags=["Transactions"])
+
+# Media type of each streamed export format
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def transaction_filters(
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    start: Optional[datetime] = Query(default=None, description="Earliest date"),
+    end: Optional[datetime] = Query(default=None, description="Date to stop before"),
+    account_id: Optional[UUID] = Query(default=None, description="Either account"),
+    category_id: Optional[UUID] = Query(default=None, description="Category"),
+    transaction_type: Optional[str] = Query(
+        default=None, description="income, expense or transfer"
+    ),
+) -> TransactionFilter:
+    """
+    Build the transaction filters of a request.
+
+    Args:
+        current_user: Current authenticated user
+        start: Earliest transaction date
+        end: Transaction date to stop before
+        account_id: Account on either side of the transaction
+        category_id: Category
+        transaction_type: Transaction type
+
+    Returns:
+        The filters
+
+    Raises:
+        HTTPException: If the date range is empty
+    """
+    try:
+        return TransactionFilter(
+            user_id=current_user.id,
+            start=start,
+            end=end,
+            account_id=account_id,
+            category_id=category_id,
+            transaction_type=transaction_type,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def transaction_fields(
+    fields: Optional[str] = Query(
+        default=None,
+        description="Comma-separated fields to return (id and transaction_date "
+        "are always included)",
+    ),
+) -> Tuple[str, ...]:
+    """
+    Parse the sparse fieldset of a request.
+
+    Args:
+        fields: Comma-separated field names
+
+    Returns:
+        Field names to select
+
+    Raises:
+        HTTPException: If a field is unknown
+    """
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("", response_model=TransactionListResponse)
+async def list_transactions(
+    filters: Annotated[TransactionFilter, Depends(transaction_filters)],
+    fields: Annotated[Tuple[str, ...], Depends(transaction_fields)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    limit: int = Query(
+        default=TRANSACTION_PAGE_SIZE, ge=1, le=200, description="Page size"
+    ),
+    cursor: Optional[str] = Query(default=None, description="Cursor of the next page"),
+) -> FastJSONResponse:
+    """
+    Get a page of the current user's transactions, newest first.
+
+    The page is rendered straight from Core rows; ``response_model``
+    documents its shape.
+
+    Args:
+        filters: Transaction filters
+        fields: Fields to return
+        db: Database session
+        limit: Page size
+        cursor: Cursor returned with the previous page
+
+    Returns:
+        Transactions and the next cursor
+
+    Raises:
+        HTTPException: If the cursor is invalid
+    """
+    try:
+        page = await TransactionListService(db).list_page(
+            filters, limit=limit, cursor=cursor, fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # Rows already have the response's shape; skip model validation
+    return FastJSONResponse(
+        {
+            "items": rows_to_dicts(fields, page.items),
+            "next_cursor": page.next_cursor,
+        }
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    filters: Annotated[TransactionFilter, Depends(transaction_filters)],
+    fields: Annotated[Tuple[str, ...], Depends(transaction_fields)],
+    export_format: Literal["ndjson", "csv"] = Query(
+        default="ndjson", alias="format", description="ndjson or csv"
+    ),
+) -> StreamingResponse:
+    """
+    Stream every matching transaction, newest first.
+
+    Rows are read from a server-side cursor one batch at a time as the
+    client consumes the response.
+
+    Args:
+        filters: Transaction filters
+        fields: Fields to return
+        export_format: ndjson or csv
+
+    Returns:
+        The streamed transactions
+    """
+    headers = {}
+    if export_format == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="transactions.csv"'
+    return StreamingResponse(
+        encode_transaction_stream(
+            export_format, stream_transaction_batches(filters, fields), fields
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=headers,
+    )
+
+
+@router.put("/{transaction_id}/category", response_model=TransactionResponse)
+async def recategorize_transaction(
+    transaction_id: UUID,
+    request: TransactionCategoryUpdate,
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> TransactionResponse:
+    """
+    Set a transaction's category.
+
+    Args:
+        transaction_id: Transaction ID
+        request: Category chosen by the user
+        current_user: Current authenticated user
+        db: Database session
+
+    Returns:
+        The updated transaction
+
+    Raises:
+        HTTPException: If the transaction or category is not found, or the
+            category does not fit the transaction type
+    """
+    try:
+        transaction = await TransactionRecategorizationService(
+            db, await get_redis()
+        ).recategorize(current_user.id, transaction_id, request.category_id)
+    except ValueError as e:
+        code = (
+            status.HTTP_404_NOT_FOUND
+            if str(e).endswith("not found")
+            else status.HTTP_400_BAD_REQUEST
+        )
+        raise HTTPException(status_code=code, detail=str(e))
+    return TransactionResponse.model_validate(transaction)
@@ -56,6 +56,34 @@ class Settings(BaseSettings):
     openai_model: str = Field(default="gpt-4")
     openai_max_tokens: int = Field(default=1000)
     openai_temperature: float = Field(default=0.1)
+    ai_categorization_provider: str = Field(default="local")  # local or openai
+    ai_categorization_batch_size: int = Field(default=50)
+    ai_categorization_concurrency: int = Field(default=4)
+    ai_categorization_max_retries: int = Field(default=3)
+    ai_categorization_retry_backoff: float = Field(default=0.5)  # seconds
+    ai_categorization_min_confidence: float = Field(default=0.7)
+    similarity_cache_dir: str = Field(default="cache/similarity")
+    ai_insight_provider: str = Field(default="local")  # local or openai
+    ai_insight_concurrency: int = Field(default=4)
+    ai_insight_tokens_per_minute: int = Field(default=40000)
+    ai_insight_lease_seconds: int = Field(default=300)
+    ai_insight_poll_interval: float = Field(default=5.0)  # seconds
+    ai_insight_max_attempts: int = Field(default=3)
+    ai_insight_context_tokens: int = Field(default=400)
+
+    # Audit Logging
+    audit_queue_size: int = Field(default=10000)
+    audit_batch_size: int = Field(default=500)
+    audit_flush_interval: float = Field(default=0.2)  # seconds
+    audit_partitions_ahead: int = Field(default=3)  # months
+    audit_retention_months: int = Field(default=12)
+    audit_archive_dir: str = Field(default="archive/audit_logs")
+
+    # Data Exports
+    data_export_dir: str = Field(default="exports")
+    data_export_batch_size: int = Field(default=2000)
+    data_export_lease_seconds: int = Field(default=600)
+    data_export_max_attempts: int = Field(default=3)
 
     # Rate Limiting
     rate_limit_per_minute: int = Field(default=60)
@@ -8,8 +8,8 @@ like system categories, default accounts, and initial configuration.
 import asyncio
 import json
 from decimal import Decimal
-from typing import List
-from uuid import uuid4
+from typing import Any, Dict, List
+from uuid import UUID, uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
@@ -18,6 +18,8 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.account import Account
 from app.models.budget import Budget
+from app.services.category_hierarchy import CategoryHierarchyService
+from app.services.category_tree import invalidate_category_tree
 
 
 # Default system categories
@@ -237,7 +239,13 @@ async def create_default_categories(
             session.add(category)
             categories.append(category)
 
+    if categories:
+        await session.flush()
+        await CategoryHierarchyService(session).rebuild(UUID(user_id))
+
     await session.commit()
+    if categories:
+        await invalidate_category_tree(UUID(user_id))
     return categories
 
 
@@ -252,7 +260,7 @@ async def create_default_accounts(session: AsyncSession, user_id: str) -> List[A
     Returns:
         List of created accounts
     """
-    default_accounts = [
+    default_accounts: List[Dict[str, Any]] = [
         {
             "name": "Cash",
             "account_type": "cash",
@@ -288,7 +296,7 @@ async def create_default_accounts(session: AsyncSession, user_id: str) -> List[A
         },
     ]
 
-    accounts = []
+    accounts: List[Account] = []
 
     for account_data in default_accounts:
         # Check if account already exists for this user
@@ -0,0 +1,61 @@
+"""
+JSON serialization for the SpendAhead backend.
+
+This module renders API responses with orjson, which serializes UUIDs and
+datetimes natively and is several times faster than the standard library
+encoder. Output matches the schemas': datetimes in ISO 8601 with their
+offset and decimals as strings, so amounts keep their exact value. Hot
+list endpoints can skip pydantic entirely and return rows converted with
+rows_to_dicts().
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def json_default(value: Any) -> Any:
+    """Serialize the types orjson does not know."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a value to JSON.
+
+    Args:
+        content: Value built from dicts, lists, scalars, UUIDs, datetimes
+            and decimals
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(content, default=json_default)
+
+
+def rows_to_dicts(
+    names: Sequence[str], rows: Iterable[Sequence[Any]]
+) -> List[Dict[str, Any]]:
+    """
+    Convert Core rows to response items without ORM or pydantic objects.
+
+    Args:
+        names: Column names, in row order
+        rows: Rows of a Core select
+
+    Returns:
+        One dict per row
+    """
+    return [dict(zip(names, row)) for row in rows]
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        """Render the content as JSON."""
+        return dumps(content)
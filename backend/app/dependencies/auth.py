@@ -5,6 +5,7 @@ This module provides FastAPI dependencies for authentication and authorization.
 """
 
 from typing import Annotated, Optional
+from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -76,8 +77,39 @@ async def get_current_user(
         raise credentials_exception
 
 
+async def get_current_user_id(
+    credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
+) -> UUID:
+    """
+    Get the current user's ID from the JWT token without loading the user.
+
+    For hot read-only endpoints that must not query the database; the token
+    is verified but the account is not re-checked for deactivation.
+
+    Args:
+        credentials: HTTP authorization credentials containing the JWT token
+
+    Returns:
+        ID of the authenticated user
+
+    Raises:
+        HTTPException: If the token is invalid
+    """
+    payload = verify_token(credentials.credentials)
+    try:
+        if payload is None or payload.get("type") != "access":
+            raise ValueError("Invalid access token")
+        return UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
 ) -> User:
     """
     Get the current active user.
@@ -100,7 +132,7 @@ async def get_current_active_user(
 
 
 async def get_current_verified_user(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> User:
     """
     Get the current verified user.
@@ -123,7 +155,7 @@ async def get_current_verified_user(
 
 
 async def get_current_superuser(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+    current_user: Annotated[User, Depends(get_current_active_user)],
 ) -> User:
     """
     Get the current superuser.
@@ -16,10 +16,25 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
-from app.api.v1 import auth, health
+from app.api.v1 import (
+    analytics,
+    auth,
+    budgets,
+    categories,
+    exports,
+    health,
+    insights,
+    rules,
+    sync,
+    transactions,
+)
 from app.core.config import settings
 from app.core.database import create_tables
 from app.core.logging import get_logger, setup_logging
+from app.core.redis import get_redis
+from app.core.serialization import FastJSONResponse
+from app.services.audit_capture import audit_capture
+from app.services.audit_writer import audit_writer
 
 # Import models to ensure they're registered with SQLAlchemy
 
@@ -51,6 +66,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             "Continuing without database tables - you can create them manually later"
         )
 
+    # Write audit events in the background, capturing ORM changes
+    await audit_writer.start(await get_redis())
+    audit_capture.install()
+
     logger.info("SpendAhead backend application started successfully")
 
     yield
@@ -58,6 +77,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # Shutdown
     logger.info("Shutting down SpendAhead backend application")
 
+    # Write or spill every queued audit event before exiting
+    audit_capture.remove()
+    await audit_writer.stop()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -69,6 +92,7 @@ app = FastAPI(
     openapi_url="/openapi.json" if settings.debug else None,
     lifespan=lifespan,
     debug=settings.debug,
+    default_response_class=FastJSONResponse,
 )
 
 # Add rate limiting
@@ -153,6 +177,14 @@ async def add_process_time_header(request: Request, call_next) -> Response:
 # Include API routes
 app.include_router(health.router, prefix="/api/v1")
 app.include_router(auth.router, prefix="/api/v1")
+app.include_router(analytics.router, prefix="/api/v1")
+app.include_router(budgets.router, prefix="/api/v1")
+app.include_router(categories.router, prefix="/api/v1")
+app.include_router(rules.router, prefix="/api/v1")
+app.include_router(insights.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
+app.include_router(transactions.router, prefix="/api/v1")
+app.include_router(sync.router, prefix="/api/v1")
 
 
 @app.get("/")
@@ -15,6 +15,13 @@ from app.models.budget import Budget, BudgetItem
 from app.models.account import Account
 from app.models.ai_insight import AIInsight
 from app.models.audit_log import AuditLog
+from app.models.spending_rollup import SpendingRollup
+from app.models.balance_snapshot import AccountBalanceSnapshot
+from app.models.category_closure import CategoryClosure
+from app.models.categorization_cache import CategorizationCacheEntry
+from app.models.categorization_rule import CategorizationRule
+from app.models.insight_job import InsightJob
+from app.models.data_export import DataExport
 
 __all__ = [
     "User",
@@ -25,4 +32,11 @@ __all__ = [
     "Account",
     "AIInsight",
     "AuditLog",
+    "SpendingRollup",
+    "AccountBalanceSnapshot",
+    "CategoryClosure",
+    "CategorizationCacheEntry",
+    "CategorizationRule",
+    "InsightJob",
+    "DataExport",
 ]
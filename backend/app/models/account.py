@@ -5,38 +5,49 @@ This module defines the Account model for managing different financial accounts
 like bank accounts, credit cards, cash, investments, etc.
 """
 
+import uuid
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy import (
     Boolean,
-    Column,
     DateTime,
     String,
     Text,
     ForeignKey,
+    Index,
     Numeric,
     Integer,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
 
+def _opening_balance_default(context: Any) -> Decimal:
+    """Default an account's opening balance to the balance it is created with."""
+    return context.get_current_parameters().get("current_balance") or Decimal("0.00")
+
+
 class Account(Base):
     """Account model for financial accounts."""
 
     __tablename__ = "accounts"
+    __table_args__ = (
+        # Changes since a sync cursor, tombstones included
+        Index("ix_accounts_user_updated", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship
-    user_id = Column(
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
@@ -44,58 +55,83 @@ class Account(Base):
     )
 
     # Account details
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=True)
-    account_type = Column(
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    account_type: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # bank, credit_card, cash, investment, etc.
-    account_subtype = Column(String(50), nullable=True)  # checking, savings, etc.
+    account_subtype: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )  # checking, savings, etc.
 
     # Financial details
-    currency = Column(String(3), default="USD", nullable=False)
-    current_balance = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
-    available_balance = Column(Numeric(10, 2), nullable=True)  # For credit cards
-    credit_limit = Column(Numeric(10, 2), nullable=True)  # For credit cards
+    currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
+    current_balance: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
+    opening_balance: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=_opening_balance_default, nullable=False
+    )  # Balance before any recorded transaction
+    available_balance: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )  # For credit cards
+    credit_limit: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )  # For credit cards
 
     # Account numbers and identifiers
-    account_number = Column(String(50), nullable=True)
-    routing_number = Column(String(20), nullable=True)  # For US bank accounts
-    institution_name = Column(String(100), nullable=True)
-    institution_id = Column(String(50), nullable=True)
+    account_number: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    routing_number: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True
+    )  # For US bank accounts
+    institution_name: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    institution_id: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
 
     # External integration
-    external_id = Column(
+    external_id: Mapped[Optional[str]] = mapped_column(
         String(255), nullable=True, index=True
     )  # For bank integrations
-    external_account_id = Column(String(255), nullable=True)  # For Plaid, etc.
-    last_sync_at = Column(DateTime(timezone=True), nullable=True)
-    sync_status = Column(
+    external_account_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )  # For Plaid, etc.
+    last_sync_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    sync_status: Mapped[str] = mapped_column(
         String(20), default="manual", nullable=False
     )  # manual, auto, error
 
     # Account status
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_archived = Column(Boolean, default=False, nullable=False)
-    exclude_from_budget = Column(
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    is_archived: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    exclude_from_budget: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # Exclude from budget calculations
-    exclude_from_net_worth = Column(
+    exclude_from_net_worth: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # Exclude from net worth
 
     # Account preferences
-    color = Column(String(7), default="#3B82F6", nullable=False)  # Hex color
-    icon = Column(String(50), nullable=True)  # Icon identifier
-    display_order = Column(Integer, default=0, nullable=False)  # For custom ordering
+    color: Mapped[str] = mapped_column(
+        String(7), default="#3B82F6", nullable=False
+    )  # Hex color
+    icon: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )  # Icon identifier
+    display_order: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # For custom ordering
 
     # Additional metadata
-    account_metadata = Column(JSONB, nullable=True)  # Additional account-specific data
+    account_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Additional account-specific data
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -103,8 +139,10 @@ class Account(Base):
     )
 
     # Soft delete
-    is_deleted = Column(Boolean, default=False, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="accounts")
@@ -165,7 +203,11 @@ class Account(Base):
         return f"{currency} {balance:,.2f}"
 
     def update_balance(self, amount: Decimal) -> None:
-        """Update account balance."""
+        """
+        Update account balance in memory.
+
+        See BalanceUpdateService for concurrent writers.
+        """
         current_balance = getattr(self, "current_balance", Decimal("0.00"))
         setattr(self, "current_balance", current_balance + amount)
 
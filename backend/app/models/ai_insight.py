@@ -5,21 +5,26 @@ This module defines the AIInsight model for storing AI-generated financial insig
 recommendations, and analysis results.
 """
 
+import uuid
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import (
     Boolean,
-    Column,
+    Computed,
     DateTime,
     String,
     Text,
     ForeignKey,
+    Index,
     Numeric,
     Integer,
+    SmallInteger,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -29,14 +34,35 @@ class AIInsight(Base):
     """AI Insight model for AI-generated financial insights."""
 
     __tablename__ = "ai_insights"
+    __table_args__ = (
+        # A user's feed in display order
+        Index(
+            "ix_ai_insights_feed",
+            "user_id",
+            text("priority_rank DESC"),
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("is_active AND NOT is_deleted"),
+        ),
+        # Visible insights that expire, for the expiry sweeper
+        Index(
+            "ix_ai_insights_expiry",
+            "expires_at",
+            postgresql_where=text(
+                "is_active AND NOT is_deleted AND expires_at IS NOT NULL"
+            ),
+        ),
+        # Changes since a sync cursor, tombstones included
+        Index("ix_ai_insights_user_updated", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship
-    user_id = Column(
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
@@ -44,62 +70,97 @@ class AIInsight(Base):
     )
 
     # Insight details
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=False)
-    insight_type = Column(
+    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str] = mapped_column(Text, nullable=False)
+    insight_type: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # spending_pattern, budget_optimization, savings_opportunity, etc.
-    category = Column(
+    category: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # warning, recommendation, analysis, alert
 
     # Insight content
-    content = Column(JSONB, nullable=False)  # Structured insight data
-    summary = Column(Text, nullable=True)  # Human-readable summary
+    content: Mapped[Dict[str, Any]] = mapped_column(
+        JSONB, nullable=False
+    )  # Structured insight data
+    summary: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )  # Human-readable summary
 
     # AI processing data
-    ai_model_used = Column(String(50), nullable=True)  # gpt-4, gpt-3.5-turbo, etc.
-    ai_confidence_score = Column(Numeric(3, 2), nullable=True)  # 0.00 to 1.00
-    ai_processing_time = Column(
+    ai_model_used: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )  # gpt-4, gpt-3.5-turbo, etc.
+    ai_confidence_score: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(3, 2), nullable=True
+    )  # 0.00 to 1.00
+    ai_processing_time: Mapped[Optional[int]] = mapped_column(
         Integer, nullable=True
     )  # Processing time in milliseconds
-    ai_tokens_used = Column(Integer, nullable=True)  # Number of tokens used
+    ai_tokens_used: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # Number of tokens used
 
     # Insight metadata
-    data_period_start = Column(DateTime(timezone=True), nullable=True)
-    data_period_end = Column(DateTime(timezone=True), nullable=True)
-    affected_categories = Column(JSONB, nullable=True)  # Array of category IDs
-    affected_accounts = Column(JSONB, nullable=True)  # Array of account IDs
+    data_period_start: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    data_period_end: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    affected_categories: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Array of category IDs
+    affected_accounts: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Array of account IDs
 
     # Financial impact
-    potential_savings = Column(Numeric(10, 2), nullable=True)
-    impact_score = Column(Integer, nullable=True)  # 1-10 scale of potential impact
+    potential_savings: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )
+    impact_score: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # 1-10 scale of potential impact
 
     # User interaction
-    is_read = Column(Boolean, default=False, nullable=False)
-    is_actioned = Column(Boolean, default=False, nullable=False)
-    action_taken = Column(String(100), nullable=True)  # What action user took
-    user_feedback = Column(String(20), nullable=True)  # helpful, not_helpful, neutral
+    is_read: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_actioned: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    action_taken: Mapped[Optional[str]] = mapped_column(
+        String(100), nullable=True
+    )  # What action user took
+    user_feedback: Mapped[Optional[str]] = mapped_column(
+        String(20), nullable=True
+    )  # helpful, not_helpful, neutral
 
     # Insight status
-    is_active = Column(Boolean, default=True, nullable=False)
-    priority = Column(
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    priority: Mapped[str] = mapped_column(
         String(20), default="medium", nullable=False
     )  # low, medium, high, critical
+    priority_rank: Mapped[int] = mapped_column(
+        SmallInteger,
+        Computed(
+            "CASE priority WHEN 'critical' THEN 3 WHEN 'high' THEN 2 "
+            "WHEN 'medium' THEN 1 ELSE 0 END",
+            persisted=True,
+        ),
+        nullable=False,
+    )  # Sortable priority, maintained by the database
 
     # Scheduling and delivery
-    scheduled_for = Column(
+    scheduled_for: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )  # When to show this insight
-    expires_at = Column(
+    expires_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )  # When insight becomes irrelevant
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -107,8 +168,10 @@ class AIInsight(Base):
     )
 
     # Soft delete
-    is_deleted = Column(Boolean, default=False, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="ai_insights")
@@ -3,30 +3,71 @@ Audit Log model for the SpendAhead backend.
 
 This module defines the AuditLog model for tracking all financial changes,
 user actions, and system events for compliance and debugging purposes.
+The table is range-partitioned by month on created_at; see
+app.services.audit_retention for partition maintenance.
 """
 
-from typing import Optional
-
-from sqlalchemy import Column, DateTime, String, Text, ForeignKey, Integer, Boolean
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
 
+# Fields whose values are redacted from sensitive audit entries
+SENSITIVE_FIELDS = frozenset(
+    ["hashed_password", "account_number", "routing_number", "amount"]
+)
+
+# Value stored in place of a redacted field
+REDACTED = "[REDACTED]"
+
+
+def has_sensitive_fields(fields: Iterable[str]) -> bool:
+    """Check if any of the fields is sensitive."""
+    return not SENSITIVE_FIELDS.isdisjoint(fields)
+
+
+def redact_sensitive_values(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the values of sensitive fields in place and return the values."""
+    for field in SENSITIVE_FIELDS.intersection(values):
+        values[field] = REDACTED
+    return values
+
 
 class AuditLog(Base):
     """Audit Log model for tracking financial changes and user actions."""
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Recent activity; rows arrive in created_at order, so BRIN stays tiny
+        Index("ix_audit_logs_created_at", "created_at", postgresql_using="brin"),
+        # History of one entity
+        Index("ix_audit_logs_entity", "entity_type", "entity_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    # Primary key
-    id = Column(
+    # Primary key (includes the partition key, as Postgres requires)
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship (who performed the action)
-    user_id = Column(
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
@@ -34,37 +75,60 @@ class AuditLog(Base):
     )
 
     # Action details
-    action = Column(String(100), nullable=False)  # create, update, delete, login, etc.
-    entity_type = Column(
+    action: Mapped[str] = mapped_column(
+        String(100), nullable=False
+    )  # create, update, delete, login, etc.
+    entity_type: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # user, transaction, category, budget, etc.
-    entity_id = Column(UUID(as_uuid=True), nullable=True)  # ID of the affected entity
+    entity_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )  # ID of the affected entity
 
     # Change tracking
-    old_values = Column(JSONB, nullable=True)  # Previous values
-    new_values = Column(JSONB, nullable=True)  # New values
-    changed_fields = Column(JSONB, nullable=True)  # Array of field names that changed
+    old_values: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Previous values
+    new_values: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # New values
+    changed_fields: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Array of field names that changed
 
     # Context information
-    ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
-    user_agent = Column(Text, nullable=True)  # Browser/client information
-    session_id = Column(String(255), nullable=True)  # Session identifier
+    ip_address: Mapped[Optional[str]] = mapped_column(
+        String(45), nullable=True
+    )  # IPv4 or IPv6
+    user_agent: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )  # Browser/client information
+    session_id: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )  # Session identifier
 
     # Additional metadata
-    description = Column(Text, nullable=True)  # Human-readable description
-    audit_metadata = Column(JSONB, nullable=True)  # Additional context data
+    description: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )  # Human-readable description
+    audit_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Additional context data
 
     # Severity and classification
-    severity = Column(
+    severity: Mapped[str] = mapped_column(
         String(20), default="info", nullable=False
     )  # info, warning, error, critical
-    is_sensitive = Column(
+    is_sensitive: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # Contains sensitive financial data
 
     # Timestamps
-    created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
     )
 
     # Relationships
@@ -125,23 +189,21 @@ class AuditLog(Base):
         """Remove sensitive data from the audit log entry."""
         if self.is_sensitive_data:
             # Remove sensitive fields from old_values and new_values
-            sensitive_fields = [
-                "hashed_password",
-                "account_number",
-                "routing_number",
-                "amount",
-            ]
-
             old_values = getattr(self, "old_values", {})
             if old_values and isinstance(old_values, dict):
-                for field in sensitive_fields:
-                    if field in old_values:
-                        old_values[field] = "[REDACTED]"
-                setattr(self, "old_values", old_values)
+                setattr(self, "old_values", redact_sensitive_values(old_values))
 
             new_values = getattr(self, "new_values", {})
             if new_values and isinstance(new_values, dict):
-                for field in sensitive_fields:
-                    if field in new_values:
-                        new_values[field] = "[REDACTED]"
-                setattr(self, "new_values", new_values)
+                setattr(self, "new_values", redact_sensitive_values(new_values))
+
+
+# Catch rows outside the monthly partitions of tables created without migrations
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS audit_logs_default "
+        "PARTITION OF audit_logs DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
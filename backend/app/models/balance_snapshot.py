@@ -0,0 +1,52 @@
+"""
+Account balance snapshot model for the SpendAhead backend.
+
+This module defines the AccountBalanceSnapshot model, periodic checkpoints of
+an account's running ledger balance used to answer balance-as-of queries
+without summing the account's whole transaction history.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class AccountBalanceSnapshot(Base):
+    """Ledger balance of an account at the end of a given (UTC) day."""
+
+    __tablename__ = "account_balance_snapshots"
+
+    # Composite primary key
+    account_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    as_of_date: Mapped[date] = mapped_column(Date, primary_key=True)
+
+    # Balance including every transaction dated on or before as_of_date
+    balance: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), default=Decimal("0.00"), nullable=False
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    # Relationships
+    account = relationship("Account")
+
+    def __repr__(self) -> str:
+        """String representation of the AccountBalanceSnapshot model."""
+        return (
+            f"<AccountBalanceSnapshot(account_id={self.account_id}, "
+            f"as_of_date={self.as_of_date}, balance={self.balance})>"
+        )
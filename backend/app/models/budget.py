@@ -5,21 +5,24 @@ This module defines the Budget and BudgetItem models for budget management
 with period-based tracking and AI-powered budget suggestions.
 """
 
+import uuid
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from sqlalchemy import (
     Boolean,
-    Column,
     DateTime,
     String,
     Text,
     ForeignKey,
+    Index,
     Numeric,
     Integer,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -29,14 +32,36 @@ class Budget(Base):
     """Budget model for budget management."""
 
     __tablename__ = "budgets"
+    __table_args__ = (
+        # Current budgets the alert engine may evaluate
+        Index(
+            "ix_budgets_alertable",
+            "end_date",
+            postgresql_where=text(
+                "alert_enabled AND is_active AND NOT is_deleted AND NOT is_template"
+            ),
+        ),
+        # Ended monthly/yearly budgets the rollover processor pages through
+        Index(
+            "ix_budgets_rollover",
+            "end_date",
+            "id",
+            postgresql_where=text(
+                "period_type IN ('monthly', 'yearly') "
+                "AND NOT is_deleted AND NOT is_template"
+            ),
+        ),
+        # Changes since a sync cursor, tombstones included
+        Index("ix_budgets_user_updated", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship
-    user_id = Column(
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
@@ -44,49 +69,73 @@ class Budget(Base):
     )
 
     # Budget details
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
     # Budget period
-    period_type = Column(
+    period_type: Mapped[str] = mapped_column(
         String(20), default="monthly", nullable=False
     )  # monthly, yearly, custom
-    start_date = Column(DateTime(timezone=True), nullable=False)
-    end_date = Column(DateTime(timezone=True), nullable=False)
+    start_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    end_date: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     # Budget amounts
-    total_budget = Column(Numeric(10, 2), nullable=False)
-    currency = Column(String(3), default="USD", nullable=False)
+    total_budget: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
 
     # Budget status
-    is_active = Column(Boolean, default=True, nullable=False)
-    is_template = Column(
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    is_template: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # For reusable budget templates
 
     # Budget settings
-    rollover_enabled = Column(
+    rollover_enabled: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # Allow unused budget to roll over
-    alert_threshold = Column(
+    alert_threshold: Mapped[int] = mapped_column(
         Integer, default=80, nullable=False
     )  # Alert when 80% of budget is used
-    alert_enabled = Column(Boolean, default=True, nullable=False)
+    alert_enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+    alert_level: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # Last alerted level: 0 none, 1 threshold reached, 2 over budget
+
+    # Period rollover
+    rollover_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )  # Unused amount carried into total_budget from the previous period
+    rolled_over_from_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("budgets.id", ondelete="SET NULL"),
+        nullable=True,
+        unique=True,
+    )  # Previous-period budget this one was rolled over from
 
     # AI budget suggestions
-    ai_generated = Column(Boolean, default=False, nullable=False)
-    ai_suggestions = Column(JSONB, nullable=True)  # AI-generated budget suggestions
+    ai_generated: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    ai_suggestions: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # AI-generated budget suggestions
 
     # Budget performance tracking
-    actual_spent = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
-    variance_amount = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
-    variance_percentage = Column(Numeric(5, 2), default=Decimal("0.00"), nullable=False)
+    actual_spent: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
+    variance_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
+    variance_percentage: Mapped[Decimal] = mapped_column(
+        Numeric(5, 2), default=Decimal("0.00"), nullable=False
+    )
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -94,8 +143,10 @@ class Budget(Base):
     )
 
     # Soft delete
-    is_deleted = Column(Boolean, default=False, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="budgets")
@@ -138,7 +189,11 @@ class Budget(Base):
         return usage_percentage >= alert_threshold
 
     def update_actual_spent(self, amount: Decimal) -> None:
-        """Update actual spent amount and recalculate variance."""
+        """
+        Update actual spent amount and recalculate variance in memory.
+
+        See BalanceUpdateService for concurrent writers.
+        """
         current_spent = getattr(self, "actual_spent", Decimal("0.00"))
         total_budget = getattr(self, "total_budget", Decimal("0.00"))
 
@@ -161,12 +216,12 @@ class BudgetItem(Base):
     __tablename__ = "budget_items"
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # Budget relationship
-    budget_id = Column(
+    budget_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("budgets.id", ondelete="CASCADE"),
         nullable=False,
@@ -174,7 +229,7 @@ class BudgetItem(Base):
     )
 
     # Category relationship
-    category_id = Column(
+    category_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("categories.id", ondelete="CASCADE"),
         nullable=False,
@@ -182,30 +237,40 @@ class BudgetItem(Base):
     )
 
     # Budget item details
-    planned_amount = Column(Numeric(10, 2), nullable=False)
-    actual_amount = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
+    planned_amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    actual_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
 
     # Budget item settings
-    is_fixed = Column(
+    is_fixed: Mapped[bool] = mapped_column(
         Boolean, default=False, nullable=False
     )  # Fixed vs flexible budget
-    priority = Column(
+    priority: Mapped[int] = mapped_column(
         Integer, default=1, nullable=False
     )  # Priority for budget adjustments
 
     # Performance tracking
-    variance_amount = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
-    variance_percentage = Column(Numeric(5, 2), default=Decimal("0.00"), nullable=False)
+    variance_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
+    variance_percentage: Mapped[Decimal] = mapped_column(
+        Numeric(5, 2), default=Decimal("0.00"), nullable=False
+    )
 
     # AI suggestions
-    ai_suggested_amount = Column(Numeric(10, 2), nullable=True)
-    ai_confidence_score = Column(Numeric(3, 2), nullable=True)
+    ai_suggested_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )
+    ai_confidence_score: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(3, 2), nullable=True
+    )
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -240,7 +305,11 @@ class BudgetItem(Base):
         return self.get_remaining_amount() < 0
 
     def update_actual_amount(self, amount: Decimal) -> None:
-        """Update actual amount and recalculate variance."""
+        """
+        Update actual amount and recalculate variance in memory.
+
+        See BalanceUpdateService for concurrent writers.
+        """
         current_actual = getattr(self, "actual_amount", Decimal("0.00"))
         planned_amount = getattr(self, "planned_amount", Decimal("0.00"))
 
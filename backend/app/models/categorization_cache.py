@@ -0,0 +1,95 @@
+"""
+Categorization cache model for the SpendAhead backend.
+
+This module defines the CategorizationCacheEntry model, which memoizes
+categorization answers keyed on normalized description, amount bucket and
+transaction type. Entries are either scoped to one user (pointing at one of
+their categories) or global (naming a category, resolved per user by name).
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Numeric,
+    SmallInteger,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class CategorizationCacheEntry(Base):
+    """Memoized categorization of one normalized description."""
+
+    __tablename__ = "categorization_cache"
+    __table_args__ = (
+        Index(
+            "uq_categorization_cache_key",
+            "user_id",
+            "normalized_description",
+            "amount_bucket",
+            "transaction_type",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
+
+    # Cache key; NULL user_id marks a global entry
+    user_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    normalized_description: Mapped[str] = mapped_column(String(255), nullable=False)
+    amount_bucket: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    transaction_type: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Cached answer
+    category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True,
+    )  # Set on per-user entries only
+    category_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    confidence: Mapped[Decimal] = mapped_column(
+        Numeric(3, 2), nullable=False
+    )  # 0.00 to 1.00
+    source: Mapped[str] = mapped_column(String(20), nullable=False)  # model or user
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the CategorizationCacheEntry model."""
+        return (
+            f"<CategorizationCacheEntry(user_id={self.user_id}, "
+            f"description='{self.normalized_description}', "
+            f"category='{self.category_name}')>"
+        )
+
+    @property
+    def is_global(self) -> bool:
+        """Check if the entry is shared by all users."""
+        return getattr(self, "user_id", None) is None
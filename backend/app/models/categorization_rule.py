@@ -0,0 +1,116 @@
+"""
+Categorization rule model for the SpendAhead backend.
+
+This module defines the CategorizationRule model for user-defined
+auto-categorization rules. A rule matches transactions on any combination
+of a description phrase, an amount range, an account and a transaction
+type, and assigns a category and/or adds tags to them.
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class CategorizationRule(Base):
+    """User-defined rule that categorizes and tags matching transactions."""
+
+    __tablename__ = "categorization_rules"
+    __table_args__ = (
+        # Active rules of a user in evaluation order
+        Index(
+            "ix_categorization_rules_active",
+            "user_id",
+            "priority",
+            "created_at",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
+
+    # User relationship
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Rule details
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    priority: Mapped[int] = mapped_column(
+        Integer, default=100, nullable=False
+    )  # Lower runs first
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
+
+    # Conditions; unset conditions match every transaction
+    description_contains: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )  # Whole-word phrase
+    min_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )  # Inclusive
+    max_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )  # Inclusive
+    account_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("accounts.id", ondelete="CASCADE"),
+        nullable=True,
+    )  # Matches either side of the transaction
+    transaction_type: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
+
+    # Actions
+    category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    add_tags: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Array of tag strings
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the CategorizationRule model."""
+        return (
+            f"<CategorizationRule(id={self.id}, name='{self.name}', "
+            f"priority={self.priority})>"
+        )
+
+    def get_tags_list(self) -> list[str]:
+        """Get list of tags the rule adds."""
+        tags = getattr(self, "add_tags", None)
+        if tags and isinstance(tags, list):
+            return tags
+        return []
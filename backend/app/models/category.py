@@ -5,21 +5,23 @@ This module defines the Category model for organizing financial transactions
 with hierarchical structure and AI-powered categorization support.
 """
 
+import uuid
+from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
 from sqlalchemy import (
     Boolean,
-    Column,
     DateTime,
     Integer,
     String,
     Text,
     ForeignKey,
+    Index,
     Numeric,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
 from app.core.database import Base
@@ -29,14 +31,18 @@ class Category(Base):
     """Category model for organizing financial transactions."""
 
     __tablename__ = "categories"
+    __table_args__ = (
+        # Changes since a sync cursor, tombstones included
+        Index("ix_categories_user_updated", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship
-    user_id = Column(
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
@@ -44,7 +50,7 @@ class Category(Base):
     )
 
     # Hierarchy support
-    parent_id = Column(
+    parent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("categories.id", ondelete="CASCADE"),
         nullable=True,
@@ -52,39 +58,53 @@ class Category(Base):
     )
 
     # Category details
-    name = Column(String(100), nullable=False)
-    description = Column(Text, nullable=True)
-    color = Column(String(7), default="#3B82F6", nullable=False)  # Hex color
-    icon = Column(String(50), nullable=True)  # Icon identifier
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    color: Mapped[str] = mapped_column(
+        String(7), default="#3B82F6", nullable=False
+    )  # Hex color
+    icon: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )  # Icon identifier
 
     # Category type (income, expense, transfer)
-    category_type = Column(String(20), default="expense", nullable=False)
+    category_type: Mapped[str] = mapped_column(
+        String(20), default="expense", nullable=False
+    )
 
     # Budget tracking
-    budget_amount = Column(Numeric(10, 2), nullable=True)
-    budget_period = Column(
+    budget_amount: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(10, 2), nullable=True
+    )
+    budget_period: Mapped[str] = mapped_column(
         String(20), default="monthly", nullable=False
     )  # monthly, yearly
 
     # Usage tracking
-    transaction_count = Column(Integer, default=0, nullable=False)
-    total_amount = Column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(10, 2), default=Decimal("0.00"), nullable=False
+    )
 
     # AI categorization
-    ai_confidence_score = Column(Numeric(3, 2), nullable=True)  # 0.00 to 1.00
-    keywords = Column(Text, nullable=True)  # JSON array of keywords for AI matching
+    ai_confidence_score: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(3, 2), nullable=True
+    )  # 0.00 to 1.00
+    keywords: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )  # JSON array of keywords for AI matching
 
     # System category (cannot be deleted/modified by user)
-    is_system = Column(Boolean, default=False, nullable=False)
+    is_system: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Active status
-    is_active = Column(Boolean, default=True, nullable=False)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -92,8 +112,10 @@ class Category(Base):
     )
 
     # Soft delete
-    is_deleted = Column(Boolean, default=False, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="categories")
@@ -110,13 +132,23 @@ class Category(Base):
         )
 
     def get_full_path(self) -> str:
-        """Get the full hierarchical path of the category."""
+        """
+        Get the full hierarchical path of the category.
+
+        Walks the lazy parent relationship; use CategoryHierarchyService
+        to get the paths of many categories in one query.
+        """
         if hasattr(self, "parent") and self.parent:
             return f"{self.parent.get_full_path()} > {getattr(self, 'name', '')}"
         return getattr(self, "name", "")
 
     def get_level(self) -> int:
-        """Get the hierarchy level of the category."""
+        """
+        Get the hierarchy level of the category.
+
+        Walks the lazy parent relationship; use CategoryHierarchyService
+        to get the levels of many categories in one query.
+        """
         if hasattr(self, "parent") and self.parent:
             return self.parent.get_level() + 1
         return 0
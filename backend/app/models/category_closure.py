@@ -0,0 +1,48 @@
+"""
+Category closure model for the SpendAhead backend.
+
+This module defines the CategoryClosure model, a closure table holding one
+row per (ancestor, descendant) pair of the category hierarchy, including
+each category paired with itself at depth 0. Paths, levels, subtrees and
+leaf status are answered by a single indexed query against it.
+"""
+
+import uuid
+
+from sqlalchemy import ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class CategoryClosure(Base):
+    """Ancestor/descendant pair of the category hierarchy."""
+
+    __tablename__ = "category_closure"
+    __table_args__ = (
+        # Ancestor lookups (paths, levels) start from the descendant
+        Index("ix_category_closure_descendant_depth", "descendant_id", "depth"),
+    )
+
+    # Composite primary key; also serves subtree lookups by ancestor
+    ancestor_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    descendant_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Number of edges between ancestor and descendant (0 for the self-row)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        """String representation of the CategoryClosure model."""
+        return (
+            f"<CategoryClosure(ancestor_id={self.ancestor_id}, "
+            f"descendant_id={self.descendant_id}, depth={self.depth})>"
+        )
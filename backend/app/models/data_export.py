@@ -0,0 +1,132 @@
+"""
+Data export model for the SpendAhead backend.
+
+This module defines the DataExport model, a user's request for a copy of
+all their data. Workers claim exports under a lease, stream each table to
+disk and checkpoint after every batch, so an interrupted export resumes
+where it stopped.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class DataExport(Base):
+    """Export of a user's data to a downloadable archive."""
+
+    __tablename__ = "data_exports"
+    __table_args__ = (
+        # Exports waiting for a worker or held under a lease
+        Index(
+            "ix_data_exports_active",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        # At most one export in progress per user, even across concurrent
+        # requests
+        Index(
+            "uq_data_exports_active_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
+
+    # User relationship
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Export details
+    export_format: Mapped[str] = mapped_column(
+        String(10), default="ndjson", nullable=False
+    )  # ndjson, csv
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", nullable=False
+    )  # pending, running, completed, failed
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # Failed runs in a row
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    # Progress
+    row_counts: Mapped[Optional[Dict[str, int]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Rows per table when started
+    rows_exported: Mapped[Optional[Dict[str, int]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Rows written per table
+    current_table: Mapped[Optional[str]] = mapped_column(
+        String(50), nullable=True
+    )  # Table being written
+    last_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )  # Last row written
+    bytes_written: Mapped[int] = mapped_column(
+        BigInteger, default=0, nullable=False
+    )  # Size of the current table's file at the last checkpoint
+
+    # Result
+    file_path: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    file_size: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+
+    # Timestamps
+    started_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the DataExport model."""
+        return f"<DataExport(id={self.id}, status='{self.status}')>"
+
+    @property
+    def progress(self) -> float:
+        """Get the share of rows written, from 0 to 1."""
+        if self.status == "completed":
+            return 1.0
+        counts: Dict[str, int] = self.row_counts or {}
+        total = sum(counts.values())
+        if not total:
+            return 0.0
+        written = sum((self.rows_exported or {}).values())
+        return min(written / total, 1.0)
@@ -0,0 +1,113 @@
+"""
+Insight job model for the SpendAhead backend.
+
+This module defines the InsightJob model, the schedule of recurring AI
+insight generation. Each user has one job per insight type; workers claim
+due jobs under a lease, generate the insight and reschedule the job.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class InsightJob(Base):
+    """Recurring insight generation job of a user."""
+
+    __tablename__ = "insight_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "insight_type"),
+        # Pending jobs in claim order
+        Index(
+            "ix_insight_jobs_due",
+            "priority",
+            "run_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Running jobs, for lease expiry and per-user exclusion
+        Index(
+            "ix_insight_jobs_running",
+            "user_id",
+            "lease_expires_at",
+            postgresql_where=text("status = 'running'"),
+        ),
+        # At most one running job per user, even across concurrent claims
+        Index(
+            "uq_insight_jobs_running_user",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
+
+    # User relationship
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Job details
+    insight_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), default="pending", nullable=False
+    )  # pending, running
+    priority: Mapped[int] = mapped_column(
+        Integer, default=100, nullable=False
+    )  # Lower runs first
+
+    # Scheduling
+    run_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, default=0, nullable=False
+    )  # Failed runs in a row
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    last_insight_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("ai_insights.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        """String representation of the InsightJob model."""
+        return (
+            f"<InsightJob(id={self.id}, type='{self.insight_type}', "
+            f"status='{self.status}')>"
+        )
@@ -0,0 +1,102 @@
+"""
+Spending rollup model for the SpendAhead backend.
+
+This module defines the SpendingRollup model, a materialized per-user monthly
+aggregate of transactions used by dashboards and budget views.
+"""
+
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import (
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class SpendingRollup(Base):
+    """Monthly transaction aggregate per user, category, currency and type."""
+
+    __tablename__ = "spending_rollups"
+    __table_args__ = (
+        Index(
+            "uq_spending_rollups_bucket",
+            "user_id",
+            "month",
+            "category_id",
+            "currency",
+            "transaction_type",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    # Primary key
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
+    )
+
+    # Bucket key
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )  # NULL bucket holds uncategorized transactions
+    month: Mapped[date] = mapped_column(
+        Date, nullable=False
+    )  # First day of the month (UTC)
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    transaction_type: Mapped[str] = mapped_column(String(20), nullable=False)
+
+    # Aggregates
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), default=Decimal("0.00"), nullable=False
+    )
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    min_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
+    max_amount: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 2), nullable=True)
+
+    # Timestamps
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    # Relationships
+    category = relationship("Category")
+
+    def __repr__(self) -> str:
+        """String representation of the SpendingRollup model."""
+        return (
+            f"<SpendingRollup(user_id={self.user_id}, month={self.month}, "
+            f"category_id={self.category_id}, total={self.total_amount})>"
+        )
+
+    @property
+    def average_amount(self) -> Decimal:
+        """Get the average transaction amount in the bucket."""
+        count = getattr(self, "transaction_count", 0)
+        if not count:
+            return Decimal("0.00")
+        total = getattr(self, "total_amount", Decimal("0.00"))
+        return (total / count).quantize(Decimal("0.01"))
@@ -5,22 +5,24 @@ This module defines the Transaction model for financial transactions
 with AI-powered categorization and comprehensive tracking.
 """
 
+import uuid
+from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy import (
     Boolean,
-    Column,
     DateTime,
     String,
     Text,
     ForeignKey,
+    Index,
     Numeric,
     Integer,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import func, text
 
 from app.core.database import Base
 
@@ -29,14 +31,31 @@ class Transaction(Base):
     """Transaction model for financial transactions."""
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Per-account date-range scans for balance-as-of queries
+        Index(
+            "ix_transactions_from_account_date", "from_account_id", "transaction_date"
+        ),
+        Index("ix_transactions_to_account_date", "to_account_id", "transaction_date"),
+        # Newest-first listing and streaming of a user's live transactions
+        Index(
+            "ix_transactions_user_date",
+            "user_id",
+            "transaction_date",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        # Changes since a sync cursor, tombstones included
+        Index("ix_transactions_user_updated", "user_id", "updated_at", "id"),
+    )
 
     # Primary key
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
     # User relationship
-    user_id = Column(
+    user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
@@ -44,13 +63,13 @@ class Transaction(Base):
     )
 
     # Account relationships
-    from_account_id = Column(
+    from_account_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("accounts.id", ondelete="SET NULL"),
         nullable=True,
         index=True,
     )
-    to_account_id = Column(
+    to_account_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("accounts.id", ondelete="SET NULL"),
         nullable=True,
@@ -58,7 +77,7 @@ class Transaction(Base):
     )
 
     # Category relationship
-    category_id = Column(
+    category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("categories.id", ondelete="SET NULL"),
         nullable=True,
@@ -66,59 +85,71 @@ class Transaction(Base):
     )
 
     # Transaction details
-    description = Column(String(255), nullable=False)
-    amount = Column(Numeric(10, 2), nullable=False)
-    currency = Column(String(3), default="USD", nullable=False)
+    description: Mapped[str] = mapped_column(String(255), nullable=False)
+    amount: Mapped[Decimal] = mapped_column(Numeric(10, 2), nullable=False)
+    currency: Mapped[str] = mapped_column(String(3), default="USD", nullable=False)
 
     # Transaction type (income, expense, transfer)
-    transaction_type = Column(String(20), nullable=False)
+    transaction_type: Mapped[str] = mapped_column(String(20), nullable=False)
 
     # Transaction date
-    transaction_date = Column(DateTime(timezone=True), nullable=False, index=True)
+    transaction_date: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
 
     # Additional details
-    notes = Column(Text, nullable=True)
-    tags = Column(JSONB, nullable=True)  # Array of tag strings
-    location = Column(String(255), nullable=True)
+    notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    tags: Mapped[Optional[List[str]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Array of tag strings
+    location: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Recurring transaction support
-    is_recurring = Column(Boolean, default=False, nullable=False)
-    recurring_pattern = Column(JSONB, nullable=True)  # Recurring pattern configuration
-    parent_transaction_id = Column(
+    is_recurring: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    recurring_pattern: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Recurring pattern configuration
+    parent_transaction_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("transactions.id", ondelete="SET NULL"),
         nullable=True,
     )
 
     # Import/Export tracking
-    external_id = Column(
+    external_id: Mapped[Optional[str]] = mapped_column(
         String(255), nullable=True, index=True
     )  # For imported transactions
-    import_source = Column(
+    import_source: Mapped[Optional[str]] = mapped_column(
         String(50), nullable=True
     )  # Source of import (CSV, bank, etc.)
-    import_metadata = Column(JSONB, nullable=True)  # Additional import metadata
+    import_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # Additional import metadata
 
     # AI categorization
-    ai_categorized = Column(Boolean, default=False, nullable=False)
-    ai_confidence_score = Column(Numeric(3, 2), nullable=True)  # 0.00 to 1.00
-    ai_suggested_category_id = Column(
+    ai_categorized: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    ai_confidence_score: Mapped[Optional[Decimal]] = mapped_column(
+        Numeric(3, 2), nullable=True
+    )  # 0.00 to 1.00
+    ai_suggested_category_id: Mapped[Optional[uuid.UUID]] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("categories.id", ondelete="SET NULL"),
         nullable=True,
     )
-    ai_categorization_data = Column(JSONB, nullable=True)  # AI processing data
+    ai_categorization_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSONB, nullable=True
+    )  # AI processing data
 
     # Status and flags
-    is_verified = Column(Boolean, default=False, nullable=False)
-    is_cleared = Column(Boolean, default=False, nullable=False)
-    is_reconciled = Column(Boolean, default=False, nullable=False)
+    is_verified: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_cleared: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_reconciled: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
     # Timestamps
-    created_at = Column(
+    created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    updated_at = Column(
+    updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
@@ -126,8 +157,10 @@ class Transaction(Base):
     )
 
     # Soft delete
-    is_deleted = Column(Boolean, default=False, nullable=False)
-    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     # Relationships
     user = relationship("User", back_populates="transactions")
@@ -4,6 +4,7 @@ User model for the SpendAhead backend.
 This module defines the User model with authentication and profile information.
 """
 
+import uuid
 from datetime import datetime
 from typing import Optional
 
@@ -21,7 +22,7 @@ class User(Base):
     __tablename__ = "users"
 
     # Primary key
-    id: Mapped[UUID] = mapped_column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, server_default=func.gen_random_uuid()
     )
 
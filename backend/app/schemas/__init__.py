@@ -15,7 +15,42 @@ from .auth import (
     PasswordResetConfirm,
     EmailVerification,
 )
+from .analytics import CategorySpendingResponse, MonthlySpendingResponse
 from .base import BaseSchema
+from .category import (
+    CategorizationCacheStatsResponse,
+    CategoryCreate,
+    CategoryResponse,
+    CategorySubtreeSpendingResponse,
+    CategoryUpdate,
+)
+from .budget import (
+    BudgetDetailResponse,
+    BudgetItemResponse,
+    BudgetPeriod,
+    BudgetResponse,
+    BudgetTemplateInstantiate,
+    BudgetTemplateInstantiateResponse,
+)
+from .categorization_rule import (
+    CategorizationRuleCreate,
+    CategorizationRuleResponse,
+    CategorizationRuleUpdate,
+    RuleApplicationResponse,
+)
+from .insight import (
+    InsightFeedResponse,
+    InsightResponse,
+    MarkAllReadResponse,
+    UnreadCountResponse,
+)
+from .data_export import DataExportCreate, DataExportResponse
+from .sync import EntityChangesResponse, SyncResponse
+from .transaction import (
+    TransactionCategoryUpdate,
+    TransactionListResponse,
+    TransactionResponse,
+)
 
 __all__ = [
     "BaseSchema",
@@ -28,4 +63,32 @@ __all__ = [
     "PasswordReset",
     "PasswordResetConfirm",
     "EmailVerification",
+    "CategorySpendingResponse",
+    "MonthlySpendingResponse",
+    "BudgetResponse",
+    "BudgetDetailResponse",
+    "BudgetItemResponse",
+    "BudgetPeriod",
+    "BudgetTemplateInstantiate",
+    "BudgetTemplateInstantiateResponse",
+    "CategoryCreate",
+    "CategoryResponse",
+    "CategoryUpdate",
+    "CategorySubtreeSpendingResponse",
+    "CategorizationCacheStatsResponse",
+    "CategorizationRuleCreate",
+    "CategorizationRuleUpdate",
+    "CategorizationRuleResponse",
+    "RuleApplicationResponse",
+    "InsightFeedResponse",
+    "InsightResponse",
+    "MarkAllReadResponse",
+    "UnreadCountResponse",
+    "DataExportCreate",
+    "DataExportResponse",
+    "EntityChangesResponse",
+    "SyncResponse",
+    "TransactionCategoryUpdate",
+    "TransactionListResponse",
+    "TransactionResponse",
 ]
@@ -0,0 +1,45 @@
+"""
+Analytics schemas for the SpendAhead backend.
+
+This module contains Pydantic models for spending analytics responses
+served from the monthly spending rollups.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Optional
+
+from pydantic import Field, field_validator
+
+from .base import BaseSchema
+
+
+class CategorySpendingResponse(BaseSchema):
+    """Schema for a per-category spending total."""
+
+    category_id: Optional[str] = Field(
+        description="Category identifier, null for uncategorized transactions"
+    )
+    currency: str = Field(description="Currency code")
+    total_amount: Decimal = Field(description="Sum of transaction amounts")
+    transaction_count: int = Field(description="Number of transactions")
+    min_amount: Optional[Decimal] = Field(description="Smallest transaction amount")
+    max_amount: Optional[Decimal] = Field(description="Largest transaction amount")
+
+    @field_validator("category_id", mode="before")
+    @classmethod
+    def convert_uuid_to_string(cls, v: Any) -> Any:
+        """Convert UUID to string if needed."""
+        if v is not None:
+            return str(v)
+        return v
+
+
+class MonthlySpendingResponse(BaseSchema):
+    """Schema for a per-month total by transaction type."""
+
+    month: date = Field(description="First day of the month")
+    currency: str = Field(description="Currency code")
+    transaction_type: str = Field(description="income, expense or transfer")
+    total_amount: Decimal = Field(description="Sum of transaction amounts")
+    transaction_count: int = Field(description="Number of transactions")
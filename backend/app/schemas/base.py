@@ -5,7 +5,7 @@ This module provides the base schema class with common configuration.
 """
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence, Tuple, Type
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -59,3 +59,36 @@ class SuccessResponse(BaseSchema):
     timestamp: datetime = Field(
         default_factory=datetime.utcnow, description="Response timestamp"
     )
+
+
+def parse_fieldset(
+    fields: Optional[str],
+    schema: Type[BaseModel],
+    default: Optional[Sequence[str]] = None,
+    required: Sequence[str] = ("id",),
+) -> Tuple[str, ...]:
+    """
+    Parse a sparse fieldset parameter against a response schema.
+
+    Args:
+        fields: Comma-separated field names, or None for the default set
+        schema: Response schema the fields belong to
+        default: Fields returned when none are requested (all of them when
+            omitted)
+        required: Fields always returned
+
+    Returns:
+        Selected field names, in schema order
+
+    Raises:
+        ValueError: If a requested field is not in the schema
+    """
+    if fields is None:
+        selected = set(schema.model_fields if default is None else default)
+    else:
+        selected = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(selected - schema.model_fields.keys())
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    selected.update(required)
+    return tuple(name for name in schema.model_fields if name in selected)
@@ -0,0 +1,116 @@
+"""
+Budget schemas for the SpendAhead backend.
+
+This module contains Pydantic models for budget and budget item responses.
+Actual and variance figures are maintained by the budget actuals engine.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, List, Optional
+from uuid import UUID
+
+from pydantic import Field, field_validator, model_validator
+
+from .base import BaseSchema
+
+
+class BudgetItemResponse(BaseSchema):
+    """Schema for a budget line item."""
+
+    id: str = Field(description="Budget item identifier")
+    category_id: str = Field(description="Category identifier")
+    planned_amount: Decimal = Field(description="Planned amount")
+    actual_amount: Decimal = Field(description="Amount spent in the category")
+    variance_amount: Decimal = Field(description="Actual minus planned amount")
+    variance_percentage: Decimal = Field(description="Variance relative to plan")
+    is_fixed: bool = Field(description="Whether this is a fixed expense")
+    priority: int = Field(description="Priority from 1 (highest) to 5 (lowest)")
+
+    @field_validator("id", "category_id", mode="before")
+    @classmethod
+    def convert_uuid_to_string(cls, v: Any) -> Any:
+        """Convert UUID to string if needed."""
+        if v is not None:
+            return str(v)
+        return v
+
+
+class BudgetResponse(BaseSchema):
+    """Schema for a budget with its current actuals."""
+
+    id: str = Field(description="Budget identifier")
+    name: str = Field(description="Budget name")
+    description: Optional[str] = Field(description="Budget description")
+    period_type: str = Field(description="monthly, yearly or custom")
+    start_date: datetime = Field(description="Start of the budget period")
+    end_date: datetime = Field(description="End of the budget period")
+    total_budget: Decimal = Field(description="Total budgeted amount")
+    currency: str = Field(description="Currency code")
+    is_active: bool = Field(description="Whether the budget is active")
+    rollover_amount: Decimal = Field(
+        description="Unused amount carried over from the previous period"
+    )
+    actual_spent: Decimal = Field(description="Amount spent in the period")
+    variance_amount: Decimal = Field(description="Actual minus budgeted amount")
+    variance_percentage: Decimal = Field(description="Variance relative to budget")
+    updated_at: datetime = Field(description="Last update timestamp")
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def convert_uuid_to_string(cls, v: Any) -> Any:
+        """Convert UUID to string if needed."""
+        if v is not None:
+            return str(v)
+        return v
+
+
+class BudgetDetailResponse(BudgetResponse):
+    """Schema for a budget including its line items."""
+
+    budget_items: List[BudgetItemResponse] = Field(
+        default_factory=list, description="Budget line items"
+    )
+
+
+class BudgetPeriod(BaseSchema):
+    """Schema for a budget period to instantiate a template into."""
+
+    start_date: datetime = Field(description="Start of the budget period")
+    end_date: datetime = Field(description="End of the budget period")
+
+    @model_validator(mode="after")
+    def validate_range(self) -> "BudgetPeriod":
+        """Ensure the period ends after it starts."""
+        if self.start_date >= self.end_date:
+            raise ValueError("start_date must be before end_date")
+        return self
+
+
+class BudgetTemplateInstantiate(BaseSchema):
+    """Schema for instantiating a budget template."""
+
+    periods: List[BudgetPeriod] = Field(
+        min_length=1, max_length=120, description="Periods to create budgets for"
+    )
+    user_ids: Optional[List[UUID]] = Field(
+        default=None,
+        max_length=1000,
+        description="Users to create budgets for (superusers only, defaults to self)",
+    )
+
+
+class BudgetTemplateInstantiateResponse(BaseSchema):
+    """Schema for the outcome of a template instantiation."""
+
+    budget_ids: List[str] = Field(description="Identifiers of the created budgets")
+    items_created: int = Field(description="Number of budget items created")
+    items_skipped: int = Field(
+        description="Template items skipped for lack of a matching category"
+    )
+
+    @field_validator("budget_ids", mode="before")
+    @classmethod
+    def convert_uuids_to_strings(cls, v: Any) -> Any:
+        """Convert UUIDs to strings if needed."""
+        return [str(item) for item in v]
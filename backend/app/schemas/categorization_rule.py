@@ -0,0 +1,145 @@
+"""
+Categorization rule schemas for the SpendAhead backend.
+
+This module contains Pydantic models for creating, updating and listing
+user-defined categorization rules and for the outcome of applying them.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import Field, field_validator
+
+from .base import BaseSchema
+
+# Longest tag a rule may add
+MAX_TAG_LENGTH = 50
+
+
+def clean_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    """
+    Normalize rule tags.
+
+    Args:
+        tags: Tags as submitted
+
+    Returns:
+        Stripped, non-blank tags in order without duplicates
+
+    Raises:
+        ValueError: If a tag is too long
+    """
+    if tags is None:
+        return None
+    cleaned = [tag.strip() for tag in tags if tag.strip()]
+    if any(len(tag) > MAX_TAG_LENGTH for tag in cleaned):
+        raise ValueError(f"Tags must be at most {MAX_TAG_LENGTH} characters")
+    return list(dict.fromkeys(cleaned))
+
+
+class CategorizationRuleCreate(BaseSchema):
+    """Schema for creating a categorization rule."""
+
+    name: str = Field(min_length=1, max_length=100, description="Rule name")
+    priority: int = Field(
+        default=100, ge=0, le=10000, description="Evaluation order, lowest first"
+    )
+    is_active: bool = Field(default=True, description="Whether the rule applies")
+    description_contains: Optional[str] = Field(
+        default=None, max_length=255, description="Whole-word description phrase"
+    )
+    min_amount: Optional[Decimal] = Field(
+        default=None, ge=0, description="Minimum absolute amount (inclusive)"
+    )
+    max_amount: Optional[Decimal] = Field(
+        default=None, ge=0, description="Maximum absolute amount (inclusive)"
+    )
+    account_id: Optional[UUID] = Field(
+        default=None, description="Account on either side of the transaction"
+    )
+    transaction_type: Optional[str] = Field(
+        default=None, description="income, expense or transfer"
+    )
+    category_id: Optional[UUID] = Field(
+        default=None, description="Category assigned to matching transactions"
+    )
+    add_tags: Optional[List[str]] = Field(
+        default=None, max_length=10, description="Tags added to matching transactions"
+    )
+
+    @field_validator("add_tags")
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Strip tags and drop blanks and duplicates."""
+        return clean_tags(v)
+
+
+class CategorizationRuleUpdate(BaseSchema):
+    """Schema for updating a categorization rule; unset fields are kept."""
+
+    name: Optional[str] = Field(
+        default=None, min_length=1, max_length=100, description="Rule name"
+    )
+    priority: Optional[int] = Field(
+        default=None, ge=0, le=10000, description="Evaluation order, lowest first"
+    )
+    is_active: Optional[bool] = Field(
+        default=None, description="Whether the rule applies"
+    )
+    description_contains: Optional[str] = Field(
+        default=None, max_length=255, description="Whole-word description phrase"
+    )
+    min_amount: Optional[Decimal] = Field(
+        default=None, ge=0, description="Minimum absolute amount (inclusive)"
+    )
+    max_amount: Optional[Decimal] = Field(
+        default=None, ge=0, description="Maximum absolute amount (inclusive)"
+    )
+    account_id: Optional[UUID] = Field(
+        default=None, description="Account on either side of the transaction"
+    )
+    transaction_type: Optional[str] = Field(
+        default=None, description="income, expense or transfer"
+    )
+    category_id: Optional[UUID] = Field(
+        default=None, description="Category assigned to matching transactions"
+    )
+    add_tags: Optional[List[str]] = Field(
+        default=None, max_length=10, description="Tags added to matching transactions"
+    )
+
+    @field_validator("add_tags")
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        """Strip tags and drop blanks and duplicates."""
+        return clean_tags(v)
+
+
+class CategorizationRuleResponse(BaseSchema):
+    """Schema for a categorization rule."""
+
+    id: UUID = Field(description="Rule identifier")
+    name: str = Field(description="Rule name")
+    priority: int = Field(description="Evaluation order, lowest first")
+    is_active: bool = Field(description="Whether the rule applies")
+    description_contains: Optional[str] = Field(
+        description="Whole-word description phrase"
+    )
+    min_amount: Optional[Decimal] = Field(description="Minimum absolute amount")
+    max_amount: Optional[Decimal] = Field(description="Maximum absolute amount")
+    account_id: Optional[UUID] = Field(description="Account condition")
+    transaction_type: Optional[str] = Field(description="Transaction type condition")
+    category_id: Optional[UUID] = Field(description="Category assigned")
+    add_tags: Optional[List[str]] = Field(description="Tags added")
+    created_at: datetime = Field(description="Creation timestamp")
+    updated_at: datetime = Field(description="Last update timestamp")
+
+
+class RuleApplicationResponse(BaseSchema):
+    """Schema for the outcome of applying rules to transactions."""
+
+    matched: int = Field(description="Transactions changed by at least one rule")
+    categorized: int = Field(description="Transactions whose category was set")
+    tagged: int = Field(description="Transactions that received new tags")
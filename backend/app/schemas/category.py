@@ -0,0 +1,95 @@
+"""
+Category schemas for the SpendAhead backend.
+
+This module contains Pydantic models for creating, updating and listing
+categories, including hierarchy information served from the category
+closure table, and for categorization cache statistics.
+"""
+
+from decimal import Decimal
+from typing import Any, Literal, Optional
+from uuid import UUID
+
+from pydantic import Field, field_validator
+
+from .base import BaseSchema
+
+
+class CategoryCreate(BaseSchema):
+    """Schema for creating a category."""
+
+    name: str = Field(min_length=1, max_length=100, description="Category name")
+    parent_id: Optional[UUID] = Field(
+        default=None, description="Parent category, or none for a root category"
+    )
+    category_type: Literal["income", "expense", "transfer"] = Field(
+        default="expense", description="income, expense or transfer"
+    )
+    color: str = Field(
+        default="#3B82F6", pattern=r"^#[0-9A-Fa-f]{6}$", description="Hex color"
+    )
+    icon: Optional[str] = Field(
+        default=None, max_length=50, description="Icon identifier"
+    )
+    description: Optional[str] = Field(default=None, description="Description")
+
+
+class CategoryUpdate(BaseSchema):
+    """Schema for updating a category; unset fields are kept."""
+
+    name: Optional[str] = Field(
+        default=None, min_length=1, max_length=100, description="Category name"
+    )
+    parent_id: Optional[UUID] = Field(
+        default=None, description="New parent category; null moves it to the root"
+    )
+    color: Optional[str] = Field(
+        default=None, pattern=r"^#[0-9A-Fa-f]{6}$", description="Hex color"
+    )
+    icon: Optional[str] = Field(
+        default=None, max_length=50, description="Icon identifier"
+    )
+    description: Optional[str] = Field(default=None, description="Description")
+
+
+class CategoryResponse(BaseSchema):
+    """Schema for a category with its position in the hierarchy."""
+
+    id: str = Field(description="Category identifier")
+    parent_id: Optional[str] = Field(description="Parent category identifier")
+    name: str = Field(description="Category name")
+    category_type: str = Field(description="income, expense or transfer")
+    color: str = Field(description="Hex color")
+    icon: Optional[str] = Field(description="Icon identifier")
+    is_system: bool = Field(description="Whether this is a system category")
+    path: str = Field(description="Full path from the root category")
+    level: int = Field(description="Depth in the hierarchy, 0 for roots")
+    is_leaf: bool = Field(description="Whether the category has no children")
+
+    @field_validator("id", "parent_id", mode="before")
+    @classmethod
+    def convert_uuid_to_string(cls, v: Any) -> Any:
+        """Convert UUID to string if needed."""
+        if v is not None:
+            return str(v)
+        return v
+
+
+class CategorySubtreeSpendingResponse(BaseSchema):
+    """Schema for spending in a category and all of its subcategories."""
+
+    currency: str = Field(description="Currency code")
+    total_amount: Decimal = Field(description="Sum of transaction amounts")
+    transaction_count: int = Field(description="Number of transactions")
+
+
+class CategorizationCacheStatsResponse(BaseSchema):
+    """Schema for categorization cache effectiveness counters."""
+
+    user_hits: int = Field(description="Lookups answered by per-user entries")
+    global_hits: int = Field(description="Lookups answered by global entries")
+    misses: int = Field(description="Lookups sent on to the model")
+    hit_rate: float = Field(description="Share of lookups answered by the cache")
+    model_requests: int = Field(description="Transactions categorized by the model")
+    ai_tokens_used: int = Field(description="Tokens consumed by model calls")
+    ai_tokens_saved: int = Field(description="Estimated tokens saved by cache hits")
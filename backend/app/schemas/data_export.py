@@ -0,0 +1,40 @@
+"""
+Data export schemas for the SpendAhead backend.
+
+This module contains Pydantic models for requesting an export of a user's
+data and reporting its progress.
+"""
+
+from datetime import datetime
+from typing import Dict, Literal, Optional
+from uuid import UUID
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class DataExportCreate(BaseSchema):
+    """Schema for requesting a data export."""
+
+    export_format: Literal["ndjson", "csv"] = Field(
+        default="ndjson", description="Format of the table files"
+    )
+
+
+class DataExportResponse(BaseSchema):
+    """Schema for a data export and its progress."""
+
+    id: UUID = Field(description="Export identifier")
+    export_format: str = Field(description="ndjson or csv")
+    status: str = Field(description="pending, running, completed or failed")
+    progress: float = Field(description="Share of rows written, from 0 to 1")
+    row_counts: Optional[Dict[str, int]] = Field(description="Rows per table")
+    rows_exported: Optional[Dict[str, int]] = Field(
+        description="Rows written per table"
+    )
+    file_size: Optional[int] = Field(description="Archive size in bytes")
+    error: Optional[str] = Field(description="Error of the last failed run")
+    created_at: datetime = Field(description="Request timestamp")
+    started_at: Optional[datetime] = Field(description="When a worker started")
+    completed_at: Optional[datetime] = Field(description="When the archive was ready")
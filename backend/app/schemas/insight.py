@@ -0,0 +1,53 @@
+"""
+Insight schemas for the SpendAhead backend.
+
+This module contains Pydantic models for the AI insight feed and the
+unread notification badge.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class InsightResponse(BaseSchema):
+    """Schema for an AI insight in the feed."""
+
+    id: UUID = Field(description="Insight identifier")
+    title: str = Field(description="Insight title")
+    description: str = Field(description="Insight text")
+    summary: Optional[str] = Field(description="Short summary")
+    insight_type: str = Field(description="Kind of insight")
+    category: str = Field(description="warning, recommendation, analysis or alert")
+    priority: str = Field(description="low, medium, high or critical")
+    content: Dict[str, Any] = Field(description="Structured figures behind the insight")
+    ai_confidence_score: Optional[Decimal] = Field(description="Model confidence")
+    data_period_start: Optional[datetime] = Field(description="Start of the data")
+    data_period_end: Optional[datetime] = Field(description="End of the data")
+    is_read: bool = Field(description="Whether the user has read the insight")
+    expires_at: Optional[datetime] = Field(description="When the insight expires")
+    created_at: datetime = Field(description="Creation timestamp")
+
+
+class InsightFeedResponse(BaseSchema):
+    """Schema for a page of the insight feed."""
+
+    items: List[InsightResponse] = Field(description="Insights, most important first")
+    next_cursor: Optional[str] = Field(description="Cursor of the next page")
+
+
+class UnreadCountResponse(BaseSchema):
+    """Schema for the unread insight badge."""
+
+    unread: int = Field(description="Number of unread insights")
+
+
+class MarkAllReadResponse(BaseSchema):
+    """Schema for the outcome of marking every insight as read."""
+
+    marked: int = Field(description="Insights marked as read")
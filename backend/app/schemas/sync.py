@@ -0,0 +1,35 @@
+"""
+Sync schemas for the SpendAhead backend.
+
+This module contains Pydantic models for the changes returned to
+offline-capable clients by the delta sync endpoint.
+"""
+
+from typing import Any, Dict, List
+from uuid import UUID
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class EntityChangesResponse(BaseSchema):
+    """Schema for the changes of one entity type."""
+
+    updated: List[Dict[str, Any]] = Field(
+        description="Created or changed entities, oldest change first"
+    )
+    deleted: List[UUID] = Field(description="IDs of deleted entities")
+
+
+class SyncResponse(BaseSchema):
+    """Schema for a page of changes since a sync cursor."""
+
+    changes: Dict[str, EntityChangesResponse] = Field(
+        description="Changes per entity type: accounts, categories, "
+        "transactions, budgets and insights"
+    )
+    next_cursor: str = Field(
+        description="Cursor of the next page, or of the next sync once caught up"
+    )
+    has_more: bool = Field(description="Whether more changes are waiting")
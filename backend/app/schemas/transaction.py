@@ -0,0 +1,81 @@
+"""
+Transaction schemas for the SpendAhead backend.
+
+This module contains Pydantic models for listing a user's transactions and
+changing their category.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from pydantic import Field
+
+from .base import BaseSchema
+
+
+class TransactionResponse(BaseSchema):
+    """
+    Schema for a listed transaction.
+
+    List endpoints return only the fields named in their ``fields``
+    parameter, plus id and transaction_date. Without it they return every
+    field except the opt-in ones at the end, which hold large or rarely
+    needed data.
+    """
+
+    id: UUID = Field(description="Transaction identifier")
+    transaction_date: datetime = Field(description="When the transaction happened")
+    description: str = Field(description="Transaction description")
+    amount: Decimal = Field(description="Transaction amount")
+    currency: str = Field(description="ISO currency code")
+    transaction_type: str = Field(description="income, expense or transfer")
+    from_account_id: Optional[UUID] = Field(description="Account debited")
+    to_account_id: Optional[UUID] = Field(description="Account credited")
+    category_id: Optional[UUID] = Field(description="Category")
+    notes: Optional[str] = Field(description="User notes")
+    tags: Optional[List[str]] = Field(description="Tags")
+    location: Optional[str] = Field(description="Where the transaction happened")
+    is_recurring: bool = Field(description="Whether the transaction recurs")
+    is_verified: bool = Field(description="Whether the user verified it")
+    is_cleared: bool = Field(description="Whether it cleared the bank")
+    is_reconciled: bool = Field(description="Whether it was reconciled")
+    ai_categorized: bool = Field(description="Whether AI chose the category")
+    created_at: datetime = Field(description="Creation timestamp")
+    updated_at: datetime = Field(description="Last update timestamp")
+
+    # Opt-in fields
+    recurring_pattern: Optional[Dict[str, Any]] = Field(
+        default=None, description="Recurrence configuration"
+    )
+    parent_transaction_id: Optional[UUID] = Field(
+        default=None, description="Transaction this one recurs from"
+    )
+    external_id: Optional[str] = Field(default=None, description="Bank identifier")
+    import_source: Optional[str] = Field(default=None, description="Import origin")
+    import_metadata: Optional[Dict[str, Any]] = Field(
+        default=None, description="Raw import data"
+    )
+    ai_confidence_score: Optional[Decimal] = Field(
+        default=None, description="Confidence of the AI category"
+    )
+    ai_suggested_category_id: Optional[UUID] = Field(
+        default=None, description="Category suggested by AI"
+    )
+    ai_categorization_data: Optional[Dict[str, Any]] = Field(
+        default=None, description="AI categorization details"
+    )
+
+
+class TransactionCategoryUpdate(BaseSchema):
+    """Schema for a category chosen by the user."""
+
+    category_id: UUID = Field(description="Category to assign")
+
+
+class TransactionListResponse(BaseSchema):
+    """Schema for a page of transactions."""
+
+    items: List[TransactionResponse] = Field(description="Transactions, newest first")
+    next_cursor: Optional[str] = Field(description="Cursor of the next page")
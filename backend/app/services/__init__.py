@@ -4,8 +4,61 @@ Services for the SpendAhead backend.
 This package contains business logic services for authentication and other features.
 """
 
+from .ai_categorization import AICategorizationPipeline, LocalStubProvider
+from .audit_capture import AuditCapture, audit_capture
+from .audit_retention import AuditRetentionService
+from .audit_writer import AuditWriter
 from .auth import AuthService
+from .balance_ledger import BalanceLedgerService
+from .balances import BalanceUpdateService
+from .budget_actuals import BudgetActualsEngine
+from .budget_alerts import BudgetAlertService
+from .budget_rollover import BudgetRolloverService
+from .budget_templates import BudgetTemplateService
+from .categorization_cache import CategorizationCacheService
+from .categorization_rules import CategorizationRuleService, rule_index_cache
+from .category_hierarchy import CategoryHierarchyService
+from .category_tree import CategoryTreeCache, category_tree_cache
+from .data_export import DataExportRunner, DataExportService
+from .delta_sync import DeltaSyncService
+from .insight_context import InsightContextBuilder
+from .insight_feed import InsightFeedService
+from .insight_scheduler import InsightScheduler, InsightWorkerPool
+from .keyword_categorizer import KeywordCategorizationService, keyword_index_cache
+from .similarity_categorizer import SimilarityCategorizer
+from .spending_rollup import SpendingRollupService
+from .transaction_list import TransactionListService
 
 __all__ = [
+    "AICategorizationPipeline",
+    "LocalStubProvider",
+    "AuditCapture",
+    "audit_capture",
+    "AuditRetentionService",
+    "AuditWriter",
     "AuthService",
+    "BalanceLedgerService",
+    "BalanceUpdateService",
+    "BudgetActualsEngine",
+    "BudgetAlertService",
+    "BudgetRolloverService",
+    "BudgetTemplateService",
+    "CategorizationCacheService",
+    "CategorizationRuleService",
+    "rule_index_cache",
+    "CategoryHierarchyService",
+    "CategoryTreeCache",
+    "category_tree_cache",
+    "DataExportRunner",
+    "DataExportService",
+    "DeltaSyncService",
+    "InsightContextBuilder",
+    "InsightFeedService",
+    "InsightScheduler",
+    "InsightWorkerPool",
+    "KeywordCategorizationService",
+    "keyword_index_cache",
+    "SimilarityCategorizer",
+    "SpendingRollupService",
+    "TransactionListService",
 ]
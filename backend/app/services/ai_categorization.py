@@ -0,0 +1,728 @@
+"""
+AI categorization pipeline for the SpendAhead backend.
+
+This module categorizes transactions the user's rules and the keyword
+categorizer could not place confidently. Answers memoized by the
+categorization cache are reused without a model call, as are confident
+predictions of the similarity categorizer built from the user's own
+history; the remaining transactions are grouped into batches of up to N
+descriptions per model call, calls run concurrently under a semaphore with
+retries and exponential backoff, and all results are written back with one
+bulk UPDATE. Models are reached through a small provider interface; a
+deterministic local stub allows offline testing and benchmarking.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.services.budget_alerts import BudgetAlertService
+from app.services.categorization_cache import CacheKey, CategorizationCacheService
+from app.services.categorization_rules import CategorizationRuleService
+from app.services.category_tree import CategoryTree, category_tree_cache
+from app.services.keyword_categorizer import (
+    CATEGORIZABLE_TYPES,
+    KeywordCategorizationService,
+)
+from app.services.similarity_categorizer import SimilarityCategorizer
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+from app.services.transaction_pipeline import apply_transaction_changes
+
+logger = get_logger(__name__)
+
+# Marker stored in ai_categorization_data once a model has seen a transaction
+MODEL_SOURCE = "model"
+
+# Transactions sent to the model per pipeline run
+AI_CATEGORIZATION_LIMIT = 5000
+
+# Tokens the local stub reports per transaction on top of its description
+STUB_PROMPT_TOKENS = 20
+
+
+@dataclass(frozen=True)
+class CategoryChoice:
+    """A category a model may pick."""
+
+    id: UUID
+    path: str
+    category_type: str
+
+
+@dataclass(frozen=True)
+class CategorizationRequest:
+    """One transaction to categorize."""
+
+    transaction_id: UUID
+    description: str
+    amount: Decimal
+    transaction_type: str
+    location: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CategorizationResult:
+    """A model's answer for one transaction."""
+
+    transaction_id: UUID
+    category_id: Optional[UUID]
+    confidence: Optional[Decimal]
+    tokens_used: int = 0
+    source: Optional[str] = None  # cache or similarity when answered locally
+
+
+class CategorizationProvider(Protocol):
+    """Interface of a model that categorizes batches of transactions."""
+
+    name: str
+
+    async def categorize(
+        self,
+        requests: Sequence[CategorizationRequest],
+        choices: Sequence[CategoryChoice],
+    ) -> List[CategorizationResult]:
+        """
+        Categorize a batch of transactions in a single model call.
+
+        Args:
+            requests: Transactions to categorize
+            choices: Categories the model may pick from
+
+        Returns:
+            One result per request; may omit requests the model skipped
+        """
+        ...
+
+
+class LocalStubProvider:
+    """
+    Deterministic offline provider.
+
+    Picks a category of the transaction's type from a hash of the
+    description, so the same input always yields the same answer. An
+    optional per-call latency simulates a remote model for benchmarks, and
+    token usage is estimated at four characters per token.
+    """
+
+    name = "local-stub"
+
+    def __init__(self, latency: float = 0.0):
+        """Initialize the stub with a simulated per-call latency in seconds."""
+        self.latency = latency
+        self.calls = 0
+
+    async def categorize(
+        self,
+        requests: Sequence[CategorizationRequest],
+        choices: Sequence[CategoryChoice],
+    ) -> List[CategorizationResult]:
+        """Categorize a batch by hashing each description."""
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        by_type: Dict[str, List[CategoryChoice]] = {}
+        for choice in sorted(choices, key=lambda choice: choice.path):
+            by_type.setdefault(choice.category_type, []).append(choice)
+
+        results = []
+        for request in requests:
+            candidates = by_type.get(request.transaction_type)
+            if not candidates:
+                results.append(CategorizationResult(request.transaction_id, None, None))
+                continue
+            digest = hashlib.blake2b(
+                request.description.strip().lower().encode(), digest_size=8
+            ).digest()
+            value = int.from_bytes(digest, "big")
+            results.append(
+                CategorizationResult(
+                    transaction_id=request.transaction_id,
+                    category_id=candidates[value % len(candidates)].id,
+                    confidence=Decimal(50 + (value >> 32) % 50) / 100,
+                    tokens_used=STUB_PROMPT_TOKENS + len(request.description) // 4,
+                )
+            )
+        return results
+
+
+class OpenAIProvider:
+    """Provider backed by the OpenAI chat completions API."""
+
+    def __init__(self, client: Optional[Any] = None) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            client: ``openai.AsyncOpenAI`` compatible client (created from
+                settings when omitted)
+        """
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client
+        self.name = f"openai:{settings.openai_model}"
+
+    async def categorize(
+        self,
+        requests: Sequence[CategorizationRequest],
+        choices: Sequence[CategoryChoice],
+    ) -> List[CategorizationResult]:
+        """Categorize a batch with one chat completion returning JSON."""
+        category_lines = "\n".join(
+            f"{number}. [{choice.category_type}] {choice.path}"
+            for number, choice in enumerate(choices, start=1)
+        )
+        transaction_lines = "\n".join(
+            f"{number}. [{request.transaction_type}] {request.description}"
+            f" ({request.amount})"
+            for number, request in enumerate(requests, start=1)
+        )
+        response = await self.client.chat.completions.create(
+            model=settings.openai_model,
+            temperature=settings.openai_temperature,
+            max_tokens=settings.openai_max_tokens,
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You categorize personal finance transactions. Pick the "
+                        "number of the best category of the same type for each "
+                        "transaction, or null if none fits. Reply with JSON: "
+                        '{"results": [{"transaction": <number>, '
+                        '"category": <number or null>, "confidence": <0..1>}]}'
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Categories:\n{category_lines}\n\n"
+                        f"Transactions:\n{transaction_lines}"
+                    ),
+                },
+            ],
+        )
+        payload = json.loads(response.choices[0].message.content or "{}")
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", 0) or 0
+
+        results = []
+        for entry in payload.get("results", []):
+            try:
+                request = requests[int(entry["transaction"]) - 1]
+                category = entry.get("category")
+                choice = choices[int(category) - 1] if category else None
+                confidence = Decimal(str(entry.get("confidence", 0)))
+            except (KeyError, IndexError, TypeError, ValueError, ArithmeticError):
+                continue
+            results.append(
+                CategorizationResult(
+                    transaction_id=request.transaction_id,
+                    category_id=choice.id if choice else None,
+                    confidence=confidence if choice else None,
+                )
+            )
+        # Attribute the call's tokens evenly to its answers
+        return [
+            replace(result, tokens_used=share)
+            for result, share in zip(results, _split(tokens, len(results)))
+        ]
+
+
+def _split(total: int, parts: int) -> List[int]:
+    """Split a total into near-equal integer parts."""
+    if not parts:
+        return []
+    share, remainder = divmod(total, parts)
+    return [share + (1 if index < remainder else 0) for index in range(parts)]
+
+
+def get_categorization_provider() -> CategorizationProvider:
+    """
+    Create the provider selected by ``AI_CATEGORIZATION_PROVIDER``.
+
+    Returns:
+        The configured provider
+
+    Raises:
+        ValueError: If the provider is unknown or not configured
+    """
+    provider = settings.ai_categorization_provider.lower()
+    if provider == "local":
+        return LocalStubProvider()
+    if provider == "openai":
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY must be set to use the openai provider")
+        return OpenAIProvider()
+    raise ValueError(f"Unknown AI categorization provider: {provider}")
+
+
+def category_choices(tree: CategoryTree) -> List[CategoryChoice]:
+    """
+    List the categories a model may assign.
+
+    Args:
+        tree: The user's category tree snapshot
+
+    Returns:
+        Active income and expense categories with their full paths
+    """
+    return [
+        CategoryChoice(id=node.id, path=node.path, category_type=node.category_type)
+        for node in tree.nodes.values()
+        if node.is_active and node.category_type in CATEGORIZABLE_TYPES
+    ]
+
+
+@dataclass
+class BatchedCategorization:
+    """Provider answers for a set of batched requests."""
+
+    answered: List[CategorizationRequest] = field(default_factory=list)
+    results: List[CategorizationResult] = field(default_factory=list)
+    model_calls: int = 0
+    failed_batches: int = 0
+
+    @property
+    def tokens_used(self) -> int:
+        """Get the tokens consumed by the answered batches."""
+        return sum(result.tokens_used for result in self.results)
+
+
+@dataclass
+class AICategorizationResult:
+    """Outcome of an AI categorization run."""
+
+    rule_assigned: int = 0
+    keyword_assigned: int = 0
+    requested: int = 0
+    cache_hits: int = 0
+    similarity_hits: int = 0
+    assigned: int = 0
+    suggested: int = 0
+    model_calls: int = 0
+    failed_batches: int = 0
+    tokens_used: int = 0
+
+
+class AICategorizationPipeline:
+    """Pipeline categorizing pending transactions with a model provider."""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: Redis,
+        provider: Optional[CategorizationProvider] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Unset options default to the ``AI_CATEGORIZATION_*`` settings.
+
+        Args:
+            db: Database session
+            redis: Redis client
+            provider: Model provider
+            batch_size: Transactions per model call
+            concurrency: Maximum model calls in flight
+            max_retries: Retries of a failed model call
+            retry_backoff: Base delay between retries in seconds
+        """
+        self.db = db
+        self.redis = redis
+        self.provider = provider or get_categorization_provider()
+        self.similarity = SimilarityCategorizer(db)
+        self.batch_size = batch_size or settings.ai_categorization_batch_size
+        self.max_retries = (
+            max_retries
+            if max_retries is not None
+            else settings.ai_categorization_max_retries
+        )
+        self.retry_backoff = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.ai_categorization_retry_backoff
+        )
+        self.min_confidence = Decimal(
+            str(settings.ai_categorization_min_confidence)
+        ).quantize(Decimal("0.01"))
+        self._semaphore = asyncio.Semaphore(
+            concurrency or settings.ai_categorization_concurrency
+        )
+
+    async def run(
+        self, user_id: UUID, limit: int = AI_CATEGORIZATION_LIMIT
+    ) -> AICategorizationResult:
+        """
+        Categorize a user's pending transactions.
+
+        Applies the user's rules and runs the keyword categorizer first,
+        answers what it can from the categorization cache and then from
+        similar past transactions, sends what is left to the model in
+        concurrent batches, then writes every answer back in one bulk
+        UPDATE. Confident answers assign the category and are cached;
+        weaker ones only record the suggestion, and transactions the model
+        left out are marked as seen. Each transaction of an answered batch
+        is sent to a model at most once; those of failed batches are
+        retried on the next run.
+
+        Args:
+            user_id: User ID
+            limit: Maximum pending transactions processed
+
+        Returns:
+            Counts of the run
+        """
+        outcome = AICategorizationResult()
+        rules = await CategorizationRuleService(self.db, self.redis).apply_pending(
+            user_id
+        )
+        outcome.rule_assigned = rules.categorized
+        keywords = await KeywordCategorizationService(
+            self.db, self.redis
+        ).categorize_pending(user_id)
+        outcome.keyword_assigned = keywords.assigned
+
+        tree = await category_tree_cache.get(self.db, self.redis, user_id)
+        choices = category_choices(tree)
+        requests = await self._load_pending(user_id, limit)
+        outcome.requested = len(requests)
+        if not requests or not choices:
+            return outcome
+
+        # Cache hits bypass the model entirely
+        cache = CategorizationCacheService(self.db, self.redis)
+        keys = {
+            request.transaction_id: CacheKey.build(
+                request.description, request.amount, request.transaction_type
+            )
+            for request in requests
+        }
+        cached = await cache.lookup(user_id, keys.values(), tree)
+        hits: List[CategorizationResult] = []
+        misses: List[CategorizationRequest] = []
+        for request in requests:
+            hit = cached.get(keys[request.transaction_id])
+            if hit is None:
+                misses.append(request)
+            else:
+                hits.append(
+                    CategorizationResult(
+                        transaction_id=request.transaction_id,
+                        category_id=hit.category_id,
+                        confidence=hit.confidence,
+                        source="cache",
+                    )
+                )
+        outcome.cache_hits = len(hits)
+
+        # Confident neighbours in the user's own history bypass it as well
+        if misses:
+            similar = await self.similarity.categorize(
+                user_id,
+                [(request.description, request.transaction_type) for request in misses],
+            )
+            remaining: List[CategorizationRequest] = []
+            for request, match in zip(misses, similar):
+                if match is None or match.confidence < self.min_confidence:
+                    remaining.append(request)
+                else:
+                    hits.append(
+                        CategorizationResult(
+                            transaction_id=request.transaction_id,
+                            category_id=match.category_id,
+                            confidence=match.confidence,
+                            source="similarity",
+                        )
+                    )
+            outcome.similarity_hits = len(misses) - len(remaining)
+            misses = remaining
+
+        batched = await self.categorize_batches(misses, choices)
+        outcome.model_calls = batched.model_calls
+        outcome.failed_batches = batched.failed_batches
+        outcome.tokens_used = batched.tokens_used
+        await cache.record_model_usage(len(batched.answered), batched.tokens_used)
+
+        valid_ids = {choice.id: choice.category_type for choice in choices}
+        types = {request.transaction_id: request.transaction_type for request in misses}
+        stale = await cache.store(
+            user_id,
+            [
+                (keys[result.transaction_id], result.category_id, result.confidence)
+                for result in batched.results
+                if result.transaction_id in types
+                and result.category_id is not None
+                and result.confidence is not None
+                and valid_ids.get(result.category_id) == types[result.transaction_id]
+                and result.confidence >= self.min_confidence
+            ],
+            tree,
+        )
+
+        hit_ids = {result.transaction_id for result in hits}
+        attempted = {request.transaction_id: request for request in batched.answered}
+        attempted.update(
+            (request.transaction_id, request)
+            for request in requests
+            if request.transaction_id in hit_ids
+        )
+        await self._write(attempted, hits + batched.results, valid_ids, outcome)
+        await cache.invalidate(stale)
+
+        logger.info(
+            "Transactions categorized by model",
+            user_id=user_id,
+            provider=self.provider.name,
+            requested=outcome.requested,
+            cache_hits=outcome.cache_hits,
+            similarity_hits=outcome.similarity_hits,
+            tokens_used=outcome.tokens_used,
+            assigned=outcome.assigned,
+            suggested=outcome.suggested,
+            failed_batches=outcome.failed_batches,
+        )
+        return outcome
+
+    async def categorize_batches(
+        self,
+        requests: Sequence[CategorizationRequest],
+        choices: Sequence[CategoryChoice],
+    ) -> BatchedCategorization:
+        """
+        Send requests to the provider in concurrent batches.
+
+        Args:
+            requests: Transactions to categorize
+            choices: Categories the model may pick from
+
+        Returns:
+            Results of every answered batch and call counts
+        """
+        batches = [
+            requests[start : start + self.batch_size]
+            for start in range(0, len(requests), self.batch_size)
+        ]
+        answers = await asyncio.gather(
+            *(self._call(batch, choices) for batch in batches)
+        )
+
+        batched = BatchedCategorization()
+        for batch, answer in zip(batches, answers):
+            if answer is None:
+                batched.failed_batches += 1
+                continue
+            batched.model_calls += 1
+            batched.answered.extend(batch)
+            batched.results.extend(answer)
+        return batched
+
+    async def _load_pending(
+        self, user_id: UUID, limit: int
+    ) -> List[CategorizationRequest]:
+        """
+        Load the transactions still waiting for a model.
+
+        Args:
+            user_id: User ID
+            limit: Maximum number of transactions
+
+        Returns:
+            Requests in transaction date order, newest first
+        """
+        result = await self.db.execute(
+            select(
+                Transaction.id,
+                Transaction.description,
+                Transaction.amount,
+                Transaction.transaction_type,
+                Transaction.location,
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.category_id.is_(None),
+                Transaction.ai_categorized == False,  # noqa: E712
+                Transaction.transaction_type.in_(CATEGORIZABLE_TYPES),
+                Transaction.is_deleted == False,  # noqa: E712
+                or_(
+                    Transaction.ai_categorization_data.is_(None),
+                    Transaction.ai_categorization_data["source"].astext != MODEL_SOURCE,
+                ),
+            )
+            .order_by(Transaction.transaction_date.desc(), Transaction.id)
+            .limit(limit)
+        )
+        return [
+            CategorizationRequest(
+                transaction_id=row.id,
+                description=row.description,
+                amount=row.amount,
+                transaction_type=row.transaction_type,
+                location=row.location,
+            )
+            for row in result
+        ]
+
+    async def _call(
+        self,
+        batch: Sequence[CategorizationRequest],
+        choices: Sequence[CategoryChoice],
+    ) -> Optional[List[CategorizationResult]]:
+        """
+        Send one batch to the provider, retrying with exponential backoff.
+
+        Args:
+            batch: Transactions to categorize
+            choices: Categories the model may pick from
+
+        Returns:
+            The provider's results, or None if every attempt failed
+        """
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await self.provider.categorize(batch, choices)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        logger.error(
+                            "AI categorization batch failed",
+                            provider=self.provider.name,
+                            size=len(batch),
+                            attempts=attempt + 1,
+                            error=str(e),
+                        )
+                        return None
+                    delay = self.retry_backoff * 2**attempt
+                    logger.warning(
+                        "AI categorization call failed, retrying",
+                        provider=self.provider.name,
+                        attempt=attempt + 1,
+                        delay=delay,
+                        error=str(e),
+                    )
+                    await asyncio.sleep(delay + random.uniform(0, delay))
+        return None
+
+    async def _write(
+        self,
+        attempted: Dict[UUID, CategorizationRequest],
+        results: Sequence[CategorizationResult],
+        valid_ids: Dict[UUID, str],
+        outcome: AICategorizationResult,
+    ) -> None:
+        """
+        Write model answers back in one bulk UPDATE and commit.
+
+        Rows categorized elsewhere while the model was running are locked
+        out and left untouched. Rows the provider left out of its answer
+        are marked as seen without a suggestion, so they are not sent again.
+
+        Args:
+            attempted: Requests of every batch the provider answered
+            results: Provider results
+            valid_ids: The user's assignable category IDs and their types
+            outcome: Counts to update
+        """
+        if not attempted:
+            return
+        answers = {
+            result.transaction_id: result
+            for result in results
+            if result.transaction_id in attempted
+        }
+
+        locked = await self.db.execute(
+            select(
+                Transaction.id,
+                Transaction.user_id,
+                Transaction.category_id,
+                Transaction.from_account_id,
+                Transaction.to_account_id,
+                Transaction.amount,
+                Transaction.currency,
+                Transaction.transaction_type,
+                Transaction.transaction_date,
+            )
+            .where(
+                Transaction.id.in_(list(attempted)),
+                Transaction.category_id.is_(None),
+                Transaction.is_deleted == False,  # noqa: E712
+            )
+            .with_for_update()
+        )
+
+        updates: List[dict] = []
+        changes: List[TransactionChange] = []
+        for row in locked:
+            answer = answers.get(row.id)
+            if answer is None:
+                updates.append(
+                    {
+                        "id": row.id,
+                        "ai_categorization_data": {
+                            "source": MODEL_SOURCE,
+                            "provider": self.provider.name,
+                            "omitted": True,
+                        },
+                    }
+                )
+                continue
+            category_id = answer.category_id
+            if (
+                category_id is not None
+                and valid_ids.get(category_id) != row.transaction_type
+            ):
+                category_id = None
+            values = {
+                "id": row.id,
+                "ai_categorization_data": {
+                    "source": MODEL_SOURCE,
+                    "provider": answer.source or self.provider.name,
+                },
+            }
+            if category_id is not None:
+                confidence = min(
+                    max(answer.confidence or Decimal(0), Decimal(0)), Decimal(1)
+                ).quantize(Decimal("0.01"))
+                values["ai_suggested_category_id"] = category_id
+                values["ai_confidence_score"] = confidence
+                if confidence >= self.min_confidence:
+                    values["category_id"] = category_id
+                    values["ai_categorized"] = True
+                    before = TransactionSnapshot.from_model(row)
+                    changes.append(
+                        TransactionChange(
+                            before=before,
+                            after=replace(before, category_id=category_id),
+                        )
+                    )
+                else:
+                    outcome.suggested += 1
+            updates.append(values)
+
+        if updates:
+            # Bulk UPDATE by primary key, grouped by the columns each row sets
+            await self.db.execute(update(Transaction), updates)
+        budget_ids = await apply_transaction_changes(self.db, changes)
+        await self.db.commit()
+        if budget_ids:
+            await BudgetAlertService(self.db, self.redis).mark_dirty(budget_ids)
+        outcome.assigned += len(changes)
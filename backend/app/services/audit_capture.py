@@ -0,0 +1,327 @@
+"""
+Automatic audit capture for the SpendAhead backend.
+
+This module records audit events for changes to audited models straight
+from the ORM's change tracking. After each flush it reads the attribute
+history of new, dirty and deleted objects and keeps only the fields that
+changed, redacting sensitive values once at capture time. Set-based
+UPDATE and DELETE statements bypass change tracking, so they are captured
+as they execute: bulk updates by primary key record each row's new values
+and other statements record the fields they set and the rows they hit. The
+events are handed to the audit writer when the transaction commits and
+dropped when it rolls back, so rolled-back changes are never audited.
+"""
+
+import enum
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, cast
+from uuid import UUID
+
+from sqlalchemy import Result, event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.core.logging import get_logger
+from app.models.account import Account
+from app.models.audit_log import has_sensitive_fields, redact_sensitive_values
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.audit_writer import AuditEvent, AuditWriter, audit_writer
+
+logger = get_logger(__name__)
+
+# Audited models and their entity types
+AUDITED_MODELS: Dict[Any, str] = {
+    Transaction: "transaction",
+    Account: "account",
+    Budget: "budget",
+    Category: "category",
+    User: "user",
+}
+
+# Audited tables and their entity types, for statements run outside the ORM
+AUDITED_TABLES = {
+    model.__tablename__: entity_type for model, entity_type in AUDITED_MODELS.items()
+}
+
+# Bookkeeping columns whose changes alone are not audited
+IGNORED_FIELDS = frozenset(["created_at", "updated_at", "last_login_at"])
+
+# Session.info keys of captured events and of the request's audit context
+PENDING_EVENTS_KEY = "audit_pending_events"
+AUDIT_CONTEXT_KEY = "audit_context"
+
+# Diff of one object: (old values, new values) of its changed fields
+Diff = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
+def _jsonable(value: Any) -> Any:
+    """Convert a column value to a JSON-compatible value."""
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    return str(value)
+
+
+def object_diff(obj: Any, created: bool = False) -> Diff:
+    """
+    Get the changed fields of an object from its attribute history.
+
+    Args:
+        obj: Persistent or newly flushed ORM object
+        created: Whether the object was just inserted, in which case every
+            non-null field counts as changed
+
+    Returns:
+        Old and new values of the changed fields
+    """
+    state = inspect(obj)
+    columns = state.mapper.column_attrs
+    old: Dict[str, Any] = {}
+    new: Dict[str, Any] = {}
+    if created:
+        for attribute in columns:
+            value = state.dict.get(attribute.key)
+            if value is not None and attribute.key not in IGNORED_FIELDS:
+                new[attribute.key] = _jsonable(value)
+        return old, new
+
+    # Only attributes set since the last load have committed state
+    for key in list(state.committed_state):
+        if key in IGNORED_FIELDS or key not in columns:
+            continue
+        history = state.attrs[key].history
+        if not history.has_changes():
+            continue
+        before = history.deleted[0] if history.deleted else None
+        after = history.added[0] if history.added else None
+        if before == after:
+            continue
+        old[key] = _jsonable(before)
+        new[key] = _jsonable(after)
+    return old, new
+
+
+def _actor(obj: Any) -> Optional[UUID]:
+    """Get the user an audited object belongs to without loading anything."""
+    loaded = inspect(obj).dict
+    actor: Optional[UUID] = (
+        loaded.get("id") if isinstance(obj, User) else loaded.get("user_id")
+    )
+    return actor
+
+
+def capture_changes(session: Session) -> List[AuditEvent]:
+    """
+    Build audit events for the audited objects of a flush.
+
+    Call from an ``after_flush`` hook, while the session still lists the
+    flushed objects as new, dirty and deleted and their history is intact.
+
+    Args:
+        session: Session being flushed
+
+    Returns:
+        One event per audited object with audited changes
+    """
+    context = session.info.get(AUDIT_CONTEXT_KEY, {})
+    changes = [(obj, "create") for obj in session.new]
+    changes += [(obj, "update") for obj in session.dirty]
+    changes += [(obj, "delete") for obj in session.deleted]
+
+    events = []
+    for obj, action in changes:
+        entity_type = AUDITED_MODELS.get(type(obj))
+        if entity_type is None:
+            continue
+        if action == "delete":
+            old: Dict[str, Any] = {}
+            new: Dict[str, Any] = {}
+        else:
+            old, new = object_diff(obj, created=action == "create")
+            if not new:
+                continue
+            if action == "update" and new.get("is_deleted") is True:
+                action = "delete"
+        sensitive = has_sensitive_fields(new)
+        events.append(
+            AuditEvent(
+                action=action,
+                entity_type=entity_type,
+                entity_id=inspect(obj).dict.get("id"),
+                user_id=context.get("user_id", _actor(obj)),
+                old_values=redact_sensitive_values(old) if old else None,
+                new_values=redact_sensitive_values(new) if new else None,
+                changed_fields=sorted(new) if action != "create" else None,
+                ip_address=context.get("ip_address"),
+                user_agent=context.get("user_agent"),
+                session_id=context.get("session_id"),
+                is_sensitive=sensitive,
+            )
+        )
+    return events
+
+
+def capture_statement(
+    state: ORMExecuteState, entity_type: str, rows: Optional[int] = None
+) -> List[AuditEvent]:
+    """
+    Build audit events for a set-based UPDATE or DELETE of an audited table.
+
+    Statements run with one parameter set per primary key, like the ORM's
+    bulk updates, record one event per row with its new values. Any other
+    statement records one ``bulk_update`` or ``bulk_delete`` event naming
+    the fields it sets; its values may be SQL expressions, so they are not
+    stored.
+
+    Args:
+        state: Execution state of the statement
+        entity_type: Entity type of the statement's table
+        rows: Number of rows the statement changed, if the driver reports it
+
+    Returns:
+        The statement's audit events
+    """
+    context = state.session.info.get(AUDIT_CONTEXT_KEY, {})
+    action = "update" if state.is_update else "delete"
+    params = cast(Sequence[Mapping[str, Any]], state.parameters or [])
+    if state.is_executemany and all("id" in row for row in params):
+        events = []
+        for row in params:
+            new = {
+                key: _jsonable(value)
+                for key, value in row.items()
+                if key != "id" and key not in IGNORED_FIELDS
+            }
+            if action == "update" and not new:
+                continue
+            events.append(
+                AuditEvent(
+                    action=action,
+                    entity_type=entity_type,
+                    entity_id=row["id"],
+                    user_id=context.get("user_id"),
+                    new_values=redact_sensitive_values(new) if new else None,
+                    changed_fields=sorted(new) if new else None,
+                    ip_address=context.get("ip_address"),
+                    user_agent=context.get("user_agent"),
+                    session_id=context.get("session_id"),
+                    is_sensitive=has_sensitive_fields(new),
+                )
+            )
+        return events
+
+    # Values are keyed by column, or by name when given as strings
+    values = getattr(state.statement, "_values", None) or {}
+    fields = {getattr(key, "key", key) for key in values}
+    if state.is_executemany:
+        fields.update(key for row in params for key in row)
+    fields -= IGNORED_FIELDS
+    if action == "update" and not fields:
+        return []
+    return [
+        AuditEvent(
+            action=f"bulk_{action}",
+            entity_type=entity_type,
+            user_id=context.get("user_id"),
+            changed_fields=sorted(fields) or None,
+            ip_address=context.get("ip_address"),
+            user_agent=context.get("user_agent"),
+            session_id=context.get("session_id"),
+            audit_metadata={"rows": rows} if rows is not None else None,
+            is_sensitive=has_sensitive_fields(fields),
+        )
+    ]
+
+
+def set_audit_context(session: Any, **context: Any) -> None:
+    """
+    Attach request details to the events a session captures.
+
+    Args:
+        session: Session or AsyncSession
+        **context: user_id, ip_address, user_agent or session_id
+    """
+    session.info.setdefault(AUDIT_CONTEXT_KEY, {}).update(context)
+
+
+class AuditCapture:
+    """Session event hooks feeding captured changes to an audit writer."""
+
+    def __init__(self, writer: AuditWriter = audit_writer):
+        """Initialize the hooks with the writer receiving committed events."""
+        self.writer = writer
+        self.installed = False
+
+    def install(self) -> None:
+        """Start capturing changes of every session."""
+        if self.installed:
+            return
+        event.listen(Session, "after_flush", self.after_flush)
+        event.listen(Session, "do_orm_execute", self.do_orm_execute)
+        event.listen(Session, "after_commit", self.after_commit)
+        event.listen(Session, "after_rollback", self.after_rollback)
+        self.installed = True
+
+    def remove(self) -> None:
+        """Stop capturing changes."""
+        if not self.installed:
+            return
+        event.remove(Session, "after_flush", self.after_flush)
+        event.remove(Session, "do_orm_execute", self.do_orm_execute)
+        event.remove(Session, "after_commit", self.after_commit)
+        event.remove(Session, "after_rollback", self.after_rollback)
+        self.installed = False
+
+    def after_flush(self, session: Session, flush_context: Any) -> None:
+        """Capture the flushed changes until the transaction ends."""
+        try:
+            events = capture_changes(session)
+        except Exception as e:
+            # Auditing must never fail the write it describes
+            logger.error("Audit capture failed", error=str(e))
+            return
+        if events:
+            session.info.setdefault(PENDING_EVENTS_KEY, []).extend(events)
+
+    def do_orm_execute(self, state: ORMExecuteState) -> Optional[Result[Any]]:
+        """Capture a set-based UPDATE or DELETE of an audited table."""
+        if not (state.is_update or state.is_delete):
+            return None
+        table = cast(UpdateBase, state.statement).table
+        entity_type = AUDITED_TABLES.get(getattr(table, "name", ""))
+        if entity_type is None:
+            return None
+        result = state.invoke_statement()
+        try:
+            events = capture_statement(
+                state, entity_type, getattr(result, "rowcount", None)
+            )
+        except Exception as e:
+            # Auditing must never fail the write it describes
+            logger.error("Audit capture failed", error=str(e))
+            return result
+        if events:
+            state.session.info.setdefault(PENDING_EVENTS_KEY, []).extend(events)
+        return result
+
+    def after_commit(self, session: Session) -> None:
+        """Hand the committed transaction's events to the writer."""
+        for captured in session.info.pop(PENDING_EVENTS_KEY, ()):
+            self.writer.record(captured)
+
+    def after_rollback(self, session: Session) -> None:
+        """Drop the events of a rolled-back transaction."""
+        session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+# Global audit capture installed by the application lifespan
+audit_capture = AuditCapture()
@@ -0,0 +1,392 @@
+"""
+Audit log retention for the SpendAhead backend.
+
+This module maintains the monthly partitions of ``audit_logs``. It creates
+partitions ahead of time so inserts never fall into the default partition,
+and archives partitions older than the retention period: each is detached,
+streamed into a compressed Parquet file on local disk and then dropped, so
+the table only ever holds recent months. Rows that did land in the default
+partition are moved into their month's partition when it is created, or
+into a detached table archived with the expired partitions.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from pathlib import Path
+from typing import Any, List, Optional, cast
+
+from sqlalchemy import CursorResult, column, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.audit_log import AuditLog
+
+logger = get_logger(__name__)
+
+# Name of the partition holding one month, and its parser
+PARTITION_NAME = "audit_logs_y{year:04d}m{month:02d}"
+PARTITION_PATTERN = re.compile(r"^audit_logs_y(\d{4})m(\d{2})$")
+
+# Partition receiving rows of months without a partition of their own
+DEFAULT_PARTITION = "audit_logs_default"
+
+# Rows fetched per round trip and written per Parquet row group
+ARCHIVE_BATCH_SIZE = 10000
+
+# Parquet compression codec of archived partitions
+ARCHIVE_COMPRESSION = "zstd"
+
+# Columns stored as JSON text in archives
+JSON_COLUMNS = frozenset(
+    ["old_values", "new_values", "changed_fields", "audit_metadata"]
+)
+
+
+def add_months(month: date, months: int) -> date:
+    """Get the first day of the month ``months`` after a month (or before)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Get the name of the partition holding a month."""
+    return PARTITION_NAME.format(year=month.year, month=month.month)
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Get the month a partition name holds, or None for other tables."""
+    match = PARTITION_PATTERN.match(name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def publish_archive(partial: Path, archive_dir: Path, month: date) -> Path:
+    """
+    Move a finished archive into place without replacing an earlier one.
+
+    Rows of an already archived month can still reach the default partition
+    late, so a month may be archived more than once. The first archive is
+    ``<YYYY-MM>.parquet``; later ones get the next free ``<YYYY-MM>.<n>``
+    name. Linking fails rather than overwrites if the name is taken.
+
+    Args:
+        partial: Fully written archive file
+        archive_dir: Directory receiving the archive
+        month: Month held by the archive
+
+    Returns:
+        Path of the published archive
+    """
+    number = 1
+    while True:
+        suffix = "" if number == 1 else f".{number}"
+        path = archive_dir / f"{month:%Y-%m}{suffix}.parquet"
+        try:
+            os.link(partial, path)
+        except FileExistsError:
+            number += 1
+            continue
+        partial.unlink()
+        return path
+
+
+def _month_start(month: date) -> datetime:
+    """Get the UTC timestamp a month starts at."""
+    return datetime.combine(month, time.min, tzinfo=timezone.utc)
+
+
+def _oldest_kept(today: date, retention_months: Optional[int]) -> date:
+    """Get the first month inside the retention period."""
+    if retention_months is None:
+        retention_months = settings.audit_retention_months
+    return add_months(today.replace(day=1), -retention_months)
+
+
+@dataclass(frozen=True)
+class AuditPartition:
+    """One monthly audit_logs partition."""
+
+    name: str
+    month: date
+    attached: bool
+
+
+class AuditRetentionService:
+    """Service creating and archiving audit_logs partitions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the retention service with a database session."""
+        self.db = db
+
+    async def partitions(self) -> List[AuditPartition]:
+        """
+        List monthly partitions, including detached ones not yet archived.
+
+        Returns:
+            Partitions ordered by month
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname AS name, i.inhrelid IS NOT NULL AS attached "
+                "FROM pg_class c "
+                "LEFT JOIN pg_inherits i ON i.inhrelid = c.oid "
+                "AND i.inhparent = 'audit_logs'::regclass "
+                "WHERE c.relkind = 'r' AND c.relname LIKE 'audit\\_logs\\_y%'"
+            )
+        )
+        partitions = [
+            AuditPartition(row.name, month, row.attached)
+            for row in result
+            if (month := partition_month(row.name)) is not None
+        ]
+        return sorted(partitions, key=lambda partition: partition.month)
+
+    async def ensure_partitions(
+        self, today: date, months_ahead: Optional[int] = None
+    ) -> List[str]:
+        """
+        Create missing partitions from this month to ``months_ahead`` ahead.
+
+        Each partition is created as a plain table, filled with any rows of
+        its month from the default partition and then attached, in one
+        transaction; PostgreSQL refuses a partition whose range still has
+        rows in the default partition.
+
+        Args:
+            today: Current date
+            months_ahead: Months after the current one to prepare
+
+        Returns:
+            Names of the created partitions
+
+        Raises:
+            Exception: If a partition cannot be created; later months are
+                not attempted
+        """
+        months_ahead = (
+            settings.audit_partitions_ahead if months_ahead is None else months_ahead
+        )
+        existing = {partition.name for partition in await self.partitions()}
+        current = today.replace(day=1)
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            # DDL takes no bind parameters; the bounds are our own timestamps
+            start = _month_start(month).isoformat()
+            end = _month_start(add_months(month, 1)).isoformat()
+            try:
+                moved = await self._take_from_default(name, month)
+                await self.db.execute(
+                    text(
+                        f"ALTER TABLE audit_logs ATTACH PARTITION {name} "
+                        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+                    )
+                )
+                await self.db.commit()
+            except Exception as e:
+                await self.db.rollback()
+                logger.error(
+                    "Audit partition not created", partition=name, error=str(e)
+                )
+                raise
+            if moved:
+                logger.warning(
+                    "Audit rows moved out of the default partition",
+                    partition=name,
+                    rows=moved,
+                )
+            created.append(name)
+        if created:
+            logger.info("Audit partitions created", partitions=created)
+        return created
+
+    async def default_months(self, before: date) -> List[date]:
+        """
+        List the months before a month that have rows in the default partition.
+
+        Args:
+            before: First month not listed
+
+        Returns:
+            Months, oldest first
+        """
+        result = await self.db.execute(
+            text(
+                "SELECT DISTINCT "
+                "date_trunc('month', created_at AT TIME ZONE 'UTC')::date AS month "
+                f"FROM {DEFAULT_PARTITION} WHERE created_at < :before ORDER BY month"
+            ),
+            {"before": _month_start(before)},
+        )
+        return [row.month for row in result]
+
+    async def _take_from_default(self, name: str, month: date) -> int:
+        """
+        Move a month's rows from the default partition into a plain table.
+
+        The table is created shaped like ``audit_logs`` unless it exists. The
+        default partition stays locked until the caller's transaction ends,
+        so no row of the month can arrive there in the meantime.
+
+        Args:
+            name: Table receiving the rows
+            month: Month whose rows are moved
+
+        Returns:
+            Number of rows moved
+        """
+        await self.db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} "
+                "(LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            )
+        )
+        await self.db.execute(
+            text(f"LOCK TABLE {DEFAULT_PARTITION} IN ACCESS EXCLUSIVE MODE")
+        )
+        result = cast(
+            CursorResult[Any],
+            await self.db.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                {
+                    "start": _month_start(month),
+                    "end": _month_start(add_months(month, 1)),
+                },
+            ),
+        )
+        return result.rowcount
+
+    async def expired_partitions(
+        self, today: date, retention_months: Optional[int] = None
+    ) -> List[AuditPartition]:
+        """
+        List partitions wholly older than the retention period.
+
+        Args:
+            today: Current date
+            retention_months: Full months kept before the current one
+
+        Returns:
+            Partitions to archive, oldest first
+        """
+        oldest_kept = _oldest_kept(today, retention_months)
+        return [
+            partition
+            for partition in await self.partitions()
+            if partition.month < oldest_kept
+        ]
+
+    async def archive_expired(
+        self,
+        today: date,
+        archive_dir: Optional[Path] = None,
+        retention_months: Optional[int] = None,
+    ) -> List[Path]:
+        """
+        Detach, export and drop every expired partition.
+
+        Expired rows in the default partition are first moved into a
+        detached table per month, named like the month's partition, so they
+        are archived along with it. A partition is dropped only after its
+        archive is complete; one that failed to export stays detached and is
+        retried on the next run.
+
+        Args:
+            today: Current date
+            archive_dir: Directory receiving the Parquet files
+            retention_months: Full months kept before the current one
+
+        Returns:
+            Paths of the written archives
+        """
+        archive_dir = Path(archive_dir or settings.audit_archive_dir)
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        for month in await self.default_months(_oldest_kept(today, retention_months)):
+            name = partition_name(month)
+            moved = await self._take_from_default(name, month)
+            await self.db.commit()
+            logger.warning(
+                "Expired audit rows moved out of the default partition",
+                partition=name,
+                rows=moved,
+            )
+        archives = []
+        for partition in await self.expired_partitions(today, retention_months):
+            if partition.attached:
+                await self.db.execute(
+                    text(f"ALTER TABLE audit_logs DETACH PARTITION {partition.name}")
+                )
+                await self.db.commit()
+            path = await self.export_partition(partition, archive_dir)
+            await self.db.execute(text(f"DROP TABLE {partition.name}"))
+            await self.db.commit()
+            archives.append(path)
+            logger.info(
+                "Audit partition archived", partition=partition.name, path=str(path)
+            )
+        return archives
+
+    async def export_partition(
+        self, partition: AuditPartition, archive_dir: Path
+    ) -> Path:
+        """
+        Stream a partition into a compressed Parquet file.
+
+        Rows are fetched through a server-side cursor and written one row
+        group per batch, so memory stays flat whatever the partition size.
+
+        Args:
+            partition: Partition to export
+            archive_dir: Directory receiving the file
+
+        Returns:
+            Path of the written file
+        """
+        # Imported here so only the retention job pays for loading Arrow
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"created_at": pa.timestamp("us", tz="UTC"), "is_sensitive": pa.bool_()}
+        columns = AuditLog.__table__.columns.keys()
+        schema = pa.schema([(name, types.get(name, pa.string())) for name in columns])
+        source = table(partition.name, *(column(name) for name in columns))
+        partial = archive_dir / f"{partition.name}.parquet.partial"
+
+        stream = await self.db.stream(
+            select(source).execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+        )
+        with pq.ParquetWriter(
+            str(partial), schema, compression=ARCHIVE_COMPRESSION
+        ) as out:
+            async for batch in stream.mappings().partitions():
+                out.write_table(
+                    pa.Table.from_pylist(
+                        [self._archive_row(row) for row in batch], schema=schema
+                    )
+                )
+        return publish_archive(partial, archive_dir, partition.month)
+
+    @staticmethod
+    def _archive_row(row: Any) -> dict:
+        """Convert a row to the types of the archive schema."""
+        values = {}
+        for name, value in row.items():
+            if value is None or name in ("created_at", "is_sensitive"):
+                values[name] = value
+            elif name in JSON_COLUMNS and not isinstance(value, str):
+                values[name] = json.dumps(value)
+            else:
+                values[name] = str(value)
+        return values
@@ -0,0 +1,279 @@
+"""
+Audit log writer for the SpendAhead backend.
+
+This module takes audit logging off the request path. Handlers record
+audit events into a bounded in-process queue without awaiting anything, and
+a background task writes them to ``audit_logs`` in multi-row INSERTs every
+few hundred milliseconds or every few hundred events. Events that do not
+fit in the queue, and batches the database rejects, are spilled to a Redis
+list and replayed later, and the queue is drained on shutdown.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, TypedDict, cast
+from uuid import UUID, uuid4
+
+from fastapi import Request
+from redis.asyncio import Redis
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.models.audit_log import AuditLog
+
+logger = get_logger(__name__)
+
+# Redis list holding serialized events that could not be written yet
+AUDIT_SPILL_KEY = "audit:spill"
+
+# Seconds between checks of the spill list while the writer is idle
+SPILL_REPLAY_INTERVAL = 30.0
+
+
+@dataclass
+class AuditEvent:
+    """One audit log entry waiting to be written."""
+
+    action: str
+    entity_type: str
+    entity_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    changed_fields: Optional[List[str]] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    session_id: Optional[str] = None
+    description: Optional[str] = None
+    audit_metadata: Optional[Dict[str, Any]] = None
+    severity: str = "info"
+    is_sensitive: bool = False
+    # Assigned at record time so replayed events keep their identity and time
+    id: UUID = field(default_factory=uuid4)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def to_json(self) -> str:
+        """Serialize the event for the Redis spill list."""
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "AuditEvent":
+        """Deserialize an event written by to_json()."""
+        values = json.loads(raw)
+        for key in ("id", "entity_id", "user_id"):
+            if values[key] is not None:
+                values[key] = UUID(values[key])
+        values["created_at"] = datetime.fromisoformat(values["created_at"])
+        return cls(**values)
+
+
+class RequestContext(TypedDict):
+    """Client details of a request, as audit event fields."""
+
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+
+
+def request_context(request: Request) -> RequestContext:
+    """Get the client details of a request as audit event fields."""
+    return {
+        "ip_address": request.client.host if request.client else None,
+        "user_agent": request.headers.get("user-agent"),
+    }
+
+
+class AuditWriter:
+    """Background writer batching audit events into multi-row INSERTs."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        max_queue: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize a stopped writer.
+
+        Args:
+            session_factory: Factory of database sessions
+            max_queue: Events held in memory before spilling to Redis
+            batch_size: Most events written per INSERT
+            flush_interval: Seconds an event may wait for a fuller batch
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = flush_interval or settings.audit_flush_interval
+        self.redis: Optional[Redis] = None
+        self._queue: "asyncio.Queue[AuditEvent]" = asyncio.Queue(
+            max_queue or settings.audit_queue_size
+        )
+        self._overflow: List[AuditEvent] = []
+        self._overflowed = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._last_replay = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Get the number of events not yet handed to the database or Redis."""
+        return self._queue.qsize() + len(self._overflow)
+
+    def record(self, event: AuditEvent) -> None:
+        """
+        Queue an event without waiting.
+
+        Safe to call from request handlers and synchronous code running on
+        the event loop. When the queue is full the event is spilled to Redis.
+
+        Args:
+            event: Event to write
+        """
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self._overflow.append(event)
+            self._overflowed.set()
+
+    async def start(self, redis: Optional[Redis]) -> None:
+        """
+        Start the flush and spill tasks.
+
+        Args:
+            redis: Redis client holding the spill list, or None to keep
+                overflow in memory
+        """
+        if self._tasks:
+            return
+        self.redis = redis
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._flush_loop()),
+            asyncio.create_task(self._spill_loop()),
+        ]
+        logger.info("Audit writer started", batch_size=self.batch_size)
+
+    async def stop(self) -> None:
+        """Write every queued event, spill the overflow and stop the tasks."""
+        if not self._tasks:
+            return
+        self._stopping.set()
+        self._overflowed.set()
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+        logger.info("Audit writer stopped", unwritten=self.pending)
+
+    async def _flush_loop(self) -> None:
+        """Write batches until stopped and the queue is empty."""
+        while True:
+            batch = await self._next_batch()
+            if batch:
+                await self._write(batch)
+            elif self._stopping.is_set():
+                return
+            else:
+                await self._replay_spill()
+
+    async def _next_batch(self) -> List[AuditEvent]:
+        """Collect up to batch_size events, waiting at most flush_interval."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        batch: List[AuditEvent] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._stopping.is_set():
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _insert(self, events: Sequence[AuditEvent]) -> None:
+        """Insert events in one statement; replays of written events are skipped."""
+        async with self.session_factory() as session:
+            try:
+                await session.execute(
+                    insert(AuditLog)
+                    .values([asdict(event) for event in events])
+                    .on_conflict_do_nothing(
+                        index_elements=[AuditLog.id, AuditLog.created_at]
+                    )
+                )
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    async def _write(self, batch: List[AuditEvent]) -> bool:
+        """Insert a batch, spilling it to Redis if the database fails."""
+        try:
+            await self._insert(batch)
+            return True
+        except Exception as e:
+            logger.error("Audit batch insert failed", events=len(batch), error=str(e))
+            await self._spill(batch)
+            return False
+
+    async def _spill(self, events: List[AuditEvent]) -> None:
+        """Append events to the Redis spill list."""
+        if self.redis is None:
+            logger.error("Audit events dropped without Redis", events=len(events))
+            return
+        try:
+            await self.redis.rpush(
+                AUDIT_SPILL_KEY, *(event.to_json() for event in events)
+            )
+        except Exception as e:
+            logger.error("Audit events dropped", events=len(events), error=str(e))
+
+    async def _spill_loop(self) -> None:
+        """Move overflowing events to Redis until stopped."""
+        while True:
+            await self._overflowed.wait()
+            self._overflowed.clear()
+            overflow, self._overflow = self._overflow, []
+            if overflow:
+                await self._spill(overflow)
+            if self._stopping.is_set() and not self._overflow:
+                return
+
+    async def _replay_spill(self) -> None:
+        """Write one batch of spilled events while the queue is idle."""
+        if self.redis is None or self._stopping.is_set():
+            return
+        now = time.monotonic()
+        if now - self._last_replay < SPILL_REPLAY_INTERVAL:
+            return
+        self._last_replay = now
+        try:
+            raw = cast(
+                Optional[List[str]],
+                await self.redis.lpop(AUDIT_SPILL_KEY, self.batch_size),
+            )
+        except Exception as e:
+            logger.warning("Audit spill unavailable", error=str(e))
+            return
+        if not raw:
+            return
+        events = [AuditEvent.from_json(item) for item in raw]
+        if await self._write(events):
+            logger.info("Spilled audit events replayed", events=len(events))
+            if len(events) == self.batch_size:
+                # More may be waiting; check again on the next idle pass
+                self._last_replay = 0.0
+
+
+# Global audit writer started and stopped by the application lifespan
+audit_writer = AuditWriter()
@@ -0,0 +1,301 @@
+"""
+Balance ledger service for the SpendAhead backend.
+
+This module answers "what was this account's balance on date X" as the
+nearest balance snapshot plus a bounded scan of the transactions dated
+after it. Snapshots are checkpointed periodically and invalidated from the
+date of any late-arriving or edited transaction onward.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, delete, func, select, union_all, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import distinct_on, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.account import Account
+from app.models.balance_snapshot import AccountBalanceSnapshot
+from app.models.transaction import Transaction
+from app.services.transaction_events import (
+    TransactionChange,
+    account_legs,
+    iter_contributions,
+)
+
+logger = get_logger(__name__)
+
+# Accounts checkpointed per round trip by checkpoint()
+CHECKPOINT_CHUNK_SIZE = 1000
+
+# Lower bound used for accounts that have no snapshot yet
+LEDGER_EPOCH = datetime(1900, 1, 1, tzinfo=timezone.utc)
+
+
+def end_of_day(day: date) -> datetime:
+    """Get the exclusive UTC upper bound of a calendar day."""
+    return datetime.combine(day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+
+def utc_date(value: datetime) -> date:
+    """Get the UTC calendar date of a timestamp."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+class BalanceLedgerService:
+    """Service for balance-as-of queries backed by periodic snapshots."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the ledger service with a database session."""
+        self.db = db
+
+    async def balance_as_of(self, account_id: UUID, as_of: date) -> Decimal:
+        """
+        Get an account's ledger balance at the end of a day.
+
+        Args:
+            account_id: Account ID
+            as_of: Day to compute the balance for
+
+        Returns:
+            Balance including every transaction dated on or before ``as_of``
+        """
+        balances = await self.balances_as_of([account_id], as_of)
+        return balances.get(account_id, Decimal("0.00"))
+
+    async def balances_as_of(
+        self, account_ids: Sequence[UUID], as_of: date
+    ) -> Dict[UUID, Decimal]:
+        """
+        Get the ledger balances of several accounts at the end of a day.
+
+        Uses two queries regardless of the number of accounts: one for the
+        nearest snapshot of each account, one for the transaction legs dated
+        between that snapshot and ``as_of``. Accounts without a snapshot
+        start from their opening balance.
+
+        Args:
+            account_ids: Account IDs
+            as_of: Day to compute the balances for
+
+        Returns:
+            Mapping of account ID to balance
+        """
+        if not account_ids:
+            return {}
+
+        latest = (
+            select(
+                AccountBalanceSnapshot.account_id,
+                AccountBalanceSnapshot.as_of_date,
+                AccountBalanceSnapshot.balance,
+            )
+            .where(
+                AccountBalanceSnapshot.account_id.in_(account_ids),
+                AccountBalanceSnapshot.as_of_date <= as_of,
+            )
+            .order_by(
+                AccountBalanceSnapshot.account_id,
+                AccountBalanceSnapshot.as_of_date.desc(),
+            )
+            .ext(distinct_on(AccountBalanceSnapshot.account_id))
+            .subquery("latest")
+        )
+        result = await self.db.execute(
+            select(
+                Account.id,
+                Account.opening_balance,
+                latest.c.as_of_date,
+                latest.c.balance,
+            )
+            .outerjoin(latest, latest.c.account_id == Account.id)
+            .where(Account.id.in_(account_ids))
+        )
+        # (inclusive lower bound of the leg scan, balance before it)
+        starts: Dict[UUID, Tuple[datetime, Decimal]] = {
+            account_id: (LEDGER_EPOCH, Decimal("0.00")) for account_id in account_ids
+        }
+        for row in result:
+            if row.as_of_date is not None:
+                starts[row.id] = (end_of_day(row.as_of_date), row.balance)
+            else:
+                starts[row.id] = (LEDGER_EPOCH, row.opening_balance)
+
+        # Scan only the legs dated after each account's snapshot
+        bounds = [(account_id, since) for account_id, (since, _) in starts.items()]
+        deltas = await self._leg_totals(bounds, end_of_day(as_of))
+
+        return {
+            account_id: balance + deltas.get(account_id, Decimal("0.00"))
+            for account_id, (_, balance) in starts.items()
+        }
+
+    async def net_worth_as_of(self, user_id: UUID, as_of: date) -> Dict[str, Decimal]:
+        """
+        Get a user's net worth at the end of a day, per currency.
+
+        Args:
+            user_id: User ID
+            as_of: Day to compute net worth for
+
+        Returns:
+            Mapping of currency code to summed balance
+        """
+        result = await self.db.execute(
+            select(Account.id, Account.currency).where(
+                Account.user_id == user_id,
+                Account.is_deleted == False,  # noqa: E712
+                Account.exclude_from_net_worth == False,  # noqa: E712
+            )
+        )
+        currencies = {row.id: row.currency for row in result}
+        balances = await self.balances_as_of(list(currencies), as_of)
+
+        net_worth: Dict[str, Decimal] = {}
+        for account_id, balance in balances.items():
+            currency = currencies[account_id]
+            net_worth[currency] = net_worth.get(currency, Decimal("0.00")) + balance
+        return net_worth
+
+    async def checkpoint(
+        self, as_of: date, account_ids: Optional[Sequence[UUID]] = None
+    ) -> int:
+        """
+        Write balance snapshots for a day.
+
+        Each snapshot is derived from the previous one plus the legs in
+        between, so checkpointing periodically keeps every later query's
+        delta scan bounded by the checkpoint interval.
+
+        Args:
+            as_of: Day to checkpoint
+            account_ids: Accounts to checkpoint (defaults to all active ones)
+
+        Returns:
+            Number of snapshots written
+        """
+        if account_ids is None:
+            result = await self.db.execute(
+                select(Account.id).where(Account.is_deleted == False)  # noqa: E712
+            )
+            account_ids = list(result.scalars().all())
+
+        written = 0
+        for start in range(0, len(account_ids), CHECKPOINT_CHUNK_SIZE):
+            chunk = account_ids[start : start + CHECKPOINT_CHUNK_SIZE]
+            balances = await self.balances_as_of(chunk, as_of)
+            stmt = insert(AccountBalanceSnapshot).values(
+                [
+                    {"account_id": account_id, "as_of_date": as_of, "balance": balance}
+                    for account_id, balance in balances.items()
+                ]
+            )
+            await self.db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[
+                        AccountBalanceSnapshot.account_id,
+                        AccountBalanceSnapshot.as_of_date,
+                    ],
+                    set_={"balance": stmt.excluded.balance},
+                )
+            )
+            written += len(balances)
+
+        logger.info("Balance snapshots checkpointed", as_of=as_of, snapshots=written)
+        return written
+
+    async def invalidate(self, changes: Iterable[TransactionChange]) -> int:
+        """
+        Drop the snapshots made stale by a batch of transaction changes.
+
+        Only snapshots dated on or after the earliest affected transaction
+        date of each account are removed; older checkpoints stay valid.
+
+        Args:
+            changes: Transaction change events
+
+        Returns:
+            Number of snapshots removed
+        """
+        earliest: Dict[UUID, date] = {}
+        for snapshot, _sign in iter_contributions(changes):
+            day = utc_date(snapshot.transaction_date)
+            for account_id, _amount in account_legs(snapshot):
+                if account_id not in earliest or day < earliest[account_id]:
+                    earliest[account_id] = day
+        if not earliest:
+            return 0
+
+        stale_from = (
+            values(
+                column("account_id", PG_UUID(as_uuid=True)),
+                column("from_date", AccountBalanceSnapshot.as_of_date.type),
+                name="stale_from",
+            )
+            .data(list(earliest.items()))
+            .alias("stale_from")
+        )
+        result = await self.db.execute(
+            delete(AccountBalanceSnapshot)
+            .where(
+                AccountBalanceSnapshot.account_id == stale_from.c.account_id,
+                AccountBalanceSnapshot.as_of_date >= stale_from.c.from_date,
+            )
+            .returning(AccountBalanceSnapshot.account_id)
+        )
+        return len(result.all())
+
+    async def _leg_totals(
+        self, bounds: List[tuple[UUID, datetime]], until: datetime
+    ) -> Dict[UUID, Decimal]:
+        """
+        Sum the signed transaction legs per account within a time window.
+
+        Args:
+            bounds: (account_id, inclusive lower bound) per account
+            until: Exclusive upper bound shared by all accounts
+
+        Returns:
+            Mapping of account ID to summed signed legs
+        """
+        windows = (
+            values(
+                column("account_id", PG_UUID(as_uuid=True)),
+                column("since", DateTime(timezone=True)),
+                name="windows",
+            )
+            .data(bounds)
+            .alias("windows")
+        )
+
+        def legs(account_column: Any, sign: int) -> Any:
+            return (
+                select(
+                    windows.c.account_id,
+                    (func.abs(Transaction.amount) * sign).label("amount"),
+                )
+                .select_from(windows)
+                .join(Transaction, account_column == windows.c.account_id)
+                .where(
+                    Transaction.is_deleted == False,  # noqa: E712
+                    Transaction.transaction_date >= windows.c.since,
+                    Transaction.transaction_date < until,
+                )
+            )
+
+        all_legs = union_all(
+            legs(Transaction.from_account_id, -1),
+            legs(Transaction.to_account_id, 1),
+        ).subquery("legs")
+        result = await self.db.execute(
+            select(all_legs.c.account_id, func.sum(all_legs.c.amount)).group_by(
+                all_legs.c.account_id
+            )
+        )
+        return {account_id: total for account_id, total in result}
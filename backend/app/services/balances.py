@@ -0,0 +1,210 @@
+"""
+Balance and aggregate update service for the SpendAhead backend.
+
+This module applies account balance and budget aggregate changes with atomic
+``UPDATE ... SET col = col + :delta RETURNING`` statements instead of
+read-modify-write on loaded ORM objects, so concurrent imports neither lose
+updates nor serialize on explicit row locks.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Mapping
+from uuid import UUID
+
+from sqlalchemy import case, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.account import Account
+from app.models.budget import Budget, BudgetItem
+from app.services.transaction_events import (
+    TransactionChange,
+    account_legs,
+    iter_contributions,
+)
+
+logger = get_logger(__name__)
+
+# Largest magnitude a Numeric(5, 2) variance percentage column can hold
+MAX_VARIANCE_PERCENTAGE = Decimal("999.99")
+
+
+def aggregate_account_deltas(
+    changes: Iterable[TransactionChange],
+) -> Dict[UUID, Decimal]:
+    """
+    Collapse a batch of transaction changes into one delta per account.
+
+    Args:
+        changes: Transaction change events
+
+    Returns:
+        Mapping of account ID to net balance delta (zero deltas omitted)
+    """
+    deltas: Dict[UUID, Decimal] = {}
+    for snapshot, sign in iter_contributions(changes):
+        for account_id, amount in account_legs(snapshot):
+            deltas[account_id] = deltas.get(account_id, Decimal("0.00")) + (
+                sign * amount
+            )
+    return {account_id: delta for account_id, delta in deltas.items() if delta}
+
+
+def variance_percentage_expr(actual: Any, planned: Any) -> Any:
+    """
+    Build the SQL expression for a clamped variance percentage.
+
+    Args:
+        actual: SQL expression for the new actual amount
+        planned: SQL expression for the planned amount
+
+    Returns:
+        SQL expression matching the model's variance formula
+    """
+    percentage = (actual - planned) / planned * 100
+    return case(
+        (
+            planned > 0,
+            func.greatest(
+                -MAX_VARIANCE_PERCENTAGE,
+                func.least(MAX_VARIANCE_PERCENTAGE, func.round(percentage, 2)),
+            ),
+        ),
+        else_=Decimal("0.00"),
+    )
+
+
+class BalanceUpdateService:
+    """
+    Service for atomic, delta-based balance and aggregate updates.
+
+    Concurrent writers should use this service rather than the models'
+    in-memory update helpers, since it applies each delta atomically in the
+    database.
+    """
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the balance service with a database session."""
+        self.db = db
+
+    async def apply_changes(
+        self, changes: Iterable[TransactionChange]
+    ) -> Dict[UUID, Decimal]:
+        """
+        Apply the balance effect of a batch of transaction changes.
+
+        Args:
+            changes: Transaction change events
+
+        Returns:
+            Mapping of account ID to its new current balance
+        """
+        return await self.apply_account_deltas(aggregate_account_deltas(changes))
+
+    async def apply_account_deltas(
+        self, deltas: Mapping[UUID, Decimal]
+    ) -> Dict[UUID, Decimal]:
+        """
+        Atomically add deltas to account balances.
+
+        Issues one UPDATE per touched account, in account ID order so that
+        concurrent batches always acquire row locks in the same order.
+
+        Args:
+            deltas: Mapping of account ID to balance delta
+
+        Returns:
+            Mapping of account ID to its new current balance
+        """
+        balances: Dict[UUID, Decimal] = {}
+        for account_id in sorted(deltas, key=str):
+            delta = deltas[account_id]
+            if not delta:
+                continue
+            result = await self.db.execute(
+                update(Account)
+                .where(Account.id == account_id)
+                .values(current_balance=Account.current_balance + delta)
+                .returning(Account.id, Account.current_balance)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            if row is None:
+                logger.warning(
+                    "Balance delta for missing account", account_id=account_id
+                )
+                continue
+            balances[row.id] = row.current_balance
+        return balances
+
+    async def apply_budget_deltas(
+        self, deltas: Mapping[UUID, Decimal]
+    ) -> Dict[UUID, Decimal]:
+        """
+        Atomically add deltas to ``Budget.actual_spent`` and its variance.
+
+        Args:
+            deltas: Mapping of budget ID to spent-amount delta
+
+        Returns:
+            Mapping of budget ID to its new actual spent amount
+        """
+        spent: Dict[UUID, Decimal] = {}
+        for budget_id in sorted(deltas, key=str):
+            delta = deltas[budget_id]
+            if not delta:
+                continue
+            new_spent = Budget.actual_spent + delta
+            result = await self.db.execute(
+                update(Budget)
+                .where(Budget.id == budget_id)
+                .values(
+                    actual_spent=new_spent,
+                    variance_amount=new_spent - Budget.total_budget,
+                    variance_percentage=variance_percentage_expr(
+                        new_spent, Budget.total_budget
+                    ),
+                )
+                .returning(Budget.id, Budget.actual_spent)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            if row is not None:
+                spent[row.id] = row.actual_spent
+        return spent
+
+    async def apply_budget_item_deltas(
+        self, deltas: Mapping[UUID, Decimal]
+    ) -> Dict[UUID, Decimal]:
+        """
+        Atomically add deltas to ``BudgetItem.actual_amount`` and its variance.
+
+        Args:
+            deltas: Mapping of budget item ID to actual-amount delta
+
+        Returns:
+            Mapping of budget item ID to its new actual amount
+        """
+        actuals: Dict[UUID, Decimal] = {}
+        for item_id in sorted(deltas, key=str):
+            delta = deltas[item_id]
+            if not delta:
+                continue
+            new_actual = BudgetItem.actual_amount + delta
+            result = await self.db.execute(
+                update(BudgetItem)
+                .where(BudgetItem.id == item_id)
+                .values(
+                    actual_amount=new_actual,
+                    variance_amount=new_actual - BudgetItem.planned_amount,
+                    variance_percentage=variance_percentage_expr(
+                        new_actual, BudgetItem.planned_amount
+                    ),
+                )
+                .returning(BudgetItem.id, BudgetItem.actual_amount)
+                .execution_options(synchronize_session=False)
+            )
+            row = result.one_or_none()
+            if row is not None:
+                actuals[row.id] = row.actual_amount
+        return actuals
@@ -0,0 +1,271 @@
+"""
+Budget actuals engine for the SpendAhead backend.
+
+This module keeps ``Budget.actual_spent``/``BudgetItem.actual_amount`` and
+their variance columns current from transaction change events, so budget
+pages are a primary-key read instead of an aggregate over transactions.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import DateTime, Numeric, String, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.logging import get_logger
+from app.models.account import Account
+from app.models.budget import Budget, BudgetItem
+from app.models.transaction import Transaction
+from app.services.balances import variance_percentage_expr
+from app.services.transaction_events import TransactionChange, iter_contributions
+
+logger = get_logger(__name__)
+
+# (user_id, category_id, from_account_id, transaction_date, currency, delta)
+Contribution = Tuple[UUID, Optional[UUID], Optional[UUID], datetime, str, Decimal]
+
+
+def expense_contributions(changes: Iterable[TransactionChange]) -> List[Contribution]:
+    """
+    Flatten changes into signed expense contributions.
+
+    Only expenses count towards budgets. An edit that moves a transaction
+    between dates or categories yields a retraction and an addition.
+
+    Args:
+        changes: Transaction change events
+
+    Returns:
+        Signed contributions ready to join against budgets
+    """
+    return [
+        (
+            snapshot.user_id,
+            snapshot.category_id,
+            snapshot.from_account_id,
+            snapshot.transaction_date,
+            snapshot.currency,
+            sign * abs(snapshot.amount),
+        )
+        for snapshot, sign in iter_contributions(changes)
+        if snapshot.transaction_type == "expense"
+    ]
+
+
+def _budget_applies(budget: Any, user_id: Any, txn_date: Any, currency: Any) -> Any:
+    """Build the join condition matching a transaction to a budget."""
+    return (
+        (budget.user_id == user_id)
+        & (budget.start_date <= txn_date)
+        & (budget.end_date >= txn_date)
+        & (budget.currency == currency)
+        & (budget.is_deleted == False)  # noqa: E712
+        & (budget.is_template == False)  # noqa: E712
+    )
+
+
+class BudgetActualsEngine:
+    """Engine mapping transaction changes onto budget and item actuals."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the engine with a database session."""
+        self.db = db
+
+    async def apply_changes(self, changes: Iterable[TransactionChange]) -> Set[UUID]:
+        """
+        Apply a batch of transaction changes to every affected budget.
+
+        Budgets are matched by user, date range and currency; budget items
+        additionally by category. Each table is updated with a single
+        set-based UPDATE joining the batch against it.
+
+        Args:
+            changes: Transaction change events
+
+        Returns:
+            IDs of the budgets whose actuals changed
+        """
+        contributions = expense_contributions(changes)
+        if not contributions:
+            return set()
+
+        batch = (
+            values(
+                column("user_id", PG_UUID(as_uuid=True)),
+                column("category_id", PG_UUID(as_uuid=True)),
+                column("from_account_id", PG_UUID(as_uuid=True)),
+                column("transaction_date", DateTime(timezone=True)),
+                column("currency", String(3)),
+                column("delta", Numeric(12, 2)),
+                name="batch",
+            )
+            .data(contributions)
+            .alias("batch")
+        )
+        excluded = aliased(Account)
+        counted = func.coalesce(excluded.exclude_from_budget, False) == False  # noqa
+
+        b = aliased(Budget)
+        budget_deltas = (
+            select(b.id.label("budget_id"), func.sum(batch.c.delta).label("delta"))
+            .select_from(batch)
+            .join(
+                b,
+                _budget_applies(
+                    b, batch.c.user_id, batch.c.transaction_date, batch.c.currency
+                ),
+            )
+            .outerjoin(excluded, excluded.id == batch.c.from_account_id)
+            .where(counted)
+            .group_by(b.id)
+            .subquery("budget_deltas")
+        )
+        new_spent = Budget.actual_spent + budget_deltas.c.delta
+        result = await self.db.execute(
+            update(Budget)
+            .where(Budget.id == budget_deltas.c.budget_id)
+            .values(
+                actual_spent=new_spent,
+                variance_amount=new_spent - Budget.total_budget,
+                variance_percentage=variance_percentage_expr(
+                    new_spent, Budget.total_budget
+                ),
+            )
+            .returning(Budget.id)
+            .execution_options(synchronize_session=False)
+        )
+        budget_ids = set(result.scalars().all())
+
+        ib = aliased(Budget)
+        item = aliased(BudgetItem)
+        item_deltas = (
+            select(item.id.label("item_id"), func.sum(batch.c.delta).label("delta"))
+            .select_from(batch)
+            .join(
+                ib,
+                _budget_applies(
+                    ib, batch.c.user_id, batch.c.transaction_date, batch.c.currency
+                ),
+            )
+            .join(
+                item,
+                (item.budget_id == ib.id) & (item.category_id == batch.c.category_id),
+            )
+            .outerjoin(excluded, excluded.id == batch.c.from_account_id)
+            .where(counted)
+            .group_by(item.id)
+            .subquery("item_deltas")
+        )
+        new_actual = BudgetItem.actual_amount + item_deltas.c.delta
+        await self.db.execute(
+            update(BudgetItem)
+            .where(BudgetItem.id == item_deltas.c.item_id)
+            .values(
+                actual_amount=new_actual,
+                variance_amount=new_actual - BudgetItem.planned_amount,
+                variance_percentage=variance_percentage_expr(
+                    new_actual, BudgetItem.planned_amount
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        return budget_ids
+
+    async def recompute(self, budget_id: UUID) -> Optional[Budget]:
+        """
+        Recompute a budget and its items from scratch.
+
+        Args:
+            budget_id: Budget ID
+
+        Returns:
+            The refreshed budget, or None if it does not exist
+        """
+        await self.recompute_many([budget_id])
+
+        budget = await self.db.get(Budget, budget_id, populate_existing=True)
+        if budget is not None:
+            logger.info("Budget actuals recomputed", budget_id=budget_id)
+        return budget
+
+    async def recompute_many(self, budget_ids: Sequence[UUID]) -> None:
+        """
+        Recompute several budgets and their items from scratch.
+
+        Issues one correlated UPDATE per table regardless of the number of
+        budgets.
+
+        Args:
+            budget_ids: Budget IDs
+        """
+        if not budget_ids:
+            return
+
+        spent = self._spent_query(Budget).correlate(Budget).scalar_subquery()
+        await self.db.execute(
+            update(Budget)
+            .where(Budget.id.in_(budget_ids))
+            .values(
+                actual_spent=spent,
+                variance_amount=spent - Budget.total_budget,
+                variance_percentage=variance_percentage_expr(
+                    spent, Budget.total_budget
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        parent = aliased(Budget)
+        item_spent = (
+            self._spent_query(parent)
+            .where(
+                parent.id == BudgetItem.budget_id,
+                Transaction.category_id == BudgetItem.category_id,
+            )
+            .correlate(BudgetItem)
+            .scalar_subquery()
+        )
+        await self.db.execute(
+            update(BudgetItem)
+            .where(BudgetItem.budget_id.in_(budget_ids))
+            .values(
+                actual_amount=item_spent,
+                variance_amount=item_spent - BudgetItem.planned_amount,
+                variance_percentage=variance_percentage_expr(
+                    item_spent, BudgetItem.planned_amount
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _spent_query(budget: Any) -> Any:
+        """
+        Build a query summing the expenses a budget covers.
+
+        Args:
+            budget: Budget entity or alias whose columns bound the query
+
+        Returns:
+            Select yielding the spent amount, to be correlated by the caller
+        """
+        account = aliased(Account)
+        return (
+            select(func.coalesce(func.sum(func.abs(Transaction.amount)), 0))
+            .select_from(Transaction)
+            .outerjoin(account, account.id == Transaction.from_account_id)
+            .where(
+                Transaction.user_id == budget.user_id,
+                Transaction.transaction_type == "expense",
+                Transaction.is_deleted == False,  # noqa: E712
+                Transaction.currency == budget.currency,
+                Transaction.transaction_date >= budget.start_date,
+                Transaction.transaction_date <= budget.end_date,
+                func.coalesce(account.exclude_from_budget, False) == False,  # noqa
+            )
+        )
@@ -0,0 +1,329 @@
+"""
+Budget alert engine for the SpendAhead backend.
+
+This module evaluates budget alert thresholds for the budgets touched by a
+batch of transaction changes and emits an alert only when a budget crosses
+into a higher alert level. The last alerted level of each budget is kept on
+its row and raised in the same transaction that stores the alert, so
+crossings are deduplicated across workers and sweeps, and an alert that
+rolls back is emitted again by the next evaluation.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, cast
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import Integer, column, insert, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.ai_insight import AIInsight
+from app.models.budget import Budget
+from app.services.insight_feed import UnreadCounters
+
+logger = get_logger(__name__)
+
+# Redis set of budget IDs waiting for evaluation by the sweep
+ALERT_DIRTY_KEY = "budget_alerts:dirty"
+
+# Budgets evaluated per SPOP round trip by sweep()
+ALERT_SWEEP_BATCH_SIZE = 500
+
+# Alert levels, ordered by severity
+LEVEL_NONE = 0
+LEVEL_THRESHOLD = 1
+LEVEL_EXCEEDED = 2
+
+LEVEL_NAMES = {LEVEL_THRESHOLD: "threshold_reached", LEVEL_EXCEEDED: "over_budget"}
+
+
+@dataclass(frozen=True)
+class BudgetAlert:
+    """An alert raised when a budget crosses into a higher alert level."""
+
+    budget_id: UUID
+    user_id: UUID
+    budget_name: str
+    level: int
+    usage_percentage: Decimal
+    actual_spent: Decimal
+    total_budget: Decimal
+    currency: str
+    end_date: datetime
+
+    @property
+    def level_name(self) -> str:
+        """Get the machine-readable name of the alert level."""
+        return LEVEL_NAMES[self.level]
+
+
+def alert_level(
+    actual_spent: Decimal, total_budget: Decimal, alert_threshold: int
+) -> int:
+    """
+    Get the alert level of a budget from its stored figures.
+
+    Args:
+        actual_spent: Amount spent in the period
+        total_budget: Total budgeted amount
+        alert_threshold: Usage percentage that triggers an alert
+
+    Returns:
+        LEVEL_NONE, LEVEL_THRESHOLD or LEVEL_EXCEEDED
+    """
+    if total_budget <= 0:
+        return LEVEL_NONE
+    if actual_spent >= total_budget:
+        return LEVEL_EXCEEDED
+    if actual_spent * 100 >= total_budget * alert_threshold:
+        return LEVEL_THRESHOLD
+    return LEVEL_NONE
+
+
+class BudgetAlertService:
+    """Service evaluating budget alerts, deduplicated on the budget rows."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the alert service with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def mark_dirty(self, budget_ids: Iterable[UUID]) -> None:
+        """
+        Queue budgets for evaluation by the next sweep.
+
+        Call this after the transaction that changed the budgets commits,
+        so the sweep never reads actuals older than the event.
+
+        Args:
+            budget_ids: IDs of budgets whose actuals changed
+        """
+        members = [str(budget_id) for budget_id in budget_ids]
+        if members:
+            await self.redis.sadd(ALERT_DIRTY_KEY, *members)
+
+    async def evaluate(self, budget_ids: Iterable[UUID]) -> List[BudgetAlert]:
+        """
+        Evaluate budgets and emit alerts for upward threshold crossings.
+
+        Budgets that dropped below a level (refunds, edits) have their
+        dedupe state lowered so a later crossing alerts again. The alerts
+        are inserted but not committed; the caller commits them together
+        with the new levels.
+
+        Args:
+            budget_ids: IDs of budgets to evaluate
+
+        Returns:
+            Alerts emitted by this evaluation
+        """
+        ids = list(dict.fromkeys(budget_ids))
+        if not ids:
+            return []
+
+        result = await self.db.execute(
+            select(
+                Budget.id,
+                Budget.user_id,
+                Budget.name,
+                Budget.total_budget,
+                Budget.actual_spent,
+                Budget.alert_threshold,
+                Budget.currency,
+                Budget.end_date,
+            ).where(
+                Budget.id.in_(ids),
+                Budget.alert_enabled == True,  # noqa: E712
+                Budget.is_active == True,  # noqa: E712
+                Budget.is_deleted == False,  # noqa: E712
+                Budget.is_template == False,  # noqa: E712
+            )
+        )
+        rows = {row.id: row for row in result}
+
+        levels: Dict[UUID, int] = {}
+        for budget_id in ids:
+            row = rows.get(budget_id)
+            levels[budget_id] = (
+                alert_level(row.actual_spent, row.total_budget, row.alert_threshold)
+                if row is not None
+                else LEVEL_NONE
+            )
+        crossed = await self._record_levels(levels)
+
+        alerts = []
+        for budget_id in ids:
+            if budget_id not in crossed:
+                continue
+            row = rows[budget_id]
+            alerts.append(
+                BudgetAlert(
+                    budget_id=budget_id,
+                    user_id=row.user_id,
+                    budget_name=row.name,
+                    level=levels[budget_id],
+                    usage_percentage=(
+                        row.actual_spent * 100 / row.total_budget
+                    ).quantize(Decimal("0.01")),
+                    actual_spent=row.actual_spent,
+                    total_budget=row.total_budget,
+                    currency=row.currency,
+                    end_date=row.end_date,
+                )
+            )
+
+        await self._persist(alerts)
+        return alerts
+
+    async def sweep(self, batch_size: int = ALERT_SWEEP_BATCH_SIZE) -> int:
+        """
+        Drain the dirty set, evaluating queued budgets in batches.
+
+        Each batch is committed before the next is popped, and its users'
+        unread counters are raised only once it is. Budgets popped from a
+        failed batch are returned to the set so the next sweep retries them.
+
+        Args:
+            batch_size: Budgets popped and evaluated per round trip
+
+        Returns:
+            Number of alerts emitted
+        """
+        emitted = 0
+        while True:
+            members = cast(
+                Optional[List[str]], await self.redis.spop(ALERT_DIRTY_KEY, batch_size)
+            )
+            if not members:
+                break
+            try:
+                alerts = await self.evaluate(UUID(member) for member in members)
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                await self.redis.sadd(ALERT_DIRTY_KEY, *members)
+                raise
+            await UnreadCounters(self.redis).adjust(
+                Counter(alert.user_id for alert in alerts)
+            )
+            emitted += len(alerts)
+
+        if emitted:
+            logger.info("Budget alerts emitted", alerts=emitted)
+        return emitted
+
+    async def mark_current_dirty(self, as_of: Optional[datetime] = None) -> int:
+        """
+        Queue every alertable budget whose period covers a moment.
+
+        Used for periodic reconciliation; reads only the partial
+        ``ix_budgets_alertable`` index range of current budgets.
+
+        Args:
+            as_of: Moment the budget periods must cover (defaults to now)
+
+        Returns:
+            Number of budgets queued
+        """
+        as_of = as_of or datetime.now(timezone.utc)
+        stream = await self.db.stream_scalars(
+            select(Budget.id)
+            .where(
+                Budget.alert_enabled == True,  # noqa: E712
+                Budget.is_active == True,  # noqa: E712
+                Budget.is_deleted == False,  # noqa: E712
+                Budget.is_template == False,  # noqa: E712
+                Budget.end_date >= as_of,
+                Budget.start_date <= as_of,
+            )
+            .execution_options(yield_per=ALERT_SWEEP_BATCH_SIZE)
+        )
+
+        queued = 0
+        async for partition in stream.partitions():
+            await self.mark_dirty(partition)
+            queued += len(partition)
+        return queued
+
+    async def _record_levels(self, levels: Dict[UUID, int]) -> Set[UUID]:
+        """
+        Store the alert level of each budget and get those that rose.
+
+        The conditional UPDATEs lock the changed budget rows until the
+        caller's transaction ends: a concurrent evaluation of the same
+        budget waits, then finds the level already raised, or raises it
+        itself if the first one rolled back.
+
+        Args:
+            levels: Current alert level of each budget
+
+        Returns:
+            IDs of the budgets whose level rose
+        """
+        current = (
+            values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("level", Integer),
+                name="current_levels",
+            )
+            .data(list(levels.items()))
+            .alias("current_levels")
+        )
+        raised = await self.db.execute(
+            update(Budget)
+            .where(Budget.id == current.c.id, Budget.alert_level < current.c.level)
+            .values(alert_level=current.c.level)
+            .returning(Budget.id)
+        )
+        crossed = set(raised.scalars().all())
+        await self.db.execute(
+            update(Budget)
+            .where(Budget.id == current.c.id, Budget.alert_level > current.c.level)
+            .values(alert_level=current.c.level)
+        )
+        return crossed
+
+    async def _persist(self, alerts: List[BudgetAlert]) -> None:
+        """Store emitted alerts as alert insights in one INSERT."""
+        if not alerts:
+            return
+
+        await self.db.execute(
+            insert(AIInsight).values(
+                [
+                    {
+                        "user_id": alert.user_id,
+                        "title": (
+                            f"Budget exceeded: {alert.budget_name}"
+                            if alert.level == LEVEL_EXCEEDED
+                            else f"Budget alert: {alert.budget_name}"
+                        ),
+                        "description": (
+                            f"You have spent {alert.actual_spent} {alert.currency} "
+                            f"of your {alert.total_budget} {alert.currency} budget "
+                            f"({alert.usage_percentage}%)."
+                        ),
+                        "insight_type": "budget_alert",
+                        "category": "alert",
+                        "content": {
+                            "budget_id": str(alert.budget_id),
+                            "level": alert.level_name,
+                            "usage_percentage": str(alert.usage_percentage),
+                            "actual_spent": str(alert.actual_spent),
+                            "total_budget": str(alert.total_budget),
+                            "currency": alert.currency,
+                        },
+                        "priority": (
+                            "critical" if alert.level == LEVEL_EXCEEDED else "high"
+                        ),
+                        "expires_at": alert.end_date,
+                    }
+                    for alert in alerts
+                ]
+            )
+        )
@@ -0,0 +1,298 @@
+"""
+Budget rollover processor for the SpendAhead backend.
+
+This module creates the next-period budget and budget items for every
+monthly and yearly budget whose period has ended, carrying unused amounts
+forward when rollover is enabled. Budgets are rolled in chunks with
+set-based ``INSERT ... SELECT`` statements, and the unique
+``rolled_over_from_id`` column makes re-runs idempotent. A budget whose
+job was missed for several periods is rolled one period per pass until
+its latest successor covers the run.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Interval,
+    case,
+    exists,
+    false,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.logging import get_logger
+from app.models.budget import Budget, BudgetItem
+from app.services.budget_actuals import BudgetActualsEngine
+
+logger = get_logger(__name__)
+
+# Budgets rolled over per chunk; each chunk commits on its own
+ROLLOVER_CHUNK_SIZE = 5000
+
+# Length of each period type that has a well-defined next period
+PERIOD_STEPS = {"monthly": "1 month", "yearly": "1 year"}
+
+
+def _period_step(period_type: str) -> Any:
+    """Get the SQL interval separating consecutive periods of a type."""
+    return literal_column(f"interval '{PERIOD_STEPS[period_type]}'", Interval)
+
+
+def next_period_bounds(budget: Any, step: Any) -> Tuple[Any, Any]:
+    """
+    Build SQL expressions for the start and end of a budget's next period.
+
+    The gap between the end of a period and the start of the following one
+    (one second, one day, ...) is preserved, so a period ending on the last
+    instant of January ends on the last instant of February next.
+
+    Args:
+        budget: Budget entity or alias
+        step: SQL interval between periods
+
+    Returns:
+        (next_start, next_end) expressions
+    """
+    next_start = budget.start_date + step
+    next_end = (next_start + step) - (next_start - budget.end_date)
+    return next_start, next_end
+
+
+class BudgetRolloverService:
+    """Service rolling ended budgets into their next period."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the rollover service with a database session."""
+        self.db = db
+
+    async def roll_over(
+        self,
+        as_of: Optional[datetime] = None,
+        chunk_size: int = ROLLOVER_CHUNK_SIZE,
+    ) -> int:
+        """
+        Roll every ended monthly and yearly budget into its next period.
+
+        A budget is eligible when its period ended before ``as_of`` and it
+        has no successor. Successors whose period has ended as well are
+        rolled by the next pass over the period type, so budgets missed
+        for several periods get one budget per missed period. Each chunk
+        is committed separately, so an interrupted run resumes where it
+        stopped and a repeated run creates nothing.
+
+        Args:
+            as_of: Moment the next periods must cover (defaults to now)
+            chunk_size: Budgets rolled over per chunk
+
+        Returns:
+            Number of budgets created
+        """
+        as_of = as_of or datetime.now(timezone.utc)
+        created = 0
+
+        for period_type in PERIOD_STEPS:
+            while True:
+                rolled = await self._roll_pass(period_type, as_of, chunk_size)
+                created += rolled
+                if not rolled:
+                    break
+
+        logger.info("Budgets rolled over", as_of=as_of, created=created)
+        return created
+
+    async def _roll_pass(
+        self, period_type: str, as_of: datetime, chunk_size: int
+    ) -> int:
+        """
+        Roll every eligible budget of a period type over by one period.
+
+        Args:
+            period_type: Period type to roll over
+            as_of: Moment the next periods must cover
+            chunk_size: Budgets rolled over per chunk
+
+        Returns:
+            Number of budgets created
+        """
+        created = 0
+        cursor: Optional[Tuple[datetime, UUID]] = None
+        while True:
+            chunk = await self._eligible_chunk(period_type, as_of, cursor, chunk_size)
+            if not chunk:
+                return created
+            cursor = chunk[-1]
+            created += await self._roll_chunk(
+                [budget_id for _end_date, budget_id in chunk], period_type
+            )
+            await self.db.commit()
+
+    async def _eligible_chunk(
+        self,
+        period_type: str,
+        as_of: datetime,
+        cursor: Optional[Tuple[datetime, UUID]],
+        chunk_size: int,
+    ) -> List[Tuple[datetime, UUID]]:
+        """
+        Get the next chunk of budgets to roll over, keyset-paged.
+
+        Reads the partial ``ix_budgets_rollover`` index in (end_date, id)
+        order up to ``as_of``. Periods are not bounded from below, so a
+        budget is rolled however long the job was down; budgets already
+        rolled cost one probe of the unique ``rolled_over_from_id`` index.
+
+        Args:
+            period_type: Period type to roll over
+            as_of: Moment the next periods must cover
+            cursor: (end_date, id) of the last budget of the previous chunk
+            chunk_size: Maximum number of budgets
+
+        Returns:
+            (end_date, id) pairs in index order
+        """
+        successor = aliased(Budget)
+
+        query = (
+            select(Budget.end_date, Budget.id)
+            .where(
+                Budget.period_type == period_type,
+                Budget.is_deleted == False,  # noqa: E712
+                Budget.is_template == False,  # noqa: E712
+                Budget.is_active == True,  # noqa: E712
+                Budget.end_date < as_of,
+                ~exists().where(successor.rolled_over_from_id == Budget.id),
+            )
+            .order_by(Budget.end_date, Budget.id)
+            .limit(chunk_size)
+        )
+        if cursor is not None:
+            query = query.where(tuple_(Budget.end_date, Budget.id) > tuple_(*cursor))
+
+        result = await self.db.execute(query)
+        return [(row.end_date, row.id) for row in result]
+
+    async def _roll_chunk(self, budget_ids: Sequence[UUID], period_type: str) -> int:
+        """
+        Create the successors of a chunk of budgets and their items.
+
+        Args:
+            budget_ids: IDs of the budgets to roll over
+            period_type: Period type shared by the budgets
+
+        Returns:
+            Number of budgets created
+        """
+        step = _period_step(period_type)
+        next_start, next_end = next_period_bounds(Budget, step)
+        carried = case(
+            (
+                Budget.rollover_enabled == True,  # noqa: E712
+                func.greatest(Budget.total_budget - Budget.actual_spent, 0),
+            ),
+            else_=0,
+        )
+        base_amount = Budget.total_budget - Budget.rollover_amount
+
+        budgets_stmt = (
+            insert(Budget)
+            .from_select(
+                [
+                    "user_id",
+                    "name",
+                    "description",
+                    "period_type",
+                    "start_date",
+                    "end_date",
+                    "total_budget",
+                    "currency",
+                    "is_active",
+                    "is_template",
+                    "is_deleted",
+                    "rollover_enabled",
+                    "rollover_amount",
+                    "rolled_over_from_id",
+                    "alert_threshold",
+                    "alert_enabled",
+                    "ai_generated",
+                    "ai_suggestions",
+                    "actual_spent",
+                    "variance_amount",
+                    "variance_percentage",
+                ],
+                select(
+                    Budget.user_id,
+                    Budget.name,
+                    Budget.description,
+                    Budget.period_type,
+                    next_start,
+                    next_end,
+                    base_amount + carried,
+                    Budget.currency,
+                    true(),
+                    false(),
+                    false(),
+                    Budget.rollover_enabled,
+                    carried,
+                    Budget.id,
+                    Budget.alert_threshold,
+                    Budget.alert_enabled,
+                    Budget.ai_generated,
+                    Budget.ai_suggestions,
+                    literal(0),
+                    literal(0),
+                    literal(0),
+                ).where(Budget.id.in_(budget_ids)),
+            )
+            .on_conflict_do_nothing(index_elements=[Budget.rolled_over_from_id])
+            .returning(Budget.id)
+        )
+        result = await self.db.execute(budgets_stmt)
+        new_ids = list(result.scalars().all())
+        if not new_ids:
+            return 0
+
+        successor = aliased(Budget)
+        await self.db.execute(
+            insert(BudgetItem).from_select(
+                [
+                    "budget_id",
+                    "category_id",
+                    "planned_amount",
+                    "actual_amount",
+                    "is_fixed",
+                    "priority",
+                    "variance_amount",
+                    "variance_percentage",
+                    "ai_suggested_amount",
+                    "ai_confidence_score",
+                ],
+                select(
+                    successor.id,
+                    BudgetItem.category_id,
+                    BudgetItem.planned_amount,
+                    literal(0),
+                    BudgetItem.is_fixed,
+                    BudgetItem.priority,
+                    literal(0),
+                    literal(0),
+                    BudgetItem.ai_suggested_amount,
+                    BudgetItem.ai_confidence_score,
+                )
+                .join(successor, successor.rolled_over_from_id == BudgetItem.budget_id)
+                .where(successor.id.in_(new_ids)),
+            )
+        )
+
+        # Count transactions already dated inside the new periods
+        await BudgetActualsEngine(self.db).recompute_many(new_ids)
+        return len(new_ids)
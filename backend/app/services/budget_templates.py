@@ -0,0 +1,223 @@
+"""
+Budget template service for the SpendAhead backend.
+
+This module instantiates budget templates into concrete budgets for one or
+many periods and one or many users. All budgets and items of a request are
+written with one multi-row INSERT per table, and template categories are
+remapped by name for users whose category IDs differ from the template's.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.logging import get_logger
+from app.models.budget import Budget, BudgetItem
+from app.models.category import Category
+from app.models.user import User
+from app.services.budget_actuals import BudgetActualsEngine
+
+logger = get_logger(__name__)
+
+# Upper bound on budgets created by a single instantiation
+MAX_TEMPLATE_INSTANCES = 10000
+
+
+@dataclass
+class TemplateInstantiation:
+    """Outcome of instantiating a budget template."""
+
+    budget_ids: List[UUID] = field(default_factory=list)
+    items_created: int = 0
+    items_skipped: int = 0
+
+
+def category_key(name: str) -> str:
+    """Normalize a category name for cross-user matching."""
+    return name.strip().lower()
+
+
+class BudgetTemplateService:
+    """Service for cloning budget templates into concrete budgets."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the template service with a database session."""
+        self.db = db
+
+    async def instantiate(
+        self,
+        template_id: UUID,
+        periods: Sequence[Tuple[datetime, datetime]],
+        user_ids: Sequence[UUID],
+        owner_id: Optional[UUID] = None,
+    ) -> TemplateInstantiation:
+        """
+        Create one budget per (user, period) from a template.
+
+        Items whose category has no same-named category for a target user
+        are skipped for that user and counted in ``items_skipped``.
+
+        Args:
+            template_id: ID of the template budget
+            periods: (start_date, end_date) of each period to instantiate
+            user_ids: Users to create budgets for
+            owner_id: If given, the template must belong to this user
+
+        Returns:
+            IDs of the created budgets and item counts
+
+        Raises:
+            ValueError: If the template does not exist or the request is invalid
+        """
+        if not periods or not user_ids:
+            raise ValueError("At least one period and one user are required")
+        if len(periods) * len(user_ids) > MAX_TEMPLATE_INSTANCES:
+            raise ValueError(
+                f"Cannot create more than {MAX_TEMPLATE_INSTANCES} budgets at once"
+            )
+        for start_date, end_date in periods:
+            if start_date >= end_date:
+                raise ValueError("Period start_date must be before end_date")
+
+        result = await self.db.execute(
+            select(Budget)
+            .options(selectinload(Budget.budget_items))
+            .where(
+                Budget.id == template_id,
+                Budget.is_template == True,  # noqa: E712
+                Budget.is_deleted == False,  # noqa: E712
+            )
+        )
+        template = result.scalar_one_or_none()
+        if template is None or (owner_id is not None and template.user_id != owner_id):
+            raise ValueError("Budget template not found")
+
+        user_ids = list(dict.fromkeys(user_ids))
+        result = await self.db.execute(
+            select(func.count(User.id)).where(
+                User.id.in_(user_ids), User.is_active == True  # noqa: E712
+            )
+        )
+        if result.scalar_one() != len(user_ids):
+            raise ValueError("One or more users do not exist or are inactive")
+
+        category_maps = await self._category_maps(template, user_ids)
+
+        outcome = TemplateInstantiation()
+        budget_rows: List[dict] = []
+        item_rows: List[dict] = []
+        for user_id in user_ids:
+            categories = category_maps[user_id]
+            for start_date, end_date in periods:
+                budget_id = uuid4()
+                outcome.budget_ids.append(budget_id)
+                budget_rows.append(
+                    {
+                        "id": budget_id,
+                        "user_id": user_id,
+                        "name": template.name,
+                        "description": template.description,
+                        "period_type": template.period_type,
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "total_budget": template.total_budget,
+                        "currency": template.currency,
+                        "is_template": False,
+                        "rollover_enabled": template.rollover_enabled,
+                        "alert_threshold": template.alert_threshold,
+                        "alert_enabled": template.alert_enabled,
+                    }
+                )
+                for item in template.budget_items:
+                    category_id = categories.get(item.category_id)
+                    if category_id is None:
+                        outcome.items_skipped += 1
+                        continue
+                    item_rows.append(
+                        {
+                            "budget_id": budget_id,
+                            "category_id": category_id,
+                            "planned_amount": item.planned_amount,
+                            "is_fixed": item.is_fixed,
+                            "priority": item.priority,
+                        }
+                    )
+
+        # Executed as batched multi-row VALUES by SQLAlchemy's insertmanyvalues
+        await self.db.execute(insert(Budget), budget_rows)
+        if item_rows:
+            await self.db.execute(insert(BudgetItem), item_rows)
+        outcome.items_created = len(item_rows)
+
+        # Periods may already contain transactions
+        await BudgetActualsEngine(self.db).recompute_many(outcome.budget_ids)
+        await self.db.commit()
+
+        logger.info(
+            "Budget template instantiated",
+            template_id=template_id,
+            budgets=len(outcome.budget_ids),
+            items=outcome.items_created,
+            skipped_items=outcome.items_skipped,
+        )
+        return outcome
+
+    async def _category_maps(
+        self, template: Budget, user_ids: Sequence[UUID]
+    ) -> Dict[UUID, Dict[UUID, UUID]]:
+        """
+        Map template category IDs to each target user's category IDs.
+
+        The template owner keeps the template's categories; other users are
+        matched on case-insensitive category name in a single query.
+
+        Args:
+            template: Template budget with its items loaded
+            user_ids: Target users
+
+        Returns:
+            Per-user mapping of template category ID to the user's category ID
+        """
+        template_category_ids = {item.category_id for item in template.budget_items}
+        maps: Dict[UUID, Dict[UUID, UUID]] = {
+            user_id: {} for user_id in user_ids if user_id != template.user_id
+        }
+        if template.user_id in user_ids:
+            maps[template.user_id] = {
+                category_id: category_id for category_id in template_category_ids
+            }
+        if not template_category_ids or not any(
+            user_id != template.user_id for user_id in user_ids
+        ):
+            return maps
+
+        result = await self.db.execute(
+            select(Category.id, Category.name).where(
+                Category.id.in_(template_category_ids)
+            )
+        )
+        names = {row.id: category_key(row.name) for row in result}
+        by_name: Dict[str, List[UUID]] = {}
+        for category_id, name in names.items():
+            by_name.setdefault(name, []).append(category_id)
+
+        others = [user_id for user_id in maps if user_id != template.user_id]
+        result = await self.db.execute(
+            select(Category.user_id, Category.id, Category.name)
+            .where(
+                Category.user_id.in_(others),
+                func.lower(func.trim(Category.name)).in_(list(by_name)),
+                Category.is_deleted == False,  # noqa: E712
+                Category.is_active == True,  # noqa: E712
+            )
+            .order_by(Category.created_at)
+        )
+        for row in result:
+            for template_category_id in by_name.get(category_key(row.name), []):
+                maps[row.user_id].setdefault(template_category_id, row.id)
+        return maps
@@ -0,0 +1,495 @@
+"""
+Categorization cache for the SpendAhead backend.
+
+This module memoizes categorization answers so recurring merchants are
+sent to a model only once. Descriptions are normalized (store numbers,
+dates, card suffixes and processor noise removed) and combined with an
+amount bucket and the transaction type into a cache key. Answers live in
+Postgres, per user and globally, with Redis in front of them; hits and
+model usage are counted in Redis so token savings can be reported next to
+tokens spent.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, cast
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import delete, func, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.categorization_cache import CategorizationCacheEntry
+from app.services.category_tree import CategoryTree
+
+logger = get_logger(__name__)
+
+# Redis key of one cached answer; scope is a user ID or "global"
+CACHE_ENTRY_KEY = "categorization_cache:{scope}:{digest}"
+
+# Redis hash of hit, miss and token counters
+CACHE_STATS_KEY = "categorization_cache:stats"
+
+# Lifetime of cached answers and of cached misses in Redis, in seconds
+CACHE_ENTRY_TTL = 86400
+CACHE_MISS_TTL = 600
+
+# Redis value marking a key known to have no entry
+_MISS = "-"
+
+# Normalization rules, applied in order to lower-cased descriptions
+_NORMALIZATION_RULES = [
+    # Dates: 2024-03-05, 03/05, 03/05/24, 05.03.2024
+    re.compile(r"\b\d{4}-\d{1,2}-\d{1,2}\b"),
+    re.compile(r"\b\d{1,2}[/.]\d{1,2}(?:[/.]\d{2,4})?\b"),
+    # Card suffixes: xxxx1234, ****1234, card 1234, ending in 1234
+    re.compile(r"[x*]{2,}\d{2,4}\b"),
+    re.compile(r"\b(?:card|acct|ending(?: in)?)\s*#?\s*\d{2,}\b"),
+    # Store numbers: #1234, store 123, no. 45
+    re.compile(r"#\s*\d+"),
+    re.compile(r"\b(?:store|str|no|location|loc)\.?\s*\d+\b"),
+    # Any other number of three or more digits (terminal, reference, phone)
+    re.compile(r"\b\d{3,}\b"),
+    # Alphanumeric reference codes such as "2k3l45"
+    re.compile(r"\b(?=[a-z]*\d[a-z]*\d)[a-z0-9]{5,}\b"),
+    # Payment processor prefixes and point-of-sale noise
+    re.compile(r"^(?:sq|tst|pp|sp|pos|ach)\s*\*\s*"),
+    re.compile(r"\b(?:pos|debit|checkcard|purchase|recurring|payment|web|online)\b"),
+]
+_PUNCTUATION = re.compile(r"[^a-z0-9&' ]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_description(description: str) -> str:
+    """
+    Reduce a transaction description to its merchant-identifying part.
+
+    "STARBUCKS #1234 SEATTLE WA" and "Starbucks 03/05 #5678 Seattle WA"
+    both normalize to "starbucks seattle wa".
+
+    Args:
+        description: Raw transaction description
+
+    Returns:
+        Normalized description (empty if nothing identifying remains)
+    """
+    text = description.lower()
+    for rule in _NORMALIZATION_RULES:
+        text = rule.sub(" ", text)
+    text = _PUNCTUATION.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()[:255]
+
+
+def amount_bucket(amount: Decimal) -> int:
+    """
+    Bucket an amount by order of magnitude (powers of two).
+
+    Args:
+        amount: Transaction amount
+
+    Returns:
+        0 for amounts below 1, otherwise the bit length of the whole part
+    """
+    return int(abs(amount)).bit_length()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """Cache key of a transaction."""
+
+    normalized_description: str
+    amount_bucket: int
+    transaction_type: str
+
+    @classmethod
+    def build(
+        cls, description: str, amount: Decimal, transaction_type: str
+    ) -> "CacheKey":
+        """Build the cache key of a transaction."""
+        return cls(
+            normalize_description(description),
+            amount_bucket(amount),
+            transaction_type,
+        )
+
+    def redis_key(self, scope: Any) -> str:
+        """Get the Redis key of this cache key for a user ID or "global"."""
+        digest = hashlib.sha1(
+            f"{self.normalized_description}|{self.amount_bucket}|"
+            f"{self.transaction_type}".encode()
+        ).hexdigest()
+        return CACHE_ENTRY_KEY.format(scope=scope, digest=digest)
+
+
+@dataclass(frozen=True)
+class CachedCategory:
+    """A cached answer resolved to one of the user's categories."""
+
+    category_id: UUID
+    confidence: Decimal
+    is_global: bool
+
+
+def _dump_entry(entry: Any) -> str:
+    """Serialize a cache row for Redis."""
+    return json.dumps(
+        {
+            "category_id": str(entry.category_id) if entry.category_id else None,
+            "category_name": entry.category_name,
+            "confidence": str(entry.confidence),
+        }
+    )
+
+
+class CategorizationCacheService:
+    """Service memoizing categorization answers in Postgres and Redis."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the cache service with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def lookup(
+        self, user_id: UUID, keys: Iterable[CacheKey], tree: CategoryTree
+    ) -> Dict[CacheKey, CachedCategory]:
+        """
+        Look up cached answers for a batch of keys.
+
+        Per-user entries win over global ones. Global entries are resolved
+        to the user's active category of the same name and type. Costs one
+        Redis MGET, plus one database query for keys Redis has not seen.
+
+        Args:
+            user_id: User ID
+            keys: Cache keys to look up
+            tree: The user's category tree snapshot
+
+        Returns:
+            Mapping of the keys that hit to their resolved category
+        """
+        keys = [key for key in dict.fromkeys(keys) if key.normalized_description]
+        if not keys:
+            return {}
+
+        # The client decodes responses, so values come back as strings
+        values = cast(
+            List[Optional[str]],
+            await self.redis.mget(
+                [key.redis_key(user_id) for key in keys]
+                + [key.redis_key("global") for key in keys]
+            ),
+        )
+        user_values = dict(zip(keys, values[: len(keys)]))
+        global_values = dict(zip(keys, values[len(keys) :]))
+
+        unknown = [
+            key
+            for key in keys
+            if user_values[key] is None
+            or (user_values[key] == _MISS and global_values[key] is None)
+        ]
+        if unknown:
+            loaded = await self._load(user_id, unknown)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key in unknown:
+                    for scope, values_by_key in (
+                        (user_id, user_values),
+                        ("global", global_values),
+                    ):
+                        entry = loaded.get((scope, key))
+                        value = _dump_entry(entry) if entry else _MISS
+                        values_by_key[key] = value
+                        pipe.set(
+                            key.redis_key(scope),
+                            value,
+                            ex=CACHE_ENTRY_TTL if entry else CACHE_MISS_TTL,
+                        )
+                await pipe.execute()
+
+        hits: Dict[CacheKey, CachedCategory] = {}
+        user_hits = global_hits = 0
+        for key in keys:
+            found = self._resolve(user_values[key], key, tree, is_global=False)
+            if found is None:
+                found = self._resolve(global_values[key], key, tree, is_global=True)
+            if found is None:
+                continue
+            hits[key] = found
+            if found.is_global:
+                global_hits += 1
+            else:
+                user_hits += 1
+
+        await self._count(
+            user_hits=user_hits,
+            global_hits=global_hits,
+            misses=len(keys) - len(hits),
+        )
+        return hits
+
+    async def store(
+        self,
+        user_id: UUID,
+        answers: Sequence[Tuple[CacheKey, UUID, Decimal]],
+        tree: CategoryTree,
+    ) -> List[str]:
+        """
+        Remember model answers, per user and globally.
+
+        Entries confirmed by the user are never overwritten by a model.
+        Written in the caller's transaction; the caller commits, then passes
+        the returned keys to invalidate().
+
+        Args:
+            user_id: User ID
+            answers: (cache key, category ID, confidence) of confident answers
+            tree: The user's category tree snapshot
+
+        Returns:
+            Redis keys made stale by the write
+        """
+        rows: Dict[Tuple[Optional[UUID], CacheKey], dict] = {}
+        for key, category_id, confidence in answers:
+            node = tree.get(category_id)
+            if node is None or not key.normalized_description:
+                continue
+            for scope in (user_id, None):
+                rows[(scope, key)] = {
+                    "user_id": scope,
+                    "normalized_description": key.normalized_description,
+                    "amount_bucket": key.amount_bucket,
+                    "transaction_type": key.transaction_type,
+                    "category_id": category_id if scope else None,
+                    "category_name": node.name,
+                    "confidence": confidence,
+                    "source": "model",
+                }
+        if not rows:
+            return []
+
+        await self._upsert(list(rows.values()))
+        return [key.redis_key(scope or "global") for scope, key in rows]
+
+    async def record_correction(
+        self,
+        user_id: UUID,
+        description: str,
+        amount: Decimal,
+        transaction_type: str,
+        category_id: UUID,
+        category_name: str,
+    ) -> List[str]:
+        """
+        Learn from a user changing a transaction's category.
+
+        Pins the user's entry to the chosen category and drops a global
+        entry that disagrees with it, so the next lookup of the key anywhere
+        goes back to the database. Call from write paths after the change is
+        flushed; the caller commits, then passes the returned keys to
+        invalidate().
+
+        Args:
+            user_id: User ID
+            description: Transaction description
+            amount: Transaction amount
+            transaction_type: Transaction type
+            category_id: Category chosen by the user
+            category_name: Name of that category
+
+        Returns:
+            Redis keys made stale by the write
+        """
+        key = CacheKey.build(description, amount, transaction_type)
+        if not key.normalized_description:
+            return []
+
+        await self._upsert(
+            [
+                {
+                    "user_id": user_id,
+                    "normalized_description": key.normalized_description,
+                    "amount_bucket": key.amount_bucket,
+                    "transaction_type": key.transaction_type,
+                    "category_id": category_id,
+                    "category_name": category_name,
+                    "confidence": Decimal("1.00"),
+                    "source": "user",
+                }
+            ],
+            overwrite_user_entries=True,
+        )
+        await self.db.execute(
+            delete(CategorizationCacheEntry).where(
+                CategorizationCacheEntry.user_id.is_(None),
+                CategorizationCacheEntry.normalized_description
+                == key.normalized_description,
+                CategorizationCacheEntry.amount_bucket == key.amount_bucket,
+                CategorizationCacheEntry.transaction_type == key.transaction_type,
+                CategorizationCacheEntry.category_name != category_name,
+            )
+        )
+        logger.debug(
+            "Categorization cache corrected",
+            user_id=user_id,
+            description=key.normalized_description,
+        )
+        return [key.redis_key(user_id), key.redis_key("global")]
+
+    async def invalidate(self, redis_keys: Sequence[str]) -> None:
+        """
+        Drop Redis entries made stale by a committed write.
+
+        Deleting them only after the commit keeps a concurrent lookup from
+        caching the old row again between the delete and the commit.
+
+        Args:
+            redis_keys: Keys returned by store() or record_correction()
+        """
+        if redis_keys:
+            await self.redis.delete(*redis_keys)
+
+    async def record_model_usage(self, requests: int, tokens: int) -> None:
+        """
+        Count transactions sent to a model and the tokens they used.
+
+        Args:
+            requests: Transactions categorized by the model
+            tokens: Tokens the model calls consumed
+        """
+        await self._count(model_requests=requests, tokens_used=tokens)
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get cache effectiveness counters.
+
+        Token savings are estimated from the average tokens the model used
+        per transaction.
+
+        Returns:
+            Hits, misses, hit rate, tokens used and estimated tokens saved
+        """
+        raw = await self.redis.hgetall(CACHE_STATS_KEY)
+        counters = {
+            field: int(raw.get(field, 0))
+            for field in (
+                "user_hits",
+                "global_hits",
+                "misses",
+                "model_requests",
+                "tokens_used",
+            )
+        }
+        hits = counters["user_hits"] + counters["global_hits"]
+        lookups = hits + counters["misses"]
+        per_request = (
+            counters["tokens_used"] / counters["model_requests"]
+            if counters["model_requests"]
+            else 0
+        )
+        return {
+            "user_hits": counters["user_hits"],
+            "global_hits": counters["global_hits"],
+            "misses": counters["misses"],
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "model_requests": counters["model_requests"],
+            "ai_tokens_used": counters["tokens_used"],
+            "ai_tokens_saved": round(hits * per_request),
+        }
+
+    async def _load(
+        self, user_id: UUID, keys: List[CacheKey]
+    ) -> Dict[Tuple[Any, CacheKey], CategorizationCacheEntry]:
+        """Load the user and global entries of some keys in one query."""
+        entry = CategorizationCacheEntry
+        result = await self.db.execute(
+            select(entry).where(
+                or_(entry.user_id == user_id, entry.user_id.is_(None)),
+                tuple_(
+                    entry.normalized_description,
+                    entry.amount_bucket,
+                    entry.transaction_type,
+                ).in_(
+                    [
+                        (
+                            key.normalized_description,
+                            key.amount_bucket,
+                            key.transaction_type,
+                        )
+                        for key in keys
+                    ]
+                ),
+            )
+        )
+        return {
+            (
+                row.user_id or "global",
+                CacheKey(
+                    row.normalized_description,
+                    row.amount_bucket,
+                    row.transaction_type,
+                ),
+            ): row
+            for row in result.scalars()
+        }
+
+    @staticmethod
+    def _resolve(
+        value: Optional[str], key: CacheKey, tree: CategoryTree, is_global: bool
+    ) -> Optional[CachedCategory]:
+        """Resolve a cached Redis value to one of the user's categories."""
+        if not value or value == _MISS:
+            return None
+        payload = json.loads(value)
+        if payload["category_id"]:
+            node = tree.get(UUID(payload["category_id"]))
+        else:
+            node = tree.find_by_name(payload["category_name"])
+        if (
+            node is None
+            or not node.is_active
+            or node.category_type != key.transaction_type
+        ):
+            return None
+        return CachedCategory(
+            category_id=node.id,
+            confidence=Decimal(payload["confidence"]),
+            is_global=is_global,
+        )
+
+    async def _upsert(
+        self, rows: List[dict], overwrite_user_entries: bool = False
+    ) -> None:
+        """Insert or refresh cache rows on their cache key."""
+        stmt = insert(CategorizationCacheEntry).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                CategorizationCacheEntry.user_id,
+                CategorizationCacheEntry.normalized_description,
+                CategorizationCacheEntry.amount_bucket,
+                CategorizationCacheEntry.transaction_type,
+            ],
+            set_={
+                "category_id": stmt.excluded.category_id,
+                "category_name": stmt.excluded.category_name,
+                "confidence": stmt.excluded.confidence,
+                "source": stmt.excluded.source,
+                "updated_at": func.now(),
+            },
+            where=(
+                None
+                if overwrite_user_entries
+                else CategorizationCacheEntry.source != "user"
+            ),
+        )
+        await self.db.execute(stmt)
+
+    async def _count(self, **counters: int) -> None:
+        """Add to the Redis stats counters, skipping zeros."""
+        for field, amount in counters.items():
+            if amount:
+                await self.redis.hincrby(CACHE_STATS_KEY, field, amount)
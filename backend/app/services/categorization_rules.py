@@ -0,0 +1,887 @@
+"""
+Categorization rules engine for the SpendAhead backend.
+
+This module manages user-defined categorization rules ("description
+contains X and amount >= Y on account Z -> category C, add tag T") and
+evaluates them without testing every rule against every transaction.
+Active rules are compiled into a decision index: rules are bucketed by
+account and transaction type, description phrases of each bucket share one
+word-level Aho-Corasick automaton, and phrase-less rules are kept sorted by
+their lower amount bound. New transactions are matched against the index
+in Python; retroactive application to history translates the rules into a
+single set-based UPDATE over ``transactions``.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from itertools import product
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import (
+    and_,
+    case,
+    false,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+    true,
+    type_coerce,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.account import Account
+from app.models.categorization_rule import CategorizationRule
+from app.models.transaction import Transaction
+from app.services.budget_alerts import BudgetAlertService
+from app.services.category_tree import CategoryTree, category_tree_cache
+from app.services.keyword_categorizer import (
+    KEYWORD_CHUNK_SIZE,
+    KeywordAutomaton,
+    tokenize,
+)
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+from app.services.transaction_pipeline import apply_transaction_changes
+
+logger = get_logger(__name__)
+
+# Redis key holding a user's rule set version
+RULES_VERSION_KEY = "categorization_rules:version:{user_id}"
+
+# Marker stored in ai_categorization_data of rule-categorized transactions
+RULE_SOURCE = "rule"
+
+# Rules a user may define
+MAX_RULES_PER_USER = 500
+
+# Number of compiled user indexes kept in each process
+RULE_CACHE_CAPACITY = 1024
+
+# Transaction types a rule may be restricted to
+RULE_TRANSACTION_TYPES = ("income", "expense", "transfer")
+
+# Lower bound used for rules without a minimum amount
+_NO_MINIMUM = Decimal("-Infinity")
+
+
+def phrase_pattern(words: Sequence[str]) -> str:
+    """
+    Build a PostgreSQL regex matching a phrase on whole words.
+
+    Matches the same descriptions as the keyword automaton does: words are
+    runs of lower-case letters and digits, separated by anything else.
+
+    Args:
+        words: Tokenized phrase
+
+    Returns:
+        Regex for ``lower(description) ~ pattern``
+    """
+    return "(^|[^a-z0-9])" + "[^a-z0-9]+".join(words) + "([^a-z0-9]|$)"
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """An active rule reduced to what evaluation needs."""
+
+    id: UUID
+    order: int
+    words: Tuple[str, ...]
+    min_amount: Optional[Decimal]
+    max_amount: Optional[Decimal]
+    account_id: Optional[UUID]
+    transaction_type: Optional[str]
+    category_id: Optional[UUID]
+    category_type: Optional[str]
+    tags: Tuple[str, ...]
+
+    def matches_amount(self, amount: Decimal) -> bool:
+        """Check if an absolute amount lies within the rule's bounds."""
+        if self.min_amount is not None and amount < self.min_amount:
+            return False
+        return self.max_amount is None or amount <= self.max_amount
+
+    def assigns_to(self, transaction_type: str) -> bool:
+        """Check if the rule's category applies to a transaction type."""
+        return self.category_id is not None and self.category_type == transaction_type
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    """What the matching rules do to one transaction."""
+
+    category_id: Optional[UUID]
+    rule_id: Optional[UUID]
+    tags: Tuple[str, ...]
+    rule_ids: Tuple[UUID, ...]
+
+
+@dataclass
+class RuleBucket:
+    """Rules sharing the same account and transaction type condition."""
+
+    automaton: Optional[KeywordAutomaton]
+    rules: Dict[UUID, CompiledRule]
+    ranged: List[CompiledRule]
+    lower_bounds: List[Decimal]
+
+    @classmethod
+    def build(cls, rules: Sequence[CompiledRule]) -> "RuleBucket":
+        """Index a bucket's rules by phrase and lower amount bound."""
+        phrases: Dict[str, List[UUID]] = {}
+        ranged: List[CompiledRule] = []
+        for rule in rules:
+            if rule.words:
+                phrases.setdefault(" ".join(rule.words), []).append(rule.id)
+            else:
+                ranged.append(rule)
+        ranged.sort(key=lambda rule: (rule.min_amount or _NO_MINIMUM, rule.order))
+        return cls(
+            automaton=KeywordAutomaton(phrases) if phrases else None,
+            rules={rule.id: rule for rule in rules},
+            ranged=ranged,
+            lower_bounds=[rule.min_amount or _NO_MINIMUM for rule in ranged],
+        )
+
+    def candidates(self, description: str, amount: Decimal) -> List[CompiledRule]:
+        """
+        Find the bucket's rules matching a description and absolute amount.
+
+        Phrase rules come from one automaton scan; phrase-less rules are cut
+        at the first lower bound above the amount before checking upper
+        bounds.
+        """
+        found: List[CompiledRule] = []
+        if self.automaton is not None:
+            for rule_id in self.automaton.scan(description):
+                rule = self.rules[rule_id]
+                if rule.matches_amount(amount):
+                    found.append(rule)
+        for rule in self.ranged[: bisect_right(self.lower_bounds, amount)]:
+            if rule.max_amount is None or amount <= rule.max_amount:
+                found.append(rule)
+        return found
+
+
+@dataclass(frozen=True)
+class RuleIndex:
+    """Compiled decision index over a user's active rules."""
+
+    user_id: UUID
+    version: Tuple[int, int]
+    rules: Tuple[CompiledRule, ...]
+    buckets: Dict[Tuple[Optional[UUID], Optional[str]], RuleBucket] = field(
+        default_factory=dict
+    )
+
+    @classmethod
+    def build(
+        cls,
+        user_id: UUID,
+        version: Tuple[int, int],
+        rules: Sequence[CategorizationRule],
+        tree: CategoryTree,
+    ) -> "RuleIndex":
+        """
+        Compile a user's rules.
+
+        Rules are ordered by priority and then creation time. Category
+        actions pointing at a missing or inactive category are dropped;
+        the rule's tags still apply.
+
+        Args:
+            user_id: User ID
+            version: (rule set version, category tree version)
+            rules: Active rules in evaluation order
+            tree: The user's category tree snapshot
+
+        Returns:
+            The compiled index
+        """
+        compiled: List[CompiledRule] = []
+        for order, rule in enumerate(rules):
+            node = tree.get(rule.category_id) if rule.category_id else None
+            if node is not None and not node.is_active:
+                node = None
+            compiled.append(
+                CompiledRule(
+                    id=rule.id,
+                    order=order,
+                    words=tuple(tokenize(rule.description_contains or "")),
+                    min_amount=rule.min_amount,
+                    max_amount=rule.max_amount,
+                    account_id=rule.account_id,
+                    transaction_type=rule.transaction_type,
+                    category_id=node.id if node else None,
+                    category_type=node.category_type if node else None,
+                    tags=tuple(rule.get_tags_list()),
+                )
+            )
+
+        grouped: Dict[Tuple[Optional[UUID], Optional[str]], List[CompiledRule]] = {}
+        for compiled_rule in compiled:
+            if compiled_rule.category_id is None and not compiled_rule.tags:
+                continue
+            key = (compiled_rule.account_id, compiled_rule.transaction_type)
+            grouped.setdefault(key, []).append(compiled_rule)
+        return cls(
+            user_id=user_id,
+            version=version,
+            rules=tuple(compiled),
+            buckets={key: RuleBucket.build(group) for key, group in grouped.items()},
+        )
+
+    def evaluate(
+        self,
+        description: str,
+        amount: Decimal,
+        transaction_type: str,
+        account_ids: Sequence[Optional[UUID]] = (),
+    ) -> Optional[RuleOutcome]:
+        """
+        Evaluate the rules against one transaction.
+
+        Only the buckets whose account and type conditions the transaction
+        satisfies are consulted. The first matching rule with an applicable
+        category assigns it; every matching rule contributes its tags.
+
+        Args:
+            description: Transaction description
+            amount: Transaction amount (compared by absolute value)
+            transaction_type: Transaction type
+            account_ids: The transaction's from and to accounts
+
+        Returns:
+            The combined outcome, or None if no rule matched
+        """
+        amount = abs(Decimal(amount))
+        accounts = {None, *(account_id for account_id in account_ids if account_id)}
+        matched: List[CompiledRule] = []
+        for key in product(accounts, (None, transaction_type)):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                matched.extend(bucket.candidates(description, amount))
+        if not matched:
+            return None
+
+        matched.sort(key=lambda rule: rule.order)
+        winner = next(
+            (rule for rule in matched if rule.assigns_to(transaction_type)), None
+        )
+        return RuleOutcome(
+            category_id=winner.category_id if winner else None,
+            rule_id=winner.id if winner else None,
+            tags=tuple(dict.fromkeys(tag for rule in matched for tag in rule.tags)),
+            rule_ids=tuple(rule.id for rule in matched),
+        )
+
+
+class RuleIndexCache:
+    """Process-local LRU of compiled rule indexes, validated against Redis."""
+
+    def __init__(self, capacity: int = RULE_CACHE_CAPACITY):
+        """Initialize an empty cache holding up to ``capacity`` indexes."""
+        self.capacity = capacity
+        self._indexes: "OrderedDict[UUID, RuleIndex]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, redis: Redis, user_id: UUID) -> RuleIndex:
+        """
+        Get the compiled rule index of a user.
+
+        The index is recompiled whenever the user's rule set version or
+        category tree version changes.
+
+        Args:
+            db: Database session
+            redis: Redis client
+            user_id: User ID
+
+        Returns:
+            The user's current rule index
+        """
+        tree = await category_tree_cache.get(db, redis, user_id)
+        rules_version = int(
+            await redis.get(RULES_VERSION_KEY.format(user_id=user_id)) or 0
+        )
+        version = (rules_version, tree.version)
+
+        index = self._indexes.get(user_id)
+        if index is None or index.version != version:
+            result = await db.execute(
+                select(CategorizationRule)
+                .where(
+                    CategorizationRule.user_id == user_id,
+                    CategorizationRule.is_active == True,  # noqa: E712
+                )
+                .order_by(CategorizationRule.priority, CategorizationRule.created_at)
+            )
+            index = RuleIndex.build(user_id, version, list(result.scalars()), tree)
+            self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.capacity:
+            self._indexes.popitem(last=False)
+        return index
+
+    async def invalidate(self, redis: Redis, user_id: UUID) -> None:
+        """
+        Invalidate a user's index in every process.
+
+        Call this after any committed write to the user's rules.
+
+        Args:
+            redis: Redis client
+            user_id: User ID
+        """
+        await redis.incr(RULES_VERSION_KEY.format(user_id=user_id))
+        self._indexes.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every locally cached index."""
+        self._indexes.clear()
+
+
+# Global rule index cache instance
+rule_index_cache = RuleIndexCache()
+
+
+@dataclass
+class RuleApplicationResult:
+    """Outcome of applying rules to transactions."""
+
+    matched: int = 0
+    categorized: int = 0
+    tagged: int = 0
+
+
+class CategorizationRuleService:
+    """Service managing and applying user categorization rules."""
+
+    # Rule columns that may be set through create and update
+    FIELDS = (
+        "name",
+        "priority",
+        "is_active",
+        "description_contains",
+        "min_amount",
+        "max_amount",
+        "account_id",
+        "transaction_type",
+        "category_id",
+        "add_tags",
+    )
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the rule service with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def list_rules(self, user_id: UUID) -> List[CategorizationRule]:
+        """
+        List a user's rules in evaluation order.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Rules ordered by priority and creation time
+        """
+        result = await self.db.execute(
+            select(CategorizationRule)
+            .where(CategorizationRule.user_id == user_id)
+            .order_by(CategorizationRule.priority, CategorizationRule.created_at)
+        )
+        return list(result.scalars())
+
+    async def get_rule(self, user_id: UUID, rule_id: UUID) -> CategorizationRule:
+        """
+        Get one of a user's rules.
+
+        Raises:
+            ValueError: If the rule does not exist or belongs to another user
+        """
+        rule = await self.db.get(CategorizationRule, rule_id)
+        if rule is None or rule.user_id != user_id:
+            raise ValueError("Rule not found")
+        return rule
+
+    async def create_rule(
+        self, user_id: UUID, values: Dict[str, Any]
+    ) -> CategorizationRule:
+        """
+        Create a rule.
+
+        Args:
+            user_id: User ID
+            values: Rule fields
+
+        Returns:
+            The created rule
+
+        Raises:
+            ValueError: If the rule is invalid or the user has too many rules
+        """
+        count = await self.db.scalar(
+            select(func.count())
+            .select_from(CategorizationRule)
+            .where(CategorizationRule.user_id == user_id)
+        )
+        if (count or 0) >= MAX_RULES_PER_USER:
+            raise ValueError(f"A user may define at most {MAX_RULES_PER_USER} rules")
+
+        rule = CategorizationRule(
+            user_id=user_id,
+            **{name: value for name, value in values.items() if name in self.FIELDS},
+        )
+        await self._validate(rule)
+        self.db.add(rule)
+        await self.db.commit()
+        await self.db.refresh(rule)
+        await rule_index_cache.invalidate(self.redis, user_id)
+        return rule
+
+    async def update_rule(
+        self, user_id: UUID, rule_id: UUID, values: Dict[str, Any]
+    ) -> CategorizationRule:
+        """
+        Update a rule.
+
+        Args:
+            user_id: User ID
+            rule_id: Rule ID
+            values: Fields to change
+
+        Returns:
+            The updated rule
+
+        Raises:
+            ValueError: If the rule is not found or becomes invalid
+        """
+        rule = await self.get_rule(user_id, rule_id)
+        for name, value in values.items():
+            if name in self.FIELDS:
+                setattr(rule, name, value)
+        await self._validate(rule)
+        await self.db.commit()
+        await self.db.refresh(rule)
+        await rule_index_cache.invalidate(self.redis, user_id)
+        return rule
+
+    async def delete_rule(self, user_id: UUID, rule_id: UUID) -> None:
+        """
+        Delete a rule. Transactions it categorized keep their category.
+
+        Raises:
+            ValueError: If the rule is not found
+        """
+        rule = await self.get_rule(user_id, rule_id)
+        await self.db.delete(rule)
+        await self.db.commit()
+        await rule_index_cache.invalidate(self.redis, user_id)
+
+    async def categorize(
+        self,
+        user_id: UUID,
+        items: Sequence[Tuple[str, Decimal, str, Sequence[Optional[UUID]]]],
+    ) -> List[Optional[RuleOutcome]]:
+        """
+        Evaluate the rules against transactions that are not stored yet.
+
+        Args:
+            user_id: User ID
+            items: (description, amount, transaction_type, account IDs)
+
+        Returns:
+            The outcome for each item, or None where no rule matched
+        """
+        index = await rule_index_cache.get(self.db, self.redis, user_id)
+        return [
+            index.evaluate(description, amount, transaction_type, account_ids)
+            for description, amount, transaction_type, account_ids in items
+        ]
+
+    async def apply_pending(
+        self, user_id: UUID, chunk_size: int = KEYWORD_CHUNK_SIZE
+    ) -> RuleApplicationResult:
+        """
+        Apply the rules to a user's uncategorized transactions.
+
+        Runs ahead of the keyword and AI categorizers on the same pending
+        set. Transactions are processed in keyset-paged chunks locked with
+        ``SKIP LOCKED``; each chunk is matched against the compiled index,
+        written with one bulk UPDATE and committed on its own.
+
+        Args:
+            user_id: User ID
+            chunk_size: Transactions evaluated per chunk
+
+        Returns:
+            Counts of matched, categorized and tagged transactions
+        """
+        index = await rule_index_cache.get(self.db, self.redis, user_id)
+        outcome = RuleApplicationResult()
+        if not index.buckets:
+            return outcome
+        cursor: Optional[UUID] = None
+
+        while True:
+            query = (
+                select(
+                    Transaction.id,
+                    Transaction.user_id,
+                    Transaction.category_id,
+                    Transaction.from_account_id,
+                    Transaction.to_account_id,
+                    Transaction.amount,
+                    Transaction.currency,
+                    Transaction.transaction_type,
+                    Transaction.transaction_date,
+                    Transaction.description,
+                    Transaction.tags,
+                )
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.category_id.is_(None),
+                    Transaction.ai_confidence_score.is_(None),
+                    Transaction.is_deleted == False,  # noqa: E712
+                )
+                .order_by(Transaction.id)
+                .limit(chunk_size)
+                .with_for_update(skip_locked=True)
+            )
+            if cursor is not None:
+                query = query.where(Transaction.id > cursor)
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+            cursor = rows[-1].id
+
+            updates: List[dict] = []
+            changes: List[TransactionChange] = []
+            for row in rows:
+                found = index.evaluate(
+                    row.description,
+                    row.amount,
+                    row.transaction_type,
+                    (row.from_account_id, row.to_account_id),
+                )
+                if found is None:
+                    continue
+                outcome.matched += 1
+                values: Dict[str, Any] = {"id": row.id}
+                current_tags = row.tags if isinstance(row.tags, list) else []
+                new_tags = [tag for tag in found.tags if tag not in current_tags]
+                if new_tags:
+                    values["tags"] = current_tags + new_tags
+                    outcome.tagged += 1
+                if found.category_id is not None:
+                    values["category_id"] = found.category_id
+                    values["ai_categorization_data"] = {
+                        "source": RULE_SOURCE,
+                        "rule_id": str(found.rule_id),
+                    }
+                    before = TransactionSnapshot.from_model(row)
+                    changes.append(
+                        TransactionChange(
+                            before=before,
+                            after=replace(before, category_id=found.category_id),
+                        )
+                    )
+                if len(values) > 1:
+                    updates.append(values)
+
+            if updates:
+                # Bulk UPDATE by primary key, grouped by the columns each row sets
+                await self.db.execute(update(Transaction), updates)
+            budget_ids: Set[UUID] = await apply_transaction_changes(self.db, changes)
+            await self.db.commit()
+            if budget_ids:
+                await BudgetAlertService(self.db, self.redis).mark_dirty(budget_ids)
+            outcome.categorized += len(changes)
+
+        logger.info(
+            "Transactions categorized by rule",
+            user_id=user_id,
+            matched=outcome.matched,
+            categorized=outcome.categorized,
+            tagged=outcome.tagged,
+        )
+        return outcome
+
+    async def apply_retroactive(
+        self, user_id: UUID, overwrite: bool = False
+    ) -> RuleApplicationResult:
+        """
+        Apply the rules to a user's whole transaction history.
+
+        All rules are translated into one set-based UPDATE: every rule
+        condition is evaluated once per candidate row, the category is a
+        CASE over those results in evaluation order and each tag is appended
+        where any rule adding it matched. Only rows that actually change are
+        written, and the old categories are returned alongside the new
+        values so rollups, balances and budgets are updated through the
+        transaction pipeline.
+
+        Args:
+            user_id: User ID
+            overwrite: Also recategorize transactions the user categorized
+                by hand; by default only uncategorized, machine-categorized
+                and rule-categorized transactions are reassigned
+
+        Returns:
+            Counts of changed, categorized and tagged transactions
+        """
+        index = await rule_index_cache.get(self.db, self.redis, user_id)
+        outcome = RuleApplicationResult()
+        rules = [
+            rule for rule in index.rules if rule.category_id is not None or rule.tags
+        ]
+        if not rules:
+            return outcome
+
+        eligible = (
+            true()
+            if overwrite
+            else or_(
+                Transaction.category_id.is_(None),
+                Transaction.ai_categorized == True,  # noqa: E712
+                Transaction.ai_categorization_data["source"].astext == RULE_SOURCE,
+            )
+        )
+        conditions = [self._condition(rule) for rule in rules]
+
+        # Evaluate every rule condition once per candidate row, locking it
+        matches = (
+            select(
+                Transaction.id,
+                Transaction.category_id,
+                Transaction.transaction_type,
+                Transaction.ai_categorization_data,
+                type_coerce(
+                    func.coalesce(Transaction.tags, literal([], JSONB)), JSONB
+                ).label("tags"),
+                eligible.label("eligible"),
+                *[
+                    condition.label(f"rule_{position}")
+                    for position, condition in enumerate(conditions)
+                ],
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.is_deleted == False,  # noqa: E712
+                or_(*conditions),
+            )
+            .with_for_update()
+            .subquery("matches")
+        )
+        matched = [matches.c[f"rule_{position}"] for position in range(len(rules))]
+
+        # First applicable category in evaluation order
+        assigning = [
+            (
+                rule,
+                and_(
+                    matches.c.eligible,
+                    hit,
+                    matches.c.transaction_type == rule.category_type,
+                ),
+            )
+            for rule, hit in zip(rules, matched)
+            if rule.category_id is not None
+        ]
+        new_category: Any = matches.c.category_id
+        new_data: Any = matches.c.ai_categorization_data
+        if assigning:
+            new_category = case(
+                *[
+                    (condition, literal(rule.category_id, Transaction.category_id.type))
+                    for rule, condition in assigning
+                ],
+                else_=matches.c.category_id,
+            )
+            new_data = case(
+                *[
+                    (
+                        condition,
+                        literal(
+                            {"source": RULE_SOURCE, "rule_id": str(rule.id)}, JSONB
+                        ),
+                    )
+                    for rule, condition in assigning
+                ],
+                else_=matches.c.ai_categorization_data,
+            )
+
+        # Each missing tag appended where any rule adding it matched
+        tag_rules: Dict[str, List[Any]] = {}
+        for rule, hit in zip(rules, matched):
+            for tag in rule.tags:
+                tag_rules.setdefault(tag, []).append(hit)
+        additions = {
+            tag: and_(or_(*hits), not_(matches.c.tags.contains([tag])))
+            for tag, hits in tag_rules.items()
+        }
+        new_tags: Any = matches.c.tags
+        for tag, condition in additions.items():
+            new_tags = new_tags.op("||", return_type=JSONB)(
+                case((condition, literal([tag], JSONB)), else_=literal([], JSONB))
+            )
+
+        category_changed = new_category.is_distinct_from(matches.c.category_id)
+        tagged = or_(*additions.values()) if additions else false()
+        targets = (
+            select(
+                matches.c.id,
+                matches.c.category_id.label("old_category_id"),
+                new_category.label("new_category_id"),
+                new_data.label("new_data"),
+                new_tags.label("new_tags"),
+                category_changed.label("category_changed"),
+                tagged.label("tagged"),
+            )
+            .where(or_(category_changed, tagged))
+            .subquery("targets")
+        )
+        result = await self.db.execute(
+            update(Transaction)
+            .where(Transaction.id == targets.c.id)
+            .values(
+                category_id=targets.c.new_category_id,
+                tags=case(
+                    (targets.c.tagged, targets.c.new_tags), else_=Transaction.tags
+                ),
+                ai_categorization_data=case(
+                    (targets.c.category_changed, targets.c.new_data),
+                    else_=Transaction.ai_categorization_data,
+                ),
+                ai_categorized=case(
+                    (targets.c.category_changed, false()),
+                    else_=Transaction.ai_categorized,
+                ),
+            )
+            .returning(
+                Transaction.id,
+                Transaction.user_id,
+                Transaction.category_id,
+                Transaction.from_account_id,
+                Transaction.to_account_id,
+                Transaction.amount,
+                Transaction.currency,
+                Transaction.transaction_type,
+                Transaction.transaction_date,
+                targets.c.old_category_id,
+                targets.c.category_changed,
+                targets.c.tagged,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        changes: List[TransactionChange] = []
+        for row in result:
+            outcome.matched += 1
+            outcome.tagged += int(row.tagged)
+            if row.category_changed:
+                after = TransactionSnapshot.from_model(row)
+                changes.append(
+                    TransactionChange(
+                        before=replace(after, category_id=row.old_category_id),
+                        after=after,
+                    )
+                )
+        budget_ids = await apply_transaction_changes(self.db, changes)
+        await self.db.commit()
+        if budget_ids:
+            await BudgetAlertService(self.db, self.redis).mark_dirty(budget_ids)
+        outcome.categorized = len(changes)
+
+        logger.info(
+            "Rules applied retroactively",
+            user_id=user_id,
+            rules=len(rules),
+            changed=outcome.matched,
+            categorized=outcome.categorized,
+            tagged=outcome.tagged,
+        )
+        return outcome
+
+    @staticmethod
+    def _condition(rule: CompiledRule) -> Any:
+        """Translate a rule's conditions into a SQL expression."""
+        clauses = []
+        if rule.words:
+            clauses.append(
+                func.lower(Transaction.description).regexp_match(
+                    phrase_pattern(rule.words)
+                )
+            )
+        if rule.min_amount is not None:
+            clauses.append(func.abs(Transaction.amount) >= rule.min_amount)
+        if rule.max_amount is not None:
+            clauses.append(func.abs(Transaction.amount) <= rule.max_amount)
+        if rule.account_id is not None:
+            clauses.append(
+                or_(
+                    Transaction.from_account_id == rule.account_id,
+                    Transaction.to_account_id == rule.account_id,
+                )
+            )
+        if rule.transaction_type is not None:
+            clauses.append(Transaction.transaction_type == rule.transaction_type)
+        return and_(true(), *clauses)
+
+    async def _validate(self, rule: CategorizationRule) -> None:
+        """
+        Check a rule's conditions, actions and references.
+
+        Raises:
+            ValueError: If the rule is invalid
+        """
+        if rule.description_contains is not None and not tokenize(
+            rule.description_contains
+        ):
+            raise ValueError("description_contains must contain a word")
+        if (
+            rule.min_amount is not None
+            and rule.max_amount is not None
+            and rule.min_amount > rule.max_amount
+        ):
+            raise ValueError("min_amount must not exceed max_amount")
+        if (
+            rule.transaction_type is not None
+            and rule.transaction_type not in RULE_TRANSACTION_TYPES
+        ):
+            raise ValueError("Invalid transaction_type")
+        if not any(
+            value is not None
+            for value in (
+                rule.description_contains,
+                rule.min_amount,
+                rule.max_amount,
+                rule.account_id,
+                rule.transaction_type,
+            )
+        ):
+            raise ValueError("A rule needs at least one condition")
+        if rule.category_id is None and not rule.get_tags_list():
+            raise ValueError("A rule must assign a category or add a tag")
+
+        if rule.account_id is not None:
+            account = await self.db.get(Account, rule.account_id)
+            if account is None or account.user_id != rule.user_id:
+                raise ValueError("Account not found")
+        if rule.category_id is not None:
+            tree = await category_tree_cache.get(self.db, self.redis, rule.user_id)
+            node = tree.get(rule.category_id)
+            if node is None:
+                raise ValueError("Category not found")
+            if rule.transaction_type not in (None, node.category_type):
+                raise ValueError(
+                    "Category type does not match the rule's transaction_type"
+                )
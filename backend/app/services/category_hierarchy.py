@@ -0,0 +1,384 @@
+"""
+Category hierarchy service for the SpendAhead backend.
+
+This module creates and moves categories, maintaining the
+``category_closure`` table on every insert, move and rebuild, and answers
+hierarchy questions (full paths, levels, subtrees, leaf status, subtree
+spending) with single indexed queries instead of walking the lazy
+``parent``/``children`` relationships.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    and_,
+    delete,
+    exists,
+    func,
+    literal,
+    literal_column,
+    select,
+    true,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.logging import get_logger
+from app.models.category import Category
+from app.models.category_closure import CategoryClosure
+from app.models.spending_rollup import SpendingRollup
+
+logger = get_logger(__name__)
+
+# Separator used when rendering full category paths
+PATH_SEPARATOR = " > "
+
+
+@dataclass(frozen=True)
+class CategoryPosition:
+    """Position of a category within its user's hierarchy."""
+
+    category_id: UUID
+    path: str
+    level: int
+    is_leaf: bool
+
+
+class CategoryHierarchyService:
+    """Service maintaining and querying the category closure table."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the hierarchy service with a database session."""
+        self.db = db
+
+    async def get_category(self, user_id: UUID, category_id: UUID) -> Category:
+        """
+        Get one of a user's live categories.
+
+        Args:
+            user_id: User ID
+            category_id: Category ID
+
+        Returns:
+            The category
+
+        Raises:
+            ValueError: If the user has no such category
+        """
+        category = await self.db.get(Category, category_id)
+        if category is None or category.user_id != user_id or category.is_deleted:
+            raise ValueError("Category not found")
+        return category
+
+    async def create_category(self, user_id: UUID, values: Dict[str, Any]) -> Category:
+        """
+        Create a category and index it in the closure table.
+
+        Args:
+            user_id: User ID
+            values: Column values, including an optional parent_id
+
+        Returns:
+            The flushed category
+
+        Raises:
+            ValueError: If the parent is not one of the user's categories
+        """
+        parent_id = values.get("parent_id")
+        if parent_id is not None:
+            await self._get_parent(user_id, parent_id)
+        category = Category(user_id=user_id, **values)
+        self.db.add(category)
+        await self.db.flush()
+        await self.on_insert(category.id, parent_id)
+        return category
+
+    async def update_category(
+        self, user_id: UUID, category_id: UUID, changes: Dict[str, Any]
+    ) -> Category:
+        """
+        Update a category, re-indexing its subtree if its parent changes.
+
+        Args:
+            user_id: User ID
+            category_id: Category ID
+            changes: Column values to change; a null parent_id makes the
+                category a root
+
+        Returns:
+            The flushed category
+
+        Raises:
+            ValueError: If the category or new parent is not found, the new
+                parent lies inside the category's subtree, or a required
+                field is set to null
+        """
+        category = await self.get_category(user_id, category_id)
+        for key in ("name", "color"):
+            if key in changes and changes[key] is None:
+                raise ValueError(f"{key} cannot be null")
+        if "parent_id" in changes and changes["parent_id"] != category.parent_id:
+            new_parent_id = changes["parent_id"]
+            if new_parent_id is not None:
+                await self._get_parent(user_id, new_parent_id)
+            await self.on_move(category.id, new_parent_id)
+        for key, value in changes.items():
+            setattr(category, key, value)
+        await self.db.flush()
+        return category
+
+    async def on_insert(self, category_id: UUID, parent_id: Optional[UUID]) -> None:
+        """
+        Index a newly inserted category.
+
+        Adds the self-row plus one row per ancestor of the parent in a
+        single ``INSERT ... SELECT``.
+
+        Args:
+            category_id: ID of the flushed category
+            parent_id: ID of its parent, if any
+        """
+        rows = select(
+            literal(category_id).label("ancestor_id"),
+            literal(category_id).label("descendant_id"),
+            literal(0).label("depth"),
+        )
+        ancestors = select(
+            CategoryClosure.ancestor_id,
+            literal(category_id),
+            CategoryClosure.depth + 1,
+        ).where(CategoryClosure.descendant_id == parent_id)
+        await self.db.execute(
+            CategoryClosure.__table__.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                rows if parent_id is None else union_all(rows, ancestors),
+            )
+        )
+
+    async def on_move(self, category_id: UUID, new_parent_id: Optional[UUID]) -> None:
+        """
+        Re-index a category subtree after its parent changed.
+
+        Args:
+            category_id: ID of the moved category
+            new_parent_id: ID of its new parent, if any
+
+        Raises:
+            ValueError: If the new parent lies inside the moved subtree
+        """
+        link = aliased(CategoryClosure)
+        subtree = select(link.descendant_id).where(link.ancestor_id == category_id)
+        if new_parent_id is not None:
+            result = await self.db.execute(
+                select(
+                    exists().where(
+                        CategoryClosure.ancestor_id == category_id,
+                        CategoryClosure.descendant_id == new_parent_id,
+                    )
+                )
+            )
+            if result.scalar():
+                raise ValueError("A category cannot be moved under its own subtree")
+
+        # Detach the subtree from its former ancestors
+        await self.db.execute(
+            delete(CategoryClosure).where(
+                CategoryClosure.descendant_id.in_(subtree),
+                CategoryClosure.ancestor_id.not_in(subtree),
+            )
+        )
+        if new_parent_id is None:
+            return
+
+        # Attach it below every ancestor of the new parent
+        above = aliased(CategoryClosure)
+        below = aliased(CategoryClosure)
+        await self.db.execute(
+            CategoryClosure.__table__.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(
+                    above.ancestor_id,
+                    below.descendant_id,
+                    above.depth + below.depth + 1,
+                )
+                .join(below, true())
+                .where(
+                    above.descendant_id == new_parent_id,
+                    below.ancestor_id == category_id,
+                ),
+            )
+        )
+
+    async def _get_parent(self, user_id: UUID, parent_id: UUID) -> Category:
+        """Get a would-be parent category, or raise ValueError."""
+        try:
+            return await self.get_category(user_id, parent_id)
+        except ValueError:
+            raise ValueError("Parent category not found")
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> None:
+        """
+        Recompute the closure rows of one user's categories, or of everyone's.
+
+        Args:
+            user_id: User ID (defaults to all users)
+        """
+        scope = select(Category.id)
+        if user_id is not None:
+            scope = scope.where(Category.user_id == user_id)
+        await self.db.execute(
+            delete(CategoryClosure).where(CategoryClosure.descendant_id.in_(scope))
+        )
+
+        roots = select(
+            Category.id.label("ancestor_id"),
+            Category.id.label("descendant_id"),
+            literal(0).label("depth"),
+        )
+        if user_id is not None:
+            roots = roots.where(Category.user_id == user_id)
+        tree = roots.cte("tree", recursive=True)
+        child = aliased(Category)
+        tree = tree.union_all(
+            select(tree.c.ancestor_id, child.id, tree.c.depth + 1).join(
+                child, child.parent_id == tree.c.descendant_id
+            )
+        )
+        await self.db.execute(
+            CategoryClosure.__table__.insert().from_select(
+                ["ancestor_id", "descendant_id", "depth"], select(tree)
+            )
+        )
+        logger.info("Category closure rebuilt", user_id=user_id)
+
+    async def get_positions(
+        self, user_id: UUID, category_ids: Optional[List[UUID]] = None
+    ) -> Dict[UUID, CategoryPosition]:
+        """
+        Get full paths, levels and leaf status of a user's categories.
+
+        Args:
+            user_id: User ID
+            category_ids: Optional categories to restrict to
+
+        Returns:
+            Mapping of category ID to its position
+        """
+        ancestor = aliased(Category)
+        descendant = aliased(Category)
+        child_link = aliased(CategoryClosure)
+        child = aliased(Category)
+
+        has_children = exists().where(
+            child_link.ancestor_id == CategoryClosure.descendant_id,
+            child_link.depth == 1,
+            child.id == child_link.descendant_id,
+            child.is_deleted == False,  # noqa: E712
+        )
+        query = (
+            select(
+                CategoryClosure.descendant_id,
+                func.string_agg(
+                    ancestor.name,
+                    aggregate_order_by(
+                        literal_column(f"'{PATH_SEPARATOR}'"),
+                        CategoryClosure.depth.desc(),
+                    ),
+                ).label("path"),
+                func.max(CategoryClosure.depth).label("level"),
+                (~has_children).label("is_leaf"),
+            )
+            .join(ancestor, ancestor.id == CategoryClosure.ancestor_id)
+            .join(descendant, descendant.id == CategoryClosure.descendant_id)
+            .where(
+                descendant.user_id == user_id,
+                descendant.is_deleted == False,  # noqa: E712
+            )
+            .group_by(CategoryClosure.descendant_id)
+        )
+        if category_ids is not None:
+            query = query.where(CategoryClosure.descendant_id.in_(category_ids))
+
+        result = await self.db.execute(query)
+        return {
+            row.descendant_id: CategoryPosition(
+                category_id=row.descendant_id,
+                path=row.path,
+                level=row.level,
+                is_leaf=row.is_leaf,
+            )
+            for row in result
+        }
+
+    async def get_subtree_ids(self, category_id: UUID) -> List[UUID]:
+        """
+        Get a category and all of its live descendants.
+
+        Args:
+            category_id: Root category ID
+
+        Returns:
+            Category IDs ordered by depth
+        """
+        result = await self.db.execute(
+            select(CategoryClosure.descendant_id)
+            .join(Category, Category.id == CategoryClosure.descendant_id)
+            .where(
+                CategoryClosure.ancestor_id == category_id,
+                Category.is_deleted == False,  # noqa: E712
+            )
+            .order_by(CategoryClosure.depth)
+        )
+        return list(result.scalars().all())
+
+    async def get_subtree_spending(
+        self,
+        user_id: UUID,
+        category_id: UUID,
+        start_month: date,
+        end_month: date,
+        transaction_type: str = "expense",
+    ) -> List[Dict[str, Any]]:
+        """
+        Get spending in a category and all of its subcategories.
+
+        Joins the monthly spending rollups against the closure table, so the
+        whole subtree is aggregated by one query.
+
+        Args:
+            user_id: User ID
+            category_id: Root category ID
+            start_month: First month (inclusive)
+            end_month: Last month (inclusive)
+            transaction_type: Transaction type to aggregate
+
+        Returns:
+            One dictionary per currency with totals and counts
+        """
+        result = await self.db.execute(
+            select(
+                SpendingRollup.currency,
+                func.sum(SpendingRollup.total_amount).label("total_amount"),
+                func.sum(SpendingRollup.transaction_count).label("transaction_count"),
+            )
+            .join(
+                CategoryClosure,
+                and_(
+                    CategoryClosure.descendant_id == SpendingRollup.category_id,
+                    CategoryClosure.ancestor_id == category_id,
+                ),
+            )
+            .where(
+                SpendingRollup.user_id == user_id,
+                SpendingRollup.month >= start_month,
+                SpendingRollup.month <= end_month,
+                SpendingRollup.transaction_type == transaction_type,
+            )
+            .group_by(SpendingRollup.currency)
+        )
+        return [dict(row._mapping) for row in result]
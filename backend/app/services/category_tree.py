@@ -0,0 +1,342 @@
+"""
+Category tree cache for the SpendAhead backend.
+
+This module builds an immutable per-user snapshot of the category tree
+(nodes by ID, children, full paths, levels and a keyword index) from a
+single query, and caches it in a process-local LRU backed by Redis. A
+per-user version stamp in Redis is bumped on every category write, so all
+processes drop stale snapshots without coordination.
+"""
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, cast
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+from app.models.category import Category
+from app.services.category_hierarchy import PATH_SEPARATOR
+
+logger = get_logger(__name__)
+
+# Redis key holding a user's category tree version
+TREE_VERSION_KEY = "category_tree:version:{user_id}"
+
+# Redis key holding a serialized snapshot for one version
+TREE_SNAPSHOT_KEY = "category_tree:snapshot:{user_id}:{version}"
+
+# How long serialized snapshots live in Redis, in seconds
+TREE_SNAPSHOT_TTL = 3600
+
+# Number of user trees kept in each process
+TREE_CACHE_CAPACITY = 1024
+
+
+def parse_keywords(raw: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse the JSON keyword array stored on a category.
+
+    Args:
+        raw: JSON array text, or None
+
+    Returns:
+        Lower-cased, stripped, de-duplicated keywords
+    """
+    if not raw:
+        return ()
+    try:
+        values = json.loads(raw)
+    except (TypeError, ValueError):
+        return ()
+    if not isinstance(values, list):
+        return ()
+    keywords = (str(value).strip().lower() for value in values)
+    return tuple(dict.fromkeys(keyword for keyword in keywords if keyword))
+
+
+@dataclass(frozen=True)
+class CategoryNode:
+    """Immutable view of one category inside a tree snapshot."""
+
+    id: UUID
+    parent_id: Optional[UUID]
+    name: str
+    category_type: str
+    color: str
+    icon: Optional[str]
+    is_system: bool
+    is_active: bool
+    budget_amount: Optional[Decimal]
+    keywords: Tuple[str, ...]
+    path: str
+    level: int
+    children: Tuple[UUID, ...]
+
+    @property
+    def is_leaf(self) -> bool:
+        """Check if the category has no children."""
+        return not self.children
+
+
+@dataclass(frozen=True)
+class CategoryTree:
+    """Immutable snapshot of one user's category tree."""
+
+    user_id: UUID
+    version: int
+    nodes: Mapping[UUID, CategoryNode]
+    roots: Tuple[UUID, ...]
+    keyword_index: Mapping[str, Tuple[UUID, ...]]
+    name_index: Mapping[str, UUID]
+
+    def get(self, category_id: UUID) -> Optional[CategoryNode]:
+        """Get a node by category ID."""
+        return self.nodes.get(category_id)
+
+    def find_by_name(self, name: str) -> Optional[CategoryNode]:
+        """Get a node by case-insensitive category name."""
+        category_id = self.name_index.get(name.strip().lower())
+        return self.nodes[category_id] if category_id is not None else None
+
+    def find_by_keyword(self, keyword: str) -> Tuple[CategoryNode, ...]:
+        """Get the nodes listing a keyword."""
+        ids = self.keyword_index.get(keyword.strip().lower(), ())
+        return tuple(self.nodes[category_id] for category_id in ids)
+
+    def subtree_ids(self, category_id: UUID) -> List[UUID]:
+        """Get a category and all of its descendants, parents first."""
+        if category_id not in self.nodes:
+            return []
+        ids = [category_id]
+        for current in ids:
+            ids.extend(self.nodes[current].children)
+        return ids
+
+    @classmethod
+    def build(
+        cls, user_id: UUID, version: int, rows: List[Dict[str, Any]]
+    ) -> "CategoryTree":
+        """
+        Build a snapshot from plain category rows.
+
+        Args:
+            user_id: Owner of the categories
+            version: Version stamp the rows were read at
+            rows: Category rows as produced by ``CategoryTreeCache.load_rows``
+
+        Returns:
+            The immutable snapshot
+        """
+        by_id = {row["id"]: row for row in rows}
+        children: Dict[Optional[UUID], List[UUID]] = {}
+        for row in sorted(rows, key=lambda row: row["name"].lower()):
+            parent_id = row["parent_id"] if row["parent_id"] in by_id else None
+            children.setdefault(parent_id, []).append(row["id"])
+
+        nodes: Dict[UUID, CategoryNode] = {}
+        keyword_index: Dict[str, List[UUID]] = {}
+        name_index: Dict[str, UUID] = {}
+        stack = [(root_id, "", 0) for root_id in reversed(children.get(None, []))]
+        while stack:
+            category_id, prefix, level = stack.pop()
+            row = by_id[category_id]
+            path = f"{prefix}{PATH_SEPARATOR}{row['name']}" if prefix else row["name"]
+            keywords = parse_keywords(row["keywords"])
+            nodes[category_id] = CategoryNode(
+                id=category_id,
+                parent_id=row["parent_id"] if level else None,
+                name=row["name"],
+                category_type=row["category_type"],
+                color=row["color"],
+                icon=row["icon"],
+                is_system=row["is_system"],
+                is_active=row["is_active"],
+                budget_amount=row["budget_amount"],
+                keywords=keywords,
+                path=path,
+                level=level,
+                children=tuple(children.get(category_id, [])),
+            )
+            for keyword in keywords:
+                keyword_index.setdefault(keyword, []).append(category_id)
+            name_index.setdefault(row["name"].strip().lower(), category_id)
+            stack.extend(
+                (child_id, path, level + 1)
+                for child_id in reversed(children.get(category_id, []))
+            )
+
+        return cls(
+            user_id=user_id,
+            version=version,
+            nodes=MappingProxyType(nodes),
+            roots=tuple(children.get(None, [])),
+            keyword_index=MappingProxyType(
+                {keyword: tuple(ids) for keyword, ids in keyword_index.items()}
+            ),
+            name_index=MappingProxyType(name_index),
+        )
+
+
+def _dump_rows(rows: List[Dict[str, Any]]) -> str:
+    """Serialize category rows for Redis."""
+    return json.dumps(
+        [
+            {
+                **row,
+                "id": str(row["id"]),
+                "parent_id": str(row["parent_id"]) if row["parent_id"] else None,
+                "budget_amount": (
+                    str(row["budget_amount"])
+                    if row["budget_amount"] is not None
+                    else None
+                ),
+            }
+            for row in rows
+        ]
+    )
+
+
+def _load_rows(payload: str) -> List[Dict[str, Any]]:
+    """Deserialize category rows stored by ``_dump_rows``."""
+    return [
+        {
+            **row,
+            "id": UUID(row["id"]),
+            "parent_id": UUID(row["parent_id"]) if row["parent_id"] else None,
+            "budget_amount": (
+                Decimal(row["budget_amount"])
+                if row["budget_amount"] is not None
+                else None
+            ),
+        }
+        for row in json.loads(payload)
+    ]
+
+
+class CategoryTreeCache:
+    """Process-local LRU of category trees, validated against Redis."""
+
+    def __init__(self, capacity: int = TREE_CACHE_CAPACITY):
+        """Initialize an empty cache holding up to ``capacity`` trees."""
+        self.capacity = capacity
+        self._trees: "OrderedDict[UUID, CategoryTree]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, redis: Redis, user_id: UUID) -> CategoryTree:
+        """
+        Get the current category tree of a user.
+
+        Costs one Redis GET when the local snapshot is current, one more
+        when another process already built it, and a single database query
+        otherwise.
+
+        Args:
+            db: Database session
+            redis: Redis client
+            user_id: User ID
+
+        Returns:
+            The user's current category tree
+        """
+        version = int(await redis.get(TREE_VERSION_KEY.format(user_id=user_id)) or 0)
+
+        tree = self._trees.get(user_id)
+        if tree is not None and tree.version == version:
+            self._trees.move_to_end(user_id)
+            return tree
+
+        snapshot_key = TREE_SNAPSHOT_KEY.format(user_id=user_id, version=version)
+        payload = cast(Optional[str], await redis.get(snapshot_key))
+        if payload is not None:
+            rows = _load_rows(payload)
+        else:
+            rows = await self.load_rows(db, user_id)
+            await redis.set(snapshot_key, _dump_rows(rows), ex=TREE_SNAPSHOT_TTL)
+
+        tree = CategoryTree.build(user_id, version, rows)
+        self._remember(tree)
+        return tree
+
+    async def invalidate(self, redis: Redis, user_id: UUID) -> None:
+        """
+        Invalidate a user's tree in every process.
+
+        Call this after any committed write to the user's categories.
+
+        Args:
+            redis: Redis client
+            user_id: User ID
+        """
+        await redis.incr(TREE_VERSION_KEY.format(user_id=user_id))
+        self._trees.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every locally cached tree."""
+        self._trees.clear()
+
+    @staticmethod
+    async def load_rows(db: AsyncSession, user_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Read the rows of a user's live categories in one query.
+
+        Args:
+            db: Database session
+            user_id: User ID
+
+        Returns:
+            One dictionary per category
+        """
+        result = await db.execute(
+            select(
+                Category.id,
+                Category.parent_id,
+                Category.name,
+                Category.category_type,
+                Category.color,
+                Category.icon,
+                Category.is_system,
+                Category.is_active,
+                Category.budget_amount,
+                Category.keywords,
+            ).where(
+                Category.user_id == user_id,
+                Category.is_deleted == False,  # noqa: E712
+            )
+        )
+        return [dict(row._mapping) for row in result]
+
+    def _remember(self, tree: CategoryTree) -> None:
+        """Store a tree, evicting the least recently used one if full."""
+        self._trees[tree.user_id] = tree
+        self._trees.move_to_end(tree.user_id)
+        while len(self._trees) > self.capacity:
+            self._trees.popitem(last=False)
+
+
+# Global category tree cache instance
+category_tree_cache = CategoryTreeCache()
+
+
+async def invalidate_category_tree(user_id: UUID) -> None:
+    """
+    Invalidate a user's category tree through the shared Redis client.
+
+    Failures are logged instead of raised so category writes never fail
+    on a cache outage.
+
+    Args:
+        user_id: User ID
+    """
+    try:
+        await category_tree_cache.invalidate(await get_redis(), user_id)
+    except Exception as e:
+        logger.warning(
+            "Category tree invalidation failed", user_id=user_id, error=str(e)
+        )
@@ -0,0 +1,557 @@
+"""
+Data exports for the SpendAhead backend.
+
+This module exports everything a user has stored, for data portability
+requests. Each table is read through a server-side cursor in primary key
+order and serialized batch by batch into its own gzip file, so memory stays
+flat however long the user's history is. Progress is checkpointed after
+every batch: an interrupted export truncates the table file back to the
+last checkpoint and carries on after the last written row. Finished table
+files are bundled into one tar archive for download.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Column, Select, and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.core.serialization import dumps, rows_to_dicts
+from app.models.account import Account
+from app.models.ai_insight import AIInsight
+from app.models.audit_log import AuditLog
+from app.models.budget import Budget, BudgetItem
+from app.models.categorization_rule import CategorizationRule
+from app.models.category import Category
+from app.models.data_export import DataExport
+from app.models.transaction import Transaction
+from app.models.user import User
+
+logger = get_logger(__name__)
+
+# Export formats and the suffix of their table files
+EXPORT_FORMATS = {"ndjson": ".ndjson.gz", "csv": ".csv.gz"}
+
+# Longest error message kept on a failed export
+MAX_ERROR_LENGTH = 1000
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """One table of a user's data and how to select their rows."""
+
+    name: str
+    model: Any
+    owner: Callable[[UUID], ColumnElement]
+    excluded: FrozenSet[str] = frozenset()
+
+    @property
+    def columns(self) -> List[Column]:
+        """Get the exported columns."""
+        return [
+            column
+            for column in self.model.__table__.columns
+            if column.name not in self.excluded
+        ]
+
+    def query(self, user_id: UUID, after: Optional[UUID] = None) -> Select:
+        """
+        Build the query of a user's rows in primary key order.
+
+        Args:
+            user_id: User ID
+            after: Last row already exported, when resuming
+
+        Returns:
+            Core select of the exported columns
+        """
+        key = self.model.__table__.c.id
+        query = select(*self.columns).where(self.owner(user_id)).order_by(key)
+        if after is not None:
+            query = query.where(key > after)
+        return query
+
+
+# Tables of an export, in the order they are written
+EXPORT_TABLES = (
+    ExportTable(
+        "profile",
+        User,
+        lambda user_id: User.id == user_id,
+        frozenset(["hashed_password"]),
+    ),
+    ExportTable("accounts", Account, lambda user_id: Account.user_id == user_id),
+    ExportTable("categories", Category, lambda user_id: Category.user_id == user_id),
+    ExportTable(
+        "categorization_rules",
+        CategorizationRule,
+        lambda user_id: CategorizationRule.user_id == user_id,
+    ),
+    ExportTable(
+        "transactions", Transaction, lambda user_id: Transaction.user_id == user_id
+    ),
+    ExportTable("budgets", Budget, lambda user_id: Budget.user_id == user_id),
+    ExportTable(
+        "budget_items",
+        BudgetItem,
+        lambda user_id: BudgetItem.budget_id.in_(
+            select(Budget.id).where(Budget.user_id == user_id)
+        ),
+    ),
+    ExportTable("ai_insights", AIInsight, lambda user_id: AIInsight.user_id == user_id),
+    ExportTable("audit_logs", AuditLog, lambda user_id: AuditLog.user_id == user_id),
+)
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize the column types json does not know."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Cannot export {type(value).__name__} values")
+
+
+def _csv_value(value: Any) -> Any:
+    """Convert a column value to a CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default, ensure_ascii=False)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def serialize_rows(
+    export_format: str, names: Sequence[str], rows: Sequence[Any], header: bool
+) -> bytes:
+    """
+    Serialize a batch of rows.
+
+    Args:
+        export_format: ndjson or csv
+        names: Column names, in row order
+        rows: Rows to serialize
+        header: Whether to start with the CSV header line
+
+    Returns:
+        UTF-8 encoded lines
+    """
+    if export_format == "ndjson":
+        return b"".join(dumps(item) + b"\n" for item in rows_to_dicts(names, rows))
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(names)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def append_member(path: Path, offset: int, data: bytes) -> int:
+    """
+    Write data as one gzip member at a checkpointed offset of a file.
+
+    Anything after the offset, left by an interrupted run, is cut off
+    first. Concatenated members decompress as a single stream.
+
+    Args:
+        path: Table file
+        offset: File size at the last checkpoint
+        data: Uncompressed data
+
+    Returns:
+        New file size
+    """
+    with open(path, "r+b" if path.exists() else "wb") as raw:
+        raw.truncate(offset)
+        raw.seek(offset)
+        with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as out:
+            out.write(data)
+        raw.flush()
+        os.fsync(raw.fileno())
+        return raw.tell()
+
+
+class DataExportService:
+    """Service requesting exports and handing them to workers."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the export service with a database session."""
+        self.db = db
+
+    async def request_export(
+        self, user_id: UUID, export_format: str = "ndjson"
+    ) -> DataExport:
+        """
+        Request an export of a user's data.
+
+        A user has at most one export in progress; requesting another
+        returns it. Two concurrent requests may both find none, in which
+        case the unique index on in-progress exports fails the later insert
+        and the export created by the earlier one is returned.
+
+        Args:
+            user_id: User ID
+            export_format: ndjson or csv
+
+        Returns:
+            The pending or running export
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+        export = await self._active_export(user_id)
+        if export is not None:
+            return export
+
+        export = DataExport(
+            user_id=user_id,
+            export_format=export_format,
+            status="pending",
+            attempts=0,
+            bytes_written=0,
+        )
+        self.db.add(export)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            # A concurrent request created the user's export first
+            await self.db.rollback()
+            existing = await self._active_export(user_id)
+            if existing is None:
+                raise
+            return existing
+        await self.db.refresh(export)
+        logger.info("Data export requested", export_id=str(export.id))
+        return export
+
+    async def get_export(self, export_id: UUID, user_id: UUID) -> DataExport:
+        """
+        Get one of a user's exports.
+
+        Args:
+            export_id: Export ID
+            user_id: User ID
+
+        Returns:
+            The export
+
+        Raises:
+            ValueError: If the export does not exist
+        """
+        result = await self.db.execute(
+            select(DataExport).where(
+                DataExport.id == export_id, DataExport.user_id == user_id
+            )
+        )
+        export = result.scalar_one_or_none()
+        if export is None:
+            raise ValueError("Export not found")
+        return export
+
+    async def claim_next(self, lease: timedelta) -> Optional[UUID]:
+        """
+        Lease the oldest pending export, or a running one whose lease ran out.
+
+        Rows locked by another claimer are skipped rather than waited for.
+
+        Args:
+            lease: How long the worker owns the export between checkpoints
+
+        Returns:
+            ID of the claimed export, or None when there is nothing to do
+        """
+        picked = (
+            select(DataExport.id)
+            .where(
+                or_(
+                    DataExport.status == "pending",
+                    and_(
+                        DataExport.status == "running",
+                        DataExport.lease_expires_at < func.now(),
+                    ),
+                )
+            )
+            .order_by(DataExport.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(DataExport)
+            .where(DataExport.id == picked.scalar_subquery())
+            .values(
+                status="running",
+                lease_expires_at=func.now() + lease,
+                started_at=func.coalesce(DataExport.started_at, func.now()),
+            )
+            .returning(DataExport.id)
+        )
+        export_id = result.scalar_one_or_none()
+        await self.db.commit()
+        return export_id
+
+    async def _active_export(self, user_id: UUID) -> Optional[DataExport]:
+        """Get a user's pending or running export, if any."""
+        result = await self.db.execute(
+            select(DataExport)
+            .where(
+                DataExport.user_id == user_id,
+                DataExport.status.in_(("pending", "running")),
+            )
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+
+class DataExportRunner:
+    """
+    Worker writing claimed exports to local storage.
+
+    Rows are streamed through one session while checkpoints are committed
+    through short separate ones, so progress is durable without ending the
+    cursor's transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        export_dir: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            session_factory: Factory of database sessions
+            export_dir: Directory receiving the archives
+            batch_size: Rows fetched and written per checkpoint
+        """
+        self.session_factory = session_factory
+        self.export_dir = Path(export_dir or settings.data_export_dir)
+        self.batch_size = batch_size or settings.data_export_batch_size
+        self.lease = timedelta(seconds=settings.data_export_lease_seconds)
+
+    async def run_pending(self, limit: Optional[int] = None) -> int:
+        """
+        Claim and run exports until none are left.
+
+        Args:
+            limit: Most exports to run
+
+        Returns:
+            Number of exports run
+        """
+        runs = 0
+        while limit is None or runs < limit:
+            async with self.session_factory() as db:
+                export_id = await DataExportService(db).claim_next(self.lease)
+            if export_id is None:
+                break
+            await self.run(export_id)
+            runs += 1
+        return runs
+
+    async def run(self, export_id: UUID) -> Optional[Path]:
+        """
+        Write an export, resuming from its last checkpoint.
+
+        A failed export goes back to the queue until it has failed
+        ``data_export_max_attempts`` times in a row.
+
+        Args:
+            export_id: ID of a claimed export
+
+        Returns:
+            Path of the archive, or None if the export did not complete
+        """
+        async with self.session_factory() as db:
+            export = await db.get(DataExport, export_id)
+        if export is None or export.status not in ("pending", "running"):
+            return None
+        try:
+            return await self._write(export)
+        except Exception as e:
+            attempts = export.attempts + 1
+            failed = attempts >= settings.data_export_max_attempts
+            await self._checkpoint(
+                export.id,
+                status="failed" if failed else "pending",
+                attempts=attempts,
+                error=str(e)[:MAX_ERROR_LENGTH],
+                lease_expires_at=None,
+            )
+            logger.error(
+                "Data export failed",
+                export_id=str(export.id),
+                attempts=attempts,
+                error=str(e),
+            )
+            return None
+
+    async def _write(self, export: DataExport) -> Path:
+        """Write the remaining tables of an export and bundle them."""
+        work_dir = self.export_dir / str(export.id)
+        names = [table.name for table in EXPORT_TABLES]
+        resume_table = export.current_table
+        rows_exported: Dict[str, int] = dict(export.rows_exported or {})
+        if resume_table is not None and not work_dir.exists():
+            # The files of earlier runs are gone; start over
+            resume_table, rows_exported = None, {}
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        if export.row_counts is None:
+            export.row_counts = await self._count_rows(export.user_id)
+            await self._checkpoint(export.id, row_counts=export.row_counts)
+
+        start = names.index(resume_table) if resume_table in names else 0
+        for table in EXPORT_TABLES[start:]:
+            resume = table.name == resume_table
+            await self._export_table(
+                export,
+                table,
+                work_dir,
+                rows_exported,
+                after=export.last_id if resume else None,
+                offset=export.bytes_written if resume else 0,
+            )
+
+        archive = self._bundle(export, work_dir)
+        await self._checkpoint(
+            export.id,
+            status="completed",
+            file_path=str(archive),
+            file_size=archive.stat().st_size,
+            error=None,
+            lease_expires_at=None,
+            completed_at=func.now(),
+        )
+        shutil.rmtree(work_dir, ignore_errors=True)
+        logger.info(
+            "Data export completed",
+            export_id=str(export.id),
+            rows=sum(rows_exported.values()),
+        )
+        return archive
+
+    async def _export_table(
+        self,
+        export: DataExport,
+        table: ExportTable,
+        work_dir: Path,
+        rows_exported: Dict[str, int],
+        after: Optional[UUID],
+        offset: int,
+    ) -> None:
+        """
+        Stream one table into its file, checkpointing after each batch.
+
+        Args:
+            export: Export being written
+            table: Table to export
+            work_dir: Directory of the table files
+            rows_exported: Rows written per table, updated in place
+            after: Last row already written, when resuming
+            offset: Size of the table file at the last checkpoint
+        """
+        path = work_dir / f"{table.name}{EXPORT_FORMATS[export.export_format]}"
+        names = [column.name for column in table.columns]
+        written = rows_exported.get(table.name, 0) if offset else 0
+
+        async with self.session_factory() as reader:
+            stream = await reader.stream(
+                table.query(export.user_id, after).execution_options(
+                    yield_per=self.batch_size
+                )
+            )
+            async for batch in stream.partitions():
+                offset = append_member(
+                    path,
+                    offset,
+                    serialize_rows(export.export_format, names, batch, offset == 0),
+                )
+                written += len(batch)
+                after = batch[-1].id
+                rows_exported[table.name] = written
+                await self._progress(export, table, rows_exported, after, offset)
+
+        if offset == 0:
+            # Still write a file, with the CSV header, for an empty table
+            offset = append_member(
+                path, 0, serialize_rows(export.export_format, names, [], True)
+            )
+            rows_exported[table.name] = 0
+            await self._progress(export, table, rows_exported, after, offset)
+
+    async def _progress(
+        self,
+        export: DataExport,
+        table: ExportTable,
+        rows_exported: Dict[str, int],
+        after: Optional[UUID],
+        offset: int,
+    ) -> None:
+        """Checkpoint the position in a table and renew the lease."""
+        await self._checkpoint(
+            export.id,
+            current_table=table.name,
+            last_id=after,
+            bytes_written=offset,
+            rows_exported=dict(rows_exported),
+            lease_expires_at=func.now() + self.lease,
+        )
+
+    async def _checkpoint(self, export_id: UUID, **values: Any) -> None:
+        """Commit changes to an export in a session of their own."""
+        async with self.session_factory() as db:
+            await db.execute(
+                update(DataExport).where(DataExport.id == export_id).values(**values)
+            )
+            await db.commit()
+
+    async def _count_rows(self, user_id: UUID) -> Dict[str, int]:
+        """Count the rows of every table in one round trip."""
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(
+                    *(
+                        select(func.count())
+                        .select_from(table.model)
+                        .where(table.owner(user_id))
+                        .scalar_subquery()
+                        .label(table.name)
+                        for table in EXPORT_TABLES
+                    )
+                )
+            )
+            return dict(result.one()._mapping)
+
+    def _bundle(self, export: DataExport, work_dir: Path) -> Path:
+        """Bundle the table files into the downloadable archive."""
+        archive = self.export_dir / f"spendahead-export-{export.id}.tar"
+        partial = archive.with_suffix(".tar.partial")
+        # Table files are already compressed, so the tar itself is not
+        with tarfile.open(partial, "w") as tar:
+            for table in EXPORT_TABLES:
+                name = f"{table.name}{EXPORT_FORMATS[export.export_format]}"
+                tar.add(work_dir / name, arcname=name)
+        partial.replace(archive)
+        return archive
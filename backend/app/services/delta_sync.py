@@ -0,0 +1,232 @@
+"""
+Delta sync for the SpendAhead backend.
+
+This module lets offline-capable clients stay current without refetching
+whole collections. Each entity type is read in ``(updated_at, id)`` order
+from a per-user index, starting after the position recorded in the
+client's cursor, so a sync only returns what changed since the last one.
+Soft-deleted rows come back as tombstones. Pages are bounded per entity
+type and the cursor keeps one position per type, so a busy type never
+holds back the others.
+"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import Column, Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.core.serialization import rows_to_dicts
+from app.models.account import Account
+from app.models.ai_insight import AIInsight
+from app.models.budget import Budget
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.services.transaction_list import OPT_IN_FIELDS
+
+logger = get_logger(__name__)
+
+# Changes returned per entity type and page when no limit is given
+SYNC_PAGE_SIZE = 200
+
+# Seconds a change may take to commit after its updated_at was stamped.
+# updated_at is set when the writing transaction starts, so a slow write
+# can commit behind rows a client already received; cursors of caught-up
+# types never move past this window and the overlap is sent again.
+SYNC_SETTLE_SECONDS = 60
+
+# Columns synced as bookkeeping rather than entity data
+SYNC_BOOKKEEPING = frozenset(["user_id", "is_deleted", "deleted_at"])
+
+# (updated_at, id) of the last change a client received of one type
+SyncPosition = Tuple[datetime, UUID]
+
+
+@dataclass(frozen=True)
+class SyncEntity:
+    """One synced entity type and the columns clients receive."""
+
+    name: str
+    model: Any
+    excluded: FrozenSet[str] = frozenset()
+
+    @property
+    def columns(self) -> List[Column]:
+        """Get the synced columns."""
+        return [
+            column
+            for column in self.model.__table__.columns
+            if column.name not in SYNC_BOOKKEEPING | self.excluded
+        ]
+
+    def query(self, user_id: UUID, after: Optional[SyncPosition], limit: int) -> Select:
+        """
+        Build the query of a user's changes, oldest first.
+
+        Tombstones are only needed by clients holding earlier state, so a
+        first sync of the type skips deleted rows.
+
+        Args:
+            user_id: User ID
+            after: Position of the last change received, if any
+            limit: Most changes to return
+
+        Returns:
+            Core select of the synced columns followed by is_deleted
+        """
+        model = self.model
+        query = select(*self.columns, model.is_deleted).where(model.user_id == user_id)
+        if after is None:
+            query = query.where(model.is_deleted == False)  # noqa: E712
+        else:
+            query = query.where(tuple_(model.updated_at, model.id) > tuple_(*after))
+        return query.order_by(model.updated_at, model.id).limit(limit)
+
+
+# Synced entity types, in response order
+SYNC_ENTITIES = (
+    SyncEntity("accounts", Account, frozenset(["account_number", "routing_number"])),
+    SyncEntity("categories", Category, frozenset(["keywords"])),
+    SyncEntity("transactions", Transaction, OPT_IN_FIELDS),
+    SyncEntity("budgets", Budget, frozenset(["ai_suggestions"])),
+    SyncEntity(
+        "insights",
+        AIInsight,
+        frozenset(["ai_model_used", "ai_processing_time", "ai_tokens_used"]),
+    ),
+)
+
+
+def encode_sync_cursor(positions: Dict[str, SyncPosition]) -> str:
+    """Encode the position of each entity type as an opaque cursor."""
+    raw = json.dumps(
+        {
+            name: [updated_at.isoformat(), str(entity_id)]
+            for name, (updated_at, entity_id) in positions.items()
+        },
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> Dict[str, SyncPosition]:
+    """
+    Decode a cursor produced by encode_sync_cursor().
+
+    Args:
+        cursor: Opaque cursor from a previous sync
+
+    Returns:
+        Position of each entity type the client has synced
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        positions = {
+            name: (datetime.fromisoformat(updated_at), UUID(entity_id))
+            for name, (updated_at, entity_id) in json.loads(raw).items()
+        }
+    except (ValueError, TypeError, AttributeError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+    if any(updated_at.tzinfo is None for updated_at, _ in positions.values()):
+        raise ValueError("Invalid cursor")
+    return positions
+
+
+@dataclass(frozen=True)
+class EntityChanges:
+    """Changes of one entity type since a client's position."""
+
+    updated: List[Dict[str, Any]]
+    deleted: List[UUID]
+
+
+@dataclass(frozen=True)
+class SyncPage:
+    """One page of a user's changes across entity types."""
+
+    changes: Dict[str, EntityChanges]
+    next_cursor: str
+    has_more: bool
+
+
+class DeltaSyncService:
+    """Service returning a user's changes since a sync cursor."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the sync service with a database session."""
+        self.db = db
+
+    async def get_changes(
+        self,
+        user_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = SYNC_PAGE_SIZE,
+        now: Optional[datetime] = None,
+    ) -> SyncPage:
+        """
+        Get a page of changes of every entity type.
+
+        Clients call again with the returned cursor while ``has_more`` is
+        set, then keep the cursor for their next sync. Changes within the
+        settle window may be sent twice; applying them is idempotent.
+
+        Args:
+            user_id: User ID
+            cursor: Cursor of the previous page or sync, None for a full sync
+            limit: Most changes to return per entity type
+            now: Current time
+
+        Returns:
+            Changed and deleted entities per type, and the next cursor
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        positions = decode_sync_cursor(cursor) if cursor else {}
+        now = now or datetime.now(timezone.utc)
+        settled: SyncPosition = (
+            now - timedelta(seconds=SYNC_SETTLE_SECONDS),
+            UUID(int=0),
+        )
+        changes = {}
+        has_more = False
+        for entity in SYNC_ENTITIES:
+            after = positions.get(entity.name)
+            result = await self.db.execute(entity.query(user_id, after, limit + 1))
+            rows = list(result.all())
+            more = len(rows) > limit
+            rows = rows[:limit]
+            if rows:
+                after = (rows[-1].updated_at, rows[-1].id)
+            if not more and after is not None:
+                # Caught up: leave room for changes still being committed
+                after = min(after, settled)
+            if after is not None:
+                positions[entity.name] = after
+            has_more = has_more or more
+            names = [column.name for column in entity.columns]
+            changes[entity.name] = EntityChanges(
+                updated=rows_to_dicts(
+                    names, (row[:-1] for row in rows if not row.is_deleted)
+                ),
+                deleted=[row.id for row in rows if row.is_deleted],
+            )
+        logger.debug(
+            "Sync page served",
+            user_id=str(user_id),
+            changes={name: len(page.updated) for name, page in changes.items()},
+            has_more=has_more,
+        )
+        return SyncPage(
+            changes=changes,
+            next_cursor=encode_sync_cursor(positions),
+            has_more=has_more,
+        )
@@ -0,0 +1,476 @@
+"""
+Insight context builder for the SpendAhead backend.
+
+This module compacts a user's transactions over a period into the short
+statistical summary an insight model is prompted with, instead of the raw
+transaction list. Totals, per-category deltas against the previous period,
+top merchants and outliers are aggregated in SQL, and the summary is
+rendered as terse text lines that never exceed a hard token budget.
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import Executable, Select, case, func, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.services.category_tree import category_tree_cache
+
+logger = get_logger(__name__)
+
+# Tokens the rendered context may use
+CONTEXT_TOKEN_BUDGET = 400
+
+# Merchants and outliers fetched per context
+CONTEXT_TOP_MERCHANTS = 10
+CONTEXT_OUTLIERS = 5
+
+# Transactions a category needs before its outliers are reported
+OUTLIER_MIN_TRANSACTIONS = 5
+
+# Standard deviations above the mean of the rest of its category that
+# make an expense an outlier
+OUTLIER_Z_SCORE = 3
+
+# Smallest spread outliers are measured against, as a share of the mean of
+# the rest of the category, so near-identical peers (a fixed subscription)
+# do not turn every small deviation into an outlier
+OUTLIER_MIN_SPREAD = 0.1
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the tokens of a text at four characters per token."""
+    return math.ceil(len(text) / 4)
+
+
+def merchant_key_expr() -> Any:
+    """Get the SQL expression grouping descriptions by merchant words."""
+    return func.btrim(
+        func.regexp_replace(
+            func.lower(Transaction.description),
+            literal_column("'[^a-z]+'"),
+            literal_column("' '"),
+            literal_column("'g'"),
+        )
+    )
+
+
+def outlier_query(scope: Sequence[Any]) -> Select:
+    """
+    Build the query of a period's unusual expenses.
+
+    Each expense is scored against the mean and standard deviation of the
+    other expenses of its category and currency, leaving it out; a single
+    large expense would otherwise inflate the deviation it is measured by
+    so much that small categories could never report one. The comparison
+    is done on squares, so the query needs no square roots.
+
+    Args:
+        scope: Filters selecting the period's expenses
+
+    Returns:
+        Rows of transaction_date, description, amount, currency,
+        category_id and category_mean (the mean of the other expenses),
+        most unusual first
+    """
+    amount = func.abs(Transaction.amount)
+    peer_group = (Transaction.category_id, Transaction.currency)
+    peers = (
+        select(
+            Transaction.transaction_date,
+            Transaction.description,
+            amount.label("amount"),
+            Transaction.currency,
+            Transaction.category_id,
+            func.count().over(partition_by=peer_group).label("peers"),
+            func.sum(amount).over(partition_by=peer_group).label("total"),
+            func.sum(amount * amount).over(partition_by=peer_group).label("squares"),
+        )
+        .where(*scope)
+        .subquery("peers")
+    )
+    others = func.nullif(peers.c.peers - 1, 0)
+    mean = (peers.c.total - peers.c.amount) / others
+    variance = (peers.c.squares - peers.c.amount * peers.c.amount) / others - (
+        mean * mean
+    )
+    floor = (OUTLIER_MIN_SPREAD * mean) * (OUTLIER_MIN_SPREAD * mean)
+    spread = case((variance > floor, variance), else_=floor)
+    deviation = peers.c.amount - mean
+    return (
+        select(
+            peers.c.transaction_date,
+            peers.c.description,
+            peers.c.amount,
+            peers.c.currency,
+            peers.c.category_id,
+            func.round(mean, 2).label("category_mean"),
+        )
+        .where(
+            peers.c.peers >= OUTLIER_MIN_TRANSACTIONS,
+            spread > 0,
+            deviation > 0,
+            deviation * deviation > OUTLIER_Z_SCORE * OUTLIER_Z_SCORE * spread,
+        )
+        .order_by((deviation * deviation / func.nullif(spread, 0)).desc())
+        .limit(CONTEXT_OUTLIERS)
+    )
+
+
+def period_label(start: datetime, end: datetime) -> str:
+    """Label a half-open period as a month when it is one, else as a range."""
+    if (
+        start.day == 1
+        and end.day == 1
+        and (end.year * 12 + end.month) - (start.year * 12 + start.month) == 1
+    ):
+        return start.strftime("%Y-%m")
+    return f"{start.date()}..{(end - timedelta(days=1)).date()}"
+
+
+def _change_percentage(current: Decimal, previous: Decimal) -> Optional[str]:
+    """Get the change between two amounts as a percentage string."""
+    if not previous:
+        return None
+    return str(((current - previous) * 100 / previous).quantize(Decimal("0.1")))
+
+
+def _signed(percentage: Optional[str]) -> str:
+    """Format a change percentage for a context line."""
+    if percentage is None:
+        return "new"
+    return f"{'+' if not percentage.startswith('-') else ''}{percentage}%"
+
+
+@dataclass(frozen=True)
+class InsightContext:
+    """Compact summary of a user's period for an insight prompt."""
+
+    period_start: datetime
+    period_end: datetime
+    data: Dict[str, Any]
+    text: str
+    tokens: int
+
+    @property
+    def category_ids(self) -> Tuple[UUID, ...]:
+        """Get the categories the summary mentions."""
+        return tuple(
+            UUID(entry["category_id"])
+            for entry in self.data["categories"]
+            if entry["category_id"]
+        )
+
+
+class _BudgetedLines:
+    """Text lines accepted while they fit a token budget."""
+
+    def __init__(self, budget: int) -> None:
+        self.budget = budget
+        self.lines: List[str] = []
+        self.tokens = 0
+
+    def add(self, line: str) -> bool:
+        """Append a line if it fits; report whether it did."""
+        # Each line also costs its newline
+        cost = estimate_text_tokens(line + "\n")
+        if self.tokens + cost > self.budget:
+            return False
+        self.lines.append(line)
+        self.tokens += cost
+        return True
+
+    def add_section(self, header: str, entries: Sequence[Tuple[str, Any]]) -> List[Any]:
+        """
+        Append a section with as many of its entries as fit, in order.
+
+        Args:
+            header: Section header line, written only with a first entry
+            entries: (line, entry) pairs, most important first
+
+        Returns:
+            The entries whose lines were written
+        """
+        if not entries:
+            return []
+        mark = (len(self.lines), self.tokens)
+        if not self.add(header):
+            return []
+        kept = []
+        for line, entry in entries:
+            if not self.add(line):
+                break
+            kept.append(entry)
+        if not kept:
+            del self.lines[mark[0] :]
+            self.tokens = mark[1]
+        return kept
+
+
+def render_context(
+    period_start: datetime,
+    period_end: datetime,
+    previous_start: datetime,
+    totals: Sequence[Mapping[str, Any]],
+    categories: Sequence[Mapping[str, Any]],
+    merchants: Sequence[Mapping[str, Any]],
+    outliers: Sequence[Mapping[str, Any]],
+    category_names: Mapping[UUID, str],
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+) -> InsightContext:
+    """
+    Render aggregated rows as a compact context within a token budget.
+
+    Sections are written in order of importance (totals, categories by size
+    of change, top merchants, outliers) and each is cut short when the
+    budget runs out, so ``data`` describes exactly what ``text`` says.
+
+    Args:
+        period_start: Start of the period (inclusive)
+        period_end: End of the period (exclusive)
+        previous_start: Start of the comparison period, which ends at
+            ``period_start``
+        totals: Rows of transaction_type, currency, current, previous, count
+        categories: Expense rows of category_id, currency, current,
+            previous, count
+        merchants: Rows of merchant, currency, total, count
+        outliers: Rows of transaction_date, description, amount, currency,
+            category_id, category_mean
+        category_names: Category names by ID
+        token_budget: Most tokens the text may use
+
+    Returns:
+        The rendered context
+    """
+
+    def name(category_id: Optional[UUID]) -> str:
+        if category_id is None:
+            return "Uncategorized"
+        return category_names.get(category_id, "Unknown")
+
+    lines = _BudgetedLines(token_budget)
+    label = period_label(period_start, period_end)
+    previous_label = period_label(previous_start, period_start)
+    lines.add(f"period {label} vs {previous_label}; amounts current/previous/change")
+
+    total_entries = [
+        {
+            "transaction_type": row["transaction_type"],
+            "currency": row["currency"],
+            "amount": str(row["current"]),
+            "previous_amount": str(row["previous"]),
+            "change_percentage": _change_percentage(row["current"], row["previous"]),
+            "count": row["count"],
+        }
+        for row in totals
+    ]
+    kept_totals = lines.add_section(
+        "totals:",
+        [
+            (
+                f"{entry['transaction_type']} {entry['amount']}/"
+                f"{entry['previous_amount']}/{_signed(entry['change_percentage'])} "
+                f"{entry['currency']} n={entry['count']}",
+                entry,
+            )
+            for entry in total_entries
+        ],
+    )
+
+    category_entries = sorted(
+        (
+            {
+                "category_id": str(row["category_id"]) if row["category_id"] else None,
+                "name": name(row["category_id"]),
+                "currency": row["currency"],
+                "amount": str(row["current"]),
+                "previous_amount": str(row["previous"]),
+                "change": str(row["current"] - row["previous"]),
+                "change_percentage": _change_percentage(
+                    row["current"], row["previous"]
+                ),
+                "count": row["count"],
+            }
+            for row in categories
+        ),
+        key=lambda entry: abs(Decimal(entry["change"])),
+        reverse=True,
+    )
+    kept_categories = lines.add_section(
+        "expense categories:",
+        [
+            (
+                f"- {entry['name']} {entry['amount']}/{entry['previous_amount']}/"
+                f"{_signed(entry['change_percentage'])} {entry['currency']} "
+                f"n={entry['count']}",
+                entry,
+            )
+            for entry in category_entries
+        ],
+    )
+
+    kept_merchants = lines.add_section(
+        "top merchants:",
+        [
+            (
+                f"- {row['merchant']} {row['total']} {row['currency']} "
+                f"x{row['count']}",
+                {
+                    "merchant": row["merchant"],
+                    "currency": row["currency"],
+                    "amount": str(row["total"]),
+                    "count": row["count"],
+                },
+            )
+            for row in merchants
+            if row["merchant"]
+        ],
+    )
+
+    kept_outliers = lines.add_section(
+        "unusual expenses:",
+        [
+            (
+                f"- {row['transaction_date'].date()} {row['description'][:40]} "
+                f"{row['amount']} {row['currency']} ({name(row['category_id'])} "
+                f"avg {row['category_mean']})",
+                {
+                    "date": row["transaction_date"].date().isoformat(),
+                    "description": row["description"][:40],
+                    "amount": str(row["amount"]),
+                    "currency": row["currency"],
+                    "category": name(row["category_id"]),
+                    "category_mean": str(row["category_mean"]),
+                },
+            )
+            for row in outliers
+        ],
+    )
+
+    text = "\n".join(lines.lines)
+    return InsightContext(
+        period_start=period_start,
+        period_end=period_end,
+        data={
+            "period": label,
+            "previous_period": previous_label,
+            "totals": kept_totals,
+            "categories": kept_categories,
+            "merchants": kept_merchants,
+            "outliers": kept_outliers,
+        },
+        text=text,
+        tokens=lines.tokens,
+    )
+
+
+class InsightContextBuilder:
+    """Service aggregating a user's period into an insight context."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the builder with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def build(
+        self,
+        user_id: UUID,
+        period_start: datetime,
+        period_end: datetime,
+        previous_start: Optional[datetime] = None,
+        token_budget: int = CONTEXT_TOKEN_BUDGET,
+    ) -> Optional[InsightContext]:
+        """
+        Summarize a user's period against the period before it.
+
+        Args:
+            user_id: User ID
+            period_start: Start of the period (inclusive)
+            period_end: End of the period (exclusive)
+            previous_start: Start of the comparison period (defaults to a
+                period of the same length ending at ``period_start``)
+            token_budget: Most tokens the rendered text may use
+
+        Returns:
+            The context, or None when the user had no transactions
+        """
+        previous_start = previous_start or period_start - (period_end - period_start)
+        scope = (
+            Transaction.user_id == user_id,
+            Transaction.is_deleted == False,  # noqa: E712
+            Transaction.transaction_date >= previous_start,
+            Transaction.transaction_date < period_end,
+        )
+        current = Transaction.transaction_date >= period_start
+        previous = Transaction.transaction_date < period_start
+        amount = func.abs(Transaction.amount)
+
+        def sums() -> List[Any]:
+            return [
+                func.coalesce(func.sum(amount).filter(current), 0).label("current"),
+                func.coalesce(func.sum(amount).filter(previous), 0).label("previous"),
+                func.count().filter(current).label("count"),
+            ]
+
+        totals = await self._rows(
+            select(Transaction.transaction_type, Transaction.currency, *sums())
+            .where(*scope)
+            .group_by(Transaction.transaction_type, Transaction.currency)
+            .order_by(Transaction.transaction_type, Transaction.currency)
+        )
+        if not totals:
+            return None
+
+        categories = await self._rows(
+            select(Transaction.category_id, Transaction.currency, *sums())
+            .where(*scope, Transaction.transaction_type == "expense")
+            .group_by(Transaction.category_id, Transaction.currency)
+        )
+
+        merchant = merchant_key_expr().label("merchant")
+        merchants = await self._rows(
+            select(
+                merchant,
+                Transaction.currency,
+                func.sum(amount).label("total"),
+                func.count().label("count"),
+            )
+            .where(*scope, current, Transaction.transaction_type == "expense")
+            .group_by(merchant, Transaction.currency)
+            .order_by(func.sum(amount).desc())
+            .limit(CONTEXT_TOP_MERCHANTS)
+        )
+
+        outliers = await self._rows(
+            outlier_query([*scope, current, Transaction.transaction_type == "expense"])
+        )
+
+        tree = await category_tree_cache.get(self.db, self.redis, user_id)
+        names = {
+            row["category_id"]: node.name
+            for row in [*categories, *outliers]
+            if row["category_id"] and (node := tree.get(row["category_id"]))
+        }
+        return render_context(
+            period_start,
+            period_end,
+            previous_start,
+            totals,
+            categories,
+            merchants,
+            outliers,
+            names,
+            token_budget,
+        )
+
+    async def _rows(self, query: Executable) -> List[Dict[str, Any]]:
+        """Execute an aggregate query and return its rows as dictionaries."""
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
@@ -0,0 +1,369 @@
+"""
+Insight feed service for the SpendAhead backend.
+
+This module serves a user's insight feed from the partial
+``ix_ai_insights_feed`` index with keyset (cursor) pagination, keeps each
+user's unread count in a Redis counter so the notification badge never
+queries Postgres, and deactivates expired insights in chunked batches.
+"""
+
+import base64
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Mapping, Optional, Sequence, Set, Tuple, cast
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import ColumnElement, CursorResult, func, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from app.core.logging import get_logger
+from app.models.ai_insight import AIInsight
+
+logger = get_logger(__name__)
+
+# Redis counter of a user's unread, visible insights
+UNREAD_COUNT_KEY = "insights:unread:{user_id}"
+
+# Insights returned per feed page when no limit is given
+FEED_PAGE_SIZE = 20
+
+# Insights deactivated per UPDATE by sweep_expired()
+EXPIRY_SWEEP_BATCH_SIZE = 1000
+
+# Users whose counters are rewritten per round trip by reconcile_unread_counts()
+RECONCILE_BATCH_SIZE = 1000
+
+# (priority_rank, created_at, id) of the last insight on a page
+FeedCursor = Tuple[int, datetime, UUID]
+
+
+def encode_cursor(insight: AIInsight) -> str:
+    """Encode the feed position after an insight as an opaque cursor."""
+    raw = f"{insight.priority_rank}|{insight.created_at.isoformat()}|{insight.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> FeedCursor:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Opaque cursor from a previous page
+
+    Returns:
+        The feed position it encodes
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        rank, created_at, insight_id = raw.split("|")
+        return int(rank), datetime.fromisoformat(created_at), UUID(insight_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def visible_insights(user_id: UUID) -> Tuple[ColumnElement[bool], ...]:
+    """Get the filter of a user's insights that the feed index covers."""
+    return (
+        AIInsight.user_id == user_id,
+        AIInsight.is_active == True,  # noqa: E712
+        AIInsight.is_deleted == False,  # noqa: E712
+    )
+
+
+class UnreadCounters:
+    """Per-user unread insight counters in Redis."""
+
+    def __init__(self, redis: Redis):
+        """Initialize the counters with a Redis client."""
+        self.redis = redis
+
+    async def get(self, user_id: UUID) -> int:
+        """Get a user's unread count; a missing counter means zero."""
+        value = await self.redis.get(UNREAD_COUNT_KEY.format(user_id=user_id))
+        return max(int(value or 0), 0)
+
+    async def adjust(self, deltas: Mapping[UUID, int]) -> None:
+        """
+        Add to the counters of several users in one round trip.
+
+        Call this after the transaction that changed the insights commits.
+
+        Args:
+            deltas: Change of each user's unread count
+        """
+        changes = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if not changes:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for user_id, delta in changes.items():
+                pipe.incrby(UNREAD_COUNT_KEY.format(user_id=user_id), delta)
+            await pipe.execute()
+
+
+@dataclass(frozen=True)
+class FeedPage:
+    """One page of a user's insight feed."""
+
+    items: List[AIInsight]
+    next_cursor: Optional[str]
+
+
+class InsightFeedService:
+    """Service serving insight feeds and maintaining unread counters."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the feed service with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+        self.counters = UnreadCounters(redis)
+
+    async def get_feed(
+        self,
+        user_id: UUID,
+        limit: int = FEED_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        unread_only: bool = False,
+        fields: Optional[Sequence[str]] = None,
+    ) -> FeedPage:
+        """
+        Get a page of a user's current insights, most important first.
+
+        Insights are ordered by priority, then newest first. Scheduled
+        insights appear once due and expired ones disappear even before the
+        sweeper deactivates them.
+
+        Args:
+            user_id: User ID
+            limit: Most insights to return
+            cursor: Cursor of the previous page
+            unread_only: Only return unread insights
+            fields: Only load these attributes, plus those of the cursor
+
+        Returns:
+            The page and the cursor of the next page, if any
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = select(AIInsight).where(
+            *visible_insights(user_id),
+            or_(
+                AIInsight.scheduled_for.is_(None), AIInsight.scheduled_for <= func.now()
+            ),
+            or_(AIInsight.expires_at.is_(None), AIInsight.expires_at > func.now()),
+        )
+        if fields is not None:
+            loaded = set(fields) | {"id", "priority_rank", "created_at"}
+            query = query.options(
+                load_only(*(getattr(AIInsight, name) for name in sorted(loaded)))
+            )
+        if unread_only:
+            query = query.where(AIInsight.is_read == False)  # noqa: E712
+        if cursor is not None:
+            query = query.where(
+                tuple_(AIInsight.priority_rank, AIInsight.created_at, AIInsight.id)
+                < tuple_(*decode_cursor(cursor))
+            )
+        result = await self.db.execute(
+            query.order_by(
+                AIInsight.priority_rank.desc(),
+                AIInsight.created_at.desc(),
+                AIInsight.id.desc(),
+            ).limit(limit + 1)
+        )
+        items = list(result.scalars().all())
+        if len(items) <= limit:
+            return FeedPage(items=items, next_cursor=None)
+        return FeedPage(
+            items=items[:limit], next_cursor=encode_cursor(items[limit - 1])
+        )
+
+    async def get_insight(self, user_id: UUID, insight_id: UUID) -> AIInsight:
+        """
+        Get one of a user's visible insights.
+
+        Args:
+            user_id: User ID
+            insight_id: Insight ID
+
+        Returns:
+            The insight
+
+        Raises:
+            ValueError: If the insight does not exist
+        """
+        result = await self.db.execute(
+            select(AIInsight).where(
+                AIInsight.id == insight_id, *visible_insights(user_id)
+            )
+        )
+        insight = result.scalar_one_or_none()
+        if insight is None:
+            raise ValueError("Insight not found")
+        return insight
+
+    async def unread_count(self, user_id: UUID) -> int:
+        """Get a user's unread count from Redis without touching Postgres."""
+        return await self.counters.get(user_id)
+
+    async def mark_as_read(self, user_id: UUID, insight_id: UUID) -> AIInsight:
+        """
+        Mark an insight as read and decrement the unread counter.
+
+        Args:
+            user_id: User ID
+            insight_id: Insight ID
+
+        Returns:
+            The updated insight
+
+        Raises:
+            ValueError: If the insight does not exist
+        """
+        result = await self.db.execute(
+            update(AIInsight)
+            .where(
+                AIInsight.id == insight_id,
+                *visible_insights(user_id),
+                AIInsight.is_read == False,  # noqa: E712
+            )
+            .values(is_read=True)
+            .returning(AIInsight.id)
+        )
+        changed = result.first() is not None
+        insight = await self.get_insight(user_id, insight_id)
+        await self.db.commit()
+        if changed:
+            await self.counters.adjust({user_id: -1})
+        return insight
+
+    async def mark_all_as_read(self, user_id: UUID) -> int:
+        """
+        Mark every visible insight of a user as read.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Number of insights marked
+        """
+        result = cast(
+            CursorResult[Any],
+            await self.db.execute(
+                update(AIInsight)
+                .where(
+                    *visible_insights(user_id),
+                    AIInsight.is_read == False,  # noqa: E712
+                )
+                .values(is_read=True)
+            ),
+        )
+        marked = result.rowcount or 0
+        await self.db.commit()
+        await self.counters.adjust({user_id: -marked})
+        return marked
+
+    async def sweep_expired(self, batch_size: int = EXPIRY_SWEEP_BATCH_SIZE) -> int:
+        """
+        Deactivate expired insights in chunks, committing each chunk.
+
+        Each chunk reads the partial ``ix_ai_insights_expiry`` index and
+        skips rows locked by other writers, so the sweep never blocks
+        readers of the feed or a concurrent sweep.
+
+        Args:
+            batch_size: Insights deactivated per UPDATE
+
+        Returns:
+            Number of insights deactivated
+        """
+        swept = 0
+        while True:
+            expired = (
+                select(AIInsight.id)
+                .where(
+                    AIInsight.is_active == True,  # noqa: E712
+                    AIInsight.is_deleted == False,  # noqa: E712
+                    AIInsight.expires_at.is_not(None),
+                    AIInsight.expires_at <= func.now(),
+                )
+                .order_by(AIInsight.expires_at)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            result = await self.db.execute(
+                update(AIInsight)
+                .where(AIInsight.id.in_(expired.scalar_subquery()))
+                .values(is_active=False)
+                .returning(AIInsight.user_id, AIInsight.is_read)
+            )
+            rows = result.all()
+            await self.db.commit()
+            await self.counters.adjust(
+                {
+                    user_id: -count
+                    for user_id, count in Counter(
+                        row.user_id for row in rows if not row.is_read
+                    ).items()
+                }
+            )
+            swept += len(rows)
+            if len(rows) < batch_size:
+                break
+
+        if swept:
+            logger.info("Expired insights deactivated", insights=swept)
+        return swept
+
+    async def reconcile_unread_counts(
+        self, batch_size: int = RECONCILE_BATCH_SIZE
+    ) -> int:
+        """
+        Rewrite every unread counter from the database.
+
+        Corrects drift from transactions that rolled back after adjusting a
+        counter, or from a Redis restart. Counters of users without unread
+        insights are removed.
+
+        Args:
+            batch_size: Counters written per round trip
+
+        Returns:
+            Number of users with unread insights
+        """
+        stream = await self.db.stream(
+            select(AIInsight.user_id, func.count().label("unread"))
+            .where(
+                AIInsight.is_active == True,  # noqa: E712
+                AIInsight.is_deleted == False,  # noqa: E712
+                AIInsight.is_read == False,  # noqa: E712
+            )
+            .group_by(AIInsight.user_id)
+            .execution_options(yield_per=batch_size)
+        )
+        counted: Set[str] = set()
+        async for partition in stream.partitions():
+            await self.redis.mset(
+                {
+                    UNREAD_COUNT_KEY.format(user_id=row.user_id): row.unread
+                    for row in partition
+                }
+            )
+            counted.update(str(row.user_id) for row in partition)
+
+        stale = [
+            key
+            async for key in self.redis.scan_iter(
+                match=UNREAD_COUNT_KEY.format(user_id="*"), count=batch_size
+            )
+            if key.rsplit(":", 1)[1] not in counted
+        ]
+        for start in range(0, len(stale), batch_size):
+            await self.redis.delete(*stale[start : start + batch_size])
+        return len(counted)
@@ -0,0 +1,939 @@
+"""
+AI insight scheduler for the SpendAhead backend.
+
+This module keeps one recurring ``insight_jobs`` row per user and insight
+type and runs due jobs in a bounded pool of async workers. Jobs are claimed
+in small batches with ``FOR UPDATE SKIP LOCKED`` under a lease, at most one
+per user at a time, and every model call first reserves its tokens from a
+per-minute budget shared by all workers through Redis. Each generated
+``AIInsight`` records the model's processing time and token usage.
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+    cast,
+)
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import (
+    CursorResult,
+    Integer,
+    String,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.ai_insight import AIInsight
+from app.models.insight_job import InsightJob
+from app.models.user import User
+from app.services.insight_context import InsightContextBuilder, estimate_text_tokens
+from app.services.insight_feed import UnreadCounters
+from app.services.spending_rollup import SpendingRollupService
+
+logger = get_logger(__name__)
+
+# Redis key counting the tokens reserved in one minute window
+TOKEN_WINDOW_KEY = "insights:tokens:{window}"
+
+# Tokens of instructions sent with every insight prompt
+INSIGHT_PROMPT_TOKENS = 250
+
+# Tokens reserved for a model reply before its real usage is known
+INSIGHT_RESPONSE_TOKENS = 300
+
+# Due jobs scanned per claimed job when picking one job per user
+CLAIM_SCAN_FACTOR = 10
+
+# Base delay before retrying a failed job, doubled per attempt
+RETRY_BACKOFF = timedelta(minutes=1)
+
+# Months of history summarized by the cash flow insight
+CASH_FLOW_MONTHS = 3
+
+INSIGHT_CATEGORIES = ("warning", "recommendation", "analysis", "alert")
+INSIGHT_PRIORITIES = ("low", "medium", "high", "critical")
+
+# Reserve tokens in a fixed one-minute window. A request larger than the
+# whole budget is admitted into an empty window so it cannot wait forever.
+# KEYS[1] is the window key; ARGV is (tokens, limit, ttl seconds).
+_RESERVE_TOKENS_SCRIPT = """
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local requested = tonumber(ARGV[1])
+if used > 0 and used + requested > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('INCRBY', KEYS[1], requested)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class InsightFacts:
+    """Figures an insight is generated from."""
+
+    period_start: datetime
+    period_end: datetime
+    data: Dict[str, Any]
+    category_ids: Tuple[UUID, ...] = ()
+    prompt: Optional[str] = None  # Compact rendering of data for the model
+
+
+@dataclass(frozen=True)
+class GeneratedInsight:
+    """Text and metadata of an insight written by a provider."""
+
+    title: str
+    description: str
+    summary: Optional[str]
+    category: str
+    priority: str
+    confidence: Optional[Decimal]
+    tokens_used: int
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    """An insight job leased to a worker."""
+
+    id: UUID
+    user_id: UUID
+    insight_type: str
+    attempts: int
+    last_insight_id: Optional[UUID]
+
+
+@dataclass(frozen=True)
+class InsightType:
+    """A recurring insight: how often it is refreshed and how it is built."""
+
+    name: str
+    interval: timedelta
+    priority: int
+    collect: Callable[
+        [AsyncSession, Redis, UUID, date], Awaitable[Optional[InsightFacts]]
+    ] = field(compare=False)
+
+
+def render_facts(facts: InsightFacts) -> str:
+    """Get the figures as sent to the model."""
+    if facts.prompt is not None:
+        return facts.prompt
+    return json.dumps(facts.data, default=str)
+
+
+def estimate_tokens(facts: InsightFacts) -> int:
+    """Estimate the tokens of one insight call at four characters per token."""
+    return (
+        INSIGHT_PROMPT_TOKENS
+        + estimate_text_tokens(render_facts(facts))
+        + INSIGHT_RESPONSE_TOKENS
+    )
+
+
+def months_before(day: date, months: int = 0) -> date:
+    """Get the first day of the month ``months`` months before ``day``."""
+    index = day.year * 12 + day.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _as_datetime(day: date) -> datetime:
+    """Get UTC midnight of a date."""
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+async def collect_spending_pattern(
+    db: AsyncSession, redis: Redis, user_id: UUID, today: date
+) -> Optional[InsightFacts]:
+    """
+    Summarize last month's spending against the month before.
+
+    Args:
+        db: Database session
+        redis: Redis client for the category tree cache
+        user_id: User ID
+        today: Current UTC date
+
+    Returns:
+        The compact context of last month, or None without spending
+    """
+    context = await InsightContextBuilder(db, redis).build(
+        user_id,
+        _as_datetime(months_before(today, 1)),
+        _as_datetime(months_before(today)),
+        previous_start=_as_datetime(months_before(today, 2)),
+        token_budget=settings.ai_insight_context_tokens,
+    )
+    if context is None or not context.data["categories"]:
+        return None
+    return InsightFacts(
+        period_start=context.period_start,
+        period_end=context.period_end,
+        data=context.data,
+        category_ids=context.category_ids,
+        prompt=context.text,
+    )
+
+
+async def collect_cash_flow(
+    db: AsyncSession, redis: Redis, user_id: UUID, today: date
+) -> Optional[InsightFacts]:
+    """
+    Summarize income, expenses and net flow over the last full months.
+
+    Args:
+        db: Database session
+        redis: Unused; part of the collector signature
+        user_id: User ID
+        today: Current UTC date
+
+    Returns:
+        Monthly totals per currency, or None without activity
+    """
+    first, last = months_before(today, CASH_FLOW_MONTHS), months_before(today, 1)
+    rows = await SpendingRollupService(db).get_monthly_totals(user_id, first, last)
+    months: Dict[Tuple[date, str], Dict[str, Decimal]] = {}
+    for row in rows:
+        if row["transaction_type"] not in ("income", "expense"):
+            continue
+        entry = months.setdefault(
+            (row["month"], row["currency"]),
+            {"income": Decimal("0.00"), "expense": Decimal("0.00")},
+        )
+        entry[row["transaction_type"]] += row["total_amount"]
+    if not months:
+        return None
+
+    return InsightFacts(
+        period_start=_as_datetime(first),
+        period_end=_as_datetime(months_before(today)),
+        data={
+            "months": [
+                {
+                    "month": month.strftime("%Y-%m"),
+                    "currency": currency,
+                    "income": str(totals["income"]),
+                    "expense": str(totals["expense"]),
+                    "net": str(totals["income"] - totals["expense"]),
+                }
+                for (month, currency), totals in sorted(months.items())
+            ]
+        },
+    )
+
+
+# Insights generated for every active user
+INSIGHT_TYPES: Dict[str, InsightType] = {
+    insight_type.name: insight_type
+    for insight_type in (
+        InsightType(
+            "spending_pattern", timedelta(days=1), 100, collect_spending_pattern
+        ),
+        InsightType("cash_flow", timedelta(days=7), 200, collect_cash_flow),
+    )
+}
+
+
+class InsightProvider(Protocol):
+    """Interface of a model that writes insights from figures."""
+
+    name: str
+
+    async def generate(
+        self, insight_type: str, facts: InsightFacts
+    ) -> GeneratedInsight:
+        """
+        Write one insight.
+
+        Args:
+            insight_type: Name of the insight type
+            facts: Figures to describe
+
+        Returns:
+            The written insight with the tokens it used
+        """
+        ...
+
+
+class LocalInsightProvider:
+    """
+    Deterministic offline provider.
+
+    Fills fixed templates from the figures, so insights are produced without
+    a model. Token usage is estimated at four characters per token, and an
+    optional latency simulates a remote model for benchmarks.
+    """
+
+    name = "local-templates"
+
+    def __init__(self, latency: float = 0.0):
+        """Initialize the provider with a simulated per-call latency in seconds."""
+        self.latency = latency
+
+    async def generate(
+        self, insight_type: str, facts: InsightFacts
+    ) -> GeneratedInsight:
+        """Write an insight from the template of its type."""
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if insight_type == "spending_pattern":
+            title, description, category, priority = self._spending_pattern(facts)
+        elif insight_type == "cash_flow":
+            title, description, category, priority = self._cash_flow(facts)
+        else:
+            raise ValueError(f"No template for insight type: {insight_type}")
+        return GeneratedInsight(
+            title=title,
+            description=description,
+            summary=title,
+            category=category,
+            priority=priority,
+            confidence=Decimal("0.90"),
+            tokens_used=estimate_tokens(facts)
+            - INSIGHT_RESPONSE_TOKENS
+            + len(description) // 4,
+        )
+
+    @staticmethod
+    def _spending_pattern(facts: InsightFacts) -> Tuple[str, str, str, str]:
+        """Describe the largest change in category spending."""
+        top = facts.data["categories"][0]
+        change = Decimal(top["change"])
+        if top["change_percentage"] is None:
+            return (
+                f"New spending on {top['name']}",
+                f"You spent {top['amount']} {top['currency']} on {top['name']} in "
+                f"{facts.data['period']}, up from nothing the period before.",
+                "analysis",
+                "medium",
+            )
+        percentage = Decimal(top["change_percentage"])
+        direction = "up" if change > 0 else "down"
+        return (
+            f"{top['name']} spending {direction} {abs(percentage)}%",
+            f"You spent {top['amount']} {top['currency']} on {top['name']} in "
+            f"{facts.data['period']}, compared with {top['previous_amount']} "
+            f"{top['currency']} in {facts.data['previous_period']}.",
+            "warning" if percentage >= 25 else "analysis",
+            "high" if percentage >= 50 else "medium" if percentage > 0 else "low",
+        )
+
+    @staticmethod
+    def _cash_flow(facts: InsightFacts) -> Tuple[str, str, str, str]:
+        """Describe the net flow of the latest month."""
+        latest = facts.data["months"][-1]
+        net = Decimal(latest["net"])
+        if net < 0:
+            return (
+                f"You spent more than you earned in {latest['month']}",
+                f"Expenses of {latest['expense']} {latest['currency']} exceeded "
+                f"income of {latest['income']} {latest['currency']} by "
+                f"{-net} {latest['currency']}.",
+                "warning",
+                "high",
+            )
+        return (
+            f"You saved {net} {latest['currency']} in {latest['month']}",
+            f"Income of {latest['income']} {latest['currency']} covered expenses "
+            f"of {latest['expense']} {latest['currency']}.",
+            "recommendation",
+            "low",
+        )
+
+
+class OpenAIInsightProvider:
+    """Provider backed by the OpenAI chat completions API."""
+
+    def __init__(self, client: Optional[Any] = None) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            client: ``openai.AsyncOpenAI`` compatible client (created from
+                settings when omitted)
+        """
+        if client is None:
+            from openai import AsyncOpenAI
+
+            client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = client
+        self.name = f"openai:{settings.openai_model}"
+
+    async def generate(
+        self, insight_type: str, facts: InsightFacts
+    ) -> GeneratedInsight:
+        """Write an insight with one chat completion returning JSON."""
+        response = await self.client.chat.completions.create(
+            model=settings.openai_model,
+            temperature=settings.openai_temperature,
+            max_tokens=settings.openai_max_tokens,
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You write short personal finance insights from the "
+                        'figures given. Reply with JSON: {"title": <string>, '
+                        '"description": <2-3 sentences>, "summary": <string>, '
+                        f'"category": <one of {", ".join(INSIGHT_CATEGORIES)}>, '
+                        f'"priority": <one of {", ".join(INSIGHT_PRIORITIES)}>, '
+                        '"confidence": <0..1>}'
+                    ),
+                },
+                {
+                    "role": "user",
+                    "content": (
+                        f"Insight type: {insight_type}\n"
+                        f"Figures:\n{render_facts(facts)}"
+                    ),
+                },
+            ],
+        )
+        payload = json.loads(response.choices[0].message.content or "{}")
+        usage = getattr(response, "usage", None)
+        try:
+            confidence = Decimal(str(payload.get("confidence")))
+        except ArithmeticError:
+            confidence = None
+        category = payload.get("category")
+        priority = payload.get("priority")
+        return GeneratedInsight(
+            title=str(payload.get("title") or insight_type)[:255],
+            description=str(payload.get("description") or ""),
+            summary=payload.get("summary"),
+            category=category if category in INSIGHT_CATEGORIES else "analysis",
+            priority=priority if priority in INSIGHT_PRIORITIES else "medium",
+            confidence=(
+                confidence if confidence is not None and 0 <= confidence <= 1 else None
+            ),
+            tokens_used=getattr(usage, "total_tokens", 0) or 0,
+        )
+
+
+def get_insight_provider() -> InsightProvider:
+    """
+    Create the provider selected by ``AI_INSIGHT_PROVIDER``.
+
+    Returns:
+        The configured provider
+
+    Raises:
+        ValueError: If the provider is unknown or not configured
+    """
+    provider = settings.ai_insight_provider.lower()
+    if provider == "local":
+        return LocalInsightProvider()
+    if provider == "openai":
+        if not settings.openai_api_key:
+            raise ValueError("OPENAI_API_KEY must be set to use the openai provider")
+        return OpenAIInsightProvider()
+    raise ValueError(f"Unknown AI insight provider: {provider}")
+
+
+class TokenBudget:
+    """Per-minute token budget shared by every worker through Redis."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            redis: Redis client
+            tokens_per_minute: Tokens all workers may spend per minute
+            clock: Wall clock in seconds, shared by every worker
+        """
+        self.redis = redis
+        self.tokens_per_minute = tokens_per_minute
+        self.clock = clock
+
+    async def reserve(self, tokens: int) -> str:
+        """
+        Reserve tokens, waiting for a later window while the budget is spent.
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            Key of the window the tokens were reserved in
+        """
+        while True:
+            now = self.clock()
+            key = TOKEN_WINDOW_KEY.format(window=int(now // 60))
+            reserved = await self.redis.eval(
+                _RESERVE_TOKENS_SCRIPT, 1, key, tokens, self.tokens_per_minute, 120
+            )
+            if reserved:
+                return key
+            await asyncio.sleep(60 - now % 60)
+
+    async def settle(self, key: str, reserved: int, used: int) -> None:
+        """
+        Replace a reservation with the tokens actually used.
+
+        Args:
+            key: Window key returned by reserve()
+            reserved: Tokens reserved
+            used: Tokens the call used
+        """
+        if used != reserved:
+            await self.redis.incrby(key, used - reserved)
+
+
+class InsightScheduler:
+    """Service maintaining and leasing the insight job schedule."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the scheduler with a database session."""
+        self.db = db
+
+    async def enqueue_missing(self) -> int:
+        """
+        Create the jobs of active users that do not have them yet.
+
+        Returns:
+            Number of jobs created
+        """
+        types = values(
+            column("insight_type", String), column("priority", Integer), name="types"
+        ).data(
+            [
+                (insight_type.name, insight_type.priority)
+                for insight_type in INSIGHT_TYPES.values()
+            ]
+        )
+        stmt = (
+            pg_insert(InsightJob)
+            .from_select(
+                ["user_id", "insight_type", "priority", "status", "attempts"],
+                select(
+                    User.id,
+                    types.c.insight_type,
+                    types.c.priority,
+                    literal("pending"),
+                    literal(0),
+                )
+                .select_from(User)
+                .join(types, true())
+                .where(User.is_active, User.is_deleted == False),  # noqa: E712
+            )
+            .on_conflict_do_nothing(index_elements=["user_id", "insight_type"])
+        )
+        result = cast(CursorResult[Any], await self.db.execute(stmt))
+        return result.rowcount or 0
+
+    async def requeue_expired(self) -> int:
+        """
+        Return jobs whose worker lease ran out to the pending queue.
+
+        Returns:
+            Number of jobs requeued
+        """
+        result = cast(
+            CursorResult[Any],
+            await self.db.execute(
+                update(InsightJob)
+                .where(
+                    InsightJob.status == "running",
+                    InsightJob.lease_expires_at < func.now(),
+                )
+                .values(status="pending", lease_expires_at=None)
+            ),
+        )
+        return result.rowcount or 0
+
+    async def claim(self, limit: int, lease: timedelta) -> List[ClaimedJob]:
+        """
+        Lease up to ``limit`` due jobs, at most one per user.
+
+        Jobs are taken in priority and due-time order from a bounded scan of
+        the pending index; users with a job already running are skipped so
+        no single user can occupy several workers. Rows locked by another
+        claimer are skipped rather than waited for. The running-job check
+        only sees committed claims, so two concurrent claims may pick
+        different jobs of the same user; the unique index on running jobs
+        per user then fails the later claim with an IntegrityError.
+
+        Args:
+            limit: Most jobs to claim
+            lease: How long the worker owns the jobs
+
+        Returns:
+            The claimed jobs
+        """
+        busy = select(InsightJob.user_id).where(InsightJob.status == "running")
+        due = (
+            select(
+                InsightJob.id,
+                InsightJob.user_id,
+                InsightJob.priority,
+                InsightJob.run_at,
+            )
+            .where(
+                InsightJob.status == "pending",
+                InsightJob.run_at <= func.now(),
+                InsightJob.user_id.not_in(busy),
+            )
+            .order_by(InsightJob.priority, InsightJob.run_at)
+            .limit(limit * CLAIM_SCAN_FACTOR)
+            .subquery("due")
+        )
+        ranked = select(
+            due.c.id,
+            due.c.priority,
+            due.c.run_at,
+            func.row_number()
+            .over(
+                partition_by=due.c.user_id,
+                order_by=(due.c.priority, due.c.run_at),
+            )
+            .label("user_rank"),
+        ).subquery("ranked")
+        picked = (
+            select(InsightJob.id)
+            .join(ranked, ranked.c.id == InsightJob.id)
+            .where(ranked.c.user_rank == 1, InsightJob.status == "pending")
+            .order_by(ranked.c.priority, ranked.c.run_at)
+            .limit(limit)
+            .with_for_update(of=InsightJob, skip_locked=True)
+        )
+        result = await self.db.execute(
+            update(InsightJob)
+            .where(InsightJob.id.in_(picked.scalar_subquery()))
+            .values(
+                status="running",
+                lease_expires_at=func.now() + lease,
+                attempts=InsightJob.attempts + 1,
+            )
+            .returning(
+                InsightJob.id,
+                InsightJob.user_id,
+                InsightJob.insight_type,
+                InsightJob.attempts,
+                InsightJob.last_insight_id,
+            )
+        )
+        return [
+            ClaimedJob(
+                id=row.id,
+                user_id=row.user_id,
+                insight_type=row.insight_type,
+                attempts=row.attempts,
+                last_insight_id=row.last_insight_id,
+            )
+            for row in result
+        ]
+
+    async def complete(self, job: ClaimedJob, insight_id: Optional[UUID]) -> bool:
+        """
+        Reschedule a finished job one interval ahead.
+
+        A new insight replaces the job's previous one in the feed.
+
+        Args:
+            job: The finished job
+            insight_id: Insight generated, or None when there was nothing to say
+
+        Returns:
+            Whether the replaced insight was still unread
+        """
+        interval = INSIGHT_TYPES[job.insight_type].interval
+        changes: Dict[str, Any] = {
+            "status": "pending",
+            "run_at": func.now() + interval,
+            "lease_expires_at": None,
+            "attempts": 0,
+            "last_error": None,
+        }
+        replaced_unread = False
+        if insight_id is not None:
+            changes["last_insight_id"] = insight_id
+            if job.last_insight_id is not None:
+                result = await self.db.execute(
+                    update(AIInsight)
+                    .where(
+                        AIInsight.id == job.last_insight_id,
+                        AIInsight.is_active == True,  # noqa: E712
+                        AIInsight.is_deleted == False,  # noqa: E712
+                    )
+                    .values(is_active=False)
+                    .returning(AIInsight.is_read)
+                )
+                replaced = result.first()
+                replaced_unread = replaced is not None and not replaced.is_read
+        await self.db.execute(
+            update(InsightJob).where(InsightJob.id == job.id).values(**changes)
+        )
+        return replaced_unread
+
+    async def fail(self, job: ClaimedJob, error: str, max_attempts: int) -> None:
+        """
+        Schedule a failed job for a retry with exponential backoff.
+
+        After ``max_attempts`` failures in a row the job waits for its next
+        regular run instead.
+
+        Args:
+            job: The failed job
+            error: Error message to record
+            max_attempts: Failures in a row before giving up until the next run
+        """
+        if job.attempts >= max_attempts:
+            delay, attempts = INSIGHT_TYPES[job.insight_type].interval, 0
+        else:
+            delay, attempts = RETRY_BACKOFF * 2 ** (job.attempts - 1), job.attempts
+        await self.db.execute(
+            update(InsightJob)
+            .where(InsightJob.id == job.id)
+            .values(
+                status="pending",
+                run_at=func.now() + delay,
+                lease_expires_at=None,
+                attempts=attempts,
+                last_error=error[:1000],
+            )
+        )
+
+
+class InsightWorkerPool:
+    """
+    Bounded pool of async workers generating due insights.
+
+    One coordinator claims jobs whenever a worker slot is free, so no more
+    than ``concurrency`` jobs run at once and the database only sees one
+    short claim transaction per batch. Each job runs in its own session.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        redis: Redis,
+        provider: Optional[InsightProvider] = None,
+        concurrency: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            session_factory: Factory of database sessions
+            redis: Redis client for the token budget and category trees
+            provider: Insight provider (configured provider when omitted)
+            concurrency: Most jobs run at once
+            tokens_per_minute: Token budget shared by every pool
+        """
+        self.session_factory = session_factory
+        self.redis = redis
+        self.provider = provider or get_insight_provider()
+        self.concurrency = concurrency or settings.ai_insight_concurrency
+        self.budget = TokenBudget(
+            redis, tokens_per_minute or settings.ai_insight_tokens_per_minute
+        )
+        self.lease = timedelta(seconds=settings.ai_insight_lease_seconds)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """
+        Generate insights until ``stop`` is set, then finish running jobs.
+
+        Args:
+            stop: Event ending the loop
+        """
+        running: Set[asyncio.Task] = set()
+        while not stop.is_set():
+            claimed = []
+            if len(running) < self.concurrency:
+                try:
+                    claimed = await self._claim(self.concurrency - len(running))
+                except Exception as e:
+                    logger.error("Claiming insight jobs failed", error=str(e))
+                for job in claimed:
+                    task = asyncio.create_task(self._process(job))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+            if running and (claimed or len(running) >= self.concurrency):
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            elif not claimed:
+                try:
+                    await asyncio.wait_for(
+                        stop.wait(), timeout=settings.ai_insight_poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        if running:
+            await asyncio.gather(*running)
+
+    async def run_once(self) -> int:
+        """
+        Claim and process one batch of due jobs.
+
+        Returns:
+            Number of jobs processed
+        """
+        claimed = await self._claim(self.concurrency)
+        await asyncio.gather(*(self._process(job) for job in claimed))
+        return len(claimed)
+
+    async def _claim(self, limit: int) -> List[ClaimedJob]:
+        """Lease due jobs in one short transaction."""
+        async with self.session_factory() as session:
+            scheduler = InsightScheduler(session)
+            requeued = await scheduler.requeue_expired()
+            try:
+                claimed = await scheduler.claim(limit, self.lease)
+            except IntegrityError:
+                # Another worker claimed a job of one of these users first
+                await session.rollback()
+                logger.info("Insight claim raced with another worker")
+                return []
+            await session.commit()
+        if requeued:
+            logger.warning("Requeued insight jobs with expired leases", count=requeued)
+        return claimed
+
+    async def _process(self, job: ClaimedJob) -> Optional[UUID]:
+        """
+        Generate the insight of a claimed job and reschedule the job.
+
+        No session is held while waiting for the token budget or the model:
+        figures are collected in one short session, the provider is called
+        with no connection checked out, and the insight is stored in a
+        second session together with the job's rescheduling.
+
+        Args:
+            job: The claimed job
+
+        Returns:
+            ID of the generated insight, or None
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            async with self.session_factory() as session:
+                facts = await INSIGHT_TYPES[job.insight_type].collect(
+                    session, self.redis, job.user_id, now.date()
+                )
+            row = None
+            if facts is not None:
+                generated, elapsed_ms = await self._generate(job, facts)
+                row = self._insight_row(job, facts, generated, elapsed_ms, now)
+
+            async with self.session_factory() as session:
+                insight_id = None
+                if row is not None:
+                    result = await session.execute(
+                        insert(AIInsight).values(**row).returning(AIInsight.id)
+                    )
+                    insight_id = result.scalar_one()
+                replaced_unread = await InsightScheduler(session).complete(
+                    job, insight_id
+                )
+                await session.commit()
+            await UnreadCounters(self.redis).adjust(
+                {job.user_id: (insight_id is not None) - replaced_unread}
+            )
+            return insight_id
+        except Exception as e:
+            logger.error(
+                "Insight generation failed",
+                job_id=job.id,
+                insight_type=job.insight_type,
+                attempts=job.attempts,
+                error=str(e),
+            )
+            try:
+                async with self.session_factory() as session:
+                    await InsightScheduler(session).fail(
+                        job, str(e), settings.ai_insight_max_attempts
+                    )
+                    await session.commit()
+            except Exception:
+                # The lease expires and the job is retried
+                logger.exception("Rescheduling failed insight job failed")
+            return None
+
+    async def _generate(
+        self, job: ClaimedJob, facts: InsightFacts
+    ) -> Tuple[GeneratedInsight, int]:
+        """
+        Call the provider within the token budget.
+
+        Args:
+            job: The claimed job
+            facts: Figures to describe
+
+        Returns:
+            The generated insight and the call's duration in milliseconds
+        """
+        estimate = estimate_tokens(facts)
+        window = await self.budget.reserve(estimate)
+        used = estimate
+        started = time.perf_counter()
+        try:
+            generated = await self.provider.generate(job.insight_type, facts)
+            used = generated.tokens_used
+        finally:
+            await self.budget.settle(window, estimate, used)
+        return generated, round((time.perf_counter() - started) * 1000)
+
+    def _insight_row(
+        self,
+        job: ClaimedJob,
+        facts: InsightFacts,
+        generated: GeneratedInsight,
+        elapsed_ms: int,
+        now: datetime,
+    ) -> Dict[str, Any]:
+        """Get the column values of a generated insight."""
+        interval = INSIGHT_TYPES[job.insight_type].interval
+        return {
+            "user_id": job.user_id,
+            "title": generated.title,
+            "description": generated.description,
+            "summary": generated.summary,
+            "insight_type": job.insight_type,
+            "category": generated.category,
+            "content": facts.data,
+            "ai_model_used": self.provider.name[:50],
+            "ai_confidence_score": generated.confidence,
+            "ai_processing_time": elapsed_ms,
+            "ai_tokens_used": generated.tokens_used,
+            "data_period_start": facts.period_start,
+            "data_period_end": facts.period_end,
+            "affected_categories": ([str(id_) for id_ in facts.category_ids] or None),
+            "priority": generated.priority,
+            "scheduled_for": now,
+            "expires_at": now + 2 * interval,
+            "is_read": False,
+            "is_actioned": False,
+            "is_active": True,
+            "is_deleted": False,
+        }
@@ -0,0 +1,444 @@
+"""
+Keyword categorizer for the SpendAhead backend.
+
+This module compiles every keyword of a user's active categories into an
+Aho-Corasick automaton and matches transaction descriptions against it in
+a single pass over their words. It is the zero-cost first pass of
+transaction categorization: confident matches are assigned directly, weak
+ones are recorded as suggestions, and only the rest need an AI call.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from decimal import Decimal
+from typing import Dict, List, Mapping, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.services.budget_alerts import BudgetAlertService
+from app.services.category_tree import CategoryTree, category_tree_cache
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+from app.services.transaction_pipeline import apply_transaction_changes
+
+logger = get_logger(__name__)
+
+# Words are maximal runs of lower-case letters and digits
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Minimum confidence for assigning a category instead of only suggesting it
+KEYWORD_ASSIGN_CONFIDENCE = Decimal("0.70")
+
+# Highest confidence a keyword match can reach
+KEYWORD_MAX_CONFIDENCE = Decimal("0.99")
+
+# Transactions categorized per chunk; each chunk commits on its own
+KEYWORD_CHUNK_SIZE = 2000
+
+# Number of compiled user indexes kept in each process
+KEYWORD_CACHE_CAPACITY = 1024
+
+# Transaction types that are categorized by keyword
+CATEGORIZABLE_TYPES = ("income", "expense")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lower-cased words.
+
+    Args:
+        text: Description or keyword
+
+    Returns:
+        Words in order of appearance
+    """
+    return WORD_PATTERN.findall(text.lower())
+
+
+def keyword_confidence(weight: int, total_weight: int) -> Decimal:
+    """
+    Score a keyword match.
+
+    Confidence grows with the number of matched keyword words and shrinks
+    with the share of the weight claimed by competing categories, so a
+    single unambiguous one-word hit scores 0.75 and a tie scores below 0.4.
+
+    Args:
+        weight: Matched words of the winning category
+        total_weight: Matched words of all categories
+
+    Returns:
+        Confidence between 0.00 and ``KEYWORD_MAX_CONFIDENCE``
+    """
+    score = (weight / total_weight) * (1 - 0.5 ** (weight + 1))
+    return min(Decimal(str(round(score, 2))), KEYWORD_MAX_CONFIDENCE)
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """Best keyword match for one description."""
+
+    category_id: UUID
+    confidence: Decimal
+    keywords: Tuple[str, ...]
+
+    @property
+    def is_confident(self) -> bool:
+        """Check if the match is strong enough to assign the category."""
+        return self.confidence >= KEYWORD_ASSIGN_CONFIDENCE
+
+
+class KeywordAutomaton:
+    """
+    Word-level Aho-Corasick automaton over a set of keywords.
+
+    Keywords and descriptions are matched on whole words, so "bus" does not
+    match inside "business" and multi-word keywords ("capital gains") match
+    as phrases. Each state reached on a word reports every keyword ending
+    there, including those inherited along its failure link, so a
+    description is scanned exactly once regardless of the keyword count.
+    """
+
+    def __init__(self, keywords: Mapping[str, Sequence[UUID]]):
+        """
+        Compile an automaton.
+
+        Args:
+            keywords: Mapping of keyword to the categories listing it
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[Tuple[str, int, Tuple[UUID, ...]], ...]] = [()]
+        pending: List[Dict[str, Tuple[int, Tuple[UUID, ...]]]] = [{}]
+
+        for keyword, category_ids in keywords.items():
+            words = tokenize(keyword)
+            if not words:
+                continue
+            state = 0
+            for word in words:
+                next_state = self._goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][word] = next_state
+                    self._goto.append({})
+                    self._outputs.append(())
+                    pending.append({})
+                state = next_state
+            pending[state][keyword] = (len(words), tuple(category_ids))
+
+        # Breadth-first failure links, merging outputs down the links
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._outputs[state] = self._own_outputs(pending[state])
+        for state in queue:
+            for word, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._outputs[child] = (
+                    self._own_outputs(pending[child]) + self._outputs[self._fail[child]]
+                )
+                queue.append(child)
+
+    @staticmethod
+    def _own_outputs(
+        pending: Dict[str, Tuple[int, Tuple[UUID, ...]]],
+    ) -> Tuple[Tuple[str, int, Tuple[UUID, ...]], ...]:
+        """Freeze the keywords ending at a state."""
+        return tuple(
+            (keyword, weight, category_ids)
+            for keyword, (weight, category_ids) in pending.items()
+        )
+
+    @property
+    def size(self) -> int:
+        """Get the number of automaton states."""
+        return len(self._goto)
+
+    def scan(self, text: str) -> Dict[UUID, Tuple[int, List[str]]]:
+        """
+        Find every keyword occurring in a text.
+
+        Args:
+            text: Description to scan
+
+        Returns:
+            Mapping of category ID to (matched word count, matched keywords)
+        """
+        goto = self._goto
+        fail = self._fail
+        outputs = self._outputs
+        hits: Dict[UUID, Tuple[int, List[str]]] = {}
+        state = 0
+        for word in WORD_PATTERN.findall(text.lower()):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for keyword, weight, category_ids in outputs[state]:
+                for category_id in category_ids:
+                    found = hits.get(category_id)
+                    if found is None:
+                        hits[category_id] = (weight, [keyword])
+                    elif keyword not in found[1]:
+                        found[1].append(keyword)
+                        hits[category_id] = (found[0] + weight, found[1])
+        return hits
+
+
+@dataclass(frozen=True)
+class KeywordIndex:
+    """Keyword automata of one user, one per category type."""
+
+    user_id: UUID
+    version: int
+    automata: Dict[str, KeywordAutomaton]
+    levels: Dict[UUID, int] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, tree: CategoryTree) -> "KeywordIndex":
+        """
+        Compile the keywords of a user's active categories.
+
+        Args:
+            tree: The user's category tree snapshot
+
+        Returns:
+            Index with one automaton per category type
+        """
+        by_type: Dict[str, Dict[str, List[UUID]]] = {}
+        for node in tree.nodes.values():
+            if not node.is_active:
+                continue
+            keywords = by_type.setdefault(node.category_type, {})
+            for keyword in node.keywords:
+                keywords.setdefault(keyword, []).append(node.id)
+        return cls(
+            user_id=tree.user_id,
+            version=tree.version,
+            automata={
+                category_type: KeywordAutomaton(keywords)
+                for category_type, keywords in by_type.items()
+            },
+            levels={node.id: node.level for node in tree.nodes.values()},
+        )
+
+    def match(self, description: str, transaction_type: str) -> Optional[KeywordMatch]:
+        """
+        Find the best category for a description.
+
+        Only categories of the transaction's type are considered. Ties on
+        matched words go to the more specific (deeper) category.
+
+        Args:
+            description: Transaction description
+            transaction_type: income or expense
+
+        Returns:
+            The best match, or None if no keyword occurs in the description
+        """
+        automaton = self.automata.get(transaction_type)
+        if automaton is None:
+            return None
+        hits = automaton.scan(description)
+        if not hits:
+            return None
+        category_id, (weight, keywords) = max(
+            hits.items(),
+            key=lambda hit: (hit[1][0], self.levels.get(hit[0], 0), str(hit[0])),
+        )
+        total_weight = sum(found[0] for found in hits.values())
+        return KeywordMatch(
+            category_id=category_id,
+            confidence=keyword_confidence(weight, total_weight),
+            keywords=tuple(keywords),
+        )
+
+
+class KeywordIndexCache:
+    """Process-local LRU of compiled keyword indexes."""
+
+    def __init__(self, capacity: int = KEYWORD_CACHE_CAPACITY):
+        """Initialize an empty cache holding up to ``capacity`` indexes."""
+        self.capacity = capacity
+        self._indexes: "OrderedDict[UUID, KeywordIndex]" = OrderedDict()
+
+    async def get(self, db: AsyncSession, redis: Redis, user_id: UUID) -> KeywordIndex:
+        """
+        Get the compiled keyword index of a user.
+
+        The index is rebuilt whenever the user's category tree version
+        changes, which every category write bumps.
+
+        Args:
+            db: Database session
+            redis: Redis client
+            user_id: User ID
+
+        Returns:
+            The user's current keyword index
+        """
+        tree = await category_tree_cache.get(db, redis, user_id)
+        index = self._indexes.get(user_id)
+        if index is None or index.version != tree.version:
+            index = KeywordIndex.build(tree)
+            self._indexes[user_id] = index
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.capacity:
+            self._indexes.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        """Drop every locally cached index."""
+        self._indexes.clear()
+
+
+# Global keyword index cache instance
+keyword_index_cache = KeywordIndexCache()
+
+
+@dataclass
+class KeywordCategorizationResult:
+    """Outcome of a keyword categorization run."""
+
+    scanned: int = 0
+    assigned: int = 0
+    suggested: int = 0
+
+
+class KeywordCategorizationService:
+    """Service categorizing transactions by category keywords."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the keyword categorizer with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def categorize(
+        self, user_id: UUID, items: Sequence[Tuple[str, str]]
+    ) -> List[Optional[KeywordMatch]]:
+        """
+        Categorize a batch of descriptions without touching the database rows.
+
+        Args:
+            user_id: Owner of the categories to match against
+            items: (description, transaction_type) pairs
+
+        Returns:
+            The best match for each item, or None where nothing matched
+        """
+        index = await keyword_index_cache.get(self.db, self.redis, user_id)
+        return [
+            index.match(description, transaction_type)
+            for description, transaction_type in items
+        ]
+
+    async def categorize_pending(
+        self, user_id: UUID, chunk_size: int = KEYWORD_CHUNK_SIZE
+    ) -> KeywordCategorizationResult:
+        """
+        Categorize a user's uncategorized transactions by keyword.
+
+        Confident matches set ``category_id`` and propagate to rollups,
+        balances and budgets; weaker ones only record the suggestion. Both
+        write ``ai_confidence_score`` and tag ``ai_categorization_data``
+        with the keywords that matched. Transactions are processed in
+        keyset-paged chunks locked with ``SKIP LOCKED``, each committed on
+        its own.
+
+        Args:
+            user_id: User ID
+            chunk_size: Transactions categorized per chunk
+
+        Returns:
+            Counts of scanned, assigned and suggested transactions
+        """
+        index = await keyword_index_cache.get(self.db, self.redis, user_id)
+        outcome = KeywordCategorizationResult()
+        cursor: Optional[UUID] = None
+
+        while True:
+            query = (
+                select(
+                    Transaction.id,
+                    Transaction.user_id,
+                    Transaction.category_id,
+                    Transaction.from_account_id,
+                    Transaction.to_account_id,
+                    Transaction.amount,
+                    Transaction.currency,
+                    Transaction.transaction_type,
+                    Transaction.transaction_date,
+                    Transaction.description,
+                )
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.category_id.is_(None),
+                    Transaction.ai_confidence_score.is_(None),
+                    Transaction.transaction_type.in_(CATEGORIZABLE_TYPES),
+                    Transaction.is_deleted == False,  # noqa: E712
+                )
+                .order_by(Transaction.id)
+                .limit(chunk_size)
+                .with_for_update(skip_locked=True)
+            )
+            if cursor is not None:
+                query = query.where(Transaction.id > cursor)
+            rows = (await self.db.execute(query)).all()
+            if not rows:
+                break
+            cursor = rows[-1].id
+            outcome.scanned += len(rows)
+
+            updates: List[dict] = []
+            changes: List[TransactionChange] = []
+            for row in rows:
+                found = index.match(row.description, row.transaction_type)
+                if found is None:
+                    continue
+                values = {
+                    "id": row.id,
+                    "ai_suggested_category_id": found.category_id,
+                    "ai_confidence_score": found.confidence,
+                    "ai_categorization_data": {
+                        "source": "keywords",
+                        "keywords": list(found.keywords),
+                    },
+                }
+                if found.is_confident:
+                    values["category_id"] = found.category_id
+                    values["ai_categorized"] = True
+                    before = TransactionSnapshot.from_model(row)
+                    changes.append(
+                        TransactionChange(
+                            before=before,
+                            after=replace(before, category_id=found.category_id),
+                        )
+                    )
+                updates.append(values)
+
+            if updates:
+                # Bulk UPDATE by primary key, grouped by the columns each row sets
+                await self.db.execute(update(Transaction), updates)
+            budget_ids: Set[UUID] = await apply_transaction_changes(self.db, changes)
+            await self.db.commit()
+            if budget_ids:
+                await BudgetAlertService(self.db, self.redis).mark_dirty(budget_ids)
+
+            outcome.assigned += len(changes)
+            outcome.suggested += len(updates) - len(changes)
+
+        logger.info(
+            "Transactions categorized by keyword",
+            user_id=user_id,
+            scanned=outcome.scanned,
+            assigned=outcome.assigned,
+            suggested=outcome.suggested,
+        )
+        return outcome
@@ -0,0 +1,691 @@
+"""
+Similarity categorizer for the SpendAhead backend.
+
+This module predicts categories from a user's own categorization history.
+Normalized descriptions are embedded as hashed character trigram vectors,
+a user's labeled history is kept as one float32 matrix in a memory-mapped
+cache file, and new descriptions are categorized by a batched
+matrix-multiply cosine top-k vote. The matrix is extended incrementally
+from transactions labeled since the last update, so no model or network
+call is involved. The index records which transactions it holds, so a
+change to one of them (a new category, a deletion) rebuilds it instead of
+leaving a stale vote behind.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.services.categorization_cache import normalize_description
+from app.services.keyword_categorizer import CATEGORIZABLE_TYPES
+
+logger = get_logger(__name__)
+
+# Width of the hashed trigram vectors (a power of two)
+NGRAM_DIMENSIONS = 256
+
+# Neighbours voting on each description
+SIMILARITY_TOP_K = 5
+
+# Minimum cosine similarity for a neighbour to vote
+SIMILARITY_MIN_SCORE = 0.5
+
+# Distinct labeled descriptions kept per user
+SIMILARITY_HISTORY_LIMIT = 10000
+
+# Query rows multiplied against the history at once, bounding memory
+SIMILARITY_QUERY_CHUNK = 1024
+
+# Seconds a labeling change may take to commit after its updated_at was
+# stamped; incremental updates re-scan this window behind the watermark
+SIMILARITY_SETTLE_SECONDS = 60
+
+# Row layout of the per-row label file
+ROW_DTYPE = np.dtype([("label", np.int32), ("type", np.int8), ("weight", np.float32)])
+
+# Layout of the member file: each indexed transaction's ID and the
+# updated_at it was indexed at, in microseconds since the epoch, by ID
+MEMBER_DTYPE = np.dtype([("id", "S16"), ("updated_at", np.int64)])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_TYPE_CODES = {
+    transaction_type: code for code, transaction_type in enumerate(CATEGORIZABLE_TYPES)
+}
+
+# Knuth's multiplicative hash constant
+_HASH_MULTIPLIER = np.uint32(2654435761)
+
+
+def vectorize(texts: Sequence[str], dimensions: int = NGRAM_DIMENSIONS) -> np.ndarray:
+    """
+    Embed texts as L2-normalized hashed character trigram vectors.
+
+    All texts are hashed in one vectorized pass: they are concatenated into
+    a single byte array, trigram codes are built with shifts, and counts
+    are accumulated with one ``bincount``. Hashing is deterministic, so
+    vectors are stable across processes.
+
+    Args:
+        texts: Normalized descriptions
+        dimensions: Vector width (a power of two)
+
+    Returns:
+        float32 matrix with one row per text
+    """
+    count = len(texts)
+    if not count:
+        return np.zeros((0, dimensions), np.float32)
+
+    encoded = [f" {text} ".encode() for text in texts]
+    lengths = np.fromiter(map(len, encoded), np.int64, count)
+    data = np.frombuffer(b"".join(encoded), np.uint8).astype(np.uint32)
+    rows = np.repeat(np.arange(count, dtype=np.int64), lengths)
+
+    # A trigram is valid when its first and last byte belong to the same text
+    valid = rows[:-2] == rows[2:]
+    codes = (data[:-2] << 16 | data[1:-1] << 8 | data[2:])[valid]
+    shift = np.uint32(32 - (dimensions.bit_length() - 1))
+    buckets = (codes * _HASH_MULTIPLIER) >> shift
+
+    counts = np.bincount(
+        rows[:-2][valid] * dimensions + buckets,
+        minlength=count * dimensions,
+    ).reshape(count, dimensions)
+    vectors = np.sqrt(counts, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    np.divide(vectors, norms, out=vectors, where=norms > 0)
+    return vectors
+
+
+def _micros(value: datetime) -> int:
+    """Get a timestamp as whole microseconds since the epoch."""
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _member_array(members: Sequence[Tuple[UUID, datetime]]) -> np.ndarray:
+    """Build a member array from (transaction ID, updated_at) pairs."""
+    array = np.array(
+        [(member_id.bytes, _micros(updated_at)) for member_id, updated_at in members],
+        dtype=MEMBER_DTYPE,
+    )
+    array.sort(order="id")
+    return array
+
+
+def _top_candidates(
+    scores: np.ndarray, top_k: int, min_score: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Select each query's top-k neighbours scoring at least ``min_score``.
+
+    For the small k used here, k row-wise ``argmax`` passes that mask out
+    each winner are several times faster than ``argpartition``. ``scores``
+    is overwritten.
+
+    Args:
+        scores: Query-by-history similarity matrix
+        top_k: Neighbours kept per query
+        min_score: Minimum similarity kept
+
+    Returns:
+        Query row, history row and similarity arrays, grouped by query row
+    """
+    k = min(top_k, scores.shape[1])
+    query_rows = np.arange(len(scores))
+    neighbours = np.empty((len(scores), k), np.intp)
+    similarities = np.empty((len(scores), k), scores.dtype)
+    for rank in range(k):
+        best = scores.argmax(axis=1)
+        neighbours[:, rank] = best
+        similarities[:, rank] = scores[query_rows, best]
+        scores[query_rows, best] = -np.inf
+
+    similarities = similarities.ravel()
+    keep = similarities >= min_score
+    return (
+        np.repeat(query_rows, k)[keep],
+        neighbours.ravel()[keep],
+        similarities[keep],
+    )
+
+
+@dataclass(frozen=True)
+class SimilarityMatch:
+    """Category predicted from similar past transactions."""
+
+    category_id: UUID
+    confidence: Decimal
+    similarity: float
+
+
+@dataclass
+class SimilarityIndex:
+    """
+    A user's labeled history as a vector matrix.
+
+    ``vectors`` holds one row per distinct (description, type, category)
+    and is usually a read-only memory map; ``rows`` holds each row's
+    category label, transaction type code and vote weight. Rows are sorted
+    by transaction type. ``members`` records the transactions the rows
+    were built from.
+    """
+
+    user_id: UUID
+    generation: str
+    vectors: np.ndarray
+    rows: np.ndarray
+    category_ids: List[UUID]
+    watermark: Optional[datetime]
+    members: np.ndarray = field(default_factory=lambda: np.zeros(0, MEMBER_DTYPE))
+
+    @property
+    def size(self) -> int:
+        """Get the number of history rows."""
+        return len(self.rows)
+
+    @classmethod
+    def build(
+        cls,
+        user_id: UUID,
+        labeled: Sequence[Tuple[str, str, UUID, float]],
+        watermark: Optional[datetime],
+        base: Optional["SimilarityIndex"] = None,
+        members: Sequence[Tuple[UUID, datetime]] = (),
+    ) -> "SimilarityIndex":
+        """
+        Build an index from labeled descriptions, optionally extending one.
+
+        Args:
+            user_id: User ID
+            labeled: (description, transaction type, category ID, weight)
+            watermark: Latest update time covered by the index
+            base: Existing index to append to; it must not hold any of
+                ``members``
+            members: (transaction ID, updated_at) of the transactions
+                ``labeled`` was built from
+
+        Returns:
+            A new in-memory index
+        """
+        category_ids = list(base.category_ids) if base else []
+        labels = {category_id: index for index, category_id in enumerate(category_ids)}
+
+        merged: Dict[Tuple[str, int, int], float] = {}
+        for description, transaction_type, category_id, weight in labeled:
+            text = normalize_description(description)
+            type_code = _TYPE_CODES.get(transaction_type)
+            if not text or type_code is None:
+                continue
+            if category_id not in labels:
+                labels[category_id] = len(category_ids)
+                category_ids.append(category_id)
+            key = (text, type_code, labels[category_id])
+            merged[key] = merged.get(key, 0.0) + weight
+
+        rows = np.array(
+            [
+                (label, type_code, weight)
+                for (_, type_code, label), weight in merged.items()
+            ],
+            dtype=ROW_DTYPE,
+        )
+        vectors = vectorize([text for text, _, _ in merged])
+        member_array = _member_array(members)
+        if base is not None:
+            rows = np.concatenate([base.rows, rows])
+            vectors = np.concatenate([base.vectors, vectors])
+            member_array = np.concatenate([base.members, member_array])
+            member_array.sort(order="id")
+
+        # Keep rows grouped by transaction type for slicing in match()
+        order = np.argsort(rows["type"], kind="stable")
+        rows = rows[order]
+        vectors = vectors[order]
+
+        return cls(
+            user_id=user_id,
+            generation=uuid4().hex,
+            vectors=vectors,
+            rows=rows,
+            category_ids=category_ids,
+            watermark=watermark,
+            members=member_array,
+        )
+
+    def indexed_at(self, transaction_ids: Sequence[UUID]) -> List[Optional[int]]:
+        """
+        Look up when transactions were indexed.
+
+        Args:
+            transaction_ids: Transaction IDs
+
+        Returns:
+            The updated_at each transaction was indexed at, in microseconds
+            since the epoch, or None for transactions the index does not hold
+        """
+        if not len(self.members) or not transaction_ids:
+            return [None] * len(transaction_ids)
+        keys = np.array([value.bytes for value in transaction_ids], dtype="S16")
+        ids = self.members["id"]
+        positions = np.minimum(np.searchsorted(ids, keys), len(ids) - 1)
+        found = ids[positions] == keys
+        stamps = self.members["updated_at"][positions]
+        return [
+            int(stamp) if hit else None for stamp, hit in zip(stamps.tolist(), found)
+        ]
+
+    def match(
+        self,
+        descriptions: Sequence[str],
+        transaction_types: Sequence[str],
+        top_k: int = SIMILARITY_TOP_K,
+        min_score: float = SIMILARITY_MIN_SCORE,
+    ) -> List[Optional[SimilarityMatch]]:
+        """
+        Predict a category for each description by a top-k neighbour vote.
+
+        Identical normalized descriptions are scored once. Each neighbour
+        of the same transaction type with cosine similarity of at least
+        ``min_score`` votes for its category with weight similarity times
+        log-scaled row weight. Confidence is the winner's share of the vote
+        scaled by its best similarity.
+
+        Args:
+            descriptions: Raw transaction descriptions
+            transaction_types: Transaction type of each description
+            top_k: Neighbours voting on each description
+            min_score: Minimum similarity for a neighbour to vote
+
+        Returns:
+            The predicted category of each description, or None
+        """
+        results: List[Optional[SimilarityMatch]] = [None] * len(descriptions)
+        if not self.size:
+            return results
+
+        # Group positions by unique (normalized text, type)
+        queries: Dict[Tuple[str, int], List[int]] = {}
+        for position, (description, transaction_type) in enumerate(
+            zip(descriptions, transaction_types)
+        ):
+            type_code = _TYPE_CODES.get(transaction_type)
+            text = normalize_description(description)
+            if text and type_code is not None:
+                queries.setdefault((text, type_code), []).append(position)
+
+        types = self.rows["type"]
+        for type_code in set(type_code for _, type_code in queries):
+            # Rows are sorted by type, so each type is a contiguous slice
+            start, stop = np.searchsorted(types, [type_code, type_code + 1])
+            if start == stop:
+                continue
+            vectors = self.vectors[start:stop]
+            labels = self.rows["label"][start:stop]
+            weights = np.log1p(self.rows["weight"][start:stop])
+            keys = [key for key in queries if key[1] == type_code]
+
+            for offset in range(0, len(keys), SIMILARITY_QUERY_CHUNK):
+                chunk = keys[offset : offset + SIMILARITY_QUERY_CHUNK]
+                scores = vectorize([text for text, _ in chunk]) @ vectors.T
+                query_rows, neighbours, similarities = _top_candidates(
+                    scores, top_k, min_score
+                )
+                if not len(query_rows):
+                    continue
+                for group, label, confidence, similarity in zip(
+                    *self._vote(query_rows, neighbours, similarities, labels, weights)
+                ):
+                    found = SimilarityMatch(
+                        category_id=self.category_ids[label],
+                        confidence=Decimal(f"{confidence:.2f}"),
+                        similarity=round(float(similarity), 4),
+                    )
+                    for position in queries[chunk[group]]:
+                        results[position] = found
+        return results
+
+    def _vote(
+        self,
+        query_rows: np.ndarray,
+        neighbours: np.ndarray,
+        similarities: np.ndarray,
+        labels: np.ndarray,
+        weights: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tally the neighbour votes of a chunk of queries at once.
+
+        Returns:
+            Query row, winning label, confidence and best similarity of
+            every query with at least one vote
+        """
+        label_count = len(self.category_ids)
+        pairs, inverse = np.unique(
+            query_rows * label_count + labels[neighbours], return_inverse=True
+        )
+        votes = np.bincount(inverse, weights=similarities * weights[neighbours])
+        best = np.zeros(len(pairs))
+        np.maximum.at(best, inverse, similarities)
+
+        pair_queries = pairs // label_count
+        totals = np.bincount(pair_queries, weights=votes)
+        order = np.lexsort((-votes, pair_queries))
+        winners = order[np.r_[True, np.diff(pair_queries[order]) != 0]]
+        queries = pair_queries[winners]
+        confidence = np.minimum(votes[winners] / totals[queries] * best[winners], 0.99)
+        return queries, pairs[winners] % label_count, confidence, best[winners]
+
+
+class SimilarityIndexStore:
+    """
+    Directory of memory-mapped user indexes.
+
+    Each user has a directory holding ``meta.json`` plus one vectors, one
+    rows and one members file per generation. A save writes a new generation
+    and then
+    atomically replaces ``meta.json``, so readers always see a complete
+    index; processes that still map an old generation keep reading it
+    until they reload.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """Initialize the store under ``directory`` (defaults to settings)."""
+        self.directory = Path(directory or settings.similarity_cache_dir)
+
+    def load(self, user_id: UUID) -> Optional[SimilarityIndex]:
+        """
+        Open a user's index, memory-mapping its vectors.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The index, or None if the user has none yet
+        """
+        user_dir = self.directory / str(user_id)
+        try:
+            meta = json.loads((user_dir / "meta.json").read_text())
+            vectors = np.load(
+                user_dir / f"{meta['generation']}.vectors.npy", mmap_mode="r"
+            )
+            rows = np.load(user_dir / f"{meta['generation']}.rows.npy")
+            members = np.load(user_dir / f"{meta['generation']}.members.npy")
+        except (OSError, ValueError, KeyError):
+            return None
+        if (
+            vectors.shape != (len(rows), NGRAM_DIMENSIONS)
+            or members.dtype != MEMBER_DTYPE
+        ):
+            return None
+        return SimilarityIndex(
+            user_id=user_id,
+            generation=meta["generation"],
+            vectors=vectors,
+            rows=rows,
+            category_ids=[UUID(value) for value in meta["category_ids"]],
+            watermark=(
+                datetime.fromisoformat(meta["watermark"]) if meta["watermark"] else None
+            ),
+            members=members,
+        )
+
+    def save(self, index: SimilarityIndex) -> SimilarityIndex:
+        """
+        Persist an index as a new generation and map it back.
+
+        Args:
+            index: In-memory index
+
+        Returns:
+            The saved index with its vectors memory-mapped
+        """
+        user_dir = self.directory / str(index.user_id)
+        user_dir.mkdir(parents=True, exist_ok=True)
+        np.save(user_dir / f"{index.generation}.vectors.npy", index.vectors)
+        np.save(user_dir / f"{index.generation}.rows.npy", index.rows)
+        np.save(user_dir / f"{index.generation}.members.npy", index.members)
+        self.save_meta(index)
+
+        for path in user_dir.glob("*.npy"):
+            if not path.name.startswith(index.generation):
+                path.unlink(missing_ok=True)
+
+        index.vectors = np.load(
+            user_dir / f"{index.generation}.vectors.npy", mmap_mode="r"
+        )
+        return index
+
+    def save_meta(self, index: SimilarityIndex) -> None:
+        """
+        Atomically point a user's ``meta.json`` at an index generation.
+
+        Called alone, this advances the watermark of a saved generation
+        without rewriting its files.
+
+        Args:
+            index: Index whose generation files are already saved
+        """
+        user_dir = self.directory / str(index.user_id)
+        meta_tmp = user_dir / f"meta.{index.generation}.{uuid4().hex}.tmp"
+        meta_tmp.write_text(
+            json.dumps(
+                {
+                    "generation": index.generation,
+                    "category_ids": [str(value) for value in index.category_ids],
+                    "watermark": (
+                        index.watermark.isoformat() if index.watermark else None
+                    ),
+                }
+            )
+        )
+        os.replace(meta_tmp, user_dir / "meta.json")
+
+    def delete(self, user_id: UUID) -> None:
+        """Remove a user's index."""
+        shutil.rmtree(self.directory / str(user_id), ignore_errors=True)
+
+
+class SimilarityCategorizer:
+    """Service categorizing transactions by similarity to a user's history."""
+
+    def __init__(self, db: AsyncSession, store: Optional[SimilarityIndexStore] = None):
+        """Initialize the categorizer with a database session and index store."""
+        self.db = db
+        self.store = store or SimilarityIndexStore()
+
+    async def categorize(
+        self, user_id: UUID, items: Sequence[Tuple[str, str]]
+    ) -> List[Optional[SimilarityMatch]]:
+        """
+        Categorize a batch of descriptions from the user's history.
+
+        Args:
+            user_id: User ID
+            items: (description, transaction_type) pairs
+
+        Returns:
+            The predicted category of each item, or None
+        """
+        index = await self.get_index(user_id)
+        return index.match(
+            [description for description, _ in items],
+            [transaction_type for _, transaction_type in items],
+        )
+
+    async def get_index(self, user_id: UUID) -> SimilarityIndex:
+        """
+        Get a user's index, updated with transactions changed since it was saved.
+
+        The index is re-opened from the store on every call, so updates
+        saved by other processes are picked up, and costs one query when
+        nothing changed. Changes are re-scanned from the settle window
+        behind the watermark, so labels committed late are not missed.
+        Newly labeled transactions are appended; the index is rebuilt from
+        scratch when it does not exist yet, when a transaction it holds was
+        recategorized or deleted, or when appends or the backlog of changes
+        outgrow the history limit.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The user's current index
+        """
+        index = self.store.load(user_id)
+        if index is None or index.watermark is None:
+            return await self.rebuild(user_id)
+
+        since = index.watermark - timedelta(seconds=SIMILARITY_SETTLE_SECONDS)
+        changes = await self._load_changes(user_id, since)
+        if len(changes) > SIMILARITY_HISTORY_LIMIT:
+            return await self.rebuild(user_id)
+
+        fresh = []
+        for row, indexed_at in zip(
+            changes, index.indexed_at([row.id for row in changes])
+        ):
+            if indexed_at is None:
+                if (
+                    row.category_id is not None
+                    and not row.is_deleted
+                    and row.transaction_type in CATEGORIZABLE_TYPES
+                ):
+                    fresh.append(row)
+            elif indexed_at != _micros(row.updated_at):
+                # A row it holds changed: its old vote must go
+                return await self.rebuild(user_id)
+
+        watermark = max([index.watermark] + [row.updated_at for row in changes])
+        if fresh:
+            if index.size + len(fresh) > SIMILARITY_HISTORY_LIMIT * 1.25:
+                return await self.rebuild(user_id)
+            index = self.store.save(
+                SimilarityIndex.build(
+                    user_id,
+                    [
+                        (row.description, row.transaction_type, row.category_id, 1.0)
+                        for row in fresh
+                    ],
+                    watermark,
+                    base=index,
+                    members=[(row.id, row.updated_at) for row in fresh],
+                )
+            )
+        elif watermark != index.watermark:
+            index.watermark = watermark
+            self.store.save_meta(index)
+        return index
+
+    async def rebuild(self, user_id: UUID) -> SimilarityIndex:
+        """
+        Rebuild a user's index from their most recent labeled history.
+
+        The watermark is the database time of the rebuild, so changes to
+        rows it did not cover are picked up by the next incremental update.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            The new index
+        """
+        watermark = (await self.db.execute(select(func.now()))).scalar_one()
+        labeled, members = await self._load_labeled(user_id)
+        index = self.store.save(
+            SimilarityIndex.build(user_id, labeled, watermark, members=members)
+        )
+        logger.info("Similarity index rebuilt", user_id=user_id, rows=index.size)
+        return index
+
+    async def _load_labeled(
+        self, user_id: UUID
+    ) -> Tuple[List[Tuple[str, str, UUID, float]], List[Tuple[UUID, datetime]]]:
+        """
+        Load labeled descriptions, grouped by description, type and category.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            (description, type, category ID, count) tuples, most recent
+            first, and the (ID, updated_at) of the transactions behind them
+        """
+        result = await self.db.execute(
+            select(
+                Transaction.description,
+                Transaction.transaction_type,
+                Transaction.category_id,
+                func.count().label("weight"),
+                func.array_agg(Transaction.id).label("ids"),
+                func.array_agg(Transaction.updated_at).label("updated"),
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.category_id.is_not(None),
+                Transaction.transaction_type.in_(CATEGORIZABLE_TYPES),
+                Transaction.is_deleted == False,  # noqa: E712
+            )
+            .group_by(
+                Transaction.description,
+                Transaction.transaction_type,
+                Transaction.category_id,
+            )
+            .order_by(func.max(Transaction.updated_at).desc())
+            .limit(SIMILARITY_HISTORY_LIMIT)
+        )
+        labeled: List[Tuple[str, str, UUID, float]] = []
+        members: List[Tuple[UUID, datetime]] = []
+        for row in result.all():
+            labeled.append(
+                (
+                    row.description,
+                    row.transaction_type,
+                    row.category_id,
+                    float(row.weight),
+                )
+            )
+            members.extend(zip(row.ids, row.updated))
+        return labeled, members
+
+    async def _load_changes(self, user_id: UUID, since: datetime) -> List[Any]:
+        """
+        Load the user's transactions changed after a time, labeled or not.
+
+        Args:
+            user_id: User ID
+            since: Only include transactions updated after this time
+
+        Returns:
+            Up to one more row than the history limit, oldest change first
+        """
+        result = await self.db.execute(
+            select(
+                Transaction.id,
+                Transaction.description,
+                Transaction.transaction_type,
+                Transaction.category_id,
+                Transaction.is_deleted,
+                Transaction.updated_at,
+            )
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.updated_at > since,
+            )
+            .order_by(Transaction.updated_at, Transaction.id)
+            .limit(SIMILARITY_HISTORY_LIMIT + 1)
+        )
+        return list(result.all())
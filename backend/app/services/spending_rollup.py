@@ -0,0 +1,459 @@
+"""
+Spending rollup service for the SpendAhead backend.
+
+This module maintains the ``spending_rollups`` table incrementally from
+transaction change events, rebuilds it for backfills, and serves the
+aggregate reads used by dashboards and budget views.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import (
+    Date,
+    Integer,
+    Numeric,
+    String,
+    cast,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.category import Category
+from app.models.spending_rollup import SpendingRollup
+from app.models.transaction import Transaction
+from app.services.transaction_events import TransactionChange, iter_contributions
+
+logger = get_logger(__name__)
+
+# (user_id, month, category_id, currency, transaction_type)
+BucketKey = Tuple[UUID, date, Optional[UUID], str, str]
+
+
+@dataclass
+class _BucketDelta:
+    """Accumulated change for a single rollup bucket within a batch."""
+
+    total: Decimal = Decimal("0.00")
+    count: int = 0
+    min_added: Optional[Decimal] = None
+    max_added: Optional[Decimal] = None
+    has_removals: bool = False
+
+
+def transaction_month_expr() -> Any:
+    """Get the SQL expression bucketing ``transaction_date`` by UTC month."""
+    return cast(
+        func.date_trunc(
+            literal_column("'month'"),
+            func.timezone(literal_column("'UTC'"), Transaction.transaction_date),
+        ),
+        Date,
+    )
+
+
+class SpendingRollupService:
+    """Service for maintaining and reading monthly spending rollups."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the rollup service with a database session."""
+        self.db = db
+
+    async def apply_changes(self, changes: Iterable[TransactionChange]) -> int:
+        """
+        Apply a batch of transaction changes to the rollup table.
+
+        Must be called after the changes have been flushed, within the same
+        database transaction. Buckets that only gained transactions are
+        updated with a single delta upsert; buckets that lost transactions
+        are recomputed from ``transactions`` because their min/max cannot be
+        derived from a delta.
+
+        Args:
+            changes: Transaction change events
+
+        Returns:
+            Number of rollup buckets touched
+        """
+        buckets: Dict[BucketKey, _BucketDelta] = {}
+        category_deltas: Dict[UUID, Tuple[int, Decimal]] = {}
+
+        for snapshot, sign in iter_contributions(changes):
+            key: BucketKey = (
+                snapshot.user_id,
+                snapshot.month,
+                snapshot.category_id,
+                snapshot.currency,
+                snapshot.transaction_type,
+            )
+            delta = buckets.setdefault(key, _BucketDelta())
+            delta.total += sign * snapshot.amount
+            delta.count += sign
+            if sign < 0:
+                delta.has_removals = True
+            else:
+                if delta.min_added is None or snapshot.amount < delta.min_added:
+                    delta.min_added = snapshot.amount
+                if delta.max_added is None or snapshot.amount > delta.max_added:
+                    delta.max_added = snapshot.amount
+
+            if snapshot.category_id is not None:
+                count, total = category_deltas.get(
+                    snapshot.category_id, (0, Decimal("0.00"))
+                )
+                category_deltas[snapshot.category_id] = (
+                    count + sign,
+                    total + sign * snapshot.amount,
+                )
+
+        additive = {k: d for k, d in buckets.items() if not d.has_removals}
+        recompute = [k for k, d in buckets.items() if d.has_removals]
+
+        if additive:
+            await self._upsert_deltas(additive)
+        if recompute:
+            await self._recompute_buckets(recompute)
+        if category_deltas:
+            await self._apply_category_deltas(category_deltas)
+
+        return len(buckets)
+
+    async def rebuild(self, user_id: Optional[UUID] = None) -> int:
+        """
+        Rebuild rollups from scratch for one user or for everyone.
+
+        Args:
+            user_id: Optional user to restrict the rebuild to
+
+        Returns:
+            Number of rollup buckets written
+        """
+        purge = delete(SpendingRollup)
+        if user_id is not None:
+            purge = purge.where(SpendingRollup.user_id == user_id)
+        await self.db.execute(purge)
+
+        source = self._aggregate_select()
+        if user_id is not None:
+            source = source.where(Transaction.user_id == user_id)
+        result = await self.db.execute(
+            insert(SpendingRollup)
+            .from_select(self._rollup_columns(), source)
+            .returning(SpendingRollup.id)
+        )
+        written = len(result.all())
+
+        await self._refresh_category_counters(user_id)
+
+        logger.info("Spending rollups rebuilt", user_id=user_id, buckets=written)
+        return written
+
+    async def get_monthly_rollups(
+        self,
+        user_id: UUID,
+        start_month: date,
+        end_month: date,
+        transaction_type: Optional[str] = None,
+    ) -> List[SpendingRollup]:
+        """
+        Get the raw rollup buckets for a user and month range.
+
+        Args:
+            user_id: User ID
+            start_month: First month (inclusive)
+            end_month: Last month (inclusive)
+            transaction_type: Optional transaction type filter
+
+        Returns:
+            Rollup rows ordered by month
+        """
+        query = select(SpendingRollup).where(
+            SpendingRollup.user_id == user_id,
+            SpendingRollup.month >= start_month,
+            SpendingRollup.month <= end_month,
+        )
+        if transaction_type is not None:
+            query = query.where(SpendingRollup.transaction_type == transaction_type)
+        result = await self.db.execute(query.order_by(SpendingRollup.month))
+        return list(result.scalars().all())
+
+    async def get_category_totals(
+        self,
+        user_id: UUID,
+        start_month: date,
+        end_month: date,
+        transaction_type: str = "expense",
+        category_ids: Optional[List[UUID]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-category totals over a month range.
+
+        Args:
+            user_id: User ID
+            start_month: First month (inclusive)
+            end_month: Last month (inclusive)
+            transaction_type: Transaction type to aggregate
+            category_ids: Optional categories to restrict to
+
+        Returns:
+            One dictionary per (category, currency) with totals and counts
+        """
+        query = (
+            select(
+                SpendingRollup.category_id,
+                SpendingRollup.currency,
+                func.sum(SpendingRollup.total_amount).label("total_amount"),
+                func.sum(SpendingRollup.transaction_count).label("transaction_count"),
+                func.min(SpendingRollup.min_amount).label("min_amount"),
+                func.max(SpendingRollup.max_amount).label("max_amount"),
+            )
+            .where(
+                SpendingRollup.user_id == user_id,
+                SpendingRollup.month >= start_month,
+                SpendingRollup.month <= end_month,
+                SpendingRollup.transaction_type == transaction_type,
+            )
+            .group_by(SpendingRollup.category_id, SpendingRollup.currency)
+            .order_by(func.sum(SpendingRollup.total_amount).desc())
+        )
+        if category_ids is not None:
+            query = query.where(SpendingRollup.category_id.in_(category_ids))
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    async def get_monthly_totals(
+        self,
+        user_id: UUID,
+        start_month: date,
+        end_month: date,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get per-month totals by transaction type over a month range.
+
+        Args:
+            user_id: User ID
+            start_month: First month (inclusive)
+            end_month: Last month (inclusive)
+
+        Returns:
+            One dictionary per (month, currency, transaction_type)
+        """
+        query = (
+            select(
+                SpendingRollup.month,
+                SpendingRollup.currency,
+                SpendingRollup.transaction_type,
+                func.sum(SpendingRollup.total_amount).label("total_amount"),
+                func.sum(SpendingRollup.transaction_count).label("transaction_count"),
+            )
+            .where(
+                SpendingRollup.user_id == user_id,
+                SpendingRollup.month >= start_month,
+                SpendingRollup.month <= end_month,
+            )
+            .group_by(
+                SpendingRollup.month,
+                SpendingRollup.currency,
+                SpendingRollup.transaction_type,
+            )
+            .order_by(SpendingRollup.month)
+        )
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    @staticmethod
+    def _rollup_columns() -> List[Any]:
+        """Get the rollup columns in aggregate-select order."""
+        return [
+            SpendingRollup.user_id,
+            SpendingRollup.month,
+            SpendingRollup.category_id,
+            SpendingRollup.currency,
+            SpendingRollup.transaction_type,
+            SpendingRollup.total_amount,
+            SpendingRollup.transaction_count,
+            SpendingRollup.min_amount,
+            SpendingRollup.max_amount,
+        ]
+
+    @staticmethod
+    def _aggregate_select() -> Any:
+        """Build the grouped select that computes rollups from transactions."""
+        month = transaction_month_expr()
+        return (
+            select(
+                Transaction.user_id,
+                month,
+                Transaction.category_id,
+                Transaction.currency,
+                Transaction.transaction_type,
+                func.sum(Transaction.amount),
+                func.count(),
+                func.min(Transaction.amount),
+                func.max(Transaction.amount),
+            )
+            .where(Transaction.is_deleted == False)  # noqa: E712
+            .group_by(
+                Transaction.user_id,
+                month,
+                Transaction.category_id,
+                Transaction.currency,
+                Transaction.transaction_type,
+            )
+        )
+
+    @staticmethod
+    def _keys_values(keys: List[BucketKey]) -> Any:
+        """Build a VALUES relation of bucket keys for set-based joins."""
+        return (
+            values(
+                column("user_id", PG_UUID(as_uuid=True)),
+                column("month", Date),
+                column("category_id", PG_UUID(as_uuid=True)),
+                column("currency", String(3)),
+                column("transaction_type", String(20)),
+                name="bucket_keys",
+            )
+            .data(keys)
+            .alias("bucket_keys")
+        )
+
+    async def _upsert_deltas(self, deltas: Dict[BucketKey, _BucketDelta]) -> None:
+        """Upsert additive bucket deltas in a single multi-row statement."""
+        rows = [
+            {
+                "user_id": key[0],
+                "month": key[1],
+                "category_id": key[2],
+                "currency": key[3],
+                "transaction_type": key[4],
+                "total_amount": delta.total,
+                "transaction_count": delta.count,
+                "min_amount": delta.min_added,
+                "max_amount": delta.max_added,
+            }
+            for key, delta in deltas.items()
+        ]
+        stmt = insert(SpendingRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SpendingRollup.user_id,
+                SpendingRollup.month,
+                SpendingRollup.category_id,
+                SpendingRollup.currency,
+                SpendingRollup.transaction_type,
+            ],
+            set_={
+                "total_amount": SpendingRollup.total_amount
+                + stmt.excluded.total_amount,
+                "transaction_count": SpendingRollup.transaction_count
+                + stmt.excluded.transaction_count,
+                "min_amount": func.least(
+                    SpendingRollup.min_amount, stmt.excluded.min_amount
+                ),
+                "max_amount": func.greatest(
+                    SpendingRollup.max_amount, stmt.excluded.max_amount
+                ),
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _recompute_buckets(self, keys: List[BucketKey]) -> None:
+        """Recompute the given buckets from the transactions table."""
+        bucket_keys = self._keys_values(keys)
+
+        await self.db.execute(
+            delete(SpendingRollup).where(
+                SpendingRollup.user_id == bucket_keys.c.user_id,
+                SpendingRollup.month == bucket_keys.c.month,
+                SpendingRollup.category_id.is_not_distinct_from(
+                    bucket_keys.c.category_id
+                ),
+                SpendingRollup.currency == bucket_keys.c.currency,
+                SpendingRollup.transaction_type == bucket_keys.c.transaction_type,
+            )
+        )
+
+        month = transaction_month_expr()
+        source = self._aggregate_select().join(
+            bucket_keys,
+            (Transaction.user_id == bucket_keys.c.user_id)
+            & (month == bucket_keys.c.month)
+            & Transaction.category_id.is_not_distinct_from(bucket_keys.c.category_id)
+            & (Transaction.currency == bucket_keys.c.currency)
+            & (Transaction.transaction_type == bucket_keys.c.transaction_type),
+        )
+        stmt = insert(SpendingRollup).from_select(self._rollup_columns(), source)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                SpendingRollup.user_id,
+                SpendingRollup.month,
+                SpendingRollup.category_id,
+                SpendingRollup.currency,
+                SpendingRollup.transaction_type,
+            ],
+            set_={
+                "total_amount": stmt.excluded.total_amount,
+                "transaction_count": stmt.excluded.transaction_count,
+                "min_amount": stmt.excluded.min_amount,
+                "max_amount": stmt.excluded.max_amount,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+    async def _apply_category_deltas(
+        self, deltas: Dict[UUID, Tuple[int, Decimal]]
+    ) -> None:
+        """Apply usage counter deltas to ``Category`` in one statement."""
+        category_deltas = (
+            values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("count_delta", Integer),
+                column("amount_delta", Numeric(14, 2)),
+                name="category_deltas",
+            )
+            .data([(cid, count, total) for cid, (count, total) in deltas.items()])
+            .alias("category_deltas")
+        )
+        await self.db.execute(
+            update(Category)
+            .where(Category.id == category_deltas.c.id)
+            .values(
+                transaction_count=Category.transaction_count
+                + category_deltas.c.count_delta,
+                total_amount=Category.total_amount + category_deltas.c.amount_delta,
+            )
+        )
+
+    async def _refresh_category_counters(self, user_id: Optional[UUID]) -> None:
+        """Recompute ``Category`` usage counters from the rollups."""
+
+        def total_of(aggregate: Any) -> Any:
+            return (
+                select(func.coalesce(func.sum(aggregate), 0))
+                .where(SpendingRollup.category_id == Category.id)
+                .correlate(Category)
+                .scalar_subquery()
+            )
+
+        stmt = update(Category).values(
+            transaction_count=total_of(SpendingRollup.transaction_count),
+            total_amount=total_of(SpendingRollup.total_amount),
+        )
+        if user_id is not None:
+            stmt = stmt.where(Category.user_id == user_id)
+        await self.db.execute(stmt)
@@ -0,0 +1,166 @@
+"""
+Transaction change events for the SpendAhead backend.
+
+This module defines lightweight, immutable snapshots of transactions and the
+change events built from them. Derived-data services (rollups, balances,
+budgets) consume these events instead of re-reading the transactions table.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Tuple, Union, Unpack
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from app.models.transaction import Transaction
+
+# A loaded Transaction, or a result row selecting the snapshot columns
+TransactionLike = Union[Transaction, "Row[Unpack[Tuple[Any, ...]]]"]
+
+
+def month_start(value: datetime) -> date:
+    """
+    Get the first day of the (UTC) month containing a timestamp.
+
+    Args:
+        value: Timestamp to bucket
+
+    Returns:
+        First day of the month as a date
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return date(value.year, value.month, 1)
+
+
+@dataclass(frozen=True)
+class TransactionSnapshot:
+    """Immutable view of the fields derived data depends on."""
+
+    id: UUID
+    user_id: UUID
+    category_id: Optional[UUID]
+    from_account_id: Optional[UUID]
+    to_account_id: Optional[UUID]
+    amount: Decimal
+    currency: str
+    transaction_type: str
+    transaction_date: datetime
+
+    @classmethod
+    def from_model(cls, transaction: TransactionLike) -> "TransactionSnapshot":
+        """
+        Capture a snapshot from a loaded Transaction.
+
+        Args:
+            transaction: Transaction ORM instance, or a result row selecting
+                the same columns
+
+        Returns:
+            Snapshot of the transaction's current attribute values
+        """
+        return cls(
+            id=transaction.id,
+            user_id=transaction.user_id,
+            category_id=transaction.category_id,
+            from_account_id=transaction.from_account_id,
+            to_account_id=transaction.to_account_id,
+            amount=Decimal(transaction.amount),
+            currency=transaction.currency or "USD",
+            transaction_type=transaction.transaction_type,
+            transaction_date=transaction.transaction_date,
+        )
+
+    @property
+    def month(self) -> date:
+        """Get the month bucket of the transaction."""
+        return month_start(self.transaction_date)
+
+
+@dataclass(frozen=True)
+class TransactionChange:
+    """
+    A single change to a transaction.
+
+    ``before`` is None for inserts and ``after`` is None for (soft) deletes.
+    Updates carry both, so consumers can retract the old contribution and
+    apply the new one.
+    """
+
+    before: Optional[TransactionSnapshot]
+    after: Optional[TransactionSnapshot]
+
+    @classmethod
+    def inserted(cls, transaction: Transaction) -> "TransactionChange":
+        """Build a change event for a newly inserted transaction."""
+        return cls(before=None, after=TransactionSnapshot.from_model(transaction))
+
+    @classmethod
+    def deleted(cls, snapshot: TransactionSnapshot) -> "TransactionChange":
+        """Build a change event for a deleted or soft-deleted transaction."""
+        return cls(before=snapshot, after=None)
+
+    @classmethod
+    def updated(
+        cls, before: TransactionSnapshot, transaction: Transaction
+    ) -> "TransactionChange":
+        """Build a change event from a prior snapshot and the updated row."""
+        return cls(before=before, after=TransactionSnapshot.from_model(transaction))
+
+    @property
+    def user_id(self) -> UUID:
+        """Get the owning user of the changed transaction."""
+        snapshot = self.after or self.before
+        assert snapshot is not None
+        return snapshot.user_id
+
+
+def iter_contributions(
+    changes: Iterable[TransactionChange],
+) -> Iterable[tuple[TransactionSnapshot, int]]:
+    """
+    Flatten changes into signed snapshot contributions.
+
+    Each removed snapshot yields ``-1`` and each added snapshot yields ``+1``.
+
+    Args:
+        changes: Transaction change events
+
+    Yields:
+        Tuples of (snapshot, sign)
+    """
+    for change in changes:
+        if change.before is not None:
+            yield change.before, -1
+        if change.after is not None:
+            yield change.after, 1
+
+
+def affected_user_ids(changes: Iterable[TransactionChange]) -> List[UUID]:
+    """Get the distinct users touched by a batch of changes."""
+    return list(dict.fromkeys(change.user_id for change in changes))
+
+
+def account_legs(snapshot: TransactionSnapshot) -> List[tuple[UUID, Decimal]]:
+    """
+    Get the signed balance effect of a transaction on each account it touches.
+
+    The ``from_account_id`` leg is debited and the ``to_account_id`` leg is
+    credited, so a transfer moves money between both accounts while income
+    and expenses touch a single account.
+
+    Args:
+        snapshot: Transaction snapshot
+
+    Returns:
+        List of (account_id, signed amount) tuples
+    """
+    amount = abs(snapshot.amount)
+    legs: List[tuple[UUID, Decimal]] = []
+    if snapshot.from_account_id is not None:
+        legs.append((snapshot.from_account_id, -amount))
+    if snapshot.to_account_id is not None:
+        legs.append((snapshot.to_account_id, amount))
+    return legs
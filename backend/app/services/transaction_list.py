@@ -0,0 +1,275 @@
+"""
+Transaction listing for the SpendAhead backend.
+
+This module lists a user's transactions newest first. Pages are served
+with keyset cursors; exports of whole date ranges are streamed as NDJSON
+or CSV from a server-side cursor, one fetch batch at a time, as Core rows
+rather than ORM instances. A batch is only fetched once the previous one
+has been handed to the client, so a slow reader holds back the cursor
+instead of filling memory, and the first bytes go out as soon as the
+first batch is read whatever the size of the range.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Row, Select, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import AsyncSessionLocal
+from app.core.logging import get_logger
+from app.models.transaction import Transaction
+from app.schemas.base import parse_fieldset
+from app.schemas.transaction import TransactionResponse
+from app.services.data_export import serialize_rows
+
+logger = get_logger(__name__)
+
+# Transactions returned per page when no limit is given
+TRANSACTION_PAGE_SIZE = 50
+
+# Rows fetched per round trip and sent per chunk when streaming
+STREAM_BATCH_SIZE = 1000
+
+# Fields left out unless requested with fields=, being large JSONB
+# documents or rarely needed
+OPT_IN_FIELDS = frozenset(
+    [
+        "recurring_pattern",
+        "parent_transaction_id",
+        "external_id",
+        "import_source",
+        "import_metadata",
+        "ai_confidence_score",
+        "ai_suggested_category_id",
+        "ai_categorization_data",
+    ]
+)
+
+# Fields every listing returns; page cursors are built from them
+REQUIRED_FIELDS = ("id", "transaction_date")
+
+# Field names of a listed transaction by default, in output order
+TRANSACTION_FIELDS = tuple(
+    name for name in TransactionResponse.model_fields if name not in OPT_IN_FIELDS
+)
+
+# Columns of a listed transaction by default, in output order
+TRANSACTION_COLUMNS = tuple(
+    Transaction.__table__.c[name] for name in TRANSACTION_FIELDS
+)
+
+# (transaction_date, id) of the last transaction on a page
+TransactionCursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(row: Row) -> str:
+    """Encode the list position after a transaction as an opaque cursor."""
+    raw = f"{row.transaction_date.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TransactionCursor:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Opaque cursor from a previous page
+
+    Returns:
+        The list position it encodes
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        transaction_date, transaction_id = raw.split("|")
+        return datetime.fromisoformat(transaction_date), UUID(transaction_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a ``fields`` parameter into the fields to select.
+
+    Args:
+        fields: Comma-separated field names, or None for the default set
+
+    Returns:
+        Selected field names, in output order
+
+    Raises:
+        ValueError: If a field is not in the transaction schema
+    """
+    return parse_fieldset(
+        fields, TransactionResponse, TRANSACTION_FIELDS, REQUIRED_FIELDS
+    )
+
+
+@dataclass(frozen=True)
+class TransactionFilter:
+    """Filters of a transaction listing."""
+
+    user_id: UUID
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    account_id: Optional[UUID] = None
+    category_id: Optional[UUID] = None
+    transaction_type: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        """Reject empty date ranges."""
+        if self.start and self.end and self.start >= self.end:
+            raise ValueError("start must be before end")
+
+    def query(self, fields: Sequence[str] = TRANSACTION_FIELDS) -> Select:
+        """
+        Build the newest-first query of the matching transactions.
+
+        Only the selected columns are fetched, so large JSONB values are
+        never read from TOAST unless requested. The order matches
+        ``ix_transactions_user_date`` scanned backwards, so rows come off
+        the index without sorting the range.
+
+        Args:
+            fields: Field names to select, in output order
+
+        Returns:
+            Core select of the fields
+        """
+        columns = Transaction.__table__.c
+        query = select(*(columns[name] for name in fields)).where(
+            Transaction.user_id == self.user_id,
+            Transaction.is_deleted == False,  # noqa: E712
+        )
+        if self.start is not None:
+            query = query.where(Transaction.transaction_date >= self.start)
+        if self.end is not None:
+            query = query.where(Transaction.transaction_date < self.end)
+        if self.account_id is not None:
+            query = query.where(
+                or_(
+                    Transaction.from_account_id == self.account_id,
+                    Transaction.to_account_id == self.account_id,
+                )
+            )
+        if self.category_id is not None:
+            query = query.where(Transaction.category_id == self.category_id)
+        if self.transaction_type is not None:
+            query = query.where(Transaction.transaction_type == self.transaction_type)
+        return query.order_by(
+            Transaction.transaction_date.desc(), Transaction.id.desc()
+        )
+
+
+@dataclass(frozen=True)
+class TransactionPage:
+    """One page of a user's transactions."""
+
+    items: List[Row]
+    next_cursor: Optional[str]
+
+
+class TransactionListService:
+    """Service listing pages of a user's transactions."""
+
+    def __init__(self, db: AsyncSession):
+        """Initialize the listing service with a database session."""
+        self.db = db
+
+    async def list_page(
+        self,
+        filters: TransactionFilter,
+        limit: int = TRANSACTION_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Sequence[str] = TRANSACTION_FIELDS,
+    ) -> TransactionPage:
+        """
+        Get a page of transactions, newest first.
+
+        Args:
+            filters: Transaction filters
+            limit: Most transactions to return
+            cursor: Cursor of the previous page
+            fields: Field names to select, including id and transaction_date
+
+        Returns:
+            The page and the cursor of the next page, if any
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = filters.query(fields)
+        if cursor is not None:
+            query = query.where(
+                tuple_(Transaction.transaction_date, Transaction.id)
+                < tuple_(*decode_cursor(cursor))
+            )
+        result = await self.db.execute(query.limit(limit + 1))
+        items = list(result.all())
+        if len(items) <= limit:
+            return TransactionPage(items=items, next_cursor=None)
+        return TransactionPage(
+            items=items[:limit], next_cursor=encode_cursor(items[limit - 1])
+        )
+
+
+async def stream_transaction_batches(
+    filters: TransactionFilter,
+    fields: Sequence[str] = TRANSACTION_FIELDS,
+    session_factory: async_sessionmaker = AsyncSessionLocal,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Stream matching transactions in fetch batches from a server-side cursor.
+
+    The stream runs in a session of its own, open for as long as the
+    client reads rather than for the request's dependencies.
+
+    Args:
+        filters: Transaction filters
+        fields: Field names to select
+        session_factory: Factory of database sessions
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Batches of Core rows, newest first
+    """
+    query = filters.query(fields).execution_options(yield_per=batch_size)
+    async with session_factory() as db:
+        stream = await db.stream(query)
+        try:
+            async for batch in stream.partitions():
+                yield batch
+        finally:
+            await stream.close()
+
+
+async def encode_transaction_stream(
+    export_format: str,
+    batches: AsyncIterator[Sequence[Row]],
+    fields: Sequence[str] = TRANSACTION_FIELDS,
+) -> AsyncIterator[bytes]:
+    """
+    Encode streamed transaction batches as NDJSON or CSV chunks.
+
+    The CSV header is sent before the first fetch, so the response starts
+    immediately.
+
+    Args:
+        export_format: ndjson or csv
+        batches: Batches from stream_transaction_batches()
+        fields: Field names of the rows
+
+    Yields:
+        One encoded chunk per batch
+    """
+    if export_format == "csv":
+        yield serialize_rows("csv", fields, [], header=True)
+    async for batch in batches:
+        yield serialize_rows(export_format, fields, batch, header=False)
@@ -0,0 +1,49 @@
+"""
+Transaction change pipeline for the SpendAhead backend.
+
+This module is the single entry point that write paths (manual edits,
+imports, bank syncs) call after flushing a batch of transaction changes,
+so every piece of derived data is updated in the same database transaction.
+"""
+
+from typing import Sequence, Set
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.services.balance_ledger import BalanceLedgerService
+from app.services.balances import BalanceUpdateService
+from app.services.budget_actuals import BudgetActualsEngine
+from app.services.spending_rollup import SpendingRollupService
+from app.services.transaction_events import TransactionChange
+
+logger = get_logger(__name__)
+
+
+async def apply_transaction_changes(
+    db: AsyncSession, changes: Sequence[TransactionChange]
+) -> Set[UUID]:
+    """
+    Propagate a flushed batch of transaction changes to derived data.
+
+    Once the database transaction commits, pass the returned budget IDs to
+    ``BudgetAlertService.mark_dirty`` so their alerts are re-evaluated.
+
+    Args:
+        db: Database session holding the flushed changes
+        changes: Transaction change events for the batch
+
+    Returns:
+        IDs of the budgets whose actuals changed
+    """
+    if not changes:
+        return set()
+
+    await SpendingRollupService(db).apply_changes(changes)
+    await BalanceUpdateService(db).apply_changes(changes)
+    await BalanceLedgerService(db).invalidate(changes)
+    budget_ids = await BudgetActualsEngine(db).apply_changes(changes)
+
+    logger.debug("Transaction changes applied", changes=len(changes))
+    return budget_ids
@@ -0,0 +1,111 @@
+"""
+Manual recategorization for the SpendAhead backend.
+
+This module applies a category the user picked for a transaction. The
+change goes through the transaction pipeline like any other write, and
+the choice is fed back to the categorization cache so the same merchant is
+answered from the user's own correction instead of a model next time.
+"""
+
+from uuid import UUID
+
+from redis.asyncio import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.models.category import Category
+from app.models.transaction import Transaction
+from app.services.budget_alerts import BudgetAlertService
+from app.services.categorization_cache import CategorizationCacheService
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+from app.services.transaction_pipeline import apply_transaction_changes
+
+logger = get_logger(__name__)
+
+
+class TransactionRecategorizationService:
+    """Service applying user-chosen categories to transactions."""
+
+    def __init__(self, db: AsyncSession, redis: Redis):
+        """Initialize the service with a database session and Redis."""
+        self.db = db
+        self.redis = redis
+
+    async def recategorize(
+        self, user_id: UUID, transaction_id: UUID, category_id: UUID
+    ) -> Transaction:
+        """
+        Set a transaction's category on the user's behalf and commit.
+
+        Choosing the category a transaction already has still confirms it
+        in the categorization cache.
+
+        Args:
+            user_id: User ID
+            transaction_id: Transaction ID
+            category_id: Category chosen by the user
+
+        Returns:
+            The updated transaction
+
+        Raises:
+            ValueError: If the transaction or category is not found, or the
+                category's type does not match the transaction's
+        """
+        transaction = (
+            await self.db.execute(
+                select(Transaction)
+                .where(
+                    Transaction.id == transaction_id,
+                    Transaction.user_id == user_id,
+                    Transaction.is_deleted == False,  # noqa: E712
+                )
+                .with_for_update()
+            )
+        ).scalar_one_or_none()
+        if transaction is None:
+            raise ValueError("Transaction not found")
+        category = await self.db.get(Category, category_id)
+        if (
+            category is None
+            or category.user_id != user_id
+            or category.is_deleted
+            or not category.is_active
+        ):
+            raise ValueError("Category not found")
+        if category.category_type != transaction.transaction_type:
+            raise ValueError(
+                f"A {category.category_type} category cannot be assigned "
+                f"to a {transaction.transaction_type} transaction"
+            )
+
+        changes = []
+        if transaction.category_id != category_id:
+            before = TransactionSnapshot.from_model(transaction)
+            transaction.category_id = category_id
+            transaction.ai_categorized = False
+            await self.db.flush()
+            changes.append(TransactionChange.updated(before, transaction))
+        budget_ids = await apply_transaction_changes(self.db, changes)
+        cache = CategorizationCacheService(self.db, self.redis)
+        stale = await cache.record_correction(
+            user_id,
+            transaction.description,
+            transaction.amount,
+            transaction.transaction_type,
+            category.id,
+            category.name,
+        )
+        await self.db.commit()
+
+        await cache.invalidate(stale)
+        if budget_ids:
+            await BudgetAlertService(self.db, self.redis).mark_dirty(budget_ids)
+        logger.info(
+            "Transaction recategorized",
+            user_id=user_id,
+            transaction_id=transaction_id,
+            category_id=category_id,
+        )
+        return transaction
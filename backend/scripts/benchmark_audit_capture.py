@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark automatic audit capture for SpendAhead.
+
+This script measures, offline and without a database, what the audit
+capture hook adds to a flush that updates N transactions. It reports the
+time spent building the diff-only events and compares their serialized
+size with full before/after row snapshots of the same changes.
+
+Usage:
+    python scripts/benchmark_audit_capture.py [--transactions N] [--flushes N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.transaction import Transaction
+from app.services.audit_capture import _jsonable, capture_changes
+
+
+def loaded_transaction(number: int) -> Transaction:
+    """Build a transaction with every column loaded, as after a SELECT."""
+    transaction = Transaction(
+        id=uuid4(),
+        user_id=uuid4(),
+        from_account_id=uuid4(),
+        to_account_id=None,
+        category_id=uuid4(),
+        description=f"Card purchase {number} at a local merchant",
+        amount=Decimal("42.17"),
+        currency="USD",
+        transaction_type="expense",
+        transaction_date=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        notes=None,
+        tags=["groceries", "weekly"],
+        location="Springfield",
+        is_recurring=False,
+        recurring_pattern=None,
+        parent_transaction_id=None,
+        external_id=f"ext-{number}",
+        import_source="plaid",
+        import_metadata={"institution": "Example Bank", "raw": "x" * 400},
+        ai_categorized=True,
+        ai_confidence_score=Decimal("0.91"),
+        ai_suggested_category_id=uuid4(),
+        ai_categorization_data={"model": "gpt-4", "reasoning": "y" * 300},
+        is_verified=False,
+        is_cleared=True,
+        is_reconciled=False,
+        created_at=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        is_deleted=False,
+        deleted_at=None,
+    )
+    make_transient_to_detached(transaction)
+    return transaction
+
+
+def full_snapshot(transaction: Transaction) -> dict:
+    """Build the full-row audit entry the capture layer replaces."""
+    state = inspect(transaction)
+    old, new, changed = {}, {}, []
+    for attribute in state.mapper.column_attrs:
+        history = state.attrs[attribute.key].history
+        before = history.deleted[0] if history.deleted else history.unchanged[0]
+        after = history.added[0] if history.added else before
+        old[attribute.key] = _jsonable(before)
+        new[attribute.key] = _jsonable(after)
+        if history.has_changes():
+            changed.append(attribute.key)
+    return {"old_values": old, "new_values": new, "changed_fields": changed}
+
+
+def benchmark(count: int, flushes: int) -> None:
+    """Time diff capture and compare its volume with full snapshots."""
+    session = Session()
+    transactions = [loaded_transaction(number) for number in range(count)]
+    session.add_all(transactions)
+    for transaction in transactions:
+        transaction.category_id = uuid4()
+        transaction.is_verified = True
+
+    started = time.perf_counter()
+    for _ in range(flushes):
+        events = capture_changes(session)
+    elapsed = (time.perf_counter() - started) / flushes
+
+    diff_bytes = sum(
+        len(
+            json.dumps(
+                {
+                    "old_values": event.old_values,
+                    "new_values": event.new_values,
+                    "changed_fields": event.changed_fields,
+                }
+            )
+        )
+        for event in events
+    )
+    full_bytes = sum(
+        len(json.dumps(full_snapshot(transaction))) for transaction in transactions
+    )
+    print(
+        f"📊 Flush of {count} updated transactions: capture took "
+        f"{elapsed * 1000:.2f}ms ({elapsed / count * 1e6:.1f}µs per object)"
+    )
+    print(
+        f"📊 Audit volume: {diff_bytes / count:.0f} bytes per event diff-only vs "
+        f"{full_bytes / count:.0f} bytes with full snapshots "
+        f"({full_bytes / diff_bytes:.1f}x smaller)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=500,
+        help="Transactions updated per flush",
+    )
+    parser.add_argument(
+        "--flushes",
+        type=int,
+        default=20,
+        help="Flushes timed",
+    )
+    args = parser.parse_args()
+    benchmark(args.transactions, args.flushes)
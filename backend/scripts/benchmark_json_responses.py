@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark transaction list serialization for SpendAhead.
+
+This script measures, offline and without a database, the cost of turning
+a page of transaction rows into a JSON response body. It compares the
+schema path (pydantic validation of every row, model_dump and the
+standard JSONResponse encoder), the same path rendered by the orjson
+default response class, and rows converted straight to dicts and rendered
+with orjson, and checks that they produce the same document.
+
+Validation and model_dump dominate the schema path, so rendering its
+output with orjson is within run-to-run noise of the standard encoder
+(0.9x to 1.3x here). The gain comes from skipping the schemas: rows
+rendered directly take about 4ms per 1,000 transactions against about
+33ms for the schema path, roughly 8x faster.
+
+Usage:
+    python scripts/benchmark_json_responses.py [--transactions N] [--runs N]
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+from uuid import uuid4
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import FastJSONResponse, rows_to_dicts
+from app.schemas.transaction import TransactionListResponse, TransactionResponse
+from app.services.transaction_list import TRANSACTION_FIELDS
+
+# Stand-in for a Core row: a tuple with attribute access
+TransactionRow = namedtuple("TransactionRow", TRANSACTION_FIELDS)
+
+
+def transaction_rows(count: int) -> list:
+    """Build rows as the transaction list query returns them."""
+    start = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    return [
+        TransactionRow(
+            id=uuid4(),
+            transaction_date=start - timedelta(hours=number),
+            description=f"Card payment {number} at Corner Grocery",
+            amount=Decimal(number % 50000) / 100,
+            currency="USD",
+            transaction_type="expense",
+            from_account_id=uuid4(),
+            to_account_id=None,
+            category_id=uuid4(),
+            notes=None,
+            tags=["groceries"],
+            location=None,
+            is_recurring=False,
+            is_verified=True,
+            is_cleared=True,
+            is_reconciled=False,
+            ai_categorized=True,
+            created_at=start,
+            updated_at=start,
+        )
+        for number in range(count)
+    ]
+
+
+def schema_page(rows: list) -> dict:
+    """Validate rows through the response schemas, as FastAPI does."""
+    page = TransactionListResponse(
+        items=[TransactionResponse.model_validate(row) for row in rows],
+        next_cursor=None,
+    )
+    return page.model_dump(mode="json", exclude_unset=True)
+
+
+def schema_body(rows: list) -> bytes:
+    """Render schema output with the standard encoder."""
+    return JSONResponse(schema_page(rows)).body
+
+
+def schema_orjson_body(rows: list) -> bytes:
+    """Render schema output with the default orjson response class."""
+    return FastJSONResponse(schema_page(rows)).body
+
+
+def fast_body(rows: list) -> bytes:
+    """Render rows directly with orjson."""
+    return FastJSONResponse(
+        {"items": rows_to_dicts(TRANSACTION_FIELDS, rows), "next_cursor": None}
+    ).body
+
+
+def per_thousand(render: Callable[[list], bytes], rows: list, runs: int) -> float:
+    """Time a renderer, in milliseconds per 1,000 transactions."""
+    render(rows)
+    started = time.perf_counter()
+    for _ in range(runs):
+        render(rows)
+    elapsed = (time.perf_counter() - started) / runs
+    return elapsed / len(rows) * 1000 * 1000
+
+
+def benchmark(count: int, runs: int) -> None:
+    """Compare the schema and fast serialization paths."""
+    rows = transaction_rows(count)
+    if json.loads(schema_body(rows)) != json.loads(fast_body(rows)):
+        print("❌ The two paths render different documents")
+        sys.exit(1)
+
+    before = per_thousand(schema_body, rows, runs)
+    rendered = per_thousand(schema_orjson_body, rows, runs)
+    after = per_thousand(fast_body, rows, runs)
+    print(f"📊 Page of {count} transactions, {runs} runs")
+    print(f"📊 Schema path:        {before:.2f}ms per 1,000 transactions")
+    print(
+        f"📊 Schema with orjson: {rendered:.2f}ms per 1,000 transactions "
+        f"({before / rendered:.1f}x speedup)"
+    )
+    print(
+        f"📊 Rows with orjson:   {after:.2f}ms per 1,000 transactions "
+        f"({before / after:.1f}x speedup)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=1000,
+        help="Transactions per page",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=50,
+        help="Renders timed per path",
+    )
+    args = parser.parse_args()
+    benchmark(args.transactions, args.runs)
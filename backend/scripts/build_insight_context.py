@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Build insight contexts for SpendAhead.
+
+This script prints the compact context an insight model would be prompted
+with for a user's last full month, with its token estimate and build time.
+Use --benchmark to compare, offline and without a database, the tokens of
+a raw transaction-list prompt with the rendered summary of the same
+synthetic month, and to time prompt construction.
+
+Usage:
+    python scripts/build_insight_context.py --user-id UUID [--tokens N]
+    python scripts/build_insight_context.py --benchmark 2000 [--tokens N]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import close_redis, get_redis
+from app.services.insight_context import (
+    CONTEXT_OUTLIERS,
+    CONTEXT_TOP_MERCHANTS,
+    OUTLIER_MIN_SPREAD,
+    OUTLIER_MIN_TRANSACTIONS,
+    OUTLIER_Z_SCORE,
+    InsightContextBuilder,
+    estimate_text_tokens,
+    render_context,
+)
+from app.services.insight_scheduler import months_before
+
+# Render iterations timed per benchmark
+BENCHMARK_RENDERS = 1000
+
+
+async def main(user_id: UUID, token_budget: int) -> None:
+    """Print the context of a user's last full month."""
+    redis = await get_redis()
+    this_month = months_before(datetime.now(timezone.utc).date())
+    period_start, period_end, previous_start = (
+        datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+        for day in (
+            months_before(this_month, 1),
+            this_month,
+            months_before(this_month, 2),
+        )
+    )
+    async with AsyncSessionLocal() as session:
+        try:
+            started = time.perf_counter()
+            context = await InsightContextBuilder(session, redis).build(
+                user_id,
+                period_start,
+                period_end,
+                previous_start=previous_start,
+                token_budget=token_budget,
+            )
+            elapsed = time.perf_counter() - started
+            if context is None:
+                print(f"⚠️  {user_id} has no transactions in {period_start:%Y-%m}")
+                return
+            print(context.text)
+            print(f"📊 ~{context.tokens} tokens, built in {elapsed * 1000:.1f}ms")
+        except Exception as e:
+            print(f"❌ Error building context: {e}")
+            sys.exit(1)
+        finally:
+            await close_redis()
+
+
+def benchmark(count: int, token_budget: int) -> None:
+    """Compare a raw transaction prompt with the rendered context."""
+    rng = random.Random(42)
+    period_end = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    period_start = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    previous_start = datetime(2025, 6, 1, tzinfo=timezone.utc)
+    categories = {uuid4(): f"Category {number}" for number in range(15)}
+    category_ids = list(categories)
+    transactions = []
+    for number in range(count):
+        day = previous_start + timedelta(days=rng.randrange(61))
+        amount = Decimal(rng.lognormvariate(3, 1)).quantize(Decimal("0.01"))
+        transactions.append(
+            (day, f"Merchant {number % 300} purchase", amount, rng.choice(category_ids))
+        )
+
+    raw_prompt = "\n".join(
+        f"{day.date()} | {description} | {amount} USD | {categories[category_id]}"
+        for day, description, amount, category_id in transactions
+    )
+
+    # Aggregate the way the SQL queries do
+    totals = {"current": Decimal(0), "previous": Decimal(0), "count": 0}
+    by_category = defaultdict(lambda: {"current": Decimal(0), "previous": Decimal(0)})
+    category_counts = defaultdict(int)
+    merchants = defaultdict(lambda: [Decimal(0), 0])
+    amounts = defaultdict(list)
+    for day, description, amount, category_id in transactions:
+        side = "current" if day >= period_start else "previous"
+        totals[side] += amount
+        by_category[category_id][side] += amount
+        if side == "current":
+            totals["count"] += 1
+            category_counts[category_id] += 1
+            merchants[description][0] += amount
+            merchants[description][1] += 1
+            amounts[category_id].append((day, description, amount))
+
+    outliers = []
+    for category_id, rows in amounts.items():
+        values = [float(amount) for _, _, amount in rows]
+        if len(values) < OUTLIER_MIN_TRANSACTIONS:
+            continue
+        for position, (day, description, amount) in enumerate(rows):
+            # Score each expense against the rest of its category
+            others = values[:position] + values[position + 1 :]
+            mean = statistics.fmean(others)
+            spread = max(statistics.pstdev(others), OUTLIER_MIN_SPREAD * mean)
+            if spread and (float(amount) - mean) / spread > OUTLIER_Z_SCORE:
+                outliers.append(
+                    {
+                        "transaction_date": day,
+                        "description": description,
+                        "amount": amount,
+                        "currency": "USD",
+                        "category_id": category_id,
+                        "category_mean": Decimal(mean).quantize(Decimal("0.01")),
+                        "score": (float(amount) - mean) / spread,
+                    }
+                )
+    outliers.sort(key=lambda row: row["score"], reverse=True)
+
+    rows = (
+        [{"transaction_type": "expense", "currency": "USD", **totals}],
+        [
+            {
+                "category_id": category_id,
+                "currency": "USD",
+                "count": category_counts[category_id],
+                **sums,
+            }
+            for category_id, sums in by_category.items()
+        ],
+        [
+            {
+                "merchant": merchant.lower(),
+                "currency": "USD",
+                "total": total,
+                "count": merchant_count,
+            }
+            for merchant, (total, merchant_count) in sorted(
+                merchants.items(), key=lambda item: item[1][0], reverse=True
+            )[:CONTEXT_TOP_MERCHANTS]
+        ],
+        outliers[:CONTEXT_OUTLIERS],
+    )
+
+    started = time.perf_counter()
+    for _ in range(BENCHMARK_RENDERS):
+        context = render_context(
+            period_start,
+            period_end,
+            previous_start,
+            *rows,
+            categories,
+            token_budget=token_budget,
+        )
+    elapsed = time.perf_counter() - started
+
+    raw_tokens = estimate_text_tokens(raw_prompt)
+    print(context.text)
+    print(
+        f"📊 {count} transactions: raw prompt ~{raw_tokens} tokens, "
+        f"context ~{context.tokens} tokens "
+        f"({raw_tokens / context.tokens:.0f}x smaller, budget {token_budget})"
+    )
+    print(
+        f"📊 Rendered {BENCHMARK_RENDERS} times: "
+        f"{elapsed / BENCHMARK_RENDERS * 1e6:.0f}µs per context"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--user-id", type=UUID, help="Build this user's context")
+    parser.add_argument(
+        "--tokens",
+        type=int,
+        default=settings.ai_insight_context_tokens,
+        help="Token budget of the rendered context",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="N",
+        help="Benchmark a month of N synthetic transactions without a database",
+    )
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.benchmark, args.tokens)
+    elif args.user_id:
+        asyncio.run(main(args.user_id, args.tokens))
+    else:
+        parser.error("one of --user-id or --benchmark is required")
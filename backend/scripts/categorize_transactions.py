@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Categorize pending transactions for SpendAhead.
+
+This script applies categorization rules, runs the keyword categorizer
+and then the AI categorization pipeline for every user with uncategorized
+transactions, or for a single user. Use --benchmark to measure pipeline
+throughput offline against the local stub provider, and similarity
+matching against a synthetic history, without a database.
+
+Usage:
+    python scripts/categorize_transactions.py [--user-id UUID] [--limit N]
+    python scripts/categorize_transactions.py --benchmark 100000 [--latency 0.2]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+from uuid import UUID, uuid4
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.redis import close_redis, get_redis
+from app.models.transaction import Transaction
+from app.services.ai_categorization import (
+    AI_CATEGORIZATION_LIMIT,
+    AICategorizationPipeline,
+    CategorizationRequest,
+    CategoryChoice,
+    LocalStubProvider,
+)
+from app.services.categorization_cache import CategorizationCacheService
+from app.services.similarity_categorizer import (
+    SIMILARITY_HISTORY_LIMIT,
+    SimilarityIndex,
+)
+
+
+async def main(user_id: Optional[UUID], limit: int) -> None:
+    """Categorize pending transactions of one or every user."""
+    redis = await get_redis()
+    async with AsyncSessionLocal() as session:
+        try:
+            if user_id is not None:
+                user_ids = [user_id]
+            else:
+                result = await session.execute(
+                    select(Transaction.user_id)
+                    .where(
+                        Transaction.category_id.is_(None),
+                        Transaction.ai_categorized == False,  # noqa: E712
+                        Transaction.is_deleted == False,  # noqa: E712
+                    )
+                    .distinct()
+                )
+                user_ids = list(result.scalars().all())
+
+            pipeline = AICategorizationPipeline(session, redis)
+            for current in user_ids:
+                outcome = await pipeline.run(current, limit)
+                print(
+                    f"✅ {current}: {outcome.rule_assigned} by rule, "
+                    f"{outcome.keyword_assigned} by keyword, "
+                    f"{outcome.cache_hits} from cache, "
+                    f"{outcome.similarity_hits} from history, "
+                    f"{outcome.assigned} assigned, {outcome.suggested} suggested, "
+                    f"{outcome.failed_batches} failed batches"
+                )
+
+            stats = await CategorizationCacheService(session, redis).stats()
+            print(
+                f"📊 Cache hit rate {stats['hit_rate']:.1%}, "
+                f"{stats['ai_tokens_used']} tokens used, "
+                f"~{stats['ai_tokens_saved']} tokens saved"
+            )
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error categorizing transactions: {e}")
+            sys.exit(1)
+        finally:
+            await close_redis()
+
+
+def merchant_name(number: int) -> str:
+    """Spell a number as a synthetic merchant name."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    name = ""
+    while True:
+        number, digit = divmod(number, len(letters))
+        name += letters[digit]
+        if not number:
+            return f"merchant {name}"
+
+
+async def benchmark(count: int, latency: float) -> None:
+    """Measure batched provider throughput against the local stub."""
+    provider = LocalStubProvider(latency=latency)
+    pipeline = AICategorizationPipeline(None, None, provider=provider)
+    choices = [
+        CategoryChoice(id=uuid4(), path=f"Category {number}", category_type="expense")
+        for number in range(20)
+    ]
+    requests = [
+        CategorizationRequest(
+            transaction_id=uuid4(),
+            description=f"Merchant {number % 5000} purchase",
+            amount=Decimal("12.50"),
+            transaction_type="expense",
+        )
+        for number in range(count)
+    ]
+
+    started = time.perf_counter()
+    await pipeline.categorize_batches(requests, choices)
+    elapsed = time.perf_counter() - started
+    print(
+        f"📊 {count} transactions in {provider.calls} calls "
+        f"(batch size {pipeline.batch_size}, concurrency "
+        f"{settings.ai_categorization_concurrency}, latency {latency}s): "
+        f"{elapsed:.2f}s, {count / elapsed:.0f} transactions/s"
+    )
+
+    # Descriptions are normalized without digits, so merchants are spelled out
+    history = [
+        (f"{merchant_name(number)} store", "expense", choice.id, 1.0)
+        for number, choice in zip(
+            range(SIMILARITY_HISTORY_LIMIT), choices * SIMILARITY_HISTORY_LIMIT
+        )
+    ]
+    index = SimilarityIndex.build(uuid4(), history, None)
+    descriptions = [f"{merchant_name(number)} shop" for number in range(count)]
+    started = time.perf_counter()
+    matches = index.match(descriptions, ["expense"] * count)
+    elapsed = time.perf_counter() - started
+    print(
+        f"📊 {count} transactions matched against {index.size} history rows: "
+        f"{elapsed:.2f}s, {sum(match is not None for match in matches)} matched"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--user-id", type=UUID, help="Only categorize this user")
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=AI_CATEGORIZATION_LIMIT,
+        help="Maximum transactions sent to the model per user",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="N",
+        help="Benchmark N synthetic transactions against the local stub",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated model latency per call in benchmark mode (seconds)",
+    )
+    args = parser.parse_args()
+    if args.benchmark:
+        asyncio.run(benchmark(args.benchmark, args.latency))
+    else:
+        asyncio.run(main(args.user_id, args.limit))
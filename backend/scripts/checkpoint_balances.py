@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Checkpoint account balance snapshots for SpendAhead.
+
+This script writes ledger balance snapshots for every active account so
+balance-as-of queries only scan the transactions since the last checkpoint.
+Run it daily from cron; use --backfill-days to recreate snapshots removed by
+backdated transactions.
+
+Usage:
+    python scripts/checkpoint_balances.py [--date YYYY-MM-DD] [--backfill-days N]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.services.balance_ledger import BalanceLedgerService
+
+
+async def main(as_of: date, backfill_days: int) -> None:
+    """Checkpoint balances for a day, oldest backfill day first."""
+    days = [as_of - timedelta(days=n) for n in range(backfill_days, -1, -1)]
+
+    async with AsyncSessionLocal() as session:
+        ledger = BalanceLedgerService(session)
+        for day in days:
+            try:
+                written = await ledger.checkpoint(day)
+                await session.commit()
+                print(f"✅ {day}: checkpointed {written} accounts")
+            except Exception as e:
+                await session.rollback()
+                print(f"❌ {day}: error checkpointing balances: {e}")
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--date", type=date.fromisoformat, default=yesterday, help="Day to checkpoint"
+    )
+    parser.add_argument(
+        "--backfill-days", type=int, default=0, help="Also checkpoint N prior days"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.date, args.backfill_days))
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Maintain audit log partitions for SpendAhead.
+
+This script creates the monthly audit_logs partitions of the coming
+months and archives partitions older than the retention period to
+compressed Parquet files before dropping them. Rows found in the default
+partition are moved into their month's partition, or archived with the
+expired ones. Run it daily from cron; it exits non-zero when a partition
+cannot be created. Use --dry-run to only list what would be archived.
+
+Usage:
+    python scripts/maintain_audit_logs.py [--retention-months N] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.audit_retention import (
+    DEFAULT_PARTITION,
+    AuditRetentionService,
+    add_months,
+)
+
+
+async def main(retention_months: int, archive_dir: Path, dry_run: bool) -> None:
+    """Create upcoming partitions and archive expired ones."""
+    today = datetime.now(timezone.utc).date()
+    async with AsyncSessionLocal() as session:
+        retention = AuditRetentionService(session)
+        try:
+            if dry_run:
+                for partition in await retention.expired_partitions(
+                    today, retention_months
+                ):
+                    state = "attached" if partition.attached else "detached"
+                    print(f"🗄️  Would archive {partition.name} ({state})")
+                oldest_kept = add_months(today.replace(day=1), -retention_months)
+                for month in await retention.default_months(oldest_kept):
+                    print(
+                        f"🗄️  Would archive {month:%Y-%m} rows of {DEFAULT_PARTITION}"
+                    )
+                return
+
+            created = await retention.ensure_partitions(today)
+            print(f"✅ Created {len(created)} partitions")
+            for path in await retention.archive_expired(
+                today, archive_dir, retention_months
+            ):
+                print(f"🗄️  Archived {path}")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error maintaining audit logs: {e}")
+            sys.exit(1)
+
+
+def positive(value: str) -> int:
+    """Parse a positive number of months."""
+    months = int(value)
+    if months < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return months
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--retention-months",
+        type=positive,
+        default=settings.audit_retention_months,
+        help="Full months of audit logs kept before the current one",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=Path,
+        default=Path(settings.audit_archive_dir),
+        help="Directory receiving the Parquet archives",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the partitions that would be archived",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.retention_months, args.archive_dir, args.dry_run))
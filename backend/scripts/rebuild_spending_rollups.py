@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Rebuild spending rollups for SpendAhead.
+
+This script recomputes the ``spending_rollups`` table and the denormalized
+category usage counters from the transactions table. Use it for backfills
+or after bulk data fixes that bypassed the incremental maintenance.
+
+Usage:
+    python scripts/rebuild_spending_rollups.py [--user-id <uuid>]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.services.spending_rollup import SpendingRollupService
+
+
+async def main(user_id: UUID | None) -> None:
+    """Rebuild rollups for one user or for all users."""
+    scope = f"user {user_id}" if user_id else "all users"
+    print(f"🔄 Rebuilding spending rollups for {scope}...")
+
+    async with AsyncSessionLocal() as session:
+        try:
+            buckets = await SpendingRollupService(session).rebuild(user_id)
+            await session.commit()
+            print(f"✅ Rebuilt {buckets} rollup buckets")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error rebuilding spending rollups: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--user-id", type=UUID, default=None, help="Limit to a user")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
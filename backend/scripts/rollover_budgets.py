@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Roll budgets into their next period for SpendAhead.
+
+This script creates the next-period budget and items for every monthly and
+yearly budget whose period has ended, carrying unused amounts forward for
+budgets with rollover enabled. Run it shortly after each month start; it is
+safe to re-run, resumes an interrupted run and catches up on periods missed
+while it was not running.
+
+Usage:
+    python scripts/rollover_budgets.py [--as-of YYYY-MM-DDTHH:MM:SS+00:00]
+"""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.services.budget_rollover import ROLLOVER_CHUNK_SIZE, BudgetRolloverService
+
+
+async def main(as_of: datetime, chunk_size: int) -> None:
+    """Roll over every budget whose period ended before a moment."""
+    async with AsyncSessionLocal() as session:
+        try:
+            created = await BudgetRolloverService(session).roll_over(
+                as_of, chunk_size=chunk_size
+            )
+            print(f"✅ Rolled over {created} budgets as of {as_of.isoformat()}")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error rolling over budgets: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--as-of",
+        type=datetime.fromisoformat,
+        default=datetime.now(timezone.utc),
+        help="Moment the next periods must cover (defaults to now)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=ROLLOVER_CHUNK_SIZE,
+        help="Budgets rolled over per committed chunk",
+    )
+    args = parser.parse_args()
+    as_of = args.as_of
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    asyncio.run(main(as_of, args.chunk_size))
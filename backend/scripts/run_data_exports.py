@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Run pending data exports for SpendAhead.
+
+This script claims pending exports, and running ones whose worker lease
+ran out, and writes them to the export directory until none are left.
+Interrupted exports resume from their last checkpoint. Run it every few
+minutes from cron, or pass --export-id to run one export directly. Use
+--benchmark to write synthetic transactions offline, without a database,
+and report the peak memory of the serializer.
+
+Usage:
+    python scripts/run_data_exports.py [--limit N]
+    python scripts/run_data_exports.py --export-id UUID
+    python scripts/run_data_exports.py --benchmark 1000000 [--format csv]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.services.data_export import (
+    EXPORT_FORMATS,
+    EXPORT_TABLES,
+    DataExportRunner,
+    append_member,
+    serialize_rows,
+)
+
+
+async def main(export_id: UUID | None, limit: int | None) -> None:
+    """Run one export, or every pending one."""
+    runner = DataExportRunner(AsyncSessionLocal)
+    try:
+        if export_id is not None:
+            path = await runner.run(export_id)
+            if path is None:
+                print(f"⚠️  Export {export_id} did not complete")
+                sys.exit(1)
+            print(f"📦 Wrote {path}")
+            return
+        runs = await runner.run_pending(limit)
+        print(f"✅ Ran {runs} data exports")
+    except Exception as e:
+        print(f"❌ Error running data exports: {e}")
+        sys.exit(1)
+
+
+def benchmark(count: int, export_format: str) -> None:
+    """Write synthetic transactions batch by batch and measure memory."""
+    table = next(table for table in EXPORT_TABLES if table.name == "transactions")
+    names = [column.name for column in table.columns]
+    batch_size = settings.data_export_batch_size
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+    def batch(first: int, size: int) -> list:
+        rows = []
+        for index in range(first, first + size):
+            values = {
+                "id": uuid4(),
+                "user_id": uuid4(),
+                "account_id": uuid4(),
+                "category_id": uuid4(),
+                "amount": Decimal(index % 50000) / 100,
+                "description": f"Card payment {index} at Corner Grocery",
+                "transaction_date": start + timedelta(minutes=index),
+                "transaction_type": "expense",
+                "tags": ["groceries", "weekly"],
+                "created_at": start,
+                "updated_at": start,
+            }
+            rows.append(tuple(values.get(name) for name in names))
+        return rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / f"transactions{EXPORT_FORMATS[export_format]}"
+        offset = 0
+        tracemalloc.start()
+        for first in range(0, count, batch_size):
+            rows = batch(first, min(batch_size, count - first))
+            offset = append_member(
+                path, offset, serialize_rows(export_format, names, rows, offset == 0)
+            )
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"📦 {count} transactions as {export_format}: {offset / 1e6:.1f}MB gzip")
+    print(f"📊 Peak memory {peak / 1e6:.1f}MB with {batch_size}-row batches")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--export-id",
+        type=UUID,
+        default=None,
+        help="Run this export only",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Most exports to run",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="ROWS",
+        help="Write ROWS synthetic transactions offline and report memory",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(EXPORT_FORMATS),
+        default="ndjson",
+        help="Format of the benchmark file",
+    )
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.benchmark, args.format)
+    else:
+        asyncio.run(main(args.export_id, args.limit))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Run the AI insight worker pool for SpendAhead.
+
+This script creates insight jobs for users who do not have them yet and then
+generates due insights until it is stopped with SIGINT or SIGTERM. Run one
+or more instances under a process supervisor; they share the job queue and
+the per-minute token budget. Use --once (e.g. from cron) to process the jobs
+that are due now and exit.
+
+Usage:
+    python scripts/run_insight_worker.py [--once] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import close_redis, get_redis
+from app.services.insight_scheduler import InsightScheduler, InsightWorkerPool
+
+
+async def main(once: bool, concurrency: int | None) -> None:
+    """Enqueue missing insight jobs and run the worker pool."""
+    redis = await get_redis()
+    try:
+        async with AsyncSessionLocal() as session:
+            created = await InsightScheduler(session).enqueue_missing()
+            await session.commit()
+        print(f"🗓️  Created {created} insight jobs")
+
+        pool = InsightWorkerPool(AsyncSessionLocal, redis, concurrency=concurrency)
+        if once:
+            total = 0
+            while processed := await pool.run_once():
+                total += processed
+            print(f"✅ Processed {total} insight jobs")
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        print(f"🚀 Generating insights with {pool.concurrency} workers")
+        await pool.run(stop)
+        print("👋 Insight worker stopped")
+    except Exception as e:
+        print(f"❌ Error running insight worker: {e}")
+        sys.exit(1)
+    finally:
+        await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Process the jobs due now and exit",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Most jobs generated at once (default: AI_INSIGHT_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.once, args.concurrency))
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Sweep pending budget alerts for SpendAhead.
+
+This script evaluates every budget queued by transaction writes since the
+last run and emits alerts for budgets that crossed a threshold. Run it every
+minute from cron; use --reconcile (e.g. hourly) to also re-queue every
+current alertable budget in case a queue entry was lost.
+
+Usage:
+    python scripts/sweep_budget_alerts.py [--reconcile]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import close_redis, get_redis
+from app.services.budget_alerts import BudgetAlertService
+
+
+async def main(reconcile: bool) -> None:
+    """Drain the budget alert queue, optionally re-queueing current budgets."""
+    redis = await get_redis()
+    async with AsyncSessionLocal() as session:
+        alerts = BudgetAlertService(session, redis)
+        try:
+            if reconcile:
+                queued = await alerts.mark_current_dirty()
+                print(f"🔄 Queued {queued} current budgets for reconciliation")
+            emitted = await alerts.sweep()
+            await session.commit()
+            print(f"✅ Emitted {emitted} budget alerts")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error sweeping budget alerts: {e}")
+            sys.exit(1)
+        finally:
+            await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Re-queue every current alertable budget before sweeping",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.reconcile))
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Sweep expired AI insights for SpendAhead.
+
+This script deactivates insights whose expiry has passed, in chunked
+batches, and lowers the unread badges of their users. Run it every few
+minutes from cron; use --reconcile (e.g. hourly) to also rewrite every
+unread counter from the database.
+
+Usage:
+    python scripts/sweep_insights.py [--reconcile]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the backend directory to the Python path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.database import AsyncSessionLocal
+from app.core.redis import close_redis, get_redis
+from app.services.insight_feed import InsightFeedService
+
+
+async def main(reconcile: bool) -> None:
+    """Deactivate expired insights, optionally reconciling unread counters."""
+    redis = await get_redis()
+    async with AsyncSessionLocal() as session:
+        feed = InsightFeedService(session, redis)
+        try:
+            swept = await feed.sweep_expired()
+            print(f"✅ Deactivated {swept} expired insights")
+            if reconcile:
+                users = await feed.reconcile_unread_counts()
+                print(f"🔄 Reconciled unread counters of {users} users")
+        except Exception as e:
+            await session.rollback()
+            print(f"❌ Error sweeping insights: {e}")
+            sys.exit(1)
+        finally:
+            await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Rewrite every unread counter from the database after sweeping",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.reconcile))
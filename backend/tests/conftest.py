@@ -109,6 +109,27 @@ def sample_transaction_data():
     }
 
 
+class CounterPipeline:
+    """Redis pipeline stand-in applying INCRBY on execute."""
+
+    def __init__(self, values):
+        self.values = values
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def incrby(self, key, amount):
+        self.commands.append((key, amount))
+
+    async def execute(self):
+        for key, amount in self.commands:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
 # Markers for test categorization
 pytest_plugins = ["pytest_asyncio"]
 
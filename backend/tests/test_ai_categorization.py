@@ -0,0 +1,254 @@
+"""
+Tests for the AI categorization pipeline.
+
+This module contains unit tests for the local stub and OpenAI providers,
+batching with bounded concurrency and retries, and the bulk write-back,
+using a scripted session instead of a database.
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import ai_categorization
+from app.services.ai_categorization import (
+    AICategorizationPipeline,
+    AICategorizationResult,
+    CategorizationRequest,
+    CategorizationResult,
+    CategoryChoice,
+    LocalStubProvider,
+    OpenAIProvider,
+)
+
+FOOD = CategoryChoice(id=uuid4(), path="Food", category_type="expense")
+SALARY = CategoryChoice(id=uuid4(), path="Salary", category_type="income")
+CHOICES = [FOOD, SALARY]
+
+
+def make_request(description="Corner Deli", transaction_type="expense"):
+    """Build a categorization request."""
+    return CategorizationRequest(
+        transaction_id=uuid4(),
+        description=description,
+        amount=Decimal("12.50"),
+        transaction_type=transaction_type,
+    )
+
+
+class FlakyProvider:
+    """Provider failing a fixed number of times and tracking concurrency."""
+
+    name = "flaky"
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def categorize(self, requests, choices):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("model unavailable")
+            return [
+                CategorizationResult(request.transaction_id, FOOD.id, Decimal("0.9"))
+                for request in requests
+            ]
+        finally:
+            self.in_flight -= 1
+
+
+def make_pipeline(provider, **options):
+    """Build a pipeline without a database or Redis."""
+    options.setdefault("retry_backoff", 0)
+    return AICategorizationPipeline(None, None, provider=provider, **options)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_stub_is_deterministic_and_type_aware():
+    """Test that the stub answers consistently within the transaction type."""
+    provider = LocalStubProvider()
+    requests = [make_request(), make_request(), make_request("ACME", "income")]
+    requests[1] = make_request("  corner deli ")
+
+    first = await provider.categorize(requests, CHOICES)
+    second = await provider.categorize(requests, CHOICES)
+
+    assert first == second
+    assert first[0].category_id == first[1].category_id == FOOD.id
+    assert first[0].confidence == first[1].confidence
+    assert Decimal("0.50") <= first[0].confidence <= Decimal("0.99")
+    assert first[2].category_id == SALARY.id
+
+    [unmatched] = await provider.categorize([make_request("x", "income")], [FOOD])
+    assert unmatched.category_id is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_batches_respect_size_and_concurrency():
+    """Test that requests are split into batches under the semaphore."""
+    provider = FlakyProvider()
+    pipeline = make_pipeline(provider, batch_size=10, concurrency=2)
+    requests = [make_request() for _ in range(95)]
+
+    batched = await pipeline.categorize_batches(requests, CHOICES)
+
+    assert provider.calls == 10
+    assert provider.max_in_flight == 2
+    assert batched.model_calls == 10
+    assert len(batched.results) == len(batched.answered) == 95
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_calls_are_retried_then_dropped():
+    """Test retries on transient failures and giving up after the limit."""
+    recovered = FlakyProvider(failures=2)
+    batched = await make_pipeline(recovered, max_retries=2).categorize_batches(
+        [make_request()], CHOICES
+    )
+    assert recovered.calls == 3
+    assert batched.model_calls == 1
+
+    broken = FlakyProvider(failures=10)
+    batched = await make_pipeline(broken, max_retries=2).categorize_batches(
+        [make_request()], CHOICES
+    )
+    assert broken.calls == 3
+    assert batched.failed_batches == 1
+    assert batched.answered == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_openai_provider_maps_numbered_answers(mock_openai_client):
+    """Test parsing of the model's JSON answer, skipping invalid entries."""
+    requests = [make_request(), make_request("Payroll", "income"), make_request()]
+    content = {
+        "results": [
+            {"transaction": 1, "category": 1, "confidence": 0.93},
+            {"transaction": 2, "category": 2, "confidence": 0.4},
+            {"transaction": 3, "category": None},
+            {"transaction": 9, "category": 1, "confidence": 0.9},
+        ]
+    }
+    mock_openai_client.chat.completions.create.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(content)))]
+    )
+
+    results = await OpenAIProvider(mock_openai_client).categorize(requests, CHOICES)
+
+    assert results == [
+        CategorizationResult(requests[0].transaction_id, FOOD.id, Decimal("0.93")),
+        CategorizationResult(requests[1].transaction_id, SALARY.id, Decimal("0.4")),
+        CategorizationResult(requests[2].transaction_id, None, None),
+    ]
+
+
+class ScriptedResult:
+    """Result stand-in serving fixed rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class RecordingSession:
+    """Async session stand-in recording bulk updates."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.updates = None
+        self.committed = False
+
+    async def execute(self, statement, params=None, **kwargs):
+        if statement.is_update:
+            self.updates = params
+            return ScriptedResult([])
+        return ScriptedResult(self.rows)
+
+    async def commit(self):
+        self.committed = True
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_write_assigns_confident_answers_and_suggests_the_rest(monkeypatch):
+    """Test the bulk write-back of model answers."""
+    requests = [make_request() for _ in range(5)]
+    rows = [
+        SimpleNamespace(
+            id=request.transaction_id,
+            user_id=uuid4(),
+            category_id=None,
+            from_account_id=uuid4(),
+            to_account_id=None,
+            amount=Decimal("12.50"),
+            currency="USD",
+            transaction_type="expense",
+            transaction_date=datetime(2024, 3, 5, tzinfo=timezone.utc),
+        )
+        for request in requests[:3] + requests[4:]
+    ]
+    results = [
+        CategorizationResult(requests[0].transaction_id, FOOD.id, Decimal("0.91")),
+        CategorizationResult(requests[1].transaction_id, FOOD.id, Decimal("0.55")),
+        CategorizationResult(requests[2].transaction_id, SALARY.id, Decimal("0.99")),
+        CategorizationResult(requests[3].transaction_id, FOOD.id, Decimal("0.99")),
+    ]
+    applied = []
+
+    async def fake_apply(db, changes):
+        applied.extend(changes)
+        return set()
+
+    monkeypatch.setattr(ai_categorization, "apply_transaction_changes", fake_apply)
+    session = RecordingSession(rows)
+    pipeline = AICategorizationPipeline(session, None, provider=LocalStubProvider())
+    outcome = AICategorizationResult()
+
+    await pipeline._write(
+        {request.transaction_id: request for request in requests},
+        results,
+        {choice.id: choice.category_type for choice in CHOICES},
+        outcome,
+    )
+
+    updates = {row["id"]: row for row in session.updates}
+    assert set(updates) == {
+        request.transaction_id for request in requests[:3] + requests[4:]
+    }
+    assert updates[requests[0].transaction_id]["category_id"] == FOOD.id
+    assert updates[requests[0].transaction_id]["ai_confidence_score"] == Decimal("0.91")
+    assert "category_id" not in updates[requests[1].transaction_id]
+    assert updates[requests[1].transaction_id]["ai_suggested_category_id"] == FOOD.id
+    # An income category is never assigned to an expense
+    assert updates[requests[2].transaction_id] == {
+        "id": requests[2].transaction_id,
+        "ai_categorization_data": {"source": "model", "provider": "local-stub"},
+    }
+    # A transaction the model left out is marked so it is not sent again
+    assert updates[requests[4].transaction_id]["ai_categorization_data"] == {
+        "source": "model",
+        "provider": "local-stub",
+        "omitted": True,
+    }
+    assert [change.after.category_id for change in applied] == [FOOD.id]
+    assert applied[0].before.category_id is None
+    assert (outcome.assigned, outcome.suggested) == (1, 1)
+    assert session.committed
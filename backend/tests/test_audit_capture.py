@@ -0,0 +1,229 @@
+"""
+Tests for automatic audit capture.
+
+This module contains unit tests for building diff-only audit events from
+ORM attribute history and from set-based statements, and for handing them
+to the writer only on commit, using an unbound session and an in-memory
+writer.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.models.account import Account
+from app.models.budget import BudgetItem
+from app.models.transaction import Transaction
+from app.services.audit_capture import (
+    AuditCapture,
+    capture_changes,
+    capture_statement,
+    set_audit_context,
+)
+
+
+def persistent(session, obj):
+    """Attach an object to a session as if it had been loaded."""
+    make_transient_to_detached(obj)
+    session.add(obj)
+    return obj
+
+
+def make_transaction(**values):
+    """Build a loaded transaction."""
+    return Transaction(
+        id=uuid4(),
+        user_id=uuid4(),
+        description="Coffee",
+        amount=Decimal("4.50"),
+        currency="USD",
+        transaction_type="expense",
+        transaction_date=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        notes=None,
+        is_deleted=False,
+        **values,
+    )
+
+
+@pytest.mark.unit
+def test_update_stores_only_changed_fields():
+    """Test that an update records the changed fields and nothing else."""
+    session = Session()
+    transaction = persistent(session, make_transaction())
+    transaction.notes = "with a friend"
+    transaction.updated_at = datetime.now(timezone.utc)
+
+    [event] = capture_changes(session)
+
+    assert event.action == "update"
+    assert event.entity_type == "transaction"
+    assert event.entity_id == transaction.id
+    assert event.user_id == transaction.user_id
+    assert event.old_values == {"notes": None}
+    assert event.new_values == {"notes": "with a friend"}
+    assert event.changed_fields == ["notes"]
+    assert event.is_sensitive is False
+
+
+@pytest.mark.unit
+def test_sensitive_fields_are_redacted_at_capture():
+    """Test that sensitive values never leave the capture layer."""
+    session = Session()
+    account = persistent(
+        session,
+        Account(id=uuid4(), user_id=uuid4(), name="Checking", account_number="1234"),
+    )
+    account.account_number = "9876"
+    account.name = "Main checking"
+
+    [event] = capture_changes(session)
+
+    assert event.is_sensitive is True
+    assert event.old_values == {"account_number": "[REDACTED]", "name": "Checking"}
+    assert event.new_values == {
+        "account_number": "[REDACTED]",
+        "name": "Main checking",
+    }
+
+
+@pytest.mark.unit
+def test_soft_delete_and_unaudited_models():
+    """Test that soft deletes are deletes and other models are skipped."""
+    session = Session()
+    transaction = persistent(session, make_transaction())
+    transaction.is_deleted = True
+    persistent(session, BudgetItem(id=uuid4())).notes = "ignored"
+    untouched = persistent(session, make_transaction())
+    untouched.updated_at = datetime.now(timezone.utc)
+
+    events = capture_changes(session)
+
+    assert [(event.action, event.entity_id) for event in events] == [
+        ("delete", transaction.id)
+    ]
+    assert events[0].new_values == {"is_deleted": True}
+
+
+@pytest.mark.unit
+def test_create_records_set_fields_with_request_context():
+    """Test that a new object records its set fields and the request details."""
+    session = Session()
+    actor = uuid4()
+    set_audit_context(session, user_id=actor, ip_address="203.0.113.9")
+    transaction = make_transaction()
+    session.add(transaction)
+
+    [event] = capture_changes(session)
+
+    assert event.action == "create"
+    assert event.user_id == actor
+    assert event.ip_address == "203.0.113.9"
+    assert event.old_values is None
+    assert event.changed_fields is None
+    assert event.new_values["transaction_date"] == "2025-08-01T00:00:00+00:00"
+    assert event.new_values["amount"] == "[REDACTED]"
+    assert "notes" not in event.new_values
+
+
+class RecordingWriter:
+    """Writer stand-in collecting recorded events."""
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+
+@pytest.mark.unit
+def test_events_are_written_only_on_commit():
+    """Test that rolled-back changes are never audited."""
+    writer = RecordingWriter()
+    capture = AuditCapture(writer)
+    session = Session()
+    persistent(session, make_transaction()).notes = "first"
+
+    capture.after_flush(session, None)
+    capture.after_rollback(session)
+    capture.after_commit(session)
+    assert writer.events == []
+
+    capture.after_flush(session, None)
+    capture.after_commit(session)
+    assert [event.new_values for event in writer.events] == [{"notes": "first"}]
+
+
+def execute_state(statement, parameters=None, rowcount=None):
+    """Build an execution state stand-in for a statement run by a session."""
+    invoked = []
+
+    def invoke_statement():
+        invoked.append(statement)
+        return SimpleNamespace(rowcount=rowcount)
+
+    return SimpleNamespace(
+        session=Session(),
+        statement=statement,
+        parameters=parameters,
+        is_update=statement.is_update,
+        is_delete=statement.is_delete,
+        is_executemany=isinstance(parameters, list),
+        invoke_statement=invoke_statement,
+        invoked=invoked,
+    )
+
+
+@pytest.mark.unit
+def test_bulk_updates_by_primary_key_record_each_row():
+    """Test that bulk updates by primary key record every row's new values."""
+    first, second, category = uuid4(), uuid4(), uuid4()
+    state = execute_state(
+        update(Transaction),
+        [
+            {"id": first, "category_id": category, "ai_categorized": True},
+            {"id": second, "updated_at": datetime.now(timezone.utc)},
+        ],
+    )
+    set_audit_context(state.session, user_id=first)
+
+    [event] = capture_statement(state, "transaction")
+
+    assert event.action == "update"
+    assert event.entity_id == first
+    assert event.user_id == first
+    assert event.new_values == {"category_id": str(category), "ai_categorized": True}
+    assert event.changed_fields == ["ai_categorized", "category_id"]
+
+
+@pytest.mark.unit
+def test_set_based_updates_are_summarized_until_commit():
+    """Test that set-based updates record their fields and row count on commit."""
+    writer = RecordingWriter()
+    capture = AuditCapture(writer)
+    state = execute_state(
+        update(Account)
+        .where(Account.id == uuid4())
+        .values(current_balance=Account.current_balance + 5),
+        rowcount=1,
+    )
+    skipped = execute_state(update(BudgetItem).values(notes="ignored"))
+
+    result = capture.do_orm_execute(state)
+    assert capture.do_orm_execute(skipped) is None
+    assert skipped.invoked == []
+    assert writer.events == []
+    capture.after_commit(state.session)
+
+    assert result.rowcount == 1
+    [event] = writer.events
+    assert event.action == "bulk_update"
+    assert event.entity_type == "account"
+    assert event.entity_id is None
+    assert event.changed_fields == ["current_balance"]
+    assert event.new_values is None
+    assert event.audit_metadata == {"rows": 1}
@@ -0,0 +1,245 @@
+"""
+Tests for audit log retention.
+
+This module contains unit tests for creating monthly audit_logs
+partitions ahead of time, for moving rows out of the default partition and
+for archiving expired partitions, using an in-memory stand-in for the
+session.
+"""
+
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.audit_retention import (
+    AuditPartition,
+    AuditRetentionService,
+    add_months,
+    partition_month,
+    partition_name,
+)
+
+
+class CatalogSession:
+    """Session stand-in answering the partition catalog queries."""
+
+    def __init__(self, *partitions, default_months=(), moved=0, fail=None):
+        self.partitions = partitions
+        self.default_months = default_months
+        self.moved = moved
+        self.fail = fail
+        self.statements = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        sql = str(statement)
+        if sql.startswith("SELECT c.relname"):
+            return [
+                SimpleNamespace(name=name, attached=attached)
+                for name, attached in self.partitions
+            ]
+        if sql.startswith("SELECT DISTINCT"):
+            return [SimpleNamespace(month=month) for month in self.default_months]
+        if self.fail and sql.startswith(self.fail):
+            raise RuntimeError("partition overlaps default rows")
+        if sql.startswith(("CREATE", "LOCK")):
+            return None
+        self.statements.append(sql)
+        return SimpleNamespace(rowcount=self.moved)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.mark.unit
+def test_month_helpers():
+    """Test month arithmetic and partition names."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2025, 1, 1), -13) == date(2023, 12, 1)
+    assert partition_name(date(2025, 7, 1)) == "audit_logs_y2025m07"
+    assert partition_month("audit_logs_y2025m07") == date(2025, 7, 1)
+    assert partition_month("audit_logs_default") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ensure_partitions_creates_missing_months():
+    """Test that only missing months up to the horizon are created."""
+    session = CatalogSession(
+        ("audit_logs_y2025m11", True), ("audit_logs_y2026m01", True)
+    )
+
+    created = await AuditRetentionService(session).ensure_partitions(
+        date(2025, 11, 15), months_ahead=3
+    )
+
+    assert created == ["audit_logs_y2025m12", "audit_logs_y2026m02"]
+    # Rows of the month are moved out of the default partition, then attached
+    assert session.statements[0].startswith(
+        "WITH moved AS (DELETE FROM audit_logs_default"
+    )
+    assert session.statements[0].endswith(
+        "INSERT INTO audit_logs_y2025m12 SELECT * FROM moved"
+    )
+    assert session.statements[1] == (
+        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_y2025m12 "
+        "FOR VALUES FROM ('2025-12-01T00:00:00+00:00') "
+        "TO ('2026-01-01T00:00:00+00:00')"
+    )
+    assert session.commits == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_ensure_partitions_fails_loudly():
+    """Test that a partition that cannot be created stops the run."""
+    session = CatalogSession(fail="ALTER TABLE audit_logs ATTACH")
+
+    with pytest.raises(RuntimeError, match="overlaps"):
+        await AuditRetentionService(session).ensure_partitions(
+            date(2025, 11, 15), months_ahead=3
+        )
+
+    assert session.rollbacks == 1
+    assert session.commits == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_archive_detaches_exports_then_drops(monkeypatch, tmp_path):
+    """Test that expired partitions are archived before they are dropped."""
+    session = CatalogSession(
+        ("audit_logs_y2024m09", True),
+        ("audit_logs_y2024m10", False),
+        ("audit_logs_y2024m11", True),
+        ("audit_logs_default", True),
+        default_months=[date(2024, 10, 1)],
+        moved=2,
+    )
+    exported = []
+
+    async def export_partition(self, partition, archive_dir):
+        exported.append((partition.name, list(session.statements)))
+        return archive_dir / f"{partition.month:%Y-%m}.parquet"
+
+    monkeypatch.setattr(AuditRetentionService, "export_partition", export_partition)
+
+    archives = await AuditRetentionService(session).archive_expired(
+        date(2025, 11, 15), tmp_path, retention_months=12
+    )
+
+    assert archives == [tmp_path / "2024-09.parquet", tmp_path / "2024-10.parquet"]
+    # Expired default rows joined their month's detached table first
+    move, *archiving = session.statements
+    assert move.endswith("INSERT INTO audit_logs_y2024m10 SELECT * FROM moved")
+    assert archiving == [
+        "ALTER TABLE audit_logs DETACH PARTITION audit_logs_y2024m09",
+        "DROP TABLE audit_logs_y2024m09",
+        "DROP TABLE audit_logs_y2024m10",
+    ]
+    # Each partition was detached, and not yet dropped, when it was exported
+    assert exported[0] == (
+        "audit_logs_y2024m09",
+        [move, "ALTER TABLE audit_logs DETACH PARTITION audit_logs_y2024m09"],
+    )
+
+
+class RowStream:
+    """Streamed result stand-in yielding row batches."""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def mappings(self):
+        return self
+
+    async def partitions(self):
+        for batch in self.batches:
+            yield batch
+
+
+def audit_row(**values):
+    """Build an audit_logs row as streamed from a partition."""
+    row = {
+        "id": uuid4(),
+        "user_id": None,
+        "action": "update",
+        "entity_type": "transaction",
+        "entity_id": uuid4(),
+        "old_values": {"notes": None},
+        "new_values": {"notes": "lunch"},
+        "changed_fields": ["notes"],
+        "ip_address": None,
+        "user_agent": None,
+        "session_id": None,
+        "description": None,
+        "audit_metadata": None,
+        "severity": "info",
+        "is_sensitive": False,
+        "created_at": datetime(2024, 9, 3, tzinfo=timezone.utc),
+    }
+    row.update(values)
+    return row
+
+
+class StreamSession:
+    """Session stand-in streaming the rows of a partition."""
+
+    def __init__(self, *batches):
+        self.batches = batches
+
+    async def stream(self, statement):
+        return RowStream(self.batches)
+
+
+SEPTEMBER = AuditPartition("audit_logs_y2024m09", date(2024, 9, 1), False)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_export_writes_compressed_parquet(tmp_path):
+    """Test that a partition is written as one Parquet row group per batch."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    row = audit_row()
+
+    path = await AuditRetentionService(
+        StreamSession([row, row], [row])
+    ).export_partition(SEPTEMBER, tmp_path)
+
+    archive = pq.ParquetFile(path)
+    assert path.name == "2024-09.parquet"
+    assert archive.metadata.num_rows == 3
+    assert archive.metadata.num_row_groups == 2
+    assert archive.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert archive.read().column("new_values")[0].as_py() == '{"notes": "lunch"}'
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_rearchiving_a_month_keeps_the_earlier_archive(tmp_path):
+    """Test that late rows of an archived month get an archive of their own."""
+    pq = pytest.importorskip("pyarrow.parquet")
+    first, late = audit_row(), audit_row()
+
+    paths = [
+        await AuditRetentionService(StreamSession([row])).export_partition(
+            SEPTEMBER, tmp_path
+        )
+        for row in (first, late)
+    ]
+
+    assert [path.name for path in paths] == ["2024-09.parquet", "2024-09.2.parquet"]
+    assert [pq.read_table(path).column("id").to_pylist() for path in paths] == [
+        [str(first["id"])],
+        [str(late["id"])],
+    ]
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "2024-09.2.parquet",
+        "2024-09.parquet",
+    ]
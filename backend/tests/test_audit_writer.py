@@ -0,0 +1,139 @@
+"""
+Tests for the audit log writer.
+
+This module contains unit tests for batching audit events into multi-row
+INSERTs, spilling overflow and failed batches to Redis and draining the
+queue on shutdown, using in-memory stand-ins for the session and Redis.
+"""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import audit_writer as audit_writer_module
+from app.services.audit_writer import AUDIT_SPILL_KEY, AuditEvent, AuditWriter
+
+
+class BatchSession:
+    """Session stand-in recording each INSERT's rows."""
+
+    def __init__(self, outcome):
+        self.outcome = outcome
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, *args, **kwargs):
+        if self.outcome.failing:
+            raise ConnectionError("database unavailable")
+        self.outcome.statements.append(statement)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class Outcome:
+    """Statements written through BatchSession."""
+
+    def __init__(self, failing=False):
+        self.failing = failing
+        self.statements = []
+
+    def session_factory(self):
+        return BatchSession(self)
+
+    @property
+    def batches(self):
+        return [len(statement._multi_values[0]) for statement in self.statements]
+
+
+class ListRedis:
+    """Redis stand-in holding lists."""
+
+    def __init__(self):
+        self.lists = {}
+
+    async def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    async def lpop(self, key, count):
+        items = self.lists.get(key, [])
+        popped, self.lists[key] = items[:count], items[count:]
+        return popped or None
+
+
+def event(number):
+    """Build a login event."""
+    return AuditEvent(action="login", entity_type="user", description=str(number))
+
+
+@pytest.mark.unit
+def test_event_round_trips_through_json():
+    """Test that a spilled event keeps its identity and types."""
+    original = AuditEvent(action="update", entity_type="budget", new_values={"a": 1})
+
+    assert AuditEvent.from_json(original.to_json()) == original
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_writer_batches_by_size_and_drains_on_stop():
+    """Test that queued events are written in multi-row INSERTs on shutdown."""
+    outcome = Outcome()
+    writer = AuditWriter(outcome.session_factory, batch_size=3, flush_interval=60)
+    for number in range(7):
+        writer.record(event(number))
+
+    await writer.start(ListRedis())
+    await writer.stop()
+
+    assert outcome.batches == [3, 3, 1]
+    assert writer.pending == 0
+    sql = str(outcome.statements[0].compile(dialect=postgresql.dialect()))
+    assert "VALUES (" in sql and "), (" in sql
+    assert sql.endswith("ON CONFLICT (id, created_at) DO NOTHING")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_overflow_spills_to_redis_and_replays(monkeypatch):
+    """Test that events beyond the queue bound are spilled, then replayed."""
+    monkeypatch.setattr(audit_writer_module, "SPILL_REPLAY_INTERVAL", 0)
+    outcome, redis = Outcome(), ListRedis()
+    writer = AuditWriter(outcome.session_factory, max_queue=2, batch_size=10)
+    for number in range(5):
+        writer.record(event(number))
+
+    await writer.start(redis)
+    await writer.stop()
+
+    assert outcome.batches == [2]
+    assert len(redis.lists[AUDIT_SPILL_KEY]) == 3
+
+    await writer.start(redis)
+    await writer._replay_spill()
+    await writer.stop()
+
+    assert outcome.batches == [2, 3]
+    assert redis.lists[AUDIT_SPILL_KEY] == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_failed_batch_is_spilled():
+    """Test that a database outage loses no events."""
+    outcome, redis = Outcome(failing=True), ListRedis()
+    writer = AuditWriter(outcome.session_factory, batch_size=10)
+    for number in range(4):
+        writer.record(event(number))
+
+    await writer.start(redis)
+    await writer.stop()
+
+    spilled = [AuditEvent.from_json(raw) for raw in redis.lists[AUDIT_SPILL_KEY]]
+    assert [item.description for item in spilled] == ["0", "1", "2", "3"]
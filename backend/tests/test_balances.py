@@ -0,0 +1,244 @@
+"""
+Tests for the balance update service.
+
+This module contains unit tests for per-account delta aggregation, the
+atomic UPDATE statements issued by BalanceUpdateService and the balance
+ledger's snapshot lookups and invalidation.
+"""
+
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.balance_ledger import LEDGER_EPOCH, BalanceLedgerService, end_of_day
+from app.services.balances import BalanceUpdateService, aggregate_account_deltas
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+
+
+class RecordingResult:
+    """Result stand-in returning no rows."""
+
+    def one_or_none(self):
+        return None
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    """Minimal async session stand-in that records executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return RecordingResult()
+
+
+def make_snapshot(**overrides) -> TransactionSnapshot:
+    """Build a transaction snapshot with sensible defaults."""
+    data = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "category_id": None,
+        "from_account_id": None,
+        "to_account_id": None,
+        "amount": Decimal("10.00"),
+        "currency": "USD",
+        "transaction_type": "expense",
+        "transaction_date": datetime(2024, 1, 10, tzinfo=timezone.utc),
+    }
+    data.update(overrides)
+    return TransactionSnapshot(**data)
+
+
+@pytest.mark.unit
+class TestAccountDeltas:
+    """Test aggregation of balance deltas within a batch."""
+
+    def test_import_collapses_to_one_delta_per_account(self):
+        """Test that a large import yields one delta per touched account."""
+        checking = uuid4()
+        changes = [
+            TransactionChange(
+                before=None, after=make_snapshot(from_account_id=checking)
+            )
+            for _ in range(1000)
+        ]
+
+        deltas = aggregate_account_deltas(changes)
+
+        assert deltas == {checking: Decimal("-10000.00")}
+
+    def test_transfer_moves_money_between_accounts(self):
+        """Test that transfers debit the source and credit the target."""
+        source, target = uuid4(), uuid4()
+        transfer = make_snapshot(
+            from_account_id=source,
+            to_account_id=target,
+            transaction_type="transfer",
+            amount=Decimal("250.00"),
+        )
+
+        deltas = aggregate_account_deltas([TransactionChange(None, transfer)])
+
+        assert deltas == {source: Decimal("-250.00"), target: Decimal("250.00")}
+
+    def test_net_zero_updates_are_dropped(self):
+        """Test that an update that does not move money produces no delta."""
+        account = uuid4()
+        before = make_snapshot(from_account_id=account)
+        after = make_snapshot(
+            id=before.id, from_account_id=account, category_id=uuid4()
+        )
+
+        assert aggregate_account_deltas([TransactionChange(before, after)]) == {}
+
+
+@pytest.mark.unit
+class TestBalanceUpdateService:
+    """Test the atomic update statements."""
+
+    @pytest.mark.asyncio
+    async def test_one_update_per_account(self):
+        """Test that each touched account gets a single relative UPDATE."""
+        session = RecordingSession()
+        deltas = {uuid4(): Decimal("5.00"), uuid4(): Decimal("-3.00")}
+
+        await BalanceUpdateService(session).apply_account_deltas(deltas)
+
+        assert len(session.statements) == 2
+        sql = str(session.statements[0].compile())
+        assert "current_balance=(accounts.current_balance +" in sql
+        assert "RETURNING" in sql
+
+
+class LedgerSession:
+    """Session stand-in returning the start of each account."""
+
+    def __init__(self, starts):
+        self.starts = starts
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.starts
+
+
+class RecordingLedger(BalanceLedgerService):
+    """Ledger recording the leg scan windows instead of querying them."""
+
+    def __init__(self, db, totals):
+        super().__init__(db)
+        self.totals = totals
+        self.bounds = None
+
+    async def _leg_totals(self, bounds, until):
+        self.bounds = dict(bounds)
+        return self.totals
+
+
+@pytest.mark.unit
+class TestBalanceLedger:
+    """Test balance-as-of queries and snapshot invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_balance_is_snapshot_plus_later_legs(self):
+        """Test that only the legs dated after the snapshot are added to it."""
+        snapshotted = uuid4()
+        starts = [
+            SimpleNamespace(
+                id=snapshotted,
+                opening_balance=Decimal("0.00"),
+                as_of_date=date(2025, 6, 30),
+                balance=Decimal("40.00"),
+            )
+        ]
+        ledger = RecordingLedger(
+            LedgerSession(starts), {snapshotted: Decimal("-15.00")}
+        )
+
+        balances = await ledger.balances_as_of([snapshotted], date(2025, 7, 15))
+
+        assert balances == {snapshotted: Decimal("25.00")}
+        assert ledger.bounds == {snapshotted: end_of_day(date(2025, 6, 30))}
+
+    @pytest.mark.asyncio
+    async def test_accounts_without_snapshot_start_from_opening_balance(self):
+        """Test that the opening balance seeds accounts with no snapshot yet."""
+        fresh, snapshotted, unknown = uuid4(), uuid4(), uuid4()
+        starts = [
+            SimpleNamespace(
+                id=fresh,
+                opening_balance=Decimal("250.00"),
+                as_of_date=None,
+                balance=None,
+            ),
+            SimpleNamespace(
+                id=snapshotted,
+                opening_balance=Decimal("999.00"),
+                as_of_date=date(2025, 6, 30),
+                balance=Decimal("40.00"),
+            ),
+        ]
+        ledger = RecordingLedger(LedgerSession(starts), {fresh: Decimal("-50.00")})
+
+        balances = await ledger.balances_as_of(
+            [fresh, snapshotted, unknown], date(2025, 7, 15)
+        )
+
+        assert balances == {
+            fresh: Decimal("200.00"),
+            snapshotted: Decimal("40.00"),
+            unknown: Decimal("0.00"),
+        }
+        assert ledger.bounds == {
+            fresh: LEDGER_EPOCH,
+            snapshotted: end_of_day(date(2025, 6, 30)),
+            unknown: LEDGER_EPOCH,
+        }
+
+    @pytest.mark.asyncio
+    async def test_invalidate_from_earliest_affected_day(self):
+        """Test that snapshots are dropped from the earliest day per account."""
+        session = RecordingSession()
+        account = uuid4()
+        before = make_snapshot(
+            from_account_id=account,
+            transaction_date=datetime(2025, 3, 5, tzinfo=timezone.utc),
+        )
+        backdated = make_snapshot(
+            id=before.id,
+            from_account_id=account,
+            transaction_date=datetime(2025, 1, 20, tzinfo=timezone.utc),
+        )
+        later = make_snapshot(
+            from_account_id=account,
+            transaction_date=datetime(2025, 2, 1, tzinfo=timezone.utc),
+        )
+
+        await BalanceLedgerService(session).invalidate(
+            [TransactionChange(before, backdated), TransactionChange(None, later)]
+        )
+
+        assert len(session.statements) == 1
+        compiled = session.statements[0].compile(dialect=postgresql.dialect())
+        assert str(compiled).startswith("DELETE FROM account_balance_snapshots")
+        assert sorted(compiled.params.values(), key=str) == sorted(
+            [account, date(2025, 1, 20)], key=str
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_skips_changes_without_accounts(self):
+        """Test that changes touching no account issue no statement."""
+        session = RecordingSession()
+
+        removed = await BalanceLedgerService(session).invalidate(
+            [TransactionChange(None, make_snapshot())]
+        )
+
+        assert removed == 0
+        assert session.statements == []
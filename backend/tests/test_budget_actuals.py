@@ -0,0 +1,120 @@
+"""
+Tests for the budget actuals engine.
+
+This module contains unit tests for expense contribution extraction and the
+set-based UPDATE statements issued by BudgetActualsEngine.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services.budget_actuals import BudgetActualsEngine, expense_contributions
+from app.services.transaction_events import TransactionChange, TransactionSnapshot
+
+
+class RecordingResult:
+    """Result stand-in returning no rows."""
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    """Minimal async session stand-in that records executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return RecordingResult()
+
+
+def make_snapshot(**overrides) -> TransactionSnapshot:
+    """Build a transaction snapshot with sensible defaults."""
+    data = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "category_id": uuid4(),
+        "from_account_id": uuid4(),
+        "to_account_id": None,
+        "amount": Decimal("-10.00"),
+        "currency": "USD",
+        "transaction_type": "expense",
+        "transaction_date": datetime(2024, 1, 10, tzinfo=timezone.utc),
+    }
+    data.update(overrides)
+    return TransactionSnapshot(**data)
+
+
+@pytest.mark.unit
+class TestExpenseContributions:
+    """Test mapping of transaction changes to budget contributions."""
+
+    def test_only_expenses_contribute(self):
+        """Test that income and transfers never touch budgets."""
+        changes = [
+            TransactionChange(None, make_snapshot(transaction_type="income")),
+            TransactionChange(None, make_snapshot(transaction_type="transfer")),
+        ]
+
+        assert expense_contributions(changes) == []
+
+    def test_category_edit_moves_amount(self):
+        """Test that recategorizing retracts from the old category."""
+        before = make_snapshot()
+        after = make_snapshot(
+            id=before.id,
+            user_id=before.user_id,
+            from_account_id=before.from_account_id,
+            category_id=uuid4(),
+        )
+
+        contributions = expense_contributions([TransactionChange(before, after)])
+
+        assert {(c[1], c[5]) for c in contributions} == {
+            (before.category_id, Decimal("-10.00")),
+            (after.category_id, Decimal("10.00")),
+        }
+
+    def test_soft_delete_retracts_amount(self):
+        """Test that deleting an expense subtracts its absolute amount."""
+        before = make_snapshot(amount=Decimal("42.50"))
+
+        contributions = expense_contributions([TransactionChange(before, None)])
+
+        assert [c[5] for c in contributions] == [Decimal("-42.50")]
+
+
+@pytest.mark.unit
+class TestBudgetActualsEngine:
+    """Test the set-based update statements."""
+
+    @pytest.mark.asyncio
+    async def test_batch_issues_two_updates(self):
+        """Test that a batch of any size updates budgets and items once each."""
+        session = RecordingSession()
+        changes = [TransactionChange(None, make_snapshot()) for _ in range(100)]
+
+        await BudgetActualsEngine(session).apply_changes(changes)
+
+        assert len(session.statements) == 2
+        budget_sql = str(session.statements[0].compile())
+        assert "actual_spent=(budgets.actual_spent + budget_deltas.delta)" in budget_sql
+        item_sql = str(session.statements[1].compile())
+        assert "budget_items.actual_amount + item_deltas.delta" in item_sql
+
+    @pytest.mark.asyncio
+    async def test_no_expenses_issue_no_statements(self):
+        """Test that batches without expenses skip the database entirely."""
+        session = RecordingSession()
+        changes = [TransactionChange(None, make_snapshot(transaction_type="income"))]
+
+        assert await BudgetActualsEngine(session).apply_changes(changes) == set()
+        assert session.statements == []
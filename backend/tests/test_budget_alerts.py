@@ -0,0 +1,199 @@
+"""
+Tests for the budget alert engine.
+
+This module contains unit tests for alert levels and crossing
+deduplication, using in-memory stand-ins for the session and Redis.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.sql import operators
+
+from app.services.budget_alerts import (
+    LEVEL_EXCEEDED,
+    LEVEL_NONE,
+    LEVEL_THRESHOLD,
+    BudgetAlertService,
+    alert_level,
+)
+from tests.conftest import CounterPipeline
+
+
+class BudgetSession:
+    """
+    Async session stand-in serving budget rows and recording inserts.
+
+    Stored alert levels follow the conditional UPDATEs and are restored on
+    rollback, like the budget rows they stand for.
+    """
+
+    def __init__(self, rows, fail_inserts=False):
+        self.rows = rows
+        self.fail_inserts = fail_inserts
+        self.inserts = []
+        self.levels = {}
+        self.committed = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        if statement.is_insert:
+            if self.fail_inserts:
+                raise ConnectionError("connection lost")
+            self.inserts.append(statement)
+            return None
+        if statement.is_update:
+            _, condition = statement._where_criteria
+            levels = dict(condition.right.table._data[0])
+            raising = condition.operator is operators.lt
+            changed = [
+                budget_id
+                for budget_id, level in levels.items()
+                if level != self.levels.get(budget_id, 0)
+                and (level > self.levels.get(budget_id, 0)) == raising
+            ]
+            for budget_id in changed:
+                self.levels[budget_id] = levels[budget_id]
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: changed))
+        return list(self.rows)
+
+    async def commit(self):
+        self.committed = dict(self.levels)
+
+    async def rollback(self):
+        self.levels = dict(self.committed)
+
+
+class AlertRedis:
+    """Redis stand-in holding the dirty set and unread counters."""
+
+    def __init__(self):
+        self.dirty = set()
+        self.counters = {}
+
+    def pipeline(self, transaction=True):
+        return CounterPipeline(self.counters)
+
+    async def sadd(self, key, *members):
+        self.dirty.update(members)
+
+    async def spop(self, key, count):
+        members = [self.dirty.pop() for _ in range(min(count, len(self.dirty)))]
+        return members or None
+
+
+def make_row(actual_spent: str, total_budget: str = "100.00", threshold: int = 80):
+    """Build a budget row with sensible defaults."""
+    return SimpleNamespace(
+        id=uuid4(),
+        user_id=uuid4(),
+        name="Groceries",
+        total_budget=Decimal(total_budget),
+        actual_spent=Decimal(actual_spent),
+        alert_threshold=threshold,
+        currency="USD",
+        end_date=datetime(2099, 1, 31, tzinfo=timezone.utc),
+    )
+
+
+@pytest.mark.unit
+class TestAlertLevel:
+    """Test alert level computation."""
+
+    def test_levels(self):
+        """Test each level boundary."""
+        total = Decimal("200.00")
+        assert alert_level(Decimal("159.99"), total, 80) == LEVEL_NONE
+        assert alert_level(Decimal("160.00"), total, 80) == LEVEL_THRESHOLD
+        assert alert_level(Decimal("200.00"), total, 80) == LEVEL_EXCEEDED
+
+    def test_zero_budget_never_alerts(self):
+        """Test that budgets without an amount never alert."""
+        assert alert_level(Decimal("50.00"), Decimal("0.00"), 80) == LEVEL_NONE
+
+
+@pytest.mark.unit
+class TestBudgetAlertService:
+    """Test crossing detection and deduplication."""
+
+    @pytest.mark.asyncio
+    async def test_alerts_only_on_crossing(self):
+        """Test that re-evaluating an unchanged budget emits nothing."""
+        row = make_row("85.00")
+        session, redis = BudgetSession([row]), AlertRedis()
+        service = BudgetAlertService(session, redis)
+
+        first = await service.evaluate([row.id])
+        second = await service.evaluate([row.id])
+
+        assert [alert.level for alert in first] == [LEVEL_THRESHOLD]
+        assert second == []
+        assert len(session.inserts) == 1
+
+    @pytest.mark.asyncio
+    async def test_several_budgets_cross_in_one_batch(self):
+        """Test that a batch persists all of its crossings in one INSERT."""
+        rows = [make_row("90.00"), make_row("120.00"), make_row("10.00")]
+        session, redis = BudgetSession(rows), AlertRedis()
+        service = BudgetAlertService(session, redis)
+
+        alerts = await service.evaluate([row.id for row in rows])
+
+        assert {alert.budget_id: alert.level for alert in alerts} == {
+            rows[0].id: LEVEL_THRESHOLD,
+            rows[1].id: LEVEL_EXCEEDED,
+        }
+        assert len(session.inserts) == 1
+        # Unread badges only move once the sweep commits
+        assert redis.counters == {}
+
+    @pytest.mark.asyncio
+    async def test_sweep_commits_before_raising_unread_counters(self):
+        """Test that each alert counts towards its user's badge after commit."""
+        rows = [make_row("90.00"), make_row("120.00")]
+        session, redis = BudgetSession(rows), AlertRedis()
+        await redis.sadd("dirty", *(str(row.id) for row in rows))
+
+        assert await BudgetAlertService(session, redis).sweep() == 2
+
+        assert session.committed == {
+            rows[0].id: LEVEL_THRESHOLD,
+            rows[1].id: LEVEL_EXCEEDED,
+        }
+        assert redis.counters == {
+            f"insights:unread:{rows[0].user_id}": 1,
+            f"insights:unread:{rows[1].user_id}": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_alert_is_emitted_again(self):
+        """Test that an alert lost with its transaction is not deduplicated."""
+        row = make_row("85.00")
+        session, redis = BudgetSession([row], fail_inserts=True), AlertRedis()
+        service = BudgetAlertService(session, redis)
+        await redis.sadd("dirty", str(row.id))
+
+        with pytest.raises(ConnectionError):
+            await service.sweep()
+        assert redis.dirty == {str(row.id)}
+        assert redis.counters == {}
+        session.fail_inserts = False
+
+        assert await service.sweep() == 1
+        assert len(session.inserts) == 1
+
+    @pytest.mark.asyncio
+    async def test_dropping_below_rearms_alert(self):
+        """Test that a refund below the threshold allows a new alert."""
+        row = make_row("85.00")
+        session, redis = BudgetSession([row]), AlertRedis()
+        service = BudgetAlertService(session, redis)
+
+        await service.evaluate([row.id])
+        row.actual_spent = Decimal("20.00")
+        assert await service.evaluate([row.id]) == []
+        row.actual_spent = Decimal("81.00")
+
+        assert len(await service.evaluate([row.id])) == 1
@@ -0,0 +1,121 @@
+"""
+Tests for the budget rollover processor.
+
+This module contains unit tests for the chunked, idempotent rollover
+statements, using a scripted session instead of a database.
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.budget_rollover import BudgetRolloverService
+
+
+class ScriptedResult:
+    """Result stand-in serving a fixed list of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class ScriptedSession:
+    """Async session stand-in answering statements from a script."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        rows = self.responses.pop(0) if self.responses else []
+        return ScriptedResult(rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+AS_OF = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.unit
+class TestBudgetRolloverService:
+    """Test the rollover processor."""
+
+    @pytest.mark.asyncio
+    async def test_chunk_is_rolled_with_insert_select(self):
+        """Test that a chunk creates budgets and items in two statements."""
+        ended = SimpleNamespace(
+            end_date=datetime(2024, 1, 31, tzinfo=timezone.utc), id=uuid4()
+        )
+        session = ScriptedSession([[ended], [uuid4()]])
+
+        created = await BudgetRolloverService(session).roll_over(AS_OF)
+
+        assert created == 1
+        assert session.commits == 1
+        budgets_sql = str(session.statements[1].compile())
+        assert "INSERT INTO budgets" in budgets_sql
+        assert "ON CONFLICT (rolled_over_from_id) DO NOTHING" in budgets_sql
+        assert "INSERT INTO budget_items" in str(session.statements[2].compile())
+
+    @pytest.mark.asyncio
+    async def test_rerun_creates_nothing(self):
+        """Test that already rolled budgets skip the item insert."""
+        ended = SimpleNamespace(
+            end_date=datetime(2024, 1, 31, tzinfo=timezone.utc), id=uuid4()
+        )
+        session = ScriptedSession([[ended], []])
+
+        created = await BudgetRolloverService(session).roll_over(AS_OF)
+
+        assert created == 0
+        assert not any(
+            "INSERT INTO budget_items" in str(statement.compile())
+            for statement in session.statements
+        )
+
+    @pytest.mark.asyncio
+    async def test_missed_periods_are_rolled_forward_pass_by_pass(self, monkeypatch):
+        """Test that a budget stale for several periods catches up to as_of."""
+
+        async def recompute_many(self, budget_ids):
+            pass
+
+        monkeypatch.setattr(
+            "app.services.budget_actuals.BudgetActualsEngine.recompute_many",
+            recompute_many,
+        )
+        november, december, january = uuid4(), uuid4(), uuid4()
+
+        def ended(month, budget_id):
+            return SimpleNamespace(
+                end_date=datetime(2023, month, 28, tzinfo=timezone.utc), id=budget_id
+            )
+
+        # Each pass: eligible chunk, budget insert, item insert, end of chunks
+        session = ScriptedSession(
+            [[ended(11, november)], [december], [], []]
+            + [[ended(12, december)], [january], [], []]
+            + [[]]
+        )
+
+        created = await BudgetRolloverService(session).roll_over(AS_OF)
+
+        assert created == 2
+        assert session.commits == 2
+        eligible_sql = str(session.statements[0].compile())
+        assert "budgets.end_date <" in eligible_sql
+        assert "budgets.end_date >=" not in eligible_sql
@@ -0,0 +1,149 @@
+"""
+Tests for the budget template service.
+
+This module contains unit tests for template instantiation and category
+remapping, using a scripted session instead of a database.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.budget_templates import BudgetTemplateService
+
+
+class ScriptedResult:
+    """Result stand-in serving a fixed value or rows."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def scalar_one(self):
+        return self.value
+
+
+class ScriptedSession:
+    """Async session stand-in answering queries from a script."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.inserts = {}
+
+    async def execute(self, statement, params=None, **kwargs):
+        if statement.is_insert:
+            self.inserts[statement.table.name] = params
+            return ScriptedResult(None)
+        if statement.is_update:
+            return ScriptedResult(None)
+        return ScriptedResult(self.responses.pop(0))
+
+    async def commit(self):
+        pass
+
+
+def make_template(owner_id, category_ids):
+    """Build a template budget with one item per category."""
+    return SimpleNamespace(
+        id=uuid4(),
+        user_id=owner_id,
+        name="Household",
+        description=None,
+        period_type="monthly",
+        total_budget=Decimal("1000.00"),
+        currency="USD",
+        rollover_enabled=False,
+        alert_threshold=80,
+        alert_enabled=True,
+        budget_items=[
+            SimpleNamespace(
+                category_id=category_id,
+                planned_amount=Decimal("100.00"),
+                is_fixed=False,
+                priority=1,
+            )
+            for category_id in category_ids
+        ],
+    )
+
+
+PERIODS = [
+    (
+        datetime(2024, month, 1, tzinfo=timezone.utc),
+        datetime(2024, month, 28, tzinfo=timezone.utc),
+    )
+    for month in (1, 2, 3)
+]
+
+
+@pytest.mark.unit
+class TestBudgetTemplateService:
+    """Test template instantiation."""
+
+    @pytest.mark.asyncio
+    async def test_one_insert_per_table_for_all_periods(self):
+        """Test that every period is written by a single insert per table."""
+        owner, groceries = uuid4(), uuid4()
+        template = make_template(owner, [groceries])
+        session = ScriptedSession([template, 1])
+
+        outcome = await BudgetTemplateService(session).instantiate(
+            template.id, PERIODS, [owner]
+        )
+
+        assert len(outcome.budget_ids) == 3
+        assert len(session.inserts["budgets"]) == 3
+        assert {row["category_id"] for row in session.inserts["budget_items"]} == {
+            groceries
+        }
+
+    @pytest.mark.asyncio
+    async def test_categories_remapped_by_name(self):
+        """Test that other users get their own same-named categories."""
+        owner, member = uuid4(), uuid4()
+        groceries, rent = uuid4(), uuid4()
+        member_groceries = uuid4()
+        template = make_template(owner, [groceries, rent])
+        session = ScriptedSession(
+            [
+                template,
+                1,
+                [
+                    SimpleNamespace(id=groceries, name="Groceries"),
+                    SimpleNamespace(id=rent, name="Rent"),
+                ],
+                [
+                    SimpleNamespace(
+                        user_id=member, id=member_groceries, name=" groceries"
+                    )
+                ],
+            ]
+        )
+
+        outcome = await BudgetTemplateService(session).instantiate(
+            template.id, PERIODS[:1], [member]
+        )
+
+        assert [row["category_id"] for row in session.inserts["budget_items"]] == [
+            member_groceries
+        ]
+        assert outcome.items_skipped == 1
+
+    @pytest.mark.asyncio
+    async def test_foreign_template_is_not_found(self):
+        """Test that users cannot instantiate someone else's template."""
+        template = make_template(uuid4(), [])
+        session = ScriptedSession([template])
+
+        with pytest.raises(ValueError, match="not found"):
+            await BudgetTemplateService(session).instantiate(
+                template.id, PERIODS, [uuid4()], owner_id=uuid4()
+            )
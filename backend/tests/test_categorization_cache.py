@@ -0,0 +1,328 @@
+"""
+Tests for the categorization cache.
+
+This module contains unit tests for description normalization, amount
+bucketing, cached lookups and learning from user corrections, using
+in-memory stand-ins for Redis and the database.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import transaction_recategorization
+from app.services.categorization_cache import (
+    CacheKey,
+    CategorizationCacheService,
+    amount_bucket,
+    normalize_description,
+)
+from app.services.category_tree import CategoryTree
+from app.services.transaction_recategorization import (
+    TransactionRecategorizationService,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "raw, normalized",
+    [
+        ("STARBUCKS #1234 SEATTLE WA", "starbucks seattle wa"),
+        ("Starbucks 03/05 #5678 Seattle WA", "starbucks seattle wa"),
+        ("SQ *BLUE BOTTLE COFFEE 4155551234", "blue bottle coffee"),
+        ("POS PURCHASE WHOLE FOODS MKT 10234 XXXX1234", "whole foods mkt"),
+        ("UBER *TRIP 2024-03-05", "uber trip"),
+        ("H&M 0402", "h&m"),
+        ("#1234 03/05", ""),
+    ],
+)
+def test_normalize_description(raw, normalized):
+    """Test that store numbers, dates and card suffixes are stripped."""
+    assert normalize_description(raw) == normalized
+
+
+@pytest.mark.unit
+def test_amount_bucket():
+    """Test power-of-two amount buckets."""
+    assert amount_bucket(Decimal("0.99")) == 0
+    assert amount_bucket(Decimal("4.50")) == amount_bucket(Decimal("7.99")) == 3
+    assert amount_bucket(Decimal("-8.00")) == 4
+
+
+class MemoryRedis:
+    """Redis stand-in backed by a dictionary."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+        self.deleted = []
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        self.deleted.append(keys)
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def hincrby(self, key, field, amount):
+        counters = self.hashes.setdefault(key, {})
+        counters[field] = str(int(counters.get(field, 0)) + amount)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    """Pipeline stand-in applying queued SETs on execute."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.queued.append((key, value))
+
+    async def execute(self):
+        self.redis.data.update(self.queued)
+
+
+class CountingSession:
+    """Session stand-in serving fixed cache rows and counting queries."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.queries += 1
+        return SimpleNamespace(scalars=lambda: iter(self.rows))
+
+
+def make_tree(user_id, *categories):
+    """Build a category tree from (name, category_type) pairs."""
+    rows = [
+        {
+            "id": uuid4(),
+            "parent_id": None,
+            "name": name,
+            "category_type": category_type,
+            "color": "#3B82F6",
+            "icon": None,
+            "is_system": True,
+            "is_active": True,
+            "budget_amount": None,
+            "keywords": None,
+        }
+        for name, category_type in categories
+    ]
+    return CategoryTree.build(user_id, 0, rows)
+
+
+def make_entry(key, user_id=None, category_id=None, name="Food", confidence="0.90"):
+    """Build a cache row for a key."""
+    return SimpleNamespace(
+        user_id=user_id,
+        normalized_description=key.normalized_description,
+        amount_bucket=key.amount_bucket,
+        transaction_type=key.transaction_type,
+        category_id=category_id,
+        category_name=name,
+        confidence=Decimal(confidence),
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_lookup_prefers_user_entries_and_resolves_global_names():
+    """Test per-user precedence, global resolution and miss counting."""
+    user_id = uuid4()
+    tree = make_tree(user_id, ("Food", "expense"), ("Coffee", "expense"))
+    coffee = tree.find_by_name("Coffee")
+    food = tree.find_by_name("Food")
+    starbucks = CacheKey.build("STARBUCKS #1234", Decimal("5.40"), "expense")
+    deli = CacheKey.build("CORNER DELI 03/05", Decimal("12.00"), "expense")
+    unknown = CacheKey.build("ACME LLC", Decimal("12.00"), "expense")
+    session = CountingSession(
+        [
+            make_entry(starbucks, name="Food"),
+            make_entry(starbucks, user_id, coffee.id, "Coffee", "1.00"),
+            make_entry(deli, name="Food", confidence="0.85"),
+        ]
+    )
+    redis = MemoryRedis()
+    cache = CategorizationCacheService(session, redis)
+
+    hits = await cache.lookup(user_id, [starbucks, deli, unknown], tree)
+
+    assert hits[starbucks].category_id == coffee.id
+    assert not hits[starbucks].is_global
+    assert hits[deli].category_id == food.id
+    assert hits[deli].confidence == Decimal("0.85")
+    assert hits[deli].is_global
+    assert unknown not in hits
+
+    # Answers and misses are now served from Redis alone
+    assert await cache.lookup(user_id, [starbucks, deli, unknown], tree) == hits
+    assert session.queries == 1
+
+    stats = await cache.stats()
+    assert stats["user_hits"] == 2
+    assert stats["global_hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == pytest.approx(4 / 6, abs=1e-4)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_global_entries_need_a_matching_category_of_the_same_type():
+    """Test that a global entry is ignored without a same-named category."""
+    user_id = uuid4()
+    tree = make_tree(user_id, ("Food", "income"))
+    key = CacheKey.build("CORNER DELI", Decimal("12.00"), "expense")
+    redis = MemoryRedis()
+    redis.data[key.redis_key(user_id)] = "-"
+    redis.data[key.redis_key("global")] = json.dumps(
+        {"category_id": None, "category_name": "Food", "confidence": "0.90"}
+    )
+    session = CountingSession([])
+
+    hits = await CategorizationCacheService(session, redis).lookup(user_id, [key], tree)
+
+    assert hits == {}
+    assert session.queries == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_stats_estimate_tokens_saved():
+    """Test that savings are estimated from average tokens per model request."""
+    redis = MemoryRedis()
+    cache = CategorizationCacheService(None, redis)
+    await cache.record_model_usage(requests=10, tokens=400)
+    await cache._count(user_hits=3, global_hits=2, misses=10)
+
+    stats = await cache.stats()
+
+    assert stats["ai_tokens_used"] == 400
+    assert stats["ai_tokens_saved"] == 200
+    assert stats["hit_rate"] == pytest.approx(5 / 15, abs=1e-4)
+
+
+class CorrectionSession:
+    """Session stand-in serving one transaction and category, logging writes."""
+
+    def __init__(self, transaction, category, redis):
+        self.transaction = transaction
+        self.category = category
+        self.redis = redis
+        self.log = []
+
+    async def execute(self, statement, params=None, **kwargs):
+        if statement.is_select:
+            return SimpleNamespace(scalar_one_or_none=lambda: self.transaction)
+        self.log.append(type(statement).__name__)
+        return SimpleNamespace()
+
+    async def get(self, model, category_id):
+        return self.category if category_id == self.category.id else None
+
+    async def flush(self):
+        self.log.append("flush")
+
+    async def commit(self):
+        # Redis must still hold the old entries when the write commits
+        self.log.append(("commit", len(self.redis.deleted)))
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_store_leaves_redis_to_be_invalidated_after_commit():
+    """Test that store() returns the stale keys instead of deleting them."""
+    user_id = uuid4()
+    tree = make_tree(user_id, ("Food", "expense"))
+    key = CacheKey.build("CORNER DELI", Decimal("12.00"), "expense")
+    redis = MemoryRedis()
+    redis.data[key.redis_key(user_id)] = "-"
+    cache = CategorizationCacheService(CountingSession([]), redis)
+
+    stale = await cache.store(
+        user_id, [(key, tree.find_by_name("Food").id, Decimal("0.90"))], tree
+    )
+
+    assert sorted(stale) == sorted([key.redis_key(user_id), key.redis_key("global")])
+    assert redis.deleted == []
+    await cache.invalidate(stale)
+    assert key.redis_key(user_id) not in redis.data
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_user_recategorization_corrects_the_cache_after_commit(monkeypatch):
+    """Test that a manual category change is learned and invalidated post-commit."""
+    user_id = uuid4()
+    category = SimpleNamespace(
+        id=uuid4(),
+        user_id=user_id,
+        name="Coffee",
+        category_type="expense",
+        is_active=True,
+        is_deleted=False,
+    )
+    transaction = SimpleNamespace(
+        id=uuid4(),
+        user_id=user_id,
+        category_id=uuid4(),
+        from_account_id=uuid4(),
+        to_account_id=None,
+        amount=Decimal("5.40"),
+        currency="USD",
+        transaction_type="expense",
+        transaction_date=datetime(2024, 3, 5, tzinfo=timezone.utc),
+        description="STARBUCKS #1234",
+        ai_categorized=True,
+    )
+    previous = transaction.category_id
+    applied = []
+
+    async def fake_apply(db, changes):
+        applied.extend(changes)
+        return set()
+
+    monkeypatch.setattr(
+        transaction_recategorization, "apply_transaction_changes", fake_apply
+    )
+    redis = MemoryRedis()
+    session = CorrectionSession(transaction, category, redis)
+    service = TransactionRecategorizationService(session, redis)
+
+    await service.recategorize(user_id, transaction.id, category.id)
+
+    assert transaction.category_id == category.id
+    assert not transaction.ai_categorized
+    assert [(c.before.category_id, c.after.category_id) for c in applied] == [
+        (previous, category.id)
+    ]
+    # The user entry is pinned and a disagreeing global entry dropped
+    assert session.log == ["flush", "Insert", "Delete", ("commit", 0)]
+    key = CacheKey.build(transaction.description, transaction.amount, "expense")
+    assert redis.deleted == [(key.redis_key(user_id), key.redis_key("global"))]
+
+    income = SimpleNamespace(**{**vars(category), "category_type": "income"})
+    with pytest.raises(ValueError, match="cannot be assigned"):
+        await TransactionRecategorizationService(
+            CorrectionSession(transaction, income, redis), redis
+        ).recategorize(user_id, transaction.id, income.id)
@@ -0,0 +1,259 @@
+"""
+Tests for the categorization rules engine.
+
+This module contains unit tests for compiling rules into the decision
+index, evaluating them against transactions, rule validation and the
+set-based retroactive UPDATE, using in-memory stand-ins for the database.
+"""
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.categorization_rule import CategorizationRule
+from app.services import categorization_rules
+from app.services.categorization_rules import (
+    CategorizationRuleService,
+    RuleIndex,
+    phrase_pattern,
+)
+from app.services.category_tree import CategoryTree
+
+
+def make_tree(user_id, *categories):
+    """Build a category tree from (name, category_type) pairs."""
+    rows = [
+        {
+            "id": uuid4(),
+            "parent_id": None,
+            "name": name,
+            "category_type": category_type,
+            "color": "#3B82F6",
+            "icon": None,
+            "is_system": False,
+            "is_active": True,
+            "budget_amount": None,
+            "keywords": None,
+        }
+        for name, category_type in categories
+    ]
+    return CategoryTree.build(user_id, 0, rows)
+
+
+def make_rule(user_id, name, **values):
+    """Build an unsaved rule."""
+    return CategorizationRule(id=uuid4(), user_id=user_id, name=name, **values)
+
+
+@pytest.fixture
+def rules_setup():
+    """A user with a few categories and rules."""
+    user_id = uuid4()
+    tree = make_tree(
+        user_id, ("Coffee", "expense"), ("Travel", "expense"), ("Salary", "income")
+    )
+    card = uuid4()
+    rules = [
+        make_rule(
+            user_id,
+            "Coffee",
+            description_contains="Blue Bottle",
+            category_id=tree.find_by_name("Coffee").id,
+            add_tags=["coffee"],
+        ),
+        make_rule(
+            user_id,
+            "Big card spend",
+            min_amount=Decimal("100"),
+            account_id=card,
+            add_tags=["review"],
+        ),
+        make_rule(
+            user_id,
+            "Work trips",
+            description_contains="uber",
+            max_amount=Decimal("80"),
+            transaction_type="expense",
+            category_id=tree.find_by_name("Travel").id,
+        ),
+        make_rule(
+            user_id,
+            "Payroll",
+            description_contains="acme payroll",
+            category_id=tree.find_by_name("Salary").id,
+        ),
+    ]
+    index = RuleIndex.build(user_id, (1, 0), rules, tree)
+    return SimpleNamespace(user_id=user_id, tree=tree, card=card, index=index)
+
+
+@pytest.mark.unit
+def test_rules_are_bucketed_by_account_and_type(rules_setup):
+    """Test that each rule lands in its (account, type) bucket."""
+    buckets = rules_setup.index.buckets
+
+    assert set(buckets) == {
+        (None, None),
+        (rules_setup.card, None),
+        (None, "expense"),
+    }
+    assert buckets[(None, None)].automaton is not None
+    assert buckets[(rules_setup.card, None)].automaton is None
+
+
+@pytest.mark.unit
+def test_evaluate_combines_category_and_tags(rules_setup):
+    """Test phrase, amount, account and type conditions together."""
+    index, tree = rules_setup.index, rules_setup.tree
+
+    coffee = index.evaluate(
+        "BLUE BOTTLE COFFEE #12", Decimal("-150.00"), "expense", (rules_setup.card,)
+    )
+    assert coffee.category_id == tree.find_by_name("Coffee").id
+    assert coffee.tags == ("coffee", "review")
+    assert len(coffee.rule_ids) == 2
+
+    assert index.evaluate("Blue Bottle", Decimal("4"), "expense").tags == ("coffee",)
+    assert index.evaluate("UBER TRIP", Decimal("25"), "expense").category_id == (
+        tree.find_by_name("Travel").id
+    )
+    assert index.evaluate("UBER TRIP", Decimal("95"), "expense") is None
+    assert index.evaluate("UBER TRIP", Decimal("25"), "income") is None
+    assert index.evaluate("Uberall GmbH", Decimal("25"), "expense") is None
+    assert index.evaluate("Big store", Decimal("500"), "expense") is None
+
+
+@pytest.mark.unit
+def test_category_applies_only_to_its_transaction_type(rules_setup):
+    """Test that an income category is never assigned to an expense."""
+    outcome = rules_setup.index.evaluate("ACME PAYROLL JUNE", Decimal("10"), "expense")
+
+    assert outcome.category_id is None
+    assert outcome.rule_id is None
+    assert outcome.tags == ()
+
+
+@pytest.mark.unit
+def test_phrase_pattern_matches_whole_words():
+    """Test the SQL regex mirrors whole-word phrase matching."""
+    assert phrase_pattern(["blue", "bottle"]) == (
+        "(^|[^a-z0-9])blue[^a-z0-9]+bottle([^a-z0-9]|$)"
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "values, message",
+    [
+        ({"add_tags": ["x"]}, "at least one condition"),
+        ({"description_contains": "uber"}, "assign a category or add a tag"),
+        (
+            {
+                "min_amount": Decimal("10"),
+                "max_amount": Decimal("5"),
+                "add_tags": ["x"],
+            },
+            "min_amount",
+        ),
+        ({"description_contains": "#!", "add_tags": ["x"]}, "must contain a word"),
+        ({"transaction_type": "refund", "add_tags": ["x"]}, "transaction_type"),
+    ],
+)
+async def test_invalid_rules_are_rejected(values, message):
+    """Test rule validation."""
+    rule = make_rule(uuid4(), "Invalid", **values)
+
+    with pytest.raises(ValueError, match=message):
+        await CategorizationRuleService(None, None)._validate(rule)
+
+
+class ReturningSession:
+    """Session stand-in returning fixed rows and recording statements."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.statements.append(statement)
+        return iter(self.rows)
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_retroactive_application_is_one_set_based_update(
+    rules_setup, monkeypatch
+):
+    """Test that history is rewritten by a single UPDATE with change events."""
+    coffee_id = rules_setup.tree.find_by_name("Coffee").id
+    old_category = uuid4()
+    returned = [
+        SimpleNamespace(
+            id=uuid4(),
+            user_id=rules_setup.user_id,
+            category_id=coffee_id,
+            from_account_id=uuid4(),
+            to_account_id=None,
+            amount=Decimal("4.50"),
+            currency="USD",
+            transaction_type="expense",
+            transaction_date=datetime(2025, 8, 1, tzinfo=timezone.utc),
+            old_category_id=old_category,
+            category_changed=True,
+            tagged=True,
+        ),
+        SimpleNamespace(
+            id=uuid4(),
+            user_id=rules_setup.user_id,
+            category_id=None,
+            from_account_id=rules_setup.card,
+            to_account_id=None,
+            amount=Decimal("250.00"),
+            currency="USD",
+            transaction_type="expense",
+            transaction_date=datetime(2025, 8, 2, tzinfo=timezone.utc),
+            old_category_id=None,
+            category_changed=False,
+            tagged=True,
+        ),
+    ]
+    session = ReturningSession(returned)
+
+    async def fake_index(db, redis, user_id):
+        return rules_setup.index
+
+    applied = []
+
+    async def fake_apply(db, changes):
+        applied.extend(changes)
+        return set()
+
+    monkeypatch.setattr(categorization_rules.rule_index_cache, "get", fake_index)
+    monkeypatch.setattr(categorization_rules, "apply_transaction_changes", fake_apply)
+
+    outcome = await CategorizationRuleService(session, None).apply_retroactive(
+        rules_setup.user_id
+    )
+
+    assert len(session.statements) == 1
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE transactions SET category_id=")
+    assert "FOR UPDATE" in sql
+    assert "RETURNING" in sql
+    # Each phrase is matched in the row filter and in its rule flag only
+    assert sql.count(" ~ ") == 2 * 3
+    assert session.commits == 1
+
+    assert (outcome.matched, outcome.categorized, outcome.tagged) == (2, 1, 2)
+    assert len(applied) == 1
+    assert applied[0].before.category_id == old_category
+    assert applied[0].after.category_id == coffee_id
@@ -0,0 +1,208 @@
+"""
+Tests for the category hierarchy service.
+
+This module contains unit tests for closure-table maintenance statements,
+using a recording session instead of a database, and for the closure rows
+left by creating and moving categories, using an in-memory SQLite table.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.models.category_closure import CategoryClosure
+from app.services.category_hierarchy import CategoryHierarchyService
+
+
+class RecordingResult:
+    """Result stand-in returning a fixed scalar."""
+
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class RecordingSession:
+    """Minimal async session stand-in that records executed statements."""
+
+    def __init__(self, scalar=None):
+        self.scalar = scalar
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return RecordingResult(self.scalar)
+
+
+class ClosureSession:
+    """Session stand-in keeping categories in memory and closure rows in SQLite."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.categories = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        return self.connection.execute(statement)
+
+    async def get(self, model, category_id):
+        return self.categories.get(category_id)
+
+    def add(self, category):
+        category.id = category.id or uuid4()
+        category.is_deleted = False
+        self.categories[category.id] = category
+
+    async def flush(self):
+        pass
+
+
+@pytest.fixture
+def closure_session():
+    """Provide a ClosureSession over an in-memory category_closure table."""
+    engine = create_engine("sqlite://")
+    CategoryClosure.__table__.create(engine)
+    with engine.connect() as connection:
+        yield ClosureSession(connection)
+
+
+def closure_rows(session):
+    """Get the closure rows as (ancestor, descendant, depth) triples."""
+    result = session.connection.execute(
+        select(
+            CategoryClosure.ancestor_id,
+            CategoryClosure.descendant_id,
+            CategoryClosure.depth,
+        )
+    )
+    return set(map(tuple, result))
+
+
+@pytest.mark.unit
+class TestCategoryHierarchyService:
+    """Test closure-table maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_insert_links_self_and_ancestors(self):
+        """Test that inserting a child copies its parent's ancestors."""
+        session = RecordingSession()
+
+        await CategoryHierarchyService(session).on_insert(uuid4(), uuid4())
+
+        assert len(session.statements) == 1
+        sql = str(session.statements[0].compile())
+        assert "UNION ALL" in sql
+        assert "category_closure.depth +" in sql
+
+    @pytest.mark.asyncio
+    async def test_root_insert_only_adds_self_row(self):
+        """Test that a root category only gets its depth-0 row."""
+        session = RecordingSession()
+
+        await CategoryHierarchyService(session).on_insert(uuid4(), None)
+
+        assert "UNION ALL" not in str(session.statements[0].compile())
+
+    @pytest.mark.asyncio
+    async def test_move_into_own_subtree_is_rejected(self):
+        """Test that cycles are rejected before any row is touched."""
+        session = RecordingSession(scalar=True)
+
+        with pytest.raises(ValueError):
+            await CategoryHierarchyService(session).on_move(uuid4(), uuid4())
+
+        assert len(session.statements) == 1
+
+    @pytest.mark.asyncio
+    async def test_move_relinks_subtree(self):
+        """Test that a move detaches then reattaches the subtree."""
+        session = RecordingSession(scalar=False)
+
+        await CategoryHierarchyService(session).on_move(uuid4(), uuid4())
+
+        assert [type(s).__name__ for s in session.statements[1:]] == [
+            "Delete",
+            "Insert",
+        ]
+
+
+@pytest.mark.unit
+class TestCategoryWrites:
+    """Test the closure rows left by creating and moving categories."""
+
+    @pytest.mark.asyncio
+    async def test_created_categories_get_ancestor_rows(self, closure_session):
+        """Test that a created category is linked to itself and its ancestors."""
+        service = CategoryHierarchyService(closure_session)
+        user_id = uuid4()
+
+        food = await service.create_category(user_id, {"name": "Food"})
+        dining = await service.create_category(
+            user_id, {"name": "Dining", "parent_id": food.id}
+        )
+        coffee = await service.create_category(
+            user_id, {"name": "Coffee", "parent_id": dining.id}
+        )
+
+        assert closure_rows(closure_session) == {
+            (food.id, food.id, 0),
+            (dining.id, dining.id, 0),
+            (coffee.id, coffee.id, 0),
+            (food.id, dining.id, 1),
+            (dining.id, coffee.id, 1),
+            (food.id, coffee.id, 2),
+        }
+
+    @pytest.mark.asyncio
+    async def test_moved_category_takes_its_subtree_along(self, closure_session):
+        """Test that re-parenting relinks the whole subtree to new ancestors."""
+        service = CategoryHierarchyService(closure_session)
+        user_id = uuid4()
+        food = await service.create_category(user_id, {"name": "Food"})
+        leisure = await service.create_category(user_id, {"name": "Leisure"})
+        dining = await service.create_category(
+            user_id, {"name": "Dining", "parent_id": food.id}
+        )
+        coffee = await service.create_category(
+            user_id, {"name": "Coffee", "parent_id": dining.id}
+        )
+
+        await service.update_category(user_id, dining.id, {"parent_id": leisure.id})
+
+        assert dining.parent_id == leisure.id
+        assert closure_rows(closure_session) == {
+            (food.id, food.id, 0),
+            (leisure.id, leisure.id, 0),
+            (dining.id, dining.id, 0),
+            (coffee.id, coffee.id, 0),
+            (leisure.id, dining.id, 1),
+            (dining.id, coffee.id, 1),
+            (leisure.id, coffee.id, 2),
+        }
+
+        await service.update_category(user_id, dining.id, {"parent_id": None})
+
+        assert (leisure.id, coffee.id, 2) not in closure_rows(closure_session)
+        assert (dining.id, coffee.id, 1) in closure_rows(closure_session)
+
+    @pytest.mark.asyncio
+    async def test_invalid_parents_are_rejected(self, closure_session):
+        """Test that unknown parents and moves into the subtree are rejected."""
+        service = CategoryHierarchyService(closure_session)
+        user_id = uuid4()
+        food = await service.create_category(user_id, {"name": "Food"})
+        dining = await service.create_category(
+            user_id, {"name": "Dining", "parent_id": food.id}
+        )
+
+        with pytest.raises(ValueError, match="Parent category not found"):
+            await service.create_category(
+                user_id, {"name": "Coffee", "parent_id": uuid4()}
+            )
+        with pytest.raises(ValueError):
+            await service.update_category(user_id, food.id, {"parent_id": dining.id})
+        with pytest.raises(ValueError, match="Category not found"):
+            await service.update_category(uuid4(), food.id, {"name": "Groceries"})
+        assert food.parent_id is None
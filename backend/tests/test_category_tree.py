@@ -0,0 +1,135 @@
+"""
+Tests for the category tree cache.
+
+This module contains unit tests for tree snapshots and their
+version-stamped caching, using in-memory stand-ins for Redis and the
+database.
+"""
+
+from uuid import uuid4
+
+import pytest
+
+from app.services.category_tree import CategoryTree, CategoryTreeCache
+
+
+class MemoryRedis:
+    """Redis stand-in backed by a dictionary."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def make_row(name, parent_id=None, keywords=None):
+    """Build a category row with sensible defaults."""
+    return {
+        "id": uuid4(),
+        "parent_id": parent_id,
+        "name": name,
+        "category_type": "expense",
+        "color": "#3B82F6",
+        "icon": None,
+        "is_system": False,
+        "is_active": True,
+        "budget_amount": None,
+        "keywords": keywords,
+    }
+
+
+class CountingCache(CategoryTreeCache):
+    """Cache serving fixed rows and counting database loads."""
+
+    def __init__(self, rows):
+        super().__init__(capacity=2)
+        self.rows = rows
+        self.loads = 0
+
+    async def load_rows(self, db, user_id):
+        self.loads += 1
+        return self.rows
+
+
+@pytest.mark.unit
+class TestCategoryTree:
+    """Test tree snapshots."""
+
+    def test_paths_levels_and_children(self):
+        """Test that paths, levels and children are precomputed."""
+        food = make_row("Food")
+        groceries = make_row("Groceries", food["id"], '["grocery", "Market"]')
+        tree = CategoryTree.build(uuid4(), 0, [groceries, food])
+
+        assert tree.roots == (food["id"],)
+        assert tree.get(groceries["id"]).path == "Food > Groceries"
+        assert tree.get(groceries["id"]).level == 1
+        assert tree.get(food["id"]).children == (groceries["id"],)
+        assert not tree.get(food["id"]).is_leaf
+        assert tree.find_by_keyword("market")[0].id == groceries["id"]
+        assert tree.find_by_name(" food ").id == food["id"]
+        assert tree.subtree_ids(food["id"]) == [food["id"], groceries["id"]]
+
+    def test_invalid_keywords_are_ignored(self):
+        """Test that malformed keyword JSON yields no keywords."""
+        row = make_row("Misc", keywords="not json")
+        tree = CategoryTree.build(uuid4(), 0, [row])
+
+        assert tree.get(row["id"]).keywords == ()
+
+
+@pytest.mark.unit
+class TestCategoryTreeCache:
+    """Test version-stamped caching."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_reads_hit_local_cache(self):
+        """Test that an unchanged version never reloads the tree."""
+        cache, redis, user_id = (
+            CountingCache([make_row("Food")]),
+            MemoryRedis(),
+            uuid4(),
+        )
+
+        first = await cache.get(None, redis, user_id)
+        second = await cache.get(None, redis, user_id)
+
+        assert first is second
+        assert cache.loads == 1
+
+    @pytest.mark.asyncio
+    async def test_other_process_reuses_redis_snapshot(self):
+        """Test that a second process builds from Redis, not the database."""
+        redis, user_id = MemoryRedis(), uuid4()
+        writer = CountingCache([make_row("Food")])
+        reader = CountingCache([])
+
+        await writer.get(None, redis, user_id)
+        tree = await reader.get(None, redis, user_id)
+
+        assert reader.loads == 0
+        assert len(tree.nodes) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_bumps_version(self):
+        """Test that invalidation forces a reload everywhere."""
+        cache, redis, user_id = (
+            CountingCache([make_row("Food")]),
+            MemoryRedis(),
+            uuid4(),
+        )
+
+        await cache.get(None, redis, user_id)
+        await cache.invalidate(redis, user_id)
+        tree = await cache.get(None, redis, user_id)
+
+        assert tree.version == 1
+        assert cache.loads == 2
@@ -0,0 +1,305 @@
+"""
+Tests for data exports.
+
+This module contains unit tests for requesting exports, streaming a user's
+tables into gzip files, checkpointing progress, resuming an interrupted
+export and bundling the archive, using in-memory stand-ins for the sessions.
+"""
+
+import gzip
+import json
+import tarfile
+from collections import namedtuple
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.dml import Update
+
+from app.core.config import settings
+from app.services.data_export import (
+    EXPORT_TABLES,
+    DataExportRunner,
+    DataExportService,
+    append_member,
+    serialize_rows,
+)
+
+TABLES = {table.name: table for table in EXPORT_TABLES}
+SQL_TABLES = {table.model.__tablename__: table.name for table in EXPORT_TABLES}
+
+
+def table_rows(name, count):
+    """Build rows of an exported table with ascending IDs."""
+    table = TABLES[name]
+    Row = namedtuple("Row", [column.name for column in table.columns])
+    return [
+        Row(
+            *(
+                UUID(int=number + 1) if column.name == "id" else None
+                for column in table.columns
+            )
+        )
+        for number in range(count)
+    ]
+
+
+class RowStream:
+    """Streamed result stand-in yielding row batches."""
+
+    def __init__(self, rows, batch_size):
+        self.rows = rows
+        self.batch_size = batch_size
+
+    async def partitions(self):
+        for start in range(0, len(self.rows), self.batch_size):
+            yield self.rows[start : start + self.batch_size]
+
+
+class ExportSession:
+    """Session stand-in serving table rows and recording checkpoints."""
+
+    def __init__(self, store):
+        self.store = store
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, export_id):
+        return self.store.export
+
+    async def execute(self, statement, *args, **kwargs):
+        if isinstance(statement, Update):
+            self.store.checkpoints.append(statement.compile().params)
+            return None
+        counts = {name: len(rows) for name, rows in self.store.tables.items()}
+        return SimpleNamespace(one=lambda: SimpleNamespace(_mapping=counts))
+
+    async def stream(self, statement):
+        name = SQL_TABLES[statement.get_final_froms()[0].name]
+        self.store.queries.append(name)
+        if self.store.fail_on == name:
+            raise ConnectionError("connection lost")
+        rows = self.store.tables.get(name, [])
+        for clause in statement._where_criteria:
+            if clause.operator is operators.gt:
+                rows = [row for row in rows if row.id > clause.right.value]
+        return RowStream(rows, statement.get_execution_options()["yield_per"])
+
+    async def commit(self):
+        pass
+
+
+class ExportStore:
+    """Export, table contents and checkpoints behind ExportSession."""
+
+    def __init__(self, export, tables, fail_on=None):
+        self.export = export
+        self.tables = tables
+        self.fail_on = fail_on
+        self.checkpoints = []
+        self.queries = []
+
+    def session_factory(self):
+        return ExportSession(self)
+
+
+class RequestSession:
+    """Session stand-in where another request commits the export first."""
+
+    def __init__(self, winner):
+        self.winner = winner
+        self.selects = 0
+        self.rolled_back = False
+
+    async def execute(self, statement, *args, **kwargs):
+        self.selects += 1
+        found = self.winner if self.rolled_back else None
+        return SimpleNamespace(scalar_one_or_none=lambda: found)
+
+    def add(self, instance):
+        pass
+
+    async def commit(self):
+        raise IntegrityError("INSERT INTO data_exports", {}, Exception("duplicate"))
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+def pending_export(**values):
+    """Build a claimed export."""
+    export = SimpleNamespace(
+        id=uuid4(),
+        user_id=uuid4(),
+        export_format="ndjson",
+        status="running",
+        attempts=0,
+        row_counts=None,
+        rows_exported=None,
+        current_table=None,
+        last_id=None,
+        bytes_written=0,
+    )
+    export.__dict__.update(values)
+    return export
+
+
+def read_archive(path):
+    """Read the table files of an archive as text."""
+    with tarfile.open(path) as tar:
+        return {
+            member.name: gzip.decompress(tar.extractfile(member).read()).decode()
+            for member in tar.getmembers()
+        }
+
+
+@pytest.mark.unit
+def test_append_member_cuts_off_writes_after_checkpoint(tmp_path):
+    """Test that a resumed write replaces bytes past the checkpoint."""
+    path = tmp_path / "transactions.ndjson.gz"
+    checkpoint = append_member(path, 0, b"first\n")
+    append_member(path, checkpoint, b"lost\n")  # Never checkpointed
+
+    append_member(path, checkpoint, b"second\n")
+
+    assert gzip.decompress(path.read_bytes()) == b"first\nsecond\n"
+
+
+@pytest.mark.unit
+def test_serialize_rows_handles_column_types():
+    """Test NDJSON and CSV serialization of UUIDs, decimals and JSON."""
+    row = (UUID(int=1), Decimal("12.50"), {"tags": ["a"]}, None)
+    names = ["id", "amount", "extra", "notes"]
+
+    line = json.loads(serialize_rows("ndjson", names, [row], header=False))
+    csv_text = serialize_rows("csv", names, [row], header=True).decode()
+
+    assert line == {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "amount": "12.50",
+        "extra": {"tags": ["a"]},
+        "notes": None,
+    }
+    assert csv_text.splitlines() == [
+        "id,amount,extra,notes",
+        '00000000-0000-0000-0000-000000000001,12.50,"{""tags"": [""a""]}",',
+    ]
+
+
+@pytest.mark.unit
+def test_queries_skip_password_and_resume_after_last_row():
+    """Test that the profile omits the password hash and queries resume by key."""
+    user_id = uuid4()
+    profile = str(
+        TABLES["profile"].query(user_id).compile(dialect=postgresql.dialect())
+    )
+    transactions = str(
+        TABLES["transactions"]
+        .query(user_id, after=uuid4())
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert "hashed_password" not in profile
+    assert "transactions.id > %(id_1)s" in transactions
+    assert transactions.endswith("ORDER BY transactions.id")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_concurrent_request_returns_the_existing_export():
+    """Test that losing the insert race returns the export that won it."""
+    winner = pending_export(status="pending")
+    session = RequestSession(winner)
+
+    export = await DataExportService(session).request_export(winner.user_id)
+
+    assert export is winner
+    assert session.rolled_back
+    assert session.selects == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_writes_every_table_and_checkpoints_batches(tmp_path):
+    """Test that an export writes all tables in batches and bundles them."""
+    export = pending_export()
+    store = ExportStore(
+        export,
+        {
+            "profile": table_rows("profile", 1),
+            "transactions": table_rows("transactions", 5),
+        },
+    )
+    runner = DataExportRunner(store.session_factory, tmp_path, batch_size=2)
+
+    path = await runner.run(export.id)
+
+    files = read_archive(path)
+    assert len(files) == len(EXPORT_TABLES)
+    assert len(files["transactions.ndjson.gz"].splitlines()) == 5
+    assert files["accounts.ndjson.gz"] == ""
+    written = [
+        checkpoint["rows_exported"]["transactions"]
+        for checkpoint in store.checkpoints
+        if checkpoint.get("current_table") == "transactions"
+    ]
+    assert written == [2, 4, 5]
+    assert store.checkpoints[-1]["status"] == "completed"
+    assert not (tmp_path / str(export.id)).exists()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_resumes_interrupted_table(tmp_path):
+    """Test that a resumed export skips finished tables and written rows."""
+    rows = table_rows("transactions", 5)
+    export = pending_export(export_format="csv")
+    store = ExportStore(export, {"transactions": rows}, fail_on="budgets")
+    runner = DataExportRunner(store.session_factory, tmp_path, batch_size=2)
+
+    assert await runner.run(export.id) is None
+    assert store.checkpoints[-1]["status"] == "pending"
+    # Resume from the checkpoint after the second transaction batch
+    checkpoint = next(
+        checkpoint
+        for checkpoint in store.checkpoints
+        if checkpoint.get("rows_exported", {}).get("transactions") == 4
+    )
+    export.__dict__.update(
+        current_table="transactions",
+        last_id=checkpoint["last_id"],
+        bytes_written=checkpoint["bytes_written"],
+        rows_exported=checkpoint["rows_exported"],
+        row_counts={"transactions": 5},
+        attempts=1,
+    )
+    store.fail_on, store.queries = None, []
+
+    path = await runner.run(export.id)
+
+    assert store.queries[0] == "transactions"
+    lines = read_archive(path)["transactions.csv.gz"].splitlines()
+    assert lines[0].startswith("id,")
+    assert [line.split(",")[0] for line in lines[1:]] == [str(row.id) for row in rows]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_runner_fails_export_after_max_attempts(tmp_path):
+    """Test that an export stops being retried after repeated failures."""
+    export = pending_export(attempts=settings.data_export_max_attempts - 1)
+    store = ExportStore(export, {}, fail_on="profile")
+
+    path = await DataExportRunner(store.session_factory, tmp_path).run(export.id)
+
+    assert path is None
+    assert store.checkpoints[-1]["status"] == "failed"
+    assert store.checkpoints[-1]["error"] == "connection lost"
@@ -0,0 +1,141 @@
+"""
+Tests for delta sync.
+
+This module contains unit tests for sync cursors, the per-type change
+queries and paging through a user's changes with tombstones, using an
+in-memory stand-in for the session.
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.delta_sync import (
+    SYNC_ENTITIES,
+    SYNC_SETTLE_SECONDS,
+    DeltaSyncService,
+    decode_sync_cursor,
+    encode_sync_cursor,
+)
+
+ENTITIES = {entity.name: entity for entity in SYNC_ENTITIES}
+TABLES = {entity.model.__tablename__: entity.name for entity in SYNC_ENTITIES}
+NOW = datetime(2025, 8, 21, 12, tzinfo=timezone.utc)
+
+
+def change_rows(name, count, deleted=(), minutes_ago=10):
+    """Build change rows of an entity type, oldest change first."""
+    names = [column.name for column in ENTITIES[name].columns]
+    Row = namedtuple("Row", names + ["is_deleted"])
+    rows = []
+    for number in range(count):
+        values = dict.fromkeys(names)
+        values.update(
+            id=UUID(int=number + 1),
+            updated_at=NOW - timedelta(minutes=minutes_ago) + timedelta(seconds=number),
+        )
+        rows.append(Row(**values, is_deleted=number in deleted))
+    return rows
+
+
+class SyncSession:
+    """Session stand-in serving change rows per table."""
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.statements = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        name = TABLES[statement.get_final_froms()[0].name]
+        self.statements[name] = statement
+        rows = self.tables.get(name, [])[: statement._limit]
+        return SimpleNamespace(all=lambda: rows)
+
+
+def compiled(query):
+    """Compile a query for PostgreSQL."""
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+def test_cursor_round_trips_and_rejects_garbage():
+    """Test that cursors keep one position per type and bad ones are rejected."""
+    positions = {"transactions": (NOW, uuid4()), "accounts": (NOW, uuid4())}
+
+    assert decode_sync_cursor(encode_sync_cursor(positions)) == positions
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_sync_cursor("not-a-cursor")
+    naive = {"accounts": (NOW.replace(tzinfo=None), uuid4())}
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_sync_cursor(encode_sync_cursor(naive))
+
+
+@pytest.mark.unit
+def test_queries_follow_sync_index_and_skip_tombstones_on_first_sync():
+    """Test that changes are read in index order, with tombstones once synced."""
+    entity = ENTITIES["transactions"]
+    first = compiled(entity.query(uuid4(), None, 10))
+    resumed = compiled(entity.query(uuid4(), (NOW, uuid4()), 10))
+
+    assert "transactions.is_deleted = false" in first
+    assert "(transactions.updated_at, transactions.id) > (" in resumed
+    assert "is_deleted = false" not in resumed
+    assert "ORDER BY transactions.updated_at, transactions.id" in resumed
+    assert "ai_categorization_data" not in first
+    assert "account_number" not in compiled(
+        ENTITIES["accounts"].query(uuid4(), None, 1)
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_changes_page_per_type_and_split_tombstones():
+    """Test that busy types page on while caught-up ones wait at the window."""
+    transactions = change_rows("transactions", 3, deleted={1})
+    accounts = change_rows("accounts", 1, minutes_ago=0)
+    session = SyncSession({"transactions": transactions, "accounts": accounts})
+
+    page = await DeltaSyncService(session).get_changes(uuid4(), limit=2, now=NOW)
+
+    assert page.has_more
+    changes = page.changes["transactions"]
+    assert [item["id"] for item in changes.updated] == [transactions[0].id]
+    assert changes.deleted == [transactions[1].id]
+    assert "is_deleted" not in changes.updated[0]
+    assert page.changes["budgets"].updated == []
+    positions = decode_sync_cursor(page.next_cursor)
+    assert positions["transactions"] == (transactions[1].updated_at, transactions[1].id)
+    # Caught up on a change inside the settle window: it will be sent again
+    settled = NOW - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    assert positions["accounts"] == (settled, UUID(int=0))
+    assert "budgets" not in positions
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_next_sync_resumes_after_cursor():
+    """Test that a cursor resumes every type after its own position."""
+    transactions = change_rows("transactions", 3)
+    session = SyncSession({"transactions": transactions[2:]})
+    cursor = encode_sync_cursor(
+        {"transactions": (transactions[1].updated_at, transactions[1].id)}
+    )
+
+    page = await DeltaSyncService(session).get_changes(
+        uuid4(), cursor=cursor, limit=2, now=NOW
+    )
+
+    assert not page.has_more
+    assert [item["id"] for item in page.changes["transactions"].updated] == [
+        transactions[2].id
+    ]
+    assert "(transactions.updated_at, transactions.id) > (" in compiled(
+        session.statements["transactions"]
+    )
+    assert "is_deleted = false" in compiled(session.statements["accounts"])
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        await DeltaSyncService(session).get_changes(uuid4(), cursor="garbage")
@@ -0,0 +1,268 @@
+"""
+Tests for the insight context builder.
+
+This module contains unit tests for rendering aggregated rows within a
+token budget and for the SQL aggregation queries, using an in-memory
+stand-in for the session, and for outlier detection against an in-memory
+SQLite table.
+"""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    MetaData,
+    String,
+    Table,
+    Uuid,
+    create_engine,
+)
+from sqlalchemy.dialects import postgresql
+
+from app.models.transaction import Transaction
+from app.services import insight_context
+from app.services.insight_context import (
+    InsightContextBuilder,
+    estimate_text_tokens,
+    outlier_query,
+    period_label,
+    render_context,
+)
+
+JULY = datetime(2025, 7, 1, tzinfo=timezone.utc)
+AUGUST = datetime(2025, 8, 1, tzinfo=timezone.utc)
+JUNE = datetime(2025, 6, 1, tzinfo=timezone.utc)
+
+
+def category_row(category_id, current, previous, count=4):
+    """Build an aggregated category row."""
+    return {
+        "category_id": category_id,
+        "currency": "USD",
+        "current": Decimal(current),
+        "previous": Decimal(previous),
+        "count": count,
+    }
+
+
+TOTALS = [
+    {
+        "transaction_type": "expense",
+        "currency": "USD",
+        "current": Decimal("900.00"),
+        "previous": Decimal("750.00"),
+        "count": 40,
+    }
+]
+
+
+@pytest.mark.unit
+def test_period_labels():
+    """Test that whole months get short labels."""
+    assert period_label(JULY, AUGUST) == "2025-07"
+    assert period_label(JULY, datetime(2025, 7, 15, tzinfo=timezone.utc)) == (
+        "2025-07-01..2025-07-14"
+    )
+
+
+@pytest.mark.unit
+def test_categories_are_ranked_by_change():
+    """Test that the largest movers come first and names are resolved."""
+    dining, rent = uuid4(), uuid4()
+    context = render_context(
+        JULY,
+        AUGUST,
+        JUNE,
+        TOTALS,
+        [category_row(rent, "500.00", "500.00"), category_row(dining, "320", "200")],
+        [],
+        [],
+        {dining: "Dining", rent: "Rent"},
+    )
+
+    assert [entry["name"] for entry in context.data["categories"]] == [
+        "Dining",
+        "Rent",
+    ]
+    assert context.data["categories"][0]["change_percentage"] == "60.0"
+    assert "- Dining 320/200/+60.0% USD n=4" in context.text
+    assert "top merchants:" not in context.text
+    assert context.category_ids == (dining, rent)
+
+
+@pytest.mark.unit
+def test_context_never_exceeds_its_token_budget():
+    """Test that sections are cut short and data matches the text."""
+    categories = [
+        category_row(uuid4(), f"{100 + index}.00", "50.00") for index in range(200)
+    ]
+    merchants = [
+        {"merchant": f"merchant {index}", "currency": "USD", "total": 10, "count": 1}
+        for index in range(10)
+    ]
+
+    context = render_context(
+        JULY, AUGUST, JUNE, TOTALS, categories, merchants, [], {}, token_budget=120
+    )
+
+    assert context.tokens <= 120
+    assert estimate_text_tokens(context.text) <= 120
+    assert 0 < len(context.data["categories"]) < 200
+    assert context.text.count("\n- ") == len(context.data["categories"])
+    assert context.data["merchants"] == []
+
+
+class AggregateSession:
+    """Session stand-in answering the aggregate queries in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return [Row(row) for row in self.responses.pop(0)]
+
+
+class Row:
+    """Result row stand-in exposing a mapping."""
+
+    def __init__(self, mapping):
+        self._mapping = mapping
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_build_aggregates_in_sql(monkeypatch):
+    """Test that the builder aggregates with four SQL queries."""
+    dining = uuid4()
+
+    class Tree:
+        def get(self, category_id):
+            return type("Node", (), {"name": "Dining"})()
+
+    async def fake_tree(db, redis, user_id):
+        return Tree()
+
+    monkeypatch.setattr(insight_context.category_tree_cache, "get", fake_tree)
+    session = AggregateSession(
+        TOTALS,
+        [category_row(dining, "320.00", "200.00")],
+        [{"merchant": "blue bottle", "currency": "USD", "total": 42, "count": 7}],
+        [
+            {
+                "transaction_date": datetime(2025, 7, 9, tzinfo=timezone.utc),
+                "description": "Omakase Dinner",
+                "amount": Decimal("240.00"),
+                "currency": "USD",
+                "category_id": dining,
+                "category_mean": Decimal("21.50"),
+            }
+        ],
+    )
+
+    context = await InsightContextBuilder(session, None).build(
+        uuid4(), JULY, AUGUST, previous_start=JUNE
+    )
+
+    assert len(session.statements) == 4
+    totals_sql, _, merchants_sql, outliers_sql = (
+        str(statement.compile(dialect=postgresql.dialect()))
+        for statement in session.statements
+    )
+    assert "FILTER (WHERE transactions.transaction_date >=" in totals_sql
+    assert "regexp_replace(lower(transactions.description), '[^a-z]+'" in merchants_sql
+    assert "sum(abs(transactions.amount)) OVER (PARTITION BY" in outliers_sql
+    assert context.data["outliers"][0]["category"] == "Dining"
+    outlier = "- 2025-07-09 Omakase Dinner 240.00 USD (Dining avg 21.50)"
+    assert outlier in context.text
+    assert context.tokens <= insight_context.CONTEXT_TOKEN_BUDGET
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_build_without_transactions_returns_none():
+    """Test that an empty period yields no context."""
+    session = AggregateSession([])
+
+    context = await InsightContextBuilder(session, None).build(uuid4(), JULY, AUGUST)
+
+    assert context is None
+
+
+@pytest.fixture
+def expense_table():
+    """Provide a SQLite connection with the transaction columns outliers use."""
+    engine = create_engine("sqlite://")
+    table = Table(
+        "transactions",
+        MetaData(),
+        Column("id", Uuid, primary_key=True),
+        Column("user_id", Uuid),
+        Column("category_id", Uuid),
+        Column("description", String),
+        Column("amount", Float),
+        Column("currency", String),
+        Column("transaction_type", String),
+        Column("transaction_date", DateTime),
+        Column("is_deleted", Boolean),
+    )
+    table.create(engine)
+    with engine.connect() as connection:
+        yield connection, table
+
+
+def add_expenses(expense_table, category_id, *amounts):
+    """Insert one expense per amount into a category, a day apart."""
+    connection, table = expense_table
+    connection.execute(
+        table.insert(),
+        [
+            {
+                "id": uuid4(),
+                "user_id": None,
+                "category_id": category_id,
+                "description": f"expense {amount}",
+                "amount": -amount,
+                "currency": "USD",
+                "transaction_type": "expense",
+                "transaction_date": JULY + timedelta(days=day),
+                "is_deleted": False,
+            }
+            for day, amount in enumerate(amounts)
+        ],
+    )
+
+
+@pytest.mark.unit
+def test_outliers_are_scored_against_the_rest_of_their_category(expense_table):
+    """Test outliers in small categories, steady peers and spread-out ones."""
+    dining, rent, travel, coffee = uuid4(), uuid4(), uuid4(), uuid4()
+    # Six expenses: a z-score over all of them could never exceed 2.05
+    add_expenses(expense_table, dining, 18, 22, 20, 25, 19, 240)
+    # Identical peers: a big jump counts, a few cents do not
+    add_expenses(expense_table, rent, 1200, 1200, 1200, 1200, 1600)
+    add_expenses(expense_table, coffee, 4, 4, 4, 4, 4.2)
+    # Widely spread amounts have no outlier
+    add_expenses(expense_table, travel, 40, 300, 90, 650, 120, 700)
+    # Too few peers to judge
+    add_expenses(expense_table, uuid4(), 10, 11, 500)
+
+    rows = (
+        expense_table[0]
+        .execute(outlier_query([Transaction.transaction_type == "expense"]))
+        .all()
+    )
+
+    assert [(row.category_id, row.amount) for row in rows] == [
+        (dining, 240),
+        (rent, 1600),
+    ]
+    assert rows[0].category_mean == pytest.approx(20.8)
+    assert rows[1].category_mean == pytest.approx(1200)
@@ -0,0 +1,189 @@
+"""
+Tests for the insight feed.
+
+This module contains unit tests for cursor pagination, Redis unread
+counters and the chunked expiry sweeper, using in-memory stand-ins for the
+session and Redis.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.insight_feed import (
+    InsightFeedService,
+    UnreadCounters,
+    decode_cursor,
+    encode_cursor,
+)
+from tests.conftest import CounterPipeline
+
+
+class FakeResult:
+    """Result stand-in over a list of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def scalar_one_or_none(self):
+        return self.first()
+
+
+class ScriptedSession:
+    """Session stand-in answering statements with scripted row lists."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return FakeResult(self.responses.pop(0) if self.responses else [])
+
+    async def commit(self):
+        self.commits += 1
+
+    def sql(self, index):
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+class CounterRedis:
+    """Redis stand-in holding integer counters."""
+
+    def __init__(self, **values):
+        self.values = dict(values)
+
+    async def get(self, key):
+        value = self.values.get(key)
+        return None if value is None else str(value)
+
+    def pipeline(self, transaction=True):
+        return CounterPipeline(self.values)
+
+
+def make_insight(rank, minutes_ago):
+    """Build a feed row."""
+    return SimpleNamespace(
+        id=uuid4(),
+        priority_rank=rank,
+        created_at=datetime(2025, 8, 14, 12, tzinfo=timezone.utc)
+        - timedelta(minutes=minutes_ago),
+    )
+
+
+@pytest.mark.unit
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the position it encodes."""
+    insight = make_insight(2, 5)
+
+    assert decode_cursor(encode_cursor(insight)) == (
+        2,
+        insight.created_at,
+        insight.id,
+    )
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_feed_pages_by_keyset():
+    """Test that a page seeks past the cursor and links to the next page."""
+    user_id = uuid4()
+    rows = [make_insight(3, 1), make_insight(2, 2), make_insight(2, 3)]
+    session = ScriptedSession(rows)
+    service = InsightFeedService(session, CounterRedis())
+
+    page = await service.get_feed(user_id, limit=2, cursor=encode_cursor(rows[0]))
+
+    assert page.items == rows[:2]
+    assert decode_cursor(page.next_cursor)[2] == rows[1].id
+    sql = session.sql(0)
+    assert (
+        "(ai_insights.priority_rank, ai_insights.created_at, ai_insights.id) < (" in sql
+    )
+    assert (
+        "ORDER BY ai_insights.priority_rank DESC, ai_insights.created_at DESC, "
+        "ai_insights.id DESC" in sql
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_mark_as_read_decrements_once():
+    """Test that only the first read of an insight lowers the badge."""
+    user_id, insight = uuid4(), make_insight(1, 0)
+    key = f"insights:unread:{user_id}"
+    redis = CounterRedis(**{key: 3})
+    session = ScriptedSession([insight.id], [insight], [], [insight])
+    service = InsightFeedService(session, redis)
+
+    await service.mark_as_read(user_id, insight.id)
+    await service.mark_as_read(user_id, insight.id)
+
+    assert await service.unread_count(user_id) == 2
+    assert session.commits == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_unread_count_reads_only_redis():
+    """Test the badge never queries the database and clamps drift."""
+    user_id = uuid4()
+    counters = UnreadCounters(CounterRedis(**{f"insights:unread:{user_id}": -2}))
+
+    assert await counters.get(user_id) == 0
+    assert await counters.get(uuid4()) == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_sweep_deactivates_in_chunks():
+    """Test that each chunk commits and lowers the badges of unread rows."""
+    alice, bob = uuid4(), uuid4()
+    first = [
+        SimpleNamespace(user_id=alice, is_read=False),
+        SimpleNamespace(user_id=alice, is_read=True),
+    ]
+    second = [SimpleNamespace(user_id=bob, is_read=False)]
+    redis = CounterRedis(**{f"insights:unread:{alice}": 1, f"insights:unread:{bob}": 4})
+    session = ScriptedSession(first, second)
+
+    swept = await InsightFeedService(session, redis).sweep_expired(batch_size=2)
+
+    assert swept == 3
+    assert session.commits == 2
+    assert "FOR UPDATE SKIP LOCKED" in session.sql(0)
+    assert redis.values == {
+        f"insights:unread:{alice}": 0,
+        f"insights:unread:{bob}": 3,
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_feed_loads_only_requested_fields():
+    """Test that a sparse feed skips the columns it does not return."""
+    session = ScriptedSession([])
+    service = InsightFeedService(session, CounterRedis())
+
+    await service.get_feed(uuid4(), fields=("id", "title"))
+
+    columns = session.sql(0).split(" FROM ")[0]
+    assert "ai_insights.title" in columns
+    assert "ai_insights.priority_rank" in columns
+    assert "ai_insights.content" not in columns
+    assert "ai_insights.affected_categories" not in columns
@@ -0,0 +1,321 @@
+"""
+Tests for the AI insight scheduler.
+
+This module contains unit tests for the fair job claim query, the shared
+per-minute token budget and the worker pool, using in-memory stand-ins for
+the database, Redis and the clock.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+
+from app.services import insight_scheduler
+from app.services.insight_scheduler import (
+    ClaimedJob,
+    InsightFacts,
+    InsightScheduler,
+    InsightType,
+    InsightWorkerPool,
+    LocalInsightProvider,
+    TokenBudget,
+    months_before,
+)
+from tests.conftest import CounterPipeline
+
+
+def spending_facts(change_percentage="60.0"):
+    """Figures of a spending pattern insight."""
+    return InsightFacts(
+        period_start=datetime(2025, 6, 1, tzinfo=timezone.utc),
+        period_end=datetime(2025, 8, 1, tzinfo=timezone.utc),
+        data={
+            "period": "2025-07",
+            "previous_period": "2025-06",
+            "categories": [
+                {
+                    "category_id": None,
+                    "name": "Dining",
+                    "currency": "USD",
+                    "amount": "320.00",
+                    "previous_amount": "200.00",
+                    "change": "120.00",
+                    "change_percentage": change_percentage,
+                }
+            ],
+        },
+    )
+
+
+class InsertResult(list):
+    """Result stand-in returning no rows and a fresh inserted ID."""
+
+    rowcount = 0
+
+    def scalar_one(self):
+        return uuid4()
+
+
+class RecordingSession:
+    """Session stand-in recording statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return InsertResult()
+
+
+@pytest.mark.unit
+def test_months_before_crosses_years():
+    """Test month arithmetic."""
+    today = datetime(2025, 2, 14).date()
+
+    assert months_before(today) == datetime(2025, 2, 1).date()
+    assert months_before(today, 2) == datetime(2024, 12, 1).date()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_claim_locks_one_due_job_per_idle_user():
+    """Test the claim is one UPDATE over a SKIP LOCKED per-user pick."""
+    session = RecordingSession()
+
+    await InsightScheduler(session).claim(4, timedelta(minutes=5))
+
+    assert len(session.statements) == 1
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE insight_jobs SET status=")
+    assert "FOR UPDATE OF insight_jobs SKIP LOCKED" in sql
+    assert "row_number() OVER (PARTITION BY due.user_id" in sql
+    assert "NOT IN (SELECT insight_jobs.user_id" in sql
+    assert "RETURNING" in sql
+
+
+class WindowRedis:
+    """Redis stand-in running the token reservation script in Python."""
+
+    def __init__(self):
+        self.values = {}
+
+    def pipeline(self, transaction=True):
+        return CounterPipeline(self.values)
+
+    async def eval(self, script, numkeys, key, tokens, limit, ttl):
+        used = self.values.get(key, 0)
+        if used > 0 and used + tokens > limit:
+            return 0
+        self.values[key] = used + tokens
+        return 1
+
+    async def incrby(self, key, amount):
+        self.values[key] = self.values.get(key, 0) + amount
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_token_budget_waits_for_next_window(monkeypatch):
+    """Test that an over-budget reservation sleeps into the next minute."""
+    clock = SimpleNamespace(now=600.0)
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr(insight_scheduler.asyncio, "sleep", fake_sleep)
+    redis = WindowRedis()
+    budget = TokenBudget(redis, 1000, clock=lambda: clock.now)
+
+    first = await budget.reserve(700)
+    await budget.settle(first, 700, 400)
+    second = await budget.reserve(500)
+    third = await budget.reserve(500)
+
+    assert first == second == "insights:tokens:10"
+    assert third == "insights:tokens:11"
+    assert slept == [60.0]
+    assert redis.values == {"insights:tokens:10": 900, "insights:tokens:11": 500}
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_local_provider_describes_largest_change():
+    """Test the spending pattern template."""
+    generated = await LocalInsightProvider().generate(
+        "spending_pattern", spending_facts()
+    )
+
+    assert generated.title == "Dining spending up 60.0%"
+    assert generated.category == "warning"
+    assert generated.priority == "high"
+    assert generated.tokens_used > 0
+
+
+class PoolSession(RecordingSession):
+    """Session stand-in tracking transaction outcomes."""
+
+    def __init__(self, log):
+        super().__init__()
+        self.log = log
+
+    async def __aenter__(self):
+        self.log.append("open")
+        return self
+
+    async def __aexit__(self, *exc):
+        self.log.append("close")
+        return False
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+class FailingProvider:
+    """Provider whose model is unavailable, recording open sessions."""
+
+    name = "failing"
+
+    def __init__(self, log):
+        self.log = log
+        self.open_sessions = None
+
+    async def generate(self, insight_type, facts):
+        self.open_sessions = self.log.count("open") - self.log.count("close")
+        raise RuntimeError("model unavailable")
+
+
+@pytest.fixture
+def pool_setup(monkeypatch):
+    """Two claimed spending pattern jobs and their recorded outcomes."""
+    jobs = [
+        ClaimedJob(uuid4(), uuid4(), "spending_pattern", 1, None),
+        ClaimedJob(uuid4(), uuid4(), "spending_pattern", 3, uuid4()),
+    ]
+    outcome = SimpleNamespace(log=[], sessions=[], completed=[], failed=[])
+
+    async def collect(db, redis, user_id, today):
+        return spending_facts()
+
+    async def requeue_expired(self):
+        return 0
+
+    async def claim(self, limit, lease):
+        return jobs[:limit]
+
+    async def complete(self, job, insight_id):
+        outcome.completed.append((job, insight_id))
+        return job.last_insight_id is not None
+
+    async def fail(self, job, error, max_attempts):
+        outcome.failed.append((job, error))
+
+    monkeypatch.setitem(
+        insight_scheduler.INSIGHT_TYPES,
+        "spending_pattern",
+        InsightType("spending_pattern", timedelta(days=1), 100, collect),
+    )
+    monkeypatch.setattr(InsightScheduler, "requeue_expired", requeue_expired)
+    monkeypatch.setattr(InsightScheduler, "claim", claim)
+    monkeypatch.setattr(InsightScheduler, "complete", complete)
+    monkeypatch.setattr(InsightScheduler, "fail", fail)
+
+    def session_factory():
+        session = PoolSession(outcome.log)
+        outcome.sessions.append(session)
+        return session
+
+    outcome.session_factory = session_factory
+    outcome.jobs = jobs
+    return outcome
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_worker_pool_records_time_and_tokens(pool_setup):
+    """Test that each generated insight stores its processing time and tokens."""
+    redis = WindowRedis()
+    pool = InsightWorkerPool(
+        pool_setup.session_factory,
+        redis,
+        provider=LocalInsightProvider(latency=0.01),
+        concurrency=2,
+        tokens_per_minute=100000,
+    )
+
+    assert await pool.run_once() == 2
+
+    inserts = [
+        statement.compile().params
+        for session in pool_setup.sessions
+        for statement in session.statements
+        if statement.is_insert
+    ]
+    assert len(inserts) == 2
+    for params in inserts:
+        assert params["ai_processing_time"] >= 10
+        assert params["ai_tokens_used"] > 0
+        assert params["ai_model_used"] == "local-templates"
+        assert params["priority"] == "high"
+    assert [job for job, _ in pool_setup.completed] == pool_setup.jobs
+    assert not pool_setup.failed
+    # The second insight replaced an unread one, leaving that badge unchanged
+    first, second = pool_setup.jobs
+    assert redis.values[f"insights:unread:{first.user_id}"] == 1
+    assert f"insights:unread:{second.user_id}" not in redis.values
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_worker_pool_reschedules_failed_jobs(pool_setup):
+    """Test that a provider error reschedules the job in a fresh session."""
+    redis = WindowRedis()
+    provider = FailingProvider(pool_setup.log)
+    pool = InsightWorkerPool(
+        pool_setup.session_factory,
+        redis,
+        provider=provider,
+        concurrency=1,
+        tokens_per_minute=100000,
+    )
+
+    assert await pool.run_once() == 1
+
+    assert pool_setup.failed == [(pool_setup.jobs[0], "model unavailable")]
+    assert not pool_setup.completed
+    # No session is held idle in transaction while the model is called
+    assert provider.open_sessions == 0
+    assert pool_setup.log[-3:] == ["open", "commit", "close"]
+    # The failed call keeps its reservation
+    assert sum(redis.values.values()) == insight_scheduler.estimate_tokens(
+        spending_facts()
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_claim_racing_another_worker_claims_nothing(pool_setup, monkeypatch):
+    """Test that a claim hitting the running-job-per-user index is rolled back."""
+
+    async def racing_claim(self, limit, lease):
+        raise IntegrityError("UPDATE insight_jobs", {}, Exception("duplicate key"))
+
+    monkeypatch.setattr(InsightScheduler, "claim", racing_claim)
+    pool = InsightWorkerPool(
+        pool_setup.session_factory,
+        WindowRedis(),
+        provider=LocalInsightProvider(),
+        concurrency=2,
+        tokens_per_minute=100000,
+    )
+
+    assert await pool.run_once() == 0
+    assert pool_setup.log == ["open", "rollback", "close"]
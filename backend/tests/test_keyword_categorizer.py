@@ -0,0 +1,117 @@
+"""
+Tests for the keyword categorizer.
+
+This module contains unit tests for the word-level Aho-Corasick automaton,
+match scoring and the per-user index cache.
+"""
+
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services import keyword_categorizer
+from app.services.category_tree import CategoryTree
+from app.services.keyword_categorizer import (
+    KeywordAutomaton,
+    KeywordIndex,
+    KeywordIndexCache,
+    keyword_confidence,
+)
+
+
+def make_row(name, keywords, parent_id=None, category_type="expense", active=True):
+    """Build a category row with sensible defaults."""
+    return {
+        "id": uuid4(),
+        "parent_id": parent_id,
+        "name": name,
+        "category_type": category_type,
+        "color": "#3B82F6",
+        "icon": None,
+        "is_system": True,
+        "is_active": active,
+        "budget_amount": None,
+        "keywords": json.dumps(keywords),
+    }
+
+
+@pytest.mark.unit
+def test_automaton_matches_whole_words_and_phrases():
+    """Test that keywords match on word boundaries, including phrases."""
+    food, income = uuid4(), uuid4()
+    automaton = KeywordAutomaton(
+        {"bus": [food], "capital gains": [income], "gains": [food]}
+    )
+
+    assert automaton.scan("BUSINESS LUNCH") == {}
+    hits = automaton.scan("Capital-Gains distribution, bus #42")
+    assert hits[income] == (2, ["capital gains"])
+    assert hits[food] == (2, ["gains", "bus"])
+
+
+@pytest.mark.unit
+def test_automaton_follows_failure_links():
+    """Test that a partial phrase falls back to overlapping keywords."""
+    first, second = uuid4(), uuid4()
+    automaton = KeywordAutomaton({"gas station": [first], "station fee": [second]})
+
+    hits = automaton.scan("gas station fee")
+
+    assert hits == {first: (2, ["gas station"]), second: (2, ["station fee"])}
+
+
+@pytest.mark.unit
+def test_keyword_confidence():
+    """Test confidence scoring for clear, strong and contested matches."""
+    assert keyword_confidence(1, 1) == Decimal("0.75")
+    assert keyword_confidence(2, 2) == Decimal("0.88")
+    assert keyword_confidence(1, 2) == Decimal("0.38")
+    assert keyword_confidence(10, 10) == Decimal("0.99")
+
+
+@pytest.mark.unit
+def test_index_filters_by_type_and_prefers_deeper_categories():
+    """Test type filtering, inactive categories and depth tie-breaking."""
+    food = make_row("Food", ["coffee"])
+    cafe = make_row("Cafes", ["coffee"], parent_id=food["id"])
+    salary = make_row("Salary", ["payroll"], category_type="income")
+    retired = make_row("Old", ["payroll"], active=False)
+    tree = CategoryTree.build(uuid4(), 0, [food, cafe, salary, retired])
+
+    index = KeywordIndex.build(tree)
+
+    found = index.match("Blue Bottle Coffee", "expense")
+    assert found.category_id == cafe["id"]
+    assert found.confidence == Decimal("0.38")
+    assert not found.is_confident
+    assert index.match("ACME PAYROLL", "expense") is None
+    paid = index.match("ACME PAYROLL", "income")
+    assert paid.category_id == salary["id"]
+    assert paid.is_confident
+    assert index.match("ACME PAYROLL", "transfer") is None
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_index_cache_rebuilds_on_tree_version(monkeypatch):
+    """Test that a cached index is reused until the tree version changes."""
+    user_id = uuid4()
+    rows = [make_row("Transport", ["uber"])]
+    trees = {"version": 0}
+
+    class FakeTreeCache:
+        async def get(self, db, redis, user_id):
+            return CategoryTree.build(user_id, trees["version"], rows)
+
+    monkeypatch.setattr(keyword_categorizer, "category_tree_cache", FakeTreeCache())
+    cache = KeywordIndexCache()
+
+    first = await cache.get(None, None, user_id)
+    assert await cache.get(None, None, user_id) is first
+
+    trees["version"] = 1
+    rebuilt = await cache.get(None, None, user_id)
+    assert rebuilt is not first
+    assert rebuilt.version == 1
@@ -0,0 +1,76 @@
+"""
+Tests for JSON serialization.
+
+This module contains unit tests for the orjson response class and for
+building list responses from Core rows with the same output as the
+pydantic schemas.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.core.serialization import FastJSONResponse, dumps, rows_to_dicts
+from app.schemas.transaction import TransactionResponse
+from app.services.transaction_list import TRANSACTION_FIELDS
+
+
+def transaction_row():
+    """Build a listed transaction row."""
+    values = dict.fromkeys(TRANSACTION_FIELDS, False)
+    values.update(
+        id=uuid4(),
+        transaction_date=datetime(2025, 7, 1, 9, 30, tzinfo=timezone.utc),
+        description="Café au lait",
+        amount=Decimal("4.50"),
+        currency="EUR",
+        transaction_type="expense",
+        from_account_id=uuid4(),
+        to_account_id=None,
+        category_id=None,
+        notes=None,
+        tags=["coffee"],
+        location=None,
+        created_at=datetime(2025, 7, 1, 9, 31, 5, 120000, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 7, 1, 9, 31, 5, 120000, tzinfo=timezone.utc),
+    )
+    return tuple(values[name] for name in TRANSACTION_FIELDS)
+
+
+@pytest.mark.unit
+def test_dumps_handles_decimals_uuids_and_datetimes():
+    """Test that decimals keep their digits and datetimes their offset."""
+    transaction_id = uuid4()
+
+    content = dumps(
+        {
+            "id": transaction_id,
+            "amount": Decimal("10.10"),
+            "at": datetime(2025, 7, 1, tzinfo=timezone.utc),
+        }
+    )
+
+    assert json.loads(content) == {
+        "id": str(transaction_id),
+        "amount": "10.10",
+        "at": "2025-07-01T00:00:00+00:00",
+    }
+    with pytest.raises(TypeError):
+        dumps({"unknown": object()})
+
+
+@pytest.mark.unit
+def test_rows_render_like_the_pydantic_schema():
+    """Test that responses built from rows match the validated schema's JSON."""
+    row = transaction_row()
+
+    fast = FastJSONResponse(rows_to_dicts(TRANSACTION_FIELDS, [row]))
+    validated = TransactionResponse.model_validate(dict(zip(TRANSACTION_FIELDS, row)))
+
+    assert fast.media_type == "application/json"
+    assert json.loads(fast.body) == [
+        json.loads(validated.model_dump_json(exclude_unset=True))
+    ]
@@ -0,0 +1,221 @@
+"""
+Tests for the similarity categorizer.
+
+This module contains unit tests for trigram vectors, neighbour voting, the
+memory-mapped index store and incremental index updates, using an
+in-memory stand-in for the database.
+"""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from app.services.similarity_categorizer import (
+    SimilarityCategorizer,
+    SimilarityIndex,
+    SimilarityIndexStore,
+    vectorize,
+)
+
+
+@pytest.mark.unit
+def test_vectorize_is_normalized_and_stable():
+    """Test that vectors are unit length and similar texts score higher."""
+    vectors = vectorize(["blue bottle coffee", "blue bottle cafe", "shell oil", ""])
+
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:3], axis=1), 1.0)
+    assert not vectors[3].any()
+    assert vectors[0] @ vectors[1] > 0.5 > vectors[0] @ vectors[2]
+    assert np.array_equal(vectors[:1], vectorize(["blue bottle coffee"]))
+
+
+@pytest.mark.unit
+def test_match_votes_within_the_same_transaction_type():
+    """Test the neighbour vote, type separation and unmatched descriptions."""
+    coffee, fuel, salary = uuid4(), uuid4(), uuid4()
+    index = SimilarityIndex.build(
+        uuid4(),
+        [
+            ("BLUE BOTTLE COFFEE #12", "expense", coffee, 3.0),
+            ("BLUE BOTTLE COFFEE SF", "expense", coffee, 1.0),
+            ("SHELL OIL 5744", "expense", fuel, 2.0),
+            ("ACME PAYROLL", "income", salary, 12.0),
+        ],
+        None,
+    )
+
+    matches = index.match(
+        [
+            "Blue Bottle Coffee 03/05",
+            "SHELL OIL 1234",
+            "ACME PAYROLL",
+            "ACME PAYROLL",
+            "Corner Deli",
+            "SHELL OIL 1234",
+        ],
+        ["expense", "expense", "income", "expense", "expense", "expense"],
+    )
+
+    assert matches[0].category_id == coffee
+    assert matches[0].confidence >= 0.9
+    assert matches[1].category_id == fuel
+    assert matches[1] == matches[5]
+    assert matches[2].category_id == salary
+    assert matches[3] is None
+    assert matches[4] is None
+
+
+@pytest.mark.unit
+def test_store_round_trips_a_memory_mapped_index(tmp_path):
+    """Test that saves replace the previous generation and map vectors."""
+    user_id = uuid4()
+    store = SimilarityIndexStore(str(tmp_path))
+    assert store.load(user_id) is None
+
+    watermark = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    first = store.save(
+        SimilarityIndex.build(user_id, [("SHELL OIL", "expense", uuid4(), 1.0)], None)
+    )
+    second = store.save(
+        SimilarityIndex.build(
+            user_id, [("ACME PAYROLL", "income", uuid4(), 1.0)], watermark, first
+        )
+    )
+
+    loaded = store.load(user_id)
+    assert isinstance(loaded.vectors, np.memmap)
+    assert loaded.generation == second.generation
+    assert loaded.size == 2
+    assert loaded.category_ids == second.category_ids
+    assert loaded.watermark == watermark
+    assert sorted(path.name for path in (tmp_path / str(user_id)).iterdir()) == [
+        f"{second.generation}.members.npy",
+        f"{second.generation}.rows.npy",
+        f"{second.generation}.vectors.npy",
+        "meta.json",
+    ]
+
+    store.delete(user_id)
+    assert store.load(user_id) is None
+
+
+class LabeledSession:
+    """Session stand-in serving the database time and queued query results."""
+
+    def __init__(self, now, *batches):
+        self.now = now
+        self.batches = list(batches)
+        self.queries = 0
+
+    async def execute(self, statement, params=None, **kwargs):
+        self.queries += 1
+        if not statement.get_final_froms():
+            return SimpleNamespace(scalar_one=lambda: self.now)
+        rows = self.batches.pop(0) if self.batches else []
+        return SimpleNamespace(all=lambda: rows)
+
+
+def labeled_row(description, category_id, *members, transaction_type="expense"):
+    """Build a grouped labeled-history row from (ID, updated_at) members."""
+    return SimpleNamespace(
+        description=description,
+        transaction_type=transaction_type,
+        category_id=category_id,
+        weight=len(members),
+        ids=[member_id for member_id, _ in members],
+        updated=[updated_at for _, updated_at in members],
+    )
+
+
+def changed_row(transaction_id, description, category_id, updated_at, deleted=False):
+    """Build a changed-transaction row."""
+    return SimpleNamespace(
+        id=transaction_id,
+        description=description,
+        transaction_type="expense",
+        category_id=category_id,
+        is_deleted=deleted,
+        updated_at=updated_at,
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_index_is_extended_with_newly_labeled_transactions(tmp_path):
+    """Test the initial build and incremental appends past the watermark."""
+    user_id = uuid4()
+    coffee, fuel = uuid4(), uuid4()
+    now = datetime(2025, 8, 10, tzinfo=timezone.utc)
+    later = now + timedelta(minutes=5)
+    session = LabeledSession(
+        now,
+        [labeled_row("BLUE BOTTLE COFFEE", coffee, (uuid4(), now))],
+        [],
+        [changed_row(uuid4(), "SHELL OIL", fuel, later)],
+    )
+    categorizer = SimilarityCategorizer(session, SimilarityIndexStore(str(tmp_path)))
+
+    first = await categorizer.categorize(
+        user_id, [("BLUE BOTTLE COFFEE 04/01", "expense"), ("SHELL OIL", "expense")]
+    )
+    assert first[0].category_id == coffee
+    assert first[1] is None
+
+    unchanged = await categorizer.get_index(user_id)
+    assert unchanged.size == 1
+    assert unchanged.watermark == now
+
+    second = await categorizer.categorize(user_id, [("SHELL OIL 5744", "expense")])
+    assert second[0].category_id == fuel
+    assert session.queries == 4
+
+    index = await categorizer.get_index(user_id)
+    assert index.size == 2
+    assert index.watermark == later
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_changes_to_indexed_rows_rebuild_and_late_commits_are_found(tmp_path):
+    """Test that stale votes are dropped and the settle window is re-scanned."""
+    user_id = uuid4()
+    coffee, fuel = uuid4(), uuid4()
+    now = datetime(2025, 8, 10, tzinfo=timezone.utc)
+    deli_id, bottle_id, late_id = uuid4(), uuid4(), uuid4()
+    session = LabeledSession(
+        now,
+        [
+            labeled_row("CORNER DELI", coffee, (deli_id, now)),
+            labeled_row("BLUE BOTTLE COFFEE", coffee, (bottle_id, now)),
+        ],
+        # Re-scanned unchanged, plus a label committed behind the watermark
+        [
+            changed_row(deli_id, "CORNER DELI", coffee, now),
+            changed_row(late_id, "SHELL OIL", fuel, now - timedelta(seconds=30)),
+        ],
+        # The deli is recategorized and the index is rebuilt from the database
+        [changed_row(deli_id, "CORNER DELI", fuel, now + timedelta(minutes=1))],
+        [
+            labeled_row("CORNER DELI", fuel, (deli_id, now + timedelta(minutes=1))),
+            labeled_row("BLUE BOTTLE COFFEE", coffee, (bottle_id, now)),
+            labeled_row("SHELL OIL", fuel, (late_id, now - timedelta(seconds=30))),
+        ],
+    )
+    categorizer = SimilarityCategorizer(session, SimilarityIndexStore(str(tmp_path)))
+    await categorizer.rebuild(user_id)
+
+    extended = await categorizer.get_index(user_id)
+    assert extended.size == 3
+    assert extended.match(["SHELL OIL"], ["expense"])[0].category_id == fuel
+    assert extended.indexed_at([late_id, uuid4()])[1] is None
+
+    session.now = now + timedelta(minutes=2)
+    rebuilt = await categorizer.get_index(user_id)
+    assert rebuilt.size == 3
+    assert rebuilt.watermark == session.now
+    assert rebuilt.match(["CORNER DELI"], ["expense"])[0].category_id == fuel
+    assert session.batches == []
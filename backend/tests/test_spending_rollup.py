@@ -0,0 +1,110 @@
+"""
+Tests for the spending rollup service.
+
+This module contains unit tests for transaction change events and the
+incremental rollup maintenance, using a recording session instead of a
+database.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from app.services.spending_rollup import SpendingRollupService
+from app.services.transaction_events import (
+    TransactionChange,
+    TransactionSnapshot,
+    month_start,
+)
+
+
+class RecordingSession:
+    """Minimal async session stand-in that records executed statements."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+
+
+def make_snapshot(**overrides) -> TransactionSnapshot:
+    """Build a transaction snapshot with sensible defaults."""
+    data = {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "category_id": uuid4(),
+        "from_account_id": None,
+        "to_account_id": None,
+        "amount": Decimal("12.50"),
+        "currency": "USD",
+        "transaction_type": "expense",
+        "transaction_date": datetime(2024, 3, 15, tzinfo=timezone.utc),
+    }
+    data.update(overrides)
+    return TransactionSnapshot(**data)
+
+
+@pytest.mark.unit
+class TestTransactionEvents:
+    """Test transaction snapshots and change events."""
+
+    def test_month_start_uses_utc(self):
+        """Test that month bucketing converts to UTC first."""
+        local = timezone(timedelta(hours=5))
+        value = datetime(2024, 4, 1, 2, 0, tzinfo=local)
+        assert month_start(value) == date(2024, 3, 1)
+
+    def test_change_user_id(self):
+        """Test that deletes still expose the owning user."""
+        snapshot = make_snapshot()
+        change = TransactionChange.deleted(snapshot)
+        assert change.user_id == snapshot.user_id
+
+
+@pytest.mark.unit
+class TestSpendingRollupService:
+    """Test incremental rollup maintenance."""
+
+    @pytest.mark.asyncio
+    async def test_inserts_use_single_upsert(self):
+        """Test that insert-only batches are applied as one delta upsert."""
+        session = RecordingSession()
+        user_id, category_id = uuid4(), uuid4()
+        changes = [
+            TransactionChange(
+                before=None,
+                after=make_snapshot(user_id=user_id, category_id=category_id),
+            )
+            for _ in range(3)
+        ]
+
+        touched = await SpendingRollupService(session).apply_changes(changes)
+
+        assert touched == 1
+        # One rollup upsert plus one category counter update
+        assert len(session.statements) == 2
+        assert "ON CONFLICT" in str(session.statements[0].compile())
+
+    @pytest.mark.asyncio
+    async def test_removals_recompute_bucket(self):
+        """Test that buckets losing transactions are recomputed."""
+        session = RecordingSession()
+        before = make_snapshot()
+        after = make_snapshot(
+            id=before.id,
+            user_id=before.user_id,
+            category_id=uuid4(),
+            amount=Decimal("20.00"),
+        )
+
+        touched = await SpendingRollupService(session).apply_changes(
+            [TransactionChange(before=before, after=after)]
+        )
+
+        assert touched == 2
+        compiled = [str(s.compile()) for s in session.statements]
+        assert any(sql.startswith("DELETE FROM spending_rollups") for sql in compiled)
+        assert any("GROUP BY" in sql for sql in compiled)
@@ -0,0 +1,210 @@
+"""
+Tests for transaction listing.
+
+This module contains unit tests for the keyset-paginated transaction list
+and the streamed NDJSON and CSV exports, using in-memory stand-ins for the
+session and the server-side cursor.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.transaction_list import (
+    TRANSACTION_COLUMNS,
+    TransactionFilter,
+    TransactionListService,
+    decode_cursor,
+    encode_cursor,
+    encode_transaction_stream,
+    parse_fields,
+    stream_transaction_batches,
+)
+
+NAMES = [column.name for column in TRANSACTION_COLUMNS]
+START = datetime(2025, 7, 1, tzinfo=timezone.utc)
+
+
+def transaction_row(number):
+    """Build a listed transaction row."""
+    values = dict.fromkeys(NAMES)
+    values.update(
+        id=UUID(int=number),
+        transaction_date=START - timedelta(days=number),
+        description=f"Payment {number}",
+    )
+    return SimpleNamespace(**values)
+
+
+def row_tuple(row):
+    """Get a row's values in column order."""
+    return tuple(getattr(row, name) for name in NAMES)
+
+
+def compiled(query):
+    """Compile a query for PostgreSQL."""
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+def test_cursor_round_trips_and_rejects_garbage():
+    """Test that cursors encode the list position and bad ones are rejected."""
+    row = transaction_row(3)
+
+    assert decode_cursor(encode_cursor(row)) == (row.transaction_date, row.id)
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.unit
+def test_filter_query_follows_list_index():
+    """Test that listings filter live rows and order newest first."""
+    account_id = uuid4()
+    sql = compiled(
+        TransactionFilter(user_id=uuid4(), start=START, account_id=account_id).query()
+    )
+
+    assert "transactions.is_deleted = false" in sql
+    assert "(transactions.from_account_id = %(from_account_id_1)s::UUID OR" in sql
+    assert sql.endswith(
+        "ORDER BY transactions.transaction_date DESC, transactions.id DESC"
+    )
+    with pytest.raises(ValueError, match="start must be before end"):
+        TransactionFilter(user_id=uuid4(), start=START, end=START)
+
+
+class PageSession:
+    """Session stand-in returning rows for a page query."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_list_page_fetches_one_extra_row_for_the_cursor():
+    """Test that a full page returns the cursor after its last row."""
+    rows = [transaction_row(number) for number in range(1, 4)]
+    session = PageSession(rows)
+    filters = TransactionFilter(user_id=uuid4())
+
+    page = await TransactionListService(session).list_page(filters, limit=2)
+    await TransactionListService(session).list_page(
+        filters, limit=2, cursor=page.next_cursor
+    )
+
+    assert page.items == rows[:2]
+    assert decode_cursor(page.next_cursor) == (rows[1].transaction_date, rows[1].id)
+    sql = compiled(session.statements[1])
+    assert "(transactions.transaction_date, transactions.id) < (" in sql
+    assert "LIMIT" in sql
+
+
+class CursorStream:
+    """Server-side cursor stand-in yielding row batches."""
+
+    def __init__(self, batches, log):
+        self.batches = batches
+        self.log = log
+
+    async def partitions(self):
+        for batch in self.batches:
+            self.log.append("fetch")
+            yield batch
+
+    async def close(self):
+        self.log.append("close")
+
+
+class StreamSession:
+    """Session stand-in opening a CursorStream."""
+
+    def __init__(self, batches, log):
+        self.batches = batches
+        self.log = log
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream(self, statement):
+        self.log.append(statement.get_execution_options()["yield_per"])
+        return CursorStream(self.batches, self.log)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_export_streams_one_chunk_per_fetched_batch():
+    """Test that each batch is fetched only after the previous chunk is sent."""
+    batches = [
+        [row_tuple(transaction_row(1)), row_tuple(transaction_row(2))],
+        [row_tuple(transaction_row(3))],
+    ]
+    log = []
+    chunks = encode_transaction_stream(
+        "ndjson",
+        stream_transaction_batches(
+            TransactionFilter(user_id=uuid4()),
+            session_factory=lambda: StreamSession(batches, log),
+            batch_size=2,
+        ),
+    )
+
+    first = await chunks.__anext__()
+    assert log == [2, "fetch"]
+    rest = [chunk async for chunk in chunks]
+
+    assert [json.loads(line)["description"] for line in first.splitlines()] == [
+        "Payment 1",
+        "Payment 2",
+    ]
+    assert len(rest) == 1
+    assert log == [2, "fetch", "fetch", "close"]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_csv_export_sends_header_before_the_first_fetch():
+    """Test that CSV responses start before any row is read."""
+
+    async def batches():
+        raise AssertionError("fetched before the header was sent")
+        yield []
+
+    chunks = encode_transaction_stream("csv", batches())
+
+    header = await chunks.__anext__()
+
+    assert header.decode().strip() == ",".join(NAMES)
+
+
+@pytest.mark.unit
+def test_sparse_fields_are_validated_and_pushed_down():
+    """Test that only requested columns are selected, in schema order."""
+    fields = parse_fields("amount, description")
+    default = compiled(TransactionFilter(user_id=uuid4()).query())
+    sparse = compiled(TransactionFilter(user_id=uuid4()).query(fields))
+
+    assert fields == ("id", "transaction_date", "description", "amount")
+    assert sparse.startswith(
+        "SELECT transactions.id, transactions.transaction_date, "
+        "transactions.description, transactions.amount \nFROM"
+    )
+    assert "import_metadata" not in default
+    assert "ai_categorization_data" not in default
+    assert "import_metadata" in compiled(
+        TransactionFilter(user_id=uuid4()).query(parse_fields("import_metadata"))
+    )
+    with pytest.raises(ValueError, match="Unknown fields: hashed_password, user_id"):
+        parse_fields("amount,user_id,hashed_password")